@@ -0,0 +1,72 @@
+"""Import-time benchmark for the ChargeHub layers.
+
+Runs `python -X importtime -c "import <module>"` in a fresh interpreter for
+each target and reports the cumulative import time plus whether any of the
+heavy UI/data dependencies were pulled in.
+
+Usage:
+    python benchmarks/import_time.py [--repeat N] [module ...]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+HEAVY_MODULES = ("streamlit", "folium", "streamlit_folium", "pandas", "numpy")
+
+DEFAULT_TARGETS = (
+    "chargehub.discovery.domain.value_objects.postal_code",
+    "chargehub.discovery.application.charging_station_service",
+    "chargehub.malfunction.application.malfunction_service",
+    "chargehub.discovery.infrastructure.repositories.charging_station_csv_repository",
+    "chargehub.malfunction.infrastructure.repositories.report_repository",
+)
+
+_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+def measure(module: str) -> tuple[float, set[str]]:
+    """Return (cumulative import time of `module` in ms, heavy top-level modules loaded)."""
+    env = dict(os.environ, PYTHONPATH=str(SRC))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    cumulative_us = 0
+    loaded: set[str] = set()
+    for line in proc.stderr.splitlines():
+        match = _LINE.match(line)
+        if not match:
+            continue
+        name = match.group(4)
+        if name == module:
+            cumulative_us = int(match.group(2))
+        top = name.split(".")[0]
+        if top in HEAVY_MODULES:
+            loaded.add(top)
+    return cumulative_us / 1000.0, loaded
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("modules", nargs="*", default=list(DEFAULT_TARGETS))
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'module':<85} {'median ms':>10}  heavy deps")
+    for module in args.modules:
+        samples = []
+        loaded: set[str] = set()
+        for _ in range(args.repeat):
+            ms, loaded = measure(module)
+            samples.append(ms)
+        print(f"{module:<85} {statistics.median(samples):>10.1f}  {', '.join(sorted(loaded)) or '-'}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""Near-duplicate report detection on a synthetic spam corpus.
+
+Files a mix of genuine reports and spam variations (case, punctuation,
+typos, repeated submissions) across many stations and reports filing
+latency and how much spam was rejected.
+
+Usage:
+    python benchmarks/report_dedup.py [--stations N] [--reports-per-station N] [--threshold T]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from chargehub.discovery.domain.aggregates.charging_station import ChargingStationAggregate
+from chargehub.discovery.infrastructure.repositories.charging_station_repository import ChargingStationRepository
+from chargehub.malfunction.application.malfunction_service import MalfunctionService
+from chargehub.malfunction.infrastructure.repositories.report_repository import ReportRepositoryImpl
+
+ISSUES = ["Screen broken", "Connector damaged", "Card reader not working", "Cable cut", "App shows offline",
+          "Plug stuck in socket", "Charging stops after 2 minutes", "Parking spot blocked by ICE car",
+          "No power on left plug", "Display flickers", "Emergency stop pressed", "QR code unreadable"]
+
+def spam_variant(rng: random.Random, text: str) -> str:
+    kind = rng.randrange(4)
+    if kind == 0:
+        return text.upper()
+    if kind == 1:
+        return text.lower() + "!" * rng.randint(1, 4)
+    if kind == 2:
+        i = rng.randrange(len(text))
+        return text[:i] + text[i] + text[i:]  # doubled character typo
+    return f"  {text}  ..."
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--stations", type=int, default=500)
+    parser.add_argument("--reports-per-station", type=int, default=40)
+    parser.add_argument("--threshold", type=float, default=0.85)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    charging_repo = ChargingStationRepository([
+        ChargingStationAggregate(station_id=i, postal_code="10115", latitude=52.5, longitude=13.4)
+        for i in range(args.stations)
+    ])
+    service = MalfunctionService(report_repository=ReportRepositoryImpl(), charging_station_repository=charging_repo,
+                                 similarity_threshold=args.threshold)
+
+    latencies = []
+    spam_filed = spam_rejected = genuine_rejected = 0
+    for station_id in range(args.stations):
+        genuine = rng.sample(ISSUES, k=4)
+        for n in range(args.reports_per_station):
+            base = genuine[n % len(genuine)]
+            is_spam = n >= len(genuine)
+            text = spam_variant(rng, base) if is_spam else base
+            start = time.perf_counter()
+            try:
+                service.file_malfunction_report(station_id, text)
+                rejected = False
+            except ValueError:
+                rejected = True
+            latencies.append((time.perf_counter() - start) * 1e6)
+            if is_spam:
+                spam_filed += 1
+                spam_rejected += rejected
+            else:
+                genuine_rejected += rejected
+
+    total = len(latencies)
+    print(f"reports filed:      {total} ({spam_filed} spam variants)")
+    print(f"spam rejected:      {spam_rejected / spam_filed:.1%}")
+    print(f"genuine rejected:   {genuine_rejected}")
+    print(f"median latency:     {statistics.median(latencies):.0f} µs")
+    print(f"p99 latency:        {sorted(latencies)[int(total * 0.99)]:.0f} µs")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+"""Free-text station search benchmark on a synthetic register.
+
+Usage:
+    python benchmarks/search_index.py [--stations N]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from chargehub.discovery.domain.aggregates.charging_station import ChargingStationAggregate
+from chargehub.discovery.infrastructure.search.station_search_index import InvertedStationSearchIndex
+
+OPERATORS = ["Allego GmbH", "Vattenfall Europe Innovation GmbH", "EnBW mobility+ AG und Co.KG", "Tesla Germany GmbH",
+             "E.ON Drive GmbH", "Lidl Dienstleistung GmbH & Co. KG", "ubitricity GmbH", "Stromnetz Berlin GmbH"]
+STREETS = ["Schönhauser Allee", "Kurfürstendamm", "Frankfurter Allee", "Karl-Marx-Straße", "Müllerstraße",
+           "Sonnenallee", "Greifswalder Straße", "Hauptstraße", "Torstraße", "Prenzlauer Allee", "Danziger Straße"]
+QUERIES = ["Allego Schönhauser Allee", "allego schoenhauser", "Vatenfall Kudamm", "karl marx str",
+           "tesla", "Muellerstrasse 12", "sonnenale"]
+
+def build(n: int, seed: int = 7):
+    rng = random.Random(seed)
+    return [
+        ChargingStationAggregate(
+            station_id=i, postal_code="10115", latitude=52.5, longitude=13.4,
+            operator=rng.choice(OPERATORS), address=f"{rng.choice(STREETS)} {rng.randint(1, 200)}",
+        )
+        for i in range(n)
+    ]
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--stations", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    stations = build(args.stations)
+    start = time.perf_counter()
+    index = InvertedStationSearchIndex(stations)
+    print(f"build: {(time.perf_counter() - start) * 1000:.1f} ms for {args.stations} stations")
+
+    for query in QUERIES:
+        samples = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            hits = index.search(query)
+            samples.append((time.perf_counter() - start) * 1000)
+        print(f"{query!r:<30} {statistics.median(samples):7.2f} ms  {len(hits):6d} hits")
+
+    stations[0].address = "Neue Straße 1"
+    start = time.perf_counter()
+    changed = index.sync(stations)
+    print(f"incremental sync: {(time.perf_counter() - start) * 1000:.1f} ms ({changed} re-indexed)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
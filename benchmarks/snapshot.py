@@ -0,0 +1,64 @@
+"""Snapshot and restore time for station availability and the report store.
+
+Builds a synthetic register and report backlog, writes both snapshots and
+restores them into fresh repositories, as a new worker would after a deploy.
+
+Usage:
+    python benchmarks/snapshot.py [--stations N] [--reports N]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from chargehub.discovery.domain.aggregates.charging_station import ChargingStationAggregate
+from chargehub.discovery.infrastructure.repositories.charging_station_repository import ChargingStationRepository
+from chargehub.malfunction.domain.aggregates.malfunction_report import ReportStatus
+from chargehub.malfunction.infrastructure.repositories.report_repository import ReportRepositoryImpl
+
+def build_stations(n: int):
+    return [ChargingStationAggregate(station_id=i, postal_code="10115", latitude=52.5, longitude=13.4) for i in range(n)]
+
+def timed(label: str, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:<22}{(time.perf_counter() - start) * 1000:8.1f} ms")
+    return result
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--stations", type=int, default=20000)
+    parser.add_argument("--reports", type=int, default=20000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    stations = ChargingStationRepository(build_stations(args.stations))
+    for station_id in rng.sample(range(args.stations), k=args.stations // 10):
+        stations.update_station_status(station_id, False)
+
+    reports = ReportRepositoryImpl()
+    for i in range(args.reports):
+        report_id = reports.save_report(rng.randrange(args.stations), f"Issue {i}: connector {rng.randrange(99)} broken")
+        if rng.random() < 0.5:
+            reports.update_status(report_id, ReportStatus.APPROVED)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        station_path, report_path = Path(tmp) / "stations.snap", Path(tmp) / "reports.snap"
+        timed("station snapshot", lambda: stations.snapshot(station_path))
+        timed("report snapshot", lambda: reports.snapshot(report_path))
+        print(f"snapshot sizes        {station_path.stat().st_size} B / {report_path.stat().st_size} B")
+
+        fresh_stations = ChargingStationRepository(build_stations(args.stations))
+        changed = timed("station restore", lambda: fresh_stations.restore(station_path))
+        restored = timed("report restore", lambda: ReportRepositoryImpl().restore(report_path))
+        print(f"restored              {changed} station overrides, {restored} reports")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""Composite station queries: planned `query()` vs a list comprehension over all stations.
+
+Prints the median time of both and the `explain()` plan for each mixed filter.
+
+Usage:
+    python benchmarks/station_query.py [--stations N] [--repeat N]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from chargehub.discovery.domain.aggregates.charging_station import ChargingStationAggregate
+from chargehub.discovery.domain.value_objects.station_query import StationQuery
+from chargehub.discovery.infrastructure.repositories.charging_station_repository import ChargingStationRepository
+
+OPERATORS = ["Allego GmbH", "Vattenfall Europe Innovation GmbH", "EnBW mobility+ AG und Co.KG", "Tesla Germany GmbH",
+             "E.ON Drive GmbH", "Lidl Dienstleistung GmbH & Co. KG", "ubitricity GmbH", "Stromnetz Berlin GmbH"]
+CODES = [f"{prefix}{i:03d}" for prefix in ("10", "12", "13") for i in range(100, 700, 7)]
+
+QUERIES = {
+    "plz + available": StationQuery(postal_codes={"10107", "10135"}, available=True),
+    "operator + available": StationQuery(operator="Allego GmbH", available=True),
+    "bbox (small) + operator": StationQuery(bbox=(52.50, 13.38, 52.52, 13.42), operator="ubitricity GmbH"),
+    "bbox (city) + unavailable": StationQuery(bbox=(52.35, 13.10, 52.65, 13.70), available=False),
+    "ids + plz + bbox": StationQuery(station_ids=set(range(0, 50_000, 500)), postal_codes=set(CODES[:40]),
+                                     bbox=(52.40, 13.20, 52.60, 13.60)),
+    "everything": StationQuery(postal_codes=set(CODES[:20]), operator="Tesla Germany GmbH", available=True,
+                               bbox=(52.40, 13.20, 52.60, 13.60)),
+}
+
+def build(n: int, seed: int = 7):
+    rng = random.Random(seed)
+    return [
+        ChargingStationAggregate(
+            station_id=i, postal_code=rng.choice(CODES),
+            latitude=rng.uniform(52.35, 52.65), longitude=rng.uniform(13.10, 13.70),
+            available=rng.random() < 0.9, operator=rng.choice(OPERATORS),
+        )
+        for i in range(n)
+    ]
+
+def naive(stations, q: StationQuery):
+    return [
+        s for s in stations
+        if (q.postal_codes is None or s.postal_code in q.postal_codes)
+        and (q.available is None or s.available == q.available)
+        and (q.operator is None or s.operator == q.operator)
+        and (q.bbox is None or (q.bbox[0] <= s.latitude <= q.bbox[2] and q.bbox[1] <= s.longitude <= q.bbox[3]))
+        and (q.station_ids is None or s.station_id in q.station_ids)
+    ]
+
+def median_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--stations", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    stations = build(args.stations)
+    repo = ChargingStationRepository(stations)
+    for name, query in QUERIES.items():
+        planned = median_ms(lambda: repo.query(query), args.repeat)
+        scanned = median_ms(lambda: naive(stations, query), args.repeat)
+        print(f"== {name}: query() {planned:7.2f} ms   full scan {scanned:7.2f} ms")
+        print(repo.explain(query))
+        print()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
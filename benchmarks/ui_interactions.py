@@ -0,0 +1,112 @@
+"""Server time per user interaction: whole-script rerun vs fragment rerun.
+
+Drives the station view through Streamlit's AppTest (no browser) over
+synthetic stations and reads the InteractionTimings the view records. AppTest
+always reruns the whole script, so each interaction yields both numbers:
+the full run (what every interaction cost before the view was split into
+fragments, and still costs with UI_FRAGMENTS = False) and the section the
+interaction's widget lives in (what a fragment rerun executes).
+
+Needs streamlit, folium and streamlit-folium.
+
+Usage:
+    python benchmarks/ui_interactions.py [--stations N] [--repeat N]
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from streamlit.testing.v1 import AppTest
+
+def app(stations: int) -> None:
+    # AppTest runs this function's source as the script, so it imports for itself
+    import random
+
+    import streamlit as st
+
+    from chargehub.config import ChargeHubConfig
+    from chargehub.discovery.application.charging_station_service import ChargingStationService
+    from chargehub.discovery.domain.aggregates.charging_station import ChargingStationAggregate
+    from chargehub.discovery.infrastructure.repositories.charging_station_repository import ChargingStationRepository
+    from chargehub.discovery.infrastructure.repositories.postal_code_registry import GeoJsonPostalCodeRegistry
+    from chargehub.discovery.infrastructure.search.station_search_index import InvertedStationSearchIndex
+    from chargehub.discovery.presentation.views.charging_station_view import ChargingStationView
+    from chargehub.malfunction.application.malfunction_service import MalfunctionService
+    from chargehub.malfunction.infrastructure.repositories.report_repository import ReportRepositoryImpl
+    from chargehub.shared.presentation import fragments
+
+    @st.cache_resource
+    def services(n):
+        registry = GeoJsonPostalCodeRegistry(ChargeHubConfig.GEOJSON_PATH)
+        rng, codes = random.Random(7), sorted(registry.codes())
+        operators = ["Allego GmbH", "Vattenfall Europe Innovation GmbH", "ubitricity GmbH", "Tesla Germany GmbH"]
+        repo = ChargingStationRepository([
+            ChargingStationAggregate(station_id=i, postal_code=rng.choice(codes), latitude=rng.uniform(52.35, 52.65),
+                                     longitude=rng.uniform(13.10, 13.70), available=rng.random() < 0.9,
+                                     operator=rng.choice(operators), address=f"Teststraße {i}")
+            for i in range(1, n + 1)
+        ])
+        discovery = ChargingStationService(repository=repo, plz_registry=registry,
+                                           search_index=InvertedStationSearchIndex(repo.get_all()))
+        malfunctions = MalfunctionService(report_repository=ReportRepositoryImpl(), charging_station_repository=repo,
+                                         plz_registry=registry)
+        return repo, discovery, malfunctions
+
+    repo, discovery, malfunctions = services(stations)
+    timings = fragments.interaction_timings()
+    with timings.measure("full run"):
+        ChargingStationView(discovery, malfunctions, repo, ChargeHubConfig()).render()
+
+def _submit_report(at: AppTest) -> None:
+    at.number_input[0].set_value(3)
+    at.text_input[2].input("Screen broken")
+    at.button[0].click()
+    at.run()
+    assert at.success, "report was not filed"
+
+def _text_search(at: AppTest, query: str) -> None:
+    at.text_input(key="plz_input").set_value("")
+    at.text_input[1].input(query)
+    at.run()
+
+# Interaction -> (action, the fragment its widget belongs to)
+INTERACTIONS = {
+    "page load": (lambda at: at.run(), "search + map"),
+    "PLZ search": (lambda at: at.text_input(key="plz_input").input("10437").run(), "search + map"),
+    "text search": (lambda at: _text_search(at, "Allego"), "search + map"),
+    "submit report": (_submit_report, "report form"),
+}
+
+def measure(stations: int, repeat: int):
+    samples = {name: ([], []) for name in INTERACTIONS}
+    for _ in range(repeat):
+        at = AppTest.from_function(app, kwargs={"stations": stations}, default_timeout=120)
+        for name, (action, section) in INTERACTIONS.items():
+            action(at)
+            if at.exception:
+                raise RuntimeError(at.exception[0].message)
+            # The records of this interaction's (single) run, newest first
+            records = dict(at.session_state["interaction_timings"].recent(3))
+            samples[name][0].append(records["full run"])
+            samples[name][1].append(records[section])
+    return {name: (statistics.median(full), statistics.median(own)) for name, (full, own) in samples.items()}
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--stations", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{args.stations} stations, median of {args.repeat} sessions (server time per interaction)")
+    print(f"{'interaction':>14}  {'whole script':>12}  {'fragment':>10}  section")
+    for name, (full, own) in measure(args.stations, args.repeat).items():
+        print(f"{name:>14}  {full:9.1f} ms  {own:7.1f} ms  {INTERACTIONS[name][1]}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,22 +1,34 @@
 from __future__ import annotations
+import os
 import sys
+from datetime import timedelta
 from pathlib import Path
 
 # Add src to sys.path
 sys.path.append(str(Path(__file__).parent / "src"))
 
 import streamlit as st
-import requests
 
 from chargehub.config import ChargeHubConfig
 from chargehub.discovery.application.charging_station_service import ChargingStationService
+from chargehub.discovery.application.search_result_cache import SearchResultCache
 from chargehub.discovery.infrastructure.repositories.charging_station_csv_repository import ChargingStationCSVRepository
+from chargehub.discovery.infrastructure.repositories.postal_code_registry import GeoJsonPostalCodeRegistry
+from chargehub.discovery.infrastructure.repositories.shared_charging_station_repository import SharedChargingStationRepository
+from chargehub.discovery.infrastructure.repositories.shared_station_state import SharedStationState
+from chargehub.discovery.infrastructure.search.station_search_index import InvertedStationSearchIndex
 from chargehub.malfunction.application.malfunction_service import MalfunctionService
+from chargehub.malfunction.application.reliability_analytics import ReliabilityAnalytics
 from chargehub.malfunction.infrastructure.repositories.report_repository import ReportRepositoryImpl
+from chargehub.malfunction.infrastructure.archive.monthly_report_archive import MonthlyReportArchive
+from chargehub.shared.infrastructure.event_log import JsonlEventLog
+from chargehub.shared.infrastructure.periodic_task import PeriodicTask
+from chargehub.shared.infrastructure.file_lock import FileLease
+from chargehub.shared.infrastructure.snapshot_file import SnapshotError, WorkerSnapshots
+from chargehub.shared.presentation import fragments
 
-# Import Presentation Layer
-from chargehub.discovery.presentation.views.charging_station_view import ChargingStationView
-from chargehub.malfunction.presentation.views.malfunction_report_view import MalfunctionReportView
+# Presentation Layer (folium / pandas) and geo helpers (numpy) are imported
+# lazily below, so only the view for the selected role pays for its stack.
 
 # ------------------------------------------------------------
 # Configuration & Setup
@@ -28,53 +40,244 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
+# Reports live per worker process, so each worker snapshots its own and merges all on startup
+@st.cache_resource
+def get_report_snapshots():
+    return WorkerSnapshots(ChargeHubConfig.REPORT_SNAPSHOT_PATH).claim()
+
 # Initialize Services (Singleton-ish pattern for Streamlit)
 @st.cache_resource
 def get_container():
     config = ChargeHubConfig()
+
+    # Known PLZs replace the prefix rule wherever PLZs are validated, so load them before the stations
+    plz_registry = GeoJsonPostalCodeRegistry(config.GEOJSON_PATH, config.PLZ_ADJACENCY_CACHE_PATH)
     
-    charging_repo = ChargingStationCSVRepository(config.DATA_PATH)
-    report_repo = ReportRepositoryImpl()
+    if config.SHARED_STATE_NAME:
+        # Only the first worker parses the CSV; the others attach to its shared block
+        shared_state = SharedStationState.create_or_attach(
+            config.SHARED_STATE_NAME,
+            lambda: ChargingStationCSVRepository(config.DATA_PATH, config.STATION_CACHE_PATH, plz_registry=plz_registry),
+            source_path=config.DATA_PATH,
+        )
+        charging_repo = SharedChargingStationRepository(shared_state)
+    else:
+        charging_repo = ChargingStationCSVRepository(config.DATA_PATH, config.STATION_CACHE_PATH, plz_registry=plz_registry)
+    # PLZs without stations are still offered while typing
+    charging_repo.register_postal_codes(plz_registry.codes())
+    count_window = timedelta(hours=config.REPORT_COUNT_WINDOW_HOURS) if config.REPORT_COUNT_WINDOW_HOURS else None
+    report_repo = ReportRepositoryImpl(
+        archive=MonthlyReportArchive(config.REPORT_ARCHIVE_DIR),
+        count_window=count_window,
+    )
     
-    discovery_service = ChargingStationService(repository=charging_repo)
+    discovery_service = ChargingStationService(
+        repository=charging_repo,
+        plz_registry=plz_registry,
+        min_results=config.SEARCH_MIN_RESULTS,
+        max_expansion_rings=config.SEARCH_MAX_EXPANSION_RINGS,
+        result_cache=SearchResultCache(max_entries=config.SEARCH_CACHE_MAX_ENTRIES),
+        search_index=InvertedStationSearchIndex(charging_repo.get_all()),
+    )
+    event_log = JsonlEventLog(config.EVENT_LOG_PATH)
+    reliability = ReliabilityAnalytics(charging_repo.iter_stations())
+    # One pass over the history at startup; afterwards every event is applied as it is published
+    reliability.apply(event_log.iter_events())
     malfunction_service = MalfunctionService(
         report_repository=report_repo,
         charging_station_repository=charging_repo,
         threshold=config.REPAIR_THRESHOLD,
+        similarity_threshold=config.DUPLICATE_SIMILARITY_THRESHOLD,
+        event_log=event_log,
+        reliability=reliability,
+        plz_registry=plz_registry,
     )
+    restore_snapshots(config, charging_repo, report_repo, get_report_snapshots())
+    # Overrides follow the restored reports, also when the station snapshot is missing or older.
+    # The reports were merged from every worker's snapshot, so this worker may settle all overrides.
+    malfunction_service.sweep_expired_windows(adopt_held=True)
     return config, charging_repo, discovery_service, malfunction_service
 
+def restore_snapshots(config, charging_repo, report_repo, report_snapshots):
+    # A corrupt snapshot must not keep the app from starting
+    if config.STATION_SNAPSHOT_PATH.exists():
+        try:
+            charging_repo.restore(config.STATION_SNAPSHOT_PATH)
+        except SnapshotError:
+            pass
+    orphaned = report_snapshots.orphaned()
+    paths = report_snapshots.paths()
+    if not paths:
+        return
+    try:
+        report_repo.restore_merged(paths)
+    except SnapshotError:
+        return
+    # Exited workers' reports are now in this worker's snapshot
+    report_repo.snapshot(report_snapshots.path)
+    report_snapshots.remove(orphaned)
+
 config, charging_repo, discovery_service, malfunction_service = get_container()
 
-# Load GeoJSON (Cached)
-@st.cache_data
-def get_berlin_geojson(path):
-    import json
+# Periodic snapshots; repositories copy their state quickly and write outside any lock.
+# One worker at a time writes the station snapshot; each writes its own report snapshot.
+@st.cache_resource
+def get_snapshotter():
+    station_writer = FileLease(config.STATION_SNAPSHOT_PATH.with_name(config.STATION_SNAPSHOT_PATH.name + ".lock"))
+    report_path = get_report_snapshots().path
+
+    def take_snapshots():
+        if station_writer.acquire():
+            charging_repo.snapshot(config.STATION_SNAPSHOT_PATH)
+        malfunction_service.report_repository.snapshot(report_path)
+
+    return PeriodicTask(take_snapshots, interval_seconds=config.SNAPSHOT_INTERVAL_SECONDS, name="snapshot").start()
+
+get_snapshotter()
+
+# Background sweep: stations come back online once their reports leave the counting window
+@st.cache_resource
+def get_threshold_sweeper():
+    return PeriodicTask(
+        malfunction_service.sweep_expired_windows,
+        interval_seconds=config.THRESHOLD_SWEEP_INTERVAL_SECONDS,
+        name="threshold-sweep",
+    ).start()
+
+get_threshold_sweeper()
+
+# Administrator notifications leave through an outbox relay, never on the report-filing path.
+# Every worker starts one; only the holder of the cursor's lease delivers.
+@st.cache_resource
+def get_notification_dispatcher():
+    from chargehub.malfunction.infrastructure.notifications.notification_dispatcher import NotificationDispatcher
+    from chargehub.malfunction.infrastructure.notifications import notification_sinks as sinks
+
+    if config.NOTIFICATION_WEBHOOK_URL:
+        sink = sinks.WebhookNotificationSink(config.NOTIFICATION_WEBHOOK_URL)
+    elif config.NOTIFICATION_SMTP_HOST:
+        sink = sinks.SmtpNotificationSink(config.NOTIFICATION_SMTP_HOST, config.NOTIFICATION_SMTP_PORT,
+                                          config.NOTIFICATION_SENDER, config.NOTIFICATION_RECIPIENTS)
+    else:
+        sink = sinks.LoggingNotificationSink()
+    dispatcher = NotificationDispatcher(
+        malfunction_service.event_log, sink,
+        cursor_path=config.NOTIFICATION_CURSOR_PATH,
+        base_delay_seconds=config.NOTIFICATION_RETRY_BASE_SECONDS,
+        max_delay_seconds=config.NOTIFICATION_RETRY_MAX_SECONDS,
+    )
+    return PeriodicTask(dispatcher.dispatch_once, interval_seconds=config.NOTIFICATION_INTERVAL_SECONDS,
+                        name="notification-dispatch").start()
+
+get_notification_dispatcher()
+
+# Live operator statuses, applied in batches (stations held offline by reports stay offline)
+@st.cache_resource
+def get_status_feed_pollers():
+    from chargehub.discovery.application.status_ingestion_service import StatusIngestionService
+    from chargehub.discovery.infrastructure.feeds.status_feed import FileStatusFeed, SocketStatusFeed
+
+    feeds = []
+    if config.STATUS_FEED_PATH:
+        feeds.append(FileStatusFeed(config.STATUS_FEED_PATH))
+    if config.STATUS_FEED_ADDRESS:
+        host, port = config.STATUS_FEED_ADDRESS
+        feeds.append(SocketStatusFeed(host, port).start())
+    ingestion = StatusIngestionService(charging_repo)
+    return [
+        PeriodicTask(lambda feed=feed: ingestion.poll(feed), interval_seconds=config.STATUS_FEED_INTERVAL_SECONDS,
+                     name=f"status-feed-{type(feed).__name__}").start()
+        for feed in feeds
+    ]
+
+get_status_feed_pollers()
+
+# PLZ geometry: memory-mapped binary copy of the GeoJSON, shared by all sessions
+@st.cache_resource
+def get_plz_geometry():
+    from chargehub.discovery.infrastructure.geo.plz_geometry import PlzGeometry
+
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return PlzGeometry.load(config.GEOJSON_PATH, config.PLZ_GEOMETRY_CACHE_PATH)
     except Exception:
         return None
 
-geojson_data = get_berlin_geojson(config.GEOJSON_PATH)
+# Load GeoJSON (Cached)
+@st.cache_resource
+def get_berlin_geojson():
+    geometry = get_plz_geometry()
+    return geometry.to_geojson() if geometry else None
+
+# District choropleth (built once, refreshed incrementally from the repository)
+@st.cache_resource
+def get_choropleth_layer():
+    from chargehub.discovery.infrastructure.geo.choropleth_layer import ChoroplethLayer
+
+    geometry = get_plz_geometry()
+    if geometry is None:
+        return None
+    return ChoroplethLayer(get_berlin_geojson(), charging_repo, areas_km2=geometry.areas_by_plz())
+
+# Memory per component, sampled in the background and shown in the admin Diagnostics tab
+@st.cache_resource
+def get_memory_monitor():
+    from chargehub.shared.infrastructure.deep_size import deep_sizeof
+    from chargehub.shared.infrastructure.memory_monitor import MemoryMonitor
+
+    monitor = MemoryMonitor(trace=config.MEMORY_TRACEMALLOC, top_modules=config.MEMORY_TOP_MODULES)
+    # Resolved here: the sampler thread has no script context to call cached resources from
+    geojson, choropleth = get_berlin_geojson(), get_choropleth_layer()
+    # Objects shared between components are charged to the first one listed
+    components = {
+        "stations": charging_repo.memory_usage,
+        "reports": malfunction_service.report_repository.memory_usage,
+        "search index": lambda seen: deep_sizeof(discovery_service.search_index, seen=seen),
+        "search cache": lambda seen: deep_sizeof(discovery_service.result_cache, seen=seen),
+        "reliability": lambda seen: deep_sizeof(malfunction_service.reliability, seen=seen),
+        "geojson": lambda seen: deep_sizeof(geojson, seen=seen),
+        "choropleth": lambda seen: deep_sizeof(choropleth, seen=seen),
+    }
+    # With shared state every worker still builds its own station indexes, so the figure is this worker's
+    labels = {"stations": f"stations (worker {os.getpid()})"} if config.SHARED_STATE_NAME else {}
+    for name, sizer in components.items():
+        budget_mb = config.MEMORY_BUDGETS_MB.get(name)
+        monitor.register(labels.get(name, name), sizer, budget=budget_mb * 1024 * 1024 if budget_mb else None)
+    return monitor
+
+@st.cache_resource
+def get_memory_sampler():
+    monitor = get_memory_monitor()
+    monitor.sample()
+    return PeriodicTask(monitor.sample, interval_seconds=config.MEMORY_SAMPLE_INTERVAL_SECONDS,
+                        name="memory-sample").start()
+
+get_memory_sampler()
 
 # ------------------------------------------------------------
 # Views Initialization
 # ------------------------------------------------------------
 # Dependency Injection for Views
-user_view = ChargingStationView(
-    discovery_service=discovery_service,
-    malfunction_service=malfunction_service,
-    charging_repo=charging_repo,
-    config=config,
-    geojson_data=geojson_data
-)
+def build_user_view():
+    from chargehub.discovery.presentation.views.charging_station_view import ChargingStationView
 
-admin_view = MalfunctionReportView(
-    malfunction_service=malfunction_service,
-    charging_repo=charging_repo,
-    config=config
-)
+    return ChargingStationView(
+        discovery_service=discovery_service,
+        malfunction_service=malfunction_service,
+        charging_repo=charging_repo,
+        config=config,
+        geojson_data=get_berlin_geojson(),
+        choropleth_layer=get_choropleth_layer(),
+    )
+
+def build_admin_view():
+    from chargehub.malfunction.presentation.views.malfunction_report_view import MalfunctionReportView
+
+    return MalfunctionReportView(
+        malfunction_service=malfunction_service,
+        charging_repo=charging_repo,
+        config=config,
+        memory_monitor=get_memory_monitor(),
+    )
 
 # ------------------------------------------------------------
 # Main Routine (Router)
@@ -91,11 +294,18 @@ def sidebar_role_switcher():
 
 def main():
     role = sidebar_role_switcher()
+    timings = fragments.interaction_timings()
     
-    if role == "USER":
-        user_view.render()
-    else:
-        admin_view.render()
+    # Full-script runs only; a fragment rerun records just its own section
+    with timings.measure("full run"):
+        if role == "USER":
+            build_user_view().render()
+        else:
+            build_admin_view().render()
+
+    if config.UI_SHOW_TIMINGS:
+        with st.sidebar:
+            fragments.render_timings(timings)
 
 if __name__ == "__main__":
     main()
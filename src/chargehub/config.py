@@ -1,5 +1,7 @@
 from pathlib import Path
 
+from chargehub.discovery.domain.interfaces.charging_station_repository import VIEWPORT_STATION_LIMIT
+
 class ChargeHubConfig:
     # Paths
     # Assumes run from project root. 
@@ -7,11 +9,81 @@ class ChargeHubConfig:
     _PROJECT_ROOT = Path(__file__).parent.parent.parent
     DATA_PATH = _PROJECT_ROOT / "data" / "Ladesaeulenregister.csv"
     GEOJSON_PATH = _PROJECT_ROOT / "data" / "berlin_plz.geojson"
+    # Derived artefacts (rebuilt automatically when the source data changes)
+    CACHE_DIR = _PROJECT_ROOT / "data" / "cache"
+    PLZ_ADJACENCY_CACHE_PATH = CACHE_DIR / "berlin_plz_adjacency.json"
+    PLZ_GEOMETRY_CACHE_PATH = CACHE_DIR / "berlin_plz.geom"
+    STATION_CACHE_PATH = CACHE_DIR / "stations.json"
+    REPORT_ARCHIVE_DIR = _PROJECT_ROOT / "data" / "archive" / "reports"
+    # Point-in-time runtime state, restored on startup
+    SNAPSHOT_DIR = _PROJECT_ROOT / "data" / "snapshots"
+    STATION_SNAPSHOT_PATH = SNAPSHOT_DIR / "stations.snap"
+    REPORT_SNAPSHOT_PATH = SNAPSHOT_DIR / "reports.snap"
+    SNAPSHOT_INTERVAL_SECONDS = 300
+    # Domain events, appended as JSON lines (read by `python -m chargehub.export`)
+    EVENT_LOG_PATH = _PROJECT_ROOT / "data" / "events" / "events.jsonl"
+    EXPORT_BATCH_SIZE = 5000
+
+    # Administrator notifications, relayed from the event log in per-station digests
+    NOTIFICATION_CURSOR_PATH = _PROJECT_ROOT / "data" / "events" / "notification_cursor.json"
+    NOTIFICATION_INTERVAL_SECONDS = 60
+    NOTIFICATION_RETRY_BASE_SECONDS = 5
+    NOTIFICATION_RETRY_MAX_SECONDS = 900
+    # Webhook takes precedence over SMTP; with neither, digests are only logged
+    NOTIFICATION_WEBHOOK_URL = None
+    NOTIFICATION_SMTP_HOST = None
+    NOTIFICATION_SMTP_PORT = 25
+    NOTIFICATION_SENDER = "chargehub@localhost"
+    NOTIFICATION_RECIPIENTS = ()
+
+    # Live status feed: a JSON/NDJSON file and/or an NDJSON TCP stream ("host", port); None = off
+    STATUS_FEED_PATH = None
+    STATUS_FEED_ADDRESS = None
+    STATUS_FEED_INTERVAL_SECONDS = 5
+
+    # Name of a shared-memory block holding station columns and statuses for all worker
+    # processes, e.g. "chargehub-stations" (None = per-process state)
+    SHARED_STATE_NAME = None
+
+    # Memory diagnostics (admin tab): sizes per component, alerts past a budget in MB
+    MEMORY_SAMPLE_INTERVAL_SECONDS = 300
+    MEMORY_BUDGETS_MB = {
+        "stations": 256, "reports": 256, "search index": 128, "search cache": 64,
+        "reliability": 32, "geojson": 128, "choropleth": 128,
+    }
+    # tracemalloc diffs by module; tracing slows every allocation, so enable it while hunting a leak
+    MEMORY_TRACEMALLOC = False
+    MEMORY_TOP_MODULES = 15
+
+    # UI: rerun views in independent fragments (False = whole-script reruns, for comparison)
+    UI_FRAGMENTS = True
+    # Show server time per interaction in the sidebar
+    UI_SHOW_TIMINGS = False
 
     # Map Defaults (Berlin)
     MAP_CENTER_LAT = 52.5200
     MAP_CENTER_LNG = 13.4050
     MAP_ZOOM_DEFAULT = 11
+    # Initial viewport (south, west, north, east) before the map has reported its bounds
+    MAP_BOUNDS_DEFAULT = (52.33, 13.08, 52.68, 13.77)
+    # More stations than this in view are drawn as clusters instead of markers
+    VIEWPORT_STATION_LIMIT = VIEWPORT_STATION_LIMIT
     
     # Business Logic
     REPAIR_THRESHOLD = 5
+    DUPLICATE_SIMILARITY_THRESHOLD = 0.85
+    # Approved reports older than this no longer count towards the threshold (None = forever)
+    REPORT_COUNT_WINDOW_HOURS = 72
+    THRESHOLD_SWEEP_INTERVAL_SECONDS = 60
+
+    # Search expansion to neighbouring districts
+    SEARCH_MIN_RESULTS = 1
+    SEARCH_MAX_EXPANSION_RINGS = 2
+    # PLZ completions shown below a partially typed code
+    PLZ_SUGGESTION_LIMIT = 6
+
+    # Minimum-power choices of the search filter (edges of the power buckets)
+    POWER_FILTER_OPTIONS_KW = (11.0, 22.0, 50.0, 150.0, 300.0)
+
+    # Search result cache (entries are per PLZ)
+    SEARCH_CACHE_MAX_ENTRIES = 256
@@ -1,40 +1,133 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List, Sequence
+from typing import List, Optional, Sequence, Tuple
 
 from chargehub.discovery.application.dtos.charging_station_dto import ChargingStationDTO
 from chargehub.discovery.application.dtos.empty_charging_stations_dto import EmptyChargingStationsDTO
+from chargehub.discovery.application.dtos.station_search_page_dto import StationSearchPageDTO
+from chargehub.discovery.application.dtos.viewport_stations_dto import ViewportStationsDTO
+from chargehub.discovery.application.search_result_cache import CachedSearchResult, CacheStats, SearchResultCache
 from chargehub.discovery.domain.events.station_search_initiated import StationSearchInitiatedEvent
 from chargehub.discovery.domain.events.postal_code_validated import PostalCodeValidatedEvent
 from chargehub.discovery.domain.events.station_failed_event import StationFailedEvent
 from chargehub.discovery.domain.events.stations_found import StationsFoundEvent
 from chargehub.discovery.domain.events.no_stations_found import NoStationsFoundEvent
+from chargehub.discovery.domain.events.search_expanded import SearchExpandedEvent
+from chargehub.discovery.domain.events.text_search_initiated import TextSearchInitiatedEvent
+from chargehub.discovery.domain.events.text_search_completed import TextSearchCompletedEvent
 from chargehub.discovery.domain.aggregates.charging_station import ChargingStationAggregate
 from chargehub.discovery.domain.value_objects.postal_code import PostalCode
-from chargehub.discovery.domain.interfaces.charging_station_repository import ChargingStationRepository
+from chargehub.discovery.domain.value_objects.station_filter import StationFilter
+from chargehub.discovery.domain.interfaces.charging_station_repository import (
+    VIEWPORT_STATION_LIMIT, ChargingStationRepository, PostalCodeSuggestion,
+)
+from chargehub.discovery.domain.interfaces.postal_code_registry import PostalCodeRegistry
+from chargehub.discovery.domain.interfaces.station_search_index import StationSearchIndex
 
 @dataclass()
 class ChargingStationService:
     """Application Service implementing the 'Search Charging Stations' use case."""
     repository: ChargingStationRepository
+    # Optional PLZ adjacency used to widen empty/sparse searches to neighbouring districts
+    plz_registry: Optional[PostalCodeRegistry] = None
+    min_results: int = 1
+    max_expansion_rings: int = 2
+    # Optional LRU cache of ready-made results, validated by per-PLZ generations
+    result_cache: Optional[SearchResultCache] = None
+    # Free-text index over operator/address for search_stations
+    search_index: Optional[StationSearchIndex] = None
 
-    def locate_charging_stations(self, postal_code_str: str) -> tuple[Sequence[ChargingStationAggregate], Sequence[object]]:
+    def locate_charging_stations(self, postal_code_str: str, station_filter: Optional[StationFilter] = None
+                                 ) -> tuple[Sequence[ChargingStationAggregate], Sequence[object]]:
         events: list[object] = [StationSearchInitiatedEvent(postal_code=postal_code_str)]
         try:
-            pc = PostalCode(postal_code_str)
+            pc = PostalCode(postal_code_str, self.plz_registry)
             events.append(PostalCodeValidatedEvent(postal_code=pc.value))
         except ValueError:
             events.append(StationFailedEvent(reason="Invalid Format"))
             raise
 
-        stations = self.repository.locate_charging_stations(pc)
-        if not stations:
+        station_filter = station_filter or StationFilter()
+        # Filtered searches get their own entries, validated by the same PLZ generations
+        key = pc.value if station_filter.is_empty else f"{pc.value}?{station_filter.cache_key()}"
+        result = None
+        if self.result_cache is not None:
+            result = self.result_cache.get(key, self.repository.postal_code_generation)
+        if result is None:
+            result = self._search(pc, station_filter)
+            if self.result_cache is not None:
+                self.result_cache.put(key, result)
+
+        # Events are rebuilt per call so a cache hit yields the same trail as a miss
+        if result.expansion is not None:
+            events.append(result.expansion)
+
+        if not result.dtos:
             events.append(NoStationsFoundEvent(postal_code=pc.value))
             return EmptyChargingStationsDTO(), events
 
-        events.append(StationsFoundEvent(stations=[s.station_id for s in stations]))
-        dtos = [ChargingStationDTO(
+        events.append(StationsFoundEvent(stations=[d.station_id for d in result.dtos]))
+        return result.dtos, events
+
+    def search_stations(self, query: str, page: int = 1, page_size: int = 20,
+                        only_available: bool = False) -> tuple[StationSearchPageDTO, Sequence[object]]:
+        """Use case 'Search by operator, street or address' with ranked, paged results."""
+        if self.search_index is None:
+            raise RuntimeError("Free-text search is not configured")
+        if page < 1 or page_size < 1:
+            raise ValueError("page and page_size must be positive")
+
+        events: list[object] = [TextSearchInitiatedEvent(query=query)]
+        hits = self.search_index.search(query, only_available=only_available)
+        events.append(TextSearchCompletedEvent(query=query, total=len(hits)))
+
+        start = (page - 1) * page_size
+        window = hits[start:start + page_size]
+        return StationSearchPageDTO(
+            query=query,
+            page=page,
+            page_size=page_size,
+            total=len(hits),
+            stations=tuple(self._to_dto(s) for s, _ in window),
+            scores=tuple(score for _, score in window),
+        ), events
+
+    def locate_in_viewport(self, south: float, west: float, north: float, east: float,
+                           limit: int = VIEWPORT_STATION_LIMIT) -> ViewportStationsDTO:
+        """Use case 'Browse the map': stations in the visible bounds, aggregated past `limit`."""
+        result = self.repository.locate_in_bbox(south, west, north, east, limit)
+        return ViewportStationsDTO(
+            total=result.total,
+            stations=tuple(self._to_dto(s) for s in result.stations),
+            clusters=tuple(result.clusters),
+        )
+
+    def suggest_postal_codes(self, prefix: str, limit: int = 8) -> List[PostalCodeSuggestion]:
+        """Use case 'Type a PLZ': known PLZs completing `prefix`, with live station counts."""
+        prefix = prefix.strip()
+        if not prefix.isdigit() or len(prefix) > 5:
+            return []
+        return self.repository.suggest_postal_codes(prefix, limit)
+
+    def cache_stats(self) -> Optional[CacheStats]:
+        return self.result_cache.stats() if self.result_cache is not None else None
+
+    def _search(self, pc: PostalCode, station_filter: StationFilter) -> CachedSearchResult:
+        # Generations are read before querying, so a concurrent change can only make the entry stale
+        generations: List[Tuple[str, int]] = [(pc.value, self.repository.postal_code_generation(pc.value))]
+        stations = list(self.repository.locate_charging_stations(pc, station_filter))
+
+        expansion = None
+        if len(stations) < self.min_results and self.plz_registry is not None:
+            expansion = self._expand_search(pc, station_filter, stations, generations)
+
+        dtos = tuple(self._to_dto(s) for s in stations)
+        return CachedSearchResult(dtos=dtos, generations=tuple(generations), expansion=expansion)
+
+    @staticmethod
+    def _to_dto(s: ChargingStationAggregate) -> ChargingStationDTO:
+        return ChargingStationDTO(
             station_id=s.station_id,
             postal_code=s.postal_code,
             latitude=s.latitude,
@@ -42,5 +135,30 @@ class ChargingStationService:
             available=s.available,
             operator=s.operator,
             address=s.address,
-        ) for s in stations]
-        return dtos, events
+            plug_types=s.plug_types.names(),
+            max_power_kw=s.max_power_kw,
+            out_of_service=s.out_of_service,
+        )
+
+    def _expand_search(self, pc: PostalCode, station_filter: StationFilter, stations: List[ChargingStationAggregate],
+                       generations: List[Tuple[str, int]]) -> Optional[SearchExpandedEvent]:
+        """Widen the search ring by ring until `min_results` stations are found."""
+        added_codes: List[str] = []
+        rings = 0
+        for ring in self.plz_registry.rings(pc.value, self.max_expansion_rings):
+            rings += 1
+            for code in ring:
+                try:
+                    neighbour = PostalCode(code, self.plz_registry)
+                except ValueError:
+                    # Malformed code in the registry's data
+                    continue
+                added_codes.append(code)
+                generations.append((code, self.repository.postal_code_generation(code)))
+                stations.extend(self.repository.locate_charging_stations(neighbour, station_filter))
+            if len(stations) >= self.min_results:
+                break
+
+        if not rings:
+            return None
+        return SearchExpandedEvent(postal_code=pc.value, rings=rings, postal_codes=tuple(added_codes))
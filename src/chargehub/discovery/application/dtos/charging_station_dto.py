@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Tuple
 
 @dataclass(frozen=True)
 class ChargingStationDTO:
@@ -11,3 +12,6 @@ class ChargingStationDTO:
     available: bool
     operator: str | None = None
     address: str | None = None
+    plug_types: Tuple[str, ...] = ()
+    max_power_kw: float | None = None
+    out_of_service: bool = False
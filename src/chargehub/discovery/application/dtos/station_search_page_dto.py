@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Sequence
+
+from chargehub.discovery.application.dtos.charging_station_dto import ChargingStationDTO
+
+@dataclass(frozen=True)
+class StationSearchPageDTO:
+    """One page of ranked free-text search results."""
+    query: str
+    page: int
+    page_size: int
+    total: int
+    stations: Sequence[ChargingStationDTO]
+    scores: Sequence[float]
+
+    @property
+    def page_count(self) -> int:
+        return max(1, -(-self.total // self.page_size))
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Sequence
+
+from chargehub.discovery.application.dtos.charging_station_dto import ChargingStationDTO
+from chargehub.discovery.domain.interfaces.charging_station_repository import StationCluster
+
+@dataclass(frozen=True)
+class ViewportStationsDTO:
+    """Stations inside the visible map area, or clusters once there are too many to draw."""
+    total: int
+    stations: Sequence[ChargingStationDTO]
+    clusters: Sequence[StationCluster]
+
+    @property
+    def aggregated(self) -> bool:
+        return bool(self.clusters)
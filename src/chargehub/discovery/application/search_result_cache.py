@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional, Tuple
+
+from chargehub.discovery.application.dtos.charging_station_dto import ChargingStationDTO
+from chargehub.discovery.domain.events.search_expanded import SearchExpandedEvent
+
+@dataclass(frozen=True)
+class CachedSearchResult:
+    """Ready-made result of one PLZ search.
+
+    `generations` records the repository generation of every PLZ the result
+    was built from, so a status change in any of them makes the entry stale.
+    """
+    dtos: Tuple[ChargingStationDTO, ...]
+    generations: Tuple[Tuple[str, int], ...]
+    expansion: Optional[SearchExpandedEvent] = None
+
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+    size: int
+    max_entries: int
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+class SearchResultCache:
+    """Bounded LRU cache of search results keyed by PLZ.
+
+    Entries are validated lazily against per-PLZ generation counters, so a
+    status change only invalidates results that include the changed PLZ.
+    """
+
+    def __init__(self, max_entries: int = 256) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be positive")
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, CachedSearchResult] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def get(self, postal_code: str, generation_of: Callable[[str], int]) -> Optional[CachedSearchResult]:
+        with self._lock:
+            entry = self._entries.get(postal_code)
+            if entry is not None and any(generation_of(code) != gen for code, gen in entry.generations):
+                del self._entries[postal_code]
+                self._invalidations += 1
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(postal_code)
+            self._hits += 1
+            return entry
+
+    def put(self, postal_code: str, entry: CachedSearchResult) -> None:
+        with self._lock:
+            self._entries[postal_code] = entry
+            self._entries.move_to_end(postal_code)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                invalidations=self._invalidations,
+                size=len(self._entries),
+                max_entries=self.max_entries,
+            )
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+from chargehub.discovery.domain.interfaces.charging_station_repository import ChargingStationRepository
+from chargehub.discovery.domain.interfaces.status_feed import StatusFeed
+from chargehub.discovery.domain.value_objects.station_status_update import StationStatusUpdate
+
+@dataclass(frozen=True)
+class StatusIngestionResult:
+    received: int
+    changed: int
+    unchanged: int
+    # Reported available, but kept offline by a malfunction override
+    overridden: int
+    # Older than an update already applied for the same station
+    stale: int
+    unknown: int
+    seconds: float
+
+@dataclass()
+class StatusIngestionService:
+    """Application Service applying live operator statuses to the station repository.
+
+    A batch is coalesced to the latest update per station and written with
+    one `update_station_statuses` call, so cached search results are
+    invalidated once per batch and PLZ rather than once per station. Only
+    the operator status is written: the repository keeps the malfunction
+    override separately, so a station taken offline by reports stays
+    offline whatever the operator reports.
+    """
+
+    repository: ChargingStationRepository
+    _last_observed: Dict[int, datetime] = field(default_factory=dict, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def ingest(self, updates: Iterable[StationStatusUpdate]) -> StatusIngestionResult:
+        started = time.perf_counter()
+        with self._lock:
+            received = stale = 0
+            latest: Dict[int, StationStatusUpdate] = {}
+            last_observed = self._last_observed
+            for update in updates:
+                received += 1
+                at = update.observed_at
+                if at is not None:
+                    previous = last_observed.get(update.station_id)
+                    if previous is not None and at < previous:
+                        stale += 1
+                        continue
+                    last_observed[update.station_id] = at
+                latest[update.station_id] = update
+
+            statuses = {station_id: update.available for station_id, update in latest.items()}
+            result = self.repository.update_station_statuses(statuses)
+            held_offline = self.repository.out_of_service_ids()
+            overridden = sum(1 for station_id in held_offline if statuses.get(station_id))
+        return StatusIngestionResult(
+            received=received, changed=result.changed, unchanged=result.unchanged,
+            overridden=overridden, stale=stale, unknown=len(result.unknown),
+            seconds=time.perf_counter() - started,
+        )
+
+    def poll(self, feed: StatusFeed) -> Optional[StatusIngestionResult]:
+        """Ingest whatever the feed received since the last poll (None when it had nothing)."""
+        updates = feed.poll()
+        return self.ingest(updates) if updates else None
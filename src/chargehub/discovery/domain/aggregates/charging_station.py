@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
+from chargehub.discovery.domain.value_objects.plug_type import PlugType
+
 @dataclass()
 class ChargingStationAggregate:
     """Aggregate Root representing a charging station.
@@ -9,6 +11,12 @@ class ChargingStationAggregate:
     Minimal fields to support the two core use cases:
     - postal_code
     - availability status
+    plus the plug types and maximum charging power used by search filters.
+
+    `available` combines the operator's live status with `out_of_service`,
+    which is set while approved malfunction reports hold the station
+    offline. On insertion into a repository, `available` is taken as the
+    operator's status; from then on the repository keeps both current.
     """
     station_id: int
     postal_code: str
@@ -17,3 +25,6 @@ class ChargingStationAggregate:
     available: bool = True
     operator: str | None = None
     address: str | None = None
+    plug_types: PlugType = PlugType(0)
+    max_power_kw: float | None = None
+    out_of_service: bool = False
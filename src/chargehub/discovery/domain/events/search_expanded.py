@@ -0,0 +1,9 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Sequence
+
+@dataclass(frozen=True)
+class SearchExpandedEvent:
+    postal_code: str
+    rings: int
+    postal_codes: Sequence[str]  # neighbouring PLZs added to the search
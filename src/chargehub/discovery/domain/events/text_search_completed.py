@@ -0,0 +1,7 @@
+from __future__ import annotations
+from dataclasses import dataclass
+
+@dataclass(frozen=True)
+class TextSearchCompletedEvent:
+    query: str
+    total: int
@@ -0,0 +1,6 @@
+from __future__ import annotations
+from dataclasses import dataclass
+
+@dataclass(frozen=True)
+class TextSearchInitiatedEvent:
+    query: str
@@ -1,7 +1,74 @@
 from abc import ABC, abstractmethod
-from typing import List
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Iterator, List, Mapping, Optional, Tuple
 from chargehub.discovery.domain.aggregates.charging_station import ChargingStationAggregate
+from chargehub.discovery.domain.value_objects.cleaning_report import CleaningReport
 from chargehub.discovery.domain.value_objects.postal_code import PostalCode
+from chargehub.discovery.domain.value_objects.station_filter import StationFilter
+from chargehub.discovery.domain.value_objects.station_query import StationQuery
+
+# Stations listed individually in a viewport before they are clustered
+VIEWPORT_STATION_LIMIT = 300
+
+class StationSetFixedError(ValueError):
+    """Raised when stations are added to a repository whose station set cannot change."""
+
+@dataclass(frozen=True)
+class StationCluster:
+    """Aggregated stations of one map area, used when a viewport holds too many to list."""
+    latitude: float
+    longitude: float
+    station_count: int
+    available_count: int
+
+@dataclass(frozen=True)
+class ViewportStations:
+    """Stations inside a bounding box: listed individually up to the limit, else as clusters."""
+    total: int
+    stations: List[ChargingStationAggregate] = field(default_factory=list)
+    clusters: List[StationCluster] = field(default_factory=list)
+
+    @property
+    def aggregated(self) -> bool:
+        return bool(self.clusters)
+
+@dataclass(frozen=True)
+class PostalCodeSuggestion:
+    """A PLZ completing a typed prefix, with its current station counts."""
+    postal_code: str
+    station_count: int
+    available_count: int
+
+@dataclass(frozen=True)
+class StatusBatchResult:
+    """Outcome of one batched status update."""
+    changed: int
+    unchanged: int
+    unknown: Tuple[int, ...] = ()
+
+@dataclass(frozen=True)
+class PlanStep:
+    """One criterion of an executed query plan.
+
+    `access` is how it was applied: "index" (drove the query), "intersect"
+    (its candidate list was intersected with the current one), "probe"
+    (checked per remaining candidate), "bitmap" (bit test per candidate),
+    "skipped" (no candidates left) or "scan" (no criteria at all).
+    """
+    criterion: str
+    access: str
+    estimated_rows: int
+    rows: int
+
+@dataclass(frozen=True)
+class QueryPlan:
+    steps: List[PlanStep]
+    result_rows: int
+
+    def __str__(self) -> str:
+        lines = [f"{i}. {s.access:<9} {s.criterion:<40} est {s.estimated_rows:>7}  -> {s.rows:>7} rows"
+                 for i, s in enumerate(self.steps, 1)]
+        return "\n".join(lines + [f"result: {self.result_rows} rows"])
 
 class ChargingStationRepository(ABC):
     """
@@ -11,13 +78,85 @@ class ChargingStationRepository(ABC):
     """
 
     @abstractmethod
-    def locate_charging_stations(self, postal_code: PostalCode) -> List[ChargingStationAggregate]:
+    def locate_charging_stations(self, postal_code: PostalCode,
+                                 station_filter: Optional[StationFilter] = None) -> List[ChargingStationAggregate]:
+        """Available stations in the PLZ, optionally restricted to a minimum power and plug types."""
+        pass
+
+    @abstractmethod
+    def locate_in_bbox(self, south: float, west: float, north: float, east: float,
+                       limit: int = VIEWPORT_STATION_LIMIT) -> ViewportStations:
+        """Stations (any status) inside the box; more than `limit` are returned as at most `limit` clusters."""
+        pass
+
+    @abstractmethod
+    def query(self, query: StationQuery) -> List[ChargingStationAggregate]:
+        """Stations (any status unless `query.available` is set) matching every criterion, in register order."""
+        pass
+
+    @abstractmethod
+    def explain(self, query: StationQuery) -> QueryPlan:
+        """Run `query` and describe the chosen plan with estimated and actual row counts."""
         pass
 
     @abstractmethod
     def update_station_status(self, station_id: int, status: bool) -> None:
+        """Set the operator's live status; a station out of service stays unavailable."""
+        pass
+
+    @abstractmethod
+    def update_station_statuses(self, statuses: Mapping[int, bool]) -> StatusBatchResult:
+        """Apply many operator status changes at once; unknown station ids are reported, not raised."""
+        pass
+
+    @abstractmethod
+    def set_out_of_service(self, station_id: int, out_of_service: bool) -> bool:
+        """Hold a station offline for malfunction reports (or release it); False if it already was."""
+        pass
+
+    @abstractmethod
+    def out_of_service_ids(self) -> FrozenSet[int]:
+        """Stations currently held offline by malfunction reports."""
         pass
 
     @abstractmethod
     def get_all(self) -> List[ChargingStationAggregate]:
         pass
+
+    @abstractmethod
+    def iter_stations(self) -> Iterator[ChargingStationAggregate]:
+        """Stream all stations with their current availability, without copying the collection."""
+        pass
+
+    @abstractmethod
+    def station_ids(self, postal_code: str) -> List[int]:
+        """Ids of all stations in `postal_code`, regardless of availability."""
+        pass
+
+    @abstractmethod
+    def count_stations(self, postal_code: Optional[str] = None) -> int:
+        pass
+
+    @abstractmethod
+    def count_available(self, postal_code: Optional[str] = None) -> int:
+        pass
+
+    @abstractmethod
+    def availability_summary(self) -> Dict[str, Tuple[int, int]]:
+        """PLZ -> (available stations, total stations)."""
+        pass
+
+    @abstractmethod
+    def suggest_postal_codes(self, prefix: str, limit: int = 8) -> List[PostalCodeSuggestion]:
+        """Known PLZs starting with `prefix`, those with the most available stations first."""
+        pass
+
+    @abstractmethod
+    def cleaning_report(self) -> Optional[CleaningReport]:
+        """Rows matched per cleaning rule when the register was loaded; None if the stations were not cleaned."""
+        pass
+
+    @abstractmethod
+    def postal_code_generation(self, postal_code: str) -> int:
+        """Counter that changes whenever a station in `postal_code` changes (for cache validation)."""
+        pass
@@ -0,0 +1,41 @@
+from abc import ABC, abstractmethod
+from typing import FrozenSet, Iterator, List, Sequence, Set
+
+
+class PostalCodeRegistry(ABC):
+    """
+    Domain Registry Interface for the set of known Berlin postal codes
+    and the adjacency between their districts.
+    """
+
+    @abstractmethod
+    def codes(self) -> FrozenSet[str]:
+        pass
+
+    @abstractmethod
+    def neighbours(self, postal_code: str) -> Sequence[str]:
+        pass
+
+    def contains(self, postal_code: str) -> bool:
+        return postal_code in self.codes()
+
+    def rings(self, postal_code: str, max_rings: int) -> Iterator[List[str]]:
+        """Yield the PLZs around `postal_code` ring by ring (breadth-first).
+
+        Ring 1 holds the direct neighbours, ring 2 their neighbours, and so on.
+        Each PLZ is yielded at most once; iteration stops early once the graph
+        is exhausted.
+        """
+        seen: Set[str] = {postal_code}
+        frontier = [postal_code]
+        for _ in range(max_rings):
+            ring: List[str] = []
+            for code in frontier:
+                for neighbour in self.neighbours(code):
+                    if neighbour not in seen:
+                        seen.add(neighbour)
+                        ring.append(neighbour)
+            if not ring:
+                return
+            yield ring
+            frontier = ring
@@ -0,0 +1,18 @@
+from abc import ABC, abstractmethod
+from typing import Iterable, List, Tuple
+from chargehub.discovery.domain.aggregates.charging_station import ChargingStationAggregate
+
+class StationSearchIndex(ABC):
+    """
+    Domain Interface for free-text search over station operator and address.
+    """
+
+    @abstractmethod
+    def search(self, query: str, only_available: bool = False) -> List[Tuple[ChargingStationAggregate, float]]:
+        """Return (station, score) pairs ranked best first."""
+        pass
+
+    @abstractmethod
+    def sync(self, stations: Iterable[ChargingStationAggregate]) -> int:
+        """Bring the index in line with `stations`; returns the number of re-indexed stations."""
+        pass
@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import List
+
+from chargehub.discovery.domain.value_objects.station_status_update import StationStatusUpdate
+
+class StatusFeed(ABC):
+    """
+    Domain Interface for a source of live station statuses (operator API, file drop, socket).
+    """
+
+    @abstractmethod
+    def poll(self) -> List[StationStatusUpdate]:
+        """Updates received since the previous poll; never blocks waiting for new ones."""
+        pass
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+@dataclass(frozen=True)
+class RuleOutcome:
+    rule: str
+    action: str
+    rows: int
+
+@dataclass(frozen=True)
+class CleaningReport:
+    """Value Object: rows matched per cleaning rule when the station register was loaded."""
+    input_rows: int
+    output_rows: int
+    outcomes: Tuple[RuleOutcome, ...]
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "input_rows": self.input_rows, "output_rows": self.output_rows,
+            "outcomes": [[o.rule, o.action, o.rows] for o in self.outcomes],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> "CleaningReport":
+        return cls(
+            input_rows=int(data["input_rows"]), output_rows=int(data["output_rows"]),
+            outcomes=tuple(RuleOutcome(rule, action, int(rows)) for rule, action, rows in data["outcomes"]),
+        )
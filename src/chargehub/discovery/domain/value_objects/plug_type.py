@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from enum import IntFlag
+from typing import Iterable, Tuple
+
+class PlugType(IntFlag):
+    """Connector standards offered by a station; a station's set is one bitmask."""
+    TYPE2 = 1
+    CCS = 2
+    CHADEMO = 4
+    SCHUKO = 8
+    TYPE1 = 16
+    TESLA = 32
+
+    @classmethod
+    def parse(cls, names: Iterable[str]) -> "PlugType":
+        """PlugType from member names, e.g. ["CCS", "CHADEMO"]."""
+        result = cls(0)
+        for name in names:
+            try:
+                result |= cls[name.strip().upper()]
+            except KeyError:
+                raise ValueError(f"Unknown plug type {name!r}; expected one of {[m.name for m in cls]}") from None
+        return result
+
+    def names(self) -> Tuple[str, ...]:
+        return tuple(member.name for member in type(self) if member in self)
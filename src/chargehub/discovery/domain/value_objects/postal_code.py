@@ -1,6 +1,10 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import InitVar, dataclass
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from chargehub.discovery.domain.interfaces.postal_code_registry import PostalCodeRegistry
 
 @dataclass(frozen=True)
 class PostalCode:
@@ -9,14 +13,21 @@ class PostalCode:
     Business Rules (from diagrams):
     - Numeric only
     - Exactly 5 digits
-    - Begins with 10, 12 or 13
+    - A known Berlin PLZ when validated against a `registry`,
+      otherwise it must begin with 10, 12 or 13
+
+    The registry is only consulted while validating; it is not part of the value.
     """
     value: str
+    registry: InitVar[Optional[PostalCodeRegistry]] = None
 
-    def __post_init__(self) -> None:
+    def __post_init__(self, registry: Optional[PostalCodeRegistry]) -> None:
         if not self.value.isdigit():
             raise ValueError("Postal code must be numeric")
         if len(self.value) != 5:
             raise ValueError("Postal code must have exactly 5 digits")
-        if not self.value.startswith(("10", "12", "13")):
+        if registry is not None:
+            if not registry.contains(self.value):
+                raise ValueError("Postal code is not a known Berlin postal code")
+        elif not self.value.startswith(("10", "12", "13")):
             raise ValueError("Postal code must start with 10, 12 or 13")
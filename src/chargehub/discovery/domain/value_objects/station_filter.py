@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+from chargehub.discovery.domain.value_objects.plug_type import PlugType
+
+@dataclass(frozen=True)
+class StationFilter:
+    """Value Object for the technical requirements of a search.
+
+    Business Rules:
+    - `min_power_kw`: the station's maximum charging power must reach it
+      (stations without a registered power never match)
+    - `plug_types`: the station must offer at least one of them
+    """
+    min_power_kw: Optional[float] = None
+    plug_types: PlugType = PlugType(0)
+
+    def __post_init__(self) -> None:
+        if self.min_power_kw is not None and self.min_power_kw < 0:
+            raise ValueError("Minimum power must not be negative")
+
+    @property
+    def is_empty(self) -> bool:
+        return self.min_power_kw is None and not self.plug_types
+
+    def cache_key(self) -> str:
+        return f"kw>={self.min_power_kw}&plugs={int(self.plug_types)}"
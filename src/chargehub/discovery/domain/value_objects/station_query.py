@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import FrozenSet, Optional, Tuple
+
+@dataclass(frozen=True)
+class StationQuery:
+    """Value Object for a conjunctive station filter; unset criteria match everything.
+
+    Business Rules:
+    - `postal_codes` / `station_ids`: the station is one of them
+    - `available`: the station's current status equals it
+    - `operator`: operator name equals it, ignoring case and surrounding spaces
+    - `bbox`: (south, west, north, east), borders included
+    - `limit`: at most this many stations, in register order
+    """
+    postal_codes: Optional[FrozenSet[str]] = None
+    available: Optional[bool] = None
+    operator: Optional[str] = None
+    bbox: Optional[Tuple[float, float, float, float]] = None
+    station_ids: Optional[FrozenSet[int]] = None
+    limit: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        # Accept any iterable for the set criteria, but keep the value object hashable
+        if self.postal_codes is not None:
+            object.__setattr__(self, "postal_codes", frozenset(self.postal_codes))
+        if self.station_ids is not None:
+            object.__setattr__(self, "station_ids", frozenset(self.station_ids))
+        if self.bbox is not None:
+            south, west, north, east = self.bbox
+            if south > north or west > east:
+                raise ValueError("Bounding box must satisfy south <= north and west <= east")
+        if self.limit is not None and self.limit < 1:
+            raise ValueError("limit must be positive")
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+@dataclass(frozen=True)
+class StationStatusUpdate:
+    """Value Object for one station's live status as reported by an operator feed.
+
+    Business Rules:
+    - `available` is True only when the station can be used right now
+      (occupied and out-of-order stations are unavailable)
+    - `observed_at`, when given, orders updates: an older one never
+      overwrites a newer one for the same station
+    """
+    station_id: int
+    available: bool
+    observed_at: Optional[datetime] = None
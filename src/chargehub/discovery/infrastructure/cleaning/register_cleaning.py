@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, List, Tuple
+
+from chargehub.discovery.domain.value_objects.cleaning_report import CleaningReport, RuleOutcome
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+FIX, DROP = "fix", "drop"
+OPERATORS = ("==", "!=", "<", "<=", ">", ">=", "missing", "present", "contains", "not contains")
+
+@dataclass(frozen=True)
+class Condition:
+    """One column test of a cleaning rule, e.g. Condition("latitude", "<", 50)."""
+    column: str
+    op: str
+    value: object = None
+
+    def __post_init__(self) -> None:
+        if self.op not in OPERATORS:
+            raise ValueError(f"Unknown operator {self.op!r}; expected one of {OPERATORS}")
+
+    def mask(self, frame: "pd.DataFrame") -> "pd.Series":
+        col = frame[self.column]
+        if self.op == "missing":
+            return col.isna()
+        if self.op == "present":
+            return col.notna()
+        if self.op in ("contains", "not contains"):
+            found = col.fillna("").astype(str).str.contains(str(self.value), regex=False)
+            return found if self.op == "contains" else ~found
+        # NaN compares False for every operator except !=, so missing values never match a comparison
+        result = {
+            "==": col == self.value, "!=": col != self.value,
+            "<": col < self.value, "<=": col <= self.value,
+            ">": col > self.value, ">=": col >= self.value,
+        }[self.op]
+        return result & col.notna() if self.op == "!=" else result
+
+@dataclass(frozen=True)
+class CleaningRule:
+    """
+    A row matches when all `when` conditions hold and, if given, at least
+    one of `when_any`. Matching rows are dropped, or get the `corrections`
+    (column, value) pairs assigned.
+    """
+    name: str
+    action: str
+    when: Tuple[Condition, ...] = ()
+    when_any: Tuple[Condition, ...] = ()
+    corrections: Tuple[Tuple[str, object], ...] = ()
+    description: str = ""
+
+    def __post_init__(self) -> None:
+        if self.action not in (FIX, DROP):
+            raise ValueError(f"Rule {self.name!r}: action must be {FIX!r} or {DROP!r}")
+        if self.action == FIX and not self.corrections:
+            raise ValueError(f"Rule {self.name!r}: a fix needs corrections")
+
+    def mask(self, frame: "pd.DataFrame") -> "pd.Series":
+        import pandas as pd
+
+        matched = pd.Series(True, index=frame.index)
+        for condition in self.when:
+            matched &= condition.mask(frame)
+        if self.when_any:
+            any_matched = pd.Series(False, index=frame.index)
+            for condition in self.when_any:
+                any_matched |= condition.mask(frame)
+            matched &= any_matched
+        return matched
+
+# Applied in order to the normalized register (see ChargingStationCSVRepository);
+# a row dropped by one rule is not seen by the rules after it.
+REGISTER_RULES: Tuple[CleaningRule, ...] = (
+    CleaningRule(
+        name="outside-berlin",
+        action=DROP,
+        when=(Condition("postal_code_valid", "==", False),),
+        description="PLZ is malformed or not a Berlin postal code",
+    ),
+    CleaningRule(
+        name="10589-missing-coordinates",
+        action=FIX,
+        when=(Condition("postal_code", "==", "10589"), Condition("operator", "not contains", "Robert Bosch")),
+        when_any=(Condition("latitude", "missing"), Condition("longitude", "missing"), Condition("latitude", "<", 50)),
+        corrections=(("latitude", 52.5263), ("longitude", 13.3039)),
+        description="Stations in 10589 registered without usable coordinates (Robert Bosch sites are correct)",
+    ),
+    CleaningRule(
+        name="missing-coordinates",
+        action=DROP,
+        when_any=(Condition("latitude", "missing"), Condition("longitude", "missing")),
+        description="No numeric latitude/longitude",
+    ),
+)
+
+class RegisterCleaner:
+    """
+    Runs a rule table over a whole frame with one boolean mask per rule,
+    instead of testing rows one at a time.
+    """
+
+    def __init__(self, rules: Tuple[CleaningRule, ...] = REGISTER_RULES) -> None:
+        names = [r.name for r in rules]
+        if len(set(names)) != len(names):
+            raise ValueError("Rule names must be unique")
+        self.rules = tuple(rules)
+
+    def fingerprint(self) -> str:
+        """Stable description of the rule table, so cached output is rebuilt when rules change."""
+        return repr(self.rules)
+
+    def clean(self, frame: "pd.DataFrame") -> Tuple["pd.DataFrame", CleaningReport]:
+        frame = frame.copy()
+        keep = None
+        outcomes: List[RuleOutcome] = []
+        for rule in self.rules:
+            matched = rule.mask(frame)
+            if keep is not None:
+                matched &= keep
+            rows = int(matched.sum())
+            if rule.action == DROP:
+                keep = ~matched if keep is None else keep & ~matched
+            elif rows:
+                for column, value in rule.corrections:
+                    frame.loc[matched, column] = value
+            outcomes.append(RuleOutcome(rule.name, rule.action, rows))
+        cleaned = frame if keep is None else frame[keep]
+        return cleaned, CleaningReport(input_rows=len(frame), output_rows=len(cleaned), outcomes=tuple(outcomes))
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import json
+import logging
+import socket
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from chargehub.discovery.domain.interfaces.status_feed import StatusFeed
+from chargehub.discovery.domain.value_objects.station_status_update import StationStatusUpdate
+
+logger = logging.getLogger(__name__)
+
+# Operator status values; anything else (e.g. UNKNOWN) leaves the station as it is
+_STATUS_VALUES = {
+    "AVAILABLE": True,
+    "OCCUPIED": False,
+    "CHARGING": False,
+    "RESERVED": False,
+    "OUT_OF_ORDER": False,
+    "INOPERATIVE": False,
+    "UNAVAILABLE": False,
+}
+
+def parse_status_record(record: object, observed_at: Optional[datetime] = None) -> Optional[StationStatusUpdate]:
+    """One `{"station_id": .., "available": bool | "status": str, "observed_at": iso}` record, or None."""
+    if not isinstance(record, dict) or "station_id" not in record:
+        return None
+    if isinstance(record.get("available"), bool):
+        available = record["available"]
+    else:
+        available = _STATUS_VALUES.get(str(record.get("status", "")).upper())
+        if available is None:
+            return None
+    stamp = record.get("observed_at")
+    try:
+        return StationStatusUpdate(station_id=int(record["station_id"]), available=available,
+                                   observed_at=_timestamp(stamp) if stamp else observed_at)
+    except (TypeError, ValueError):
+        return None
+
+def parse_status_document(document: object) -> List[StationStatusUpdate]:
+    """
+    A JSON feed document: a list of records, or an object with `statuses`
+    (a list of records or a `{station_id: bool | status}` mapping) and an
+    optional document-wide `observed_at`. Snapshots and deltas share the
+    format; stations a document leaves out keep their status.
+    """
+    observed_at = None
+    if isinstance(document, dict):
+        stamp = document.get("observed_at")
+        observed_at = _timestamp(stamp) if stamp else None
+        document = document.get("statuses", [])
+    if isinstance(document, dict):
+        document = [{"station_id": key, ("available" if isinstance(value, bool) else "status"): value}
+                    for key, value in document.items()]
+    if not isinstance(document, list):
+        return []
+    updates = (parse_status_record(record, observed_at) for record in document)
+    return [u for u in updates if u is not None]
+
+def parse_status_lines(lines: Iterable[str]) -> List[StationStatusUpdate]:
+    """NDJSON: one record per line; malformed lines are skipped."""
+    updates = []
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            update = parse_status_record(json.loads(line))
+        except ValueError:
+            update = None
+        if update is None:
+            logger.debug("Skipping unreadable status line %r", line[:200])
+            continue
+        updates.append(update)
+    return updates
+
+def _timestamp(value: object) -> datetime:
+    stamp = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    return stamp if stamp.tzinfo else stamp.replace(tzinfo=timezone.utc)
+
+def _is_older(update: StationStatusUpdate, than: StationStatusUpdate) -> bool:
+    return update.observed_at is not None and than.observed_at is not None and update.observed_at < than.observed_at
+
+class FileStatusFeed(StatusFeed):
+    """
+    Status feed dropped into a local file.
+
+    `.ndjson`/`.jsonl` files are treated as an append-only stream of deltas
+    and read on from the last complete line; a file that shrank or was
+    replaced is read from the start. Any other file holds one JSON document
+    and is re-read whenever its size or modification time changes.
+    """
+
+    STREAM_SUFFIXES = (".ndjson", ".jsonl")
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._signature: Optional[Tuple[int, int, int]] = None  # (inode, size, mtime_ns)
+        self._offset = 0
+
+    def poll(self) -> List[StationStatusUpdate]:
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return []
+        signature = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        if signature == self._signature:
+            return []
+        replaced = self._signature is not None and (stat.st_ino != self._signature[0] or stat.st_size < self._offset)
+        self._signature = signature
+
+        if self.path.suffix.lower() not in self.STREAM_SUFFIXES:
+            try:
+                return parse_status_document(json.loads(self.path.read_text(encoding="utf-8")))
+            except ValueError:
+                # Caught mid-write; the next change triggers another read
+                logger.warning("Status feed %s is not valid JSON yet", self.path)
+                self._signature = None
+                return []
+
+        if replaced:
+            self._offset = 0
+        with open(self.path, "rb") as f:
+            f.seek(self._offset)
+            data = f.read()
+        # Only complete lines; a partially written last line is read next time
+        end = data.rfind(b"\n") + 1
+        self._offset += end
+        return parse_status_lines(data[:end].decode("utf-8", errors="replace").splitlines())
+
+class SocketStatusFeed(StatusFeed):
+    """
+    NDJSON status stream read from a TCP socket on a background thread.
+
+    Received updates are buffered until the next `poll`, keeping only the
+    latest per station, so the buffer never outgrows the station count
+    however long nobody polls. When the connection drops, the reader
+    reconnects after `reconnect_seconds`.
+    """
+
+    def __init__(self, host: str, port: int, reconnect_seconds: float = 5.0) -> None:
+        self.host = host
+        self.port = port
+        self.reconnect_seconds = reconnect_seconds
+        self._buffer: Dict[int, StationStatusUpdate] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "SocketStatusFeed":
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="status-feed-socket", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def poll(self) -> List[StationStatusUpdate]:
+        with self._lock:
+            updates, self._buffer = self._buffer, {}
+        return list(updates.values())
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                with socket.create_connection((self.host, self.port), timeout=self.reconnect_seconds) as conn:
+                    conn.settimeout(1.0)
+                    self._read(conn)
+            except OSError as exc:
+                logger.warning("Status feed %s:%s unavailable: %s", self.host, self.port, exc)
+            self._stop.wait(self.reconnect_seconds)
+
+    def _read(self, conn: socket.socket) -> None:
+        pending = b""
+        while not self._stop.is_set():
+            try:
+                chunk = conn.recv(65536)
+            except socket.timeout:
+                continue
+            if not chunk:
+                return
+            pending += chunk
+            end = pending.rfind(b"\n") + 1
+            if not end:
+                continue
+            updates = parse_status_lines(pending[:end].decode("utf-8", errors="replace").splitlines())
+            pending = pending[end:]
+            with self._lock:
+                for update in updates:
+                    current = self._buffer.get(update.station_id)
+                    if current is None or not _is_older(update, current):
+                        self._buffer[update.station_id] = update
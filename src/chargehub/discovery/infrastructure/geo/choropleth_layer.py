@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional
+
+import numpy as np
+
+from chargehub.discovery.domain.interfaces.charging_station_repository import ChargingStationRepository
+from chargehub.discovery.infrastructure.geo.polygon_area import geometry_area_km2
+
+@dataclass(frozen=True)
+class DistrictStats:
+    postal_code: str
+    station_count: int
+    available_count: int
+    available_ratio: float
+    area_km2: float
+    stations_per_km2: float
+
+class ChoroplethLayer:
+    """
+    District-level layer of station density and availability per PLZ.
+
+    Polygon areas and the per-PLZ aggregates are computed once, as arrays
+    aligned with the PLZ order. Afterwards `refresh()` only recomputes PLZs
+    whose repository generation changed, and the prebuilt GeoJSON is updated
+    in place so the UI can render the whole city as a single layer.
+    """
+
+    def __init__(self, geojson: dict, repository: ChargingStationRepository,
+                 areas_km2: Optional[Mapping[str, float]] = None) -> None:
+        self.repository = repository
+        self._lock = threading.Lock()
+
+        features = geojson.get("features", [])
+        self._codes: List[str] = sorted({f["properties"]["plz_code"] for f in features})
+        self._slot: Dict[str, int] = {code: i for i, code in enumerate(self._codes)}
+
+        if areas_km2 is not None:
+            # Precomputed (e.g. PlzGeometry.areas_by_plz), skips walking the coordinates
+            self._area = np.array([areas_km2.get(code, 0.0) for code in self._codes], dtype=np.float64)
+        else:
+            self._area = np.zeros(len(self._codes), dtype=np.float64)
+            for feature in features:
+                self._area[self._slot[feature["properties"]["plz_code"]]] += geometry_area_km2(feature["geometry"])
+
+        summary = repository.availability_summary()
+        counts = np.array([summary.get(code, (0, 0)) for code in self._codes], dtype=np.int64).reshape(-1, 2)
+        self._available = counts[:, 0].copy()
+        self._total = counts[:, 1].copy()
+        self._generations = np.array([repository.postal_code_generation(code) for code in self._codes], dtype=np.int64)
+
+        # Features share geometry with the source; only properties are layer-owned
+        self._features_by_slot: List[List[dict]] = [[] for _ in self._codes]
+        layer_features = []
+        for feature in features:
+            layer_feature = {
+                "type": "Feature",
+                "geometry": feature["geometry"],
+                "properties": dict(feature["properties"]),
+            }
+            self._features_by_slot[self._slot[feature["properties"]["plz_code"]]].append(layer_feature)
+            layer_features.append(layer_feature)
+        self._geojson = {"type": "FeatureCollection", "features": layer_features}
+
+        ratio, density = self._derive(self._available, self._total, self._area)
+        for slot in range(len(self._codes)):
+            self._write_properties(slot, ratio[slot], density[slot])
+
+    @staticmethod
+    def _derive(available: np.ndarray, total: np.ndarray, area: np.ndarray):
+        ratio = np.where(total > 0, available / np.maximum(total, 1), 0.0)
+        density = np.where(area > 0, total / np.where(area > 0, area, 1.0), 0.0)
+        return ratio, density
+
+    def _write_properties(self, slot: int, ratio: float, density: float) -> None:
+        for feature in self._features_by_slot[slot]:
+            feature["properties"].update({
+                "station_count": int(self._total[slot]),
+                "available_count": int(self._available[slot]),
+                "available_ratio": round(float(ratio), 4),
+                "area_km2": round(float(self._area[slot]), 3),
+                "stations_per_km2": round(float(density), 3),
+            })
+
+    def refresh(self) -> int:
+        """Pick up status changes since the last refresh; returns the number of PLZs updated."""
+        with self._lock:
+            changed = 0
+            for slot, code in enumerate(self._codes):
+                generation = self.repository.postal_code_generation(code)
+                if generation == self._generations[slot]:
+                    continue
+                self._generations[slot] = generation
+                self._available[slot] = self.repository.count_available(code)
+                self._total[slot] = self.repository.count_stations(code)
+                ratio, density = self._derive(self._available[slot:slot + 1], self._total[slot:slot + 1], self._area[slot:slot + 1])
+                self._write_properties(slot, ratio[0], density[0])
+                changed += 1
+            return changed
+
+    def geojson(self) -> dict:
+        self.refresh()
+        return self._geojson
+
+    def stats(self, postal_code: str) -> Optional[DistrictStats]:
+        slot = self._slot.get(postal_code)
+        if slot is None:
+            return None
+        self.refresh()
+        ratio, density = self._derive(self._available[slot:slot + 1], self._total[slot:slot + 1], self._area[slot:slot + 1])
+        return DistrictStats(
+            postal_code=postal_code,
+            station_count=int(self._total[slot]),
+            available_count=int(self._available[slot]),
+            available_ratio=float(ratio[0]),
+            area_km2=float(self._area[slot]),
+            stations_per_km2=float(density[0]),
+        )
+
+    def max_density(self) -> float:
+        _, density = self._derive(self._available, self._total, self._area)
+        return float(density.max()) if len(density) else 0.0
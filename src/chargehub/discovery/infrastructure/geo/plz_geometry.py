@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from chargehub.discovery.infrastructure.geo.polygon_area import EARTH_RADIUS_KM
+
+class PlzGeometry:
+    """
+    Memory-mapped, columnar copy of berlin_plz.geojson.
+
+    The binary file holds one float64 coordinate array plus offset arrays
+    (feature -> polygons -> rings -> points) and a small JSON block with the
+    feature properties. Opening it maps the file read-only, so worker
+    processes share the pages and every array is a zero-copy NumPy view.
+
+    File layout (little endian, sections 8-byte aligned):
+        header                      see _HEADER
+        feature_polygon_offsets     int64[n_features + 1]
+        polygon_ring_offsets        int64[n_polygons + 1]
+        ring_point_offsets          int64[n_rings + 1]
+        coords                      float64[n_points, 2]   (lon, lat)
+        properties                  UTF-8 JSON list, one dict per feature
+    """
+
+    MAGIC = b"CHGEOM\x00\x01"
+    VERSION = 1
+    # magic, version, source size, source mtime_ns, n_features, n_polygons, n_rings, n_points, properties bytes
+    _HEADER = struct.Struct("<8sIqqqqqqq")
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (magic, version, self.source_size, self.source_mtime_ns,
+         n_features, n_polygons, n_rings, n_points, props_len) = self._HEADER.unpack_from(self._mmap, 0)
+        if magic != self.MAGIC or version != self.VERSION:
+            raise ValueError(f"{self.path} is not a PLZ geometry file (version {self.VERSION})")
+
+        offset = _align(self._HEADER.size)
+        self.feature_polygon_offsets, offset = self._view(np.int64, n_features + 1, offset)
+        self.polygon_ring_offsets, offset = self._view(np.int64, n_polygons + 1, offset)
+        self.ring_point_offsets, offset = self._view(np.int64, n_rings + 1, offset)
+        coords, offset = self._view(np.float64, n_points * 2, offset)
+        self.coords = coords.reshape(n_points, 2)
+        self.properties: List[dict] = json.loads(bytes(self._mmap[offset:offset + props_len]).decode("utf-8"))
+
+        self.codes: List[str] = [p["plz_code"] for p in self.properties]
+        self._features_by_plz: Dict[str, List[int]] = {}
+        for i, code in enumerate(self.codes):
+            self._features_by_plz.setdefault(code, []).append(i)
+
+    def _view(self, dtype, count: int, offset: int) -> Tuple[np.ndarray, int]:
+        array = np.frombuffer(self._mmap, dtype=dtype, count=count, offset=offset)
+        return array, _align(offset + array.nbytes)
+
+    # ------------------------------------------------------------
+    # Loading / conversion
+    # ------------------------------------------------------------
+    @classmethod
+    def load(cls, geojson_path: Path, cache_path: Path) -> "PlzGeometry":
+        """Map `cache_path`, regenerating it first if `geojson_path` changed."""
+        stat = Path(geojson_path).stat()
+        try:
+            geometry = cls(cache_path)
+            if (geometry.source_size, geometry.source_mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+                return geometry
+            geometry.close()
+        except (OSError, ValueError, struct.error):
+            pass
+
+        with open(geojson_path, "r", encoding="utf-8") as f:
+            geojson = json.load(f)
+        cls.write(geojson, cache_path, source_size=stat.st_size, source_mtime_ns=stat.st_mtime_ns)
+        return cls(cache_path)
+
+    @classmethod
+    def write(cls, geojson: dict, path: Path, source_size: int = 0, source_mtime_ns: int = 0) -> None:
+        feature_offsets = [0]
+        polygon_offsets = [0]
+        ring_offsets = [0]
+        points: List[List[float]] = []
+        properties = []
+
+        for feature in geojson.get("features", []):
+            geometry = feature["geometry"]
+            polygons = geometry["coordinates"] if geometry["type"] == "MultiPolygon" else [geometry["coordinates"]]
+            for polygon in polygons:
+                for ring in polygon:
+                    points.extend(ring)
+                    ring_offsets.append(len(points))
+                polygon_offsets.append(len(ring_offsets) - 1)
+            feature_offsets.append(len(polygon_offsets) - 1)
+            properties.append(feature["properties"])
+
+        props_blob = json.dumps(properties, ensure_ascii=False).encode("utf-8")
+        coords = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        header = cls._HEADER.pack(
+            cls.MAGIC, cls.VERSION, source_size, source_mtime_ns,
+            len(properties), len(polygon_offsets) - 1, len(ring_offsets) - 1, len(coords), len(props_blob),
+        )
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write-then-rename: workers that already mapped the old file keep a valid view
+        tmp_path = path.with_suffix(path.suffix + f".{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            for block in (
+                header,
+                np.asarray(feature_offsets, dtype=np.int64).tobytes(),
+                np.asarray(polygon_offsets, dtype=np.int64).tobytes(),
+                np.asarray(ring_offsets, dtype=np.int64).tobytes(),
+                coords.tobytes(),
+                props_blob,
+            ):
+                f.write(block)
+                f.write(b"\x00" * (_align(f.tell()) - f.tell()))
+        os.replace(tmp_path, path)
+
+    def close(self) -> None:
+        # Views into the map must be dropped before it can be closed
+        self.feature_polygon_offsets = self.polygon_ring_offsets = self.ring_point_offsets = self.coords = None
+        self._mmap.close()
+
+    # ------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------
+    def features_for(self, postal_code: str) -> List[int]:
+        return list(self._features_by_plz.get(postal_code, ()))
+
+    def feature_rings(self, feature: int) -> List[List[np.ndarray]]:
+        """Rings of every polygon of `feature` as (n, 2) coordinate views."""
+        polygons = []
+        for p in range(self.feature_polygon_offsets[feature], self.feature_polygon_offsets[feature + 1]):
+            rings = []
+            for r in range(self.polygon_ring_offsets[p], self.polygon_ring_offsets[p + 1]):
+                rings.append(self.coords[self.ring_point_offsets[r]:self.ring_point_offsets[r + 1]])
+            polygons.append(rings)
+        return polygons
+
+    def ring_areas_km2(self) -> np.ndarray:
+        """Unsigned area of every ring, computed in one vectorised pass over all points."""
+        starts = self.ring_point_offsets[:-1]
+        lengths = np.diff(self.ring_point_offsets)
+        lon = np.radians(self.coords[:, 0])
+        lat = np.radians(self.coords[:, 1])
+
+        # Local equirectangular projection per ring (cos of the ring's mean latitude)
+        mean_lat = np.add.reduceat(lat, starts) / lengths
+        x = EARTH_RADIUS_KM * lon * np.repeat(np.cos(mean_lat), lengths)
+        y = EARTH_RADIUS_KM * lat
+
+        # Shoelace terms between consecutive points; rings are closed, so the
+        # pair that would cross into the next ring is masked out.
+        cross = np.zeros_like(x)
+        cross[:-1] = x[:-1] * y[1:] - x[1:] * y[:-1]
+        cross[self.ring_point_offsets[1:] - 1] = 0.0
+        return np.abs(np.add.reduceat(cross, starts)) / 2.0
+
+    def areas_by_plz(self) -> Dict[str, float]:
+        """Area per PLZ in km² (exterior rings minus holes, summed over features)."""
+        ring_areas = self.ring_areas_km2()
+        exterior = np.zeros(len(ring_areas), dtype=bool)
+        exterior[self.polygon_ring_offsets[:-1]] = True
+        signed = np.where(exterior, ring_areas, -ring_areas)
+        polygon_areas = np.maximum(np.add.reduceat(signed, self.polygon_ring_offsets[:-1]), 0.0)
+        feature_areas = np.add.reduceat(polygon_areas, self.feature_polygon_offsets[:-1])
+
+        areas: Dict[str, float] = {}
+        for code, area in zip(self.codes, feature_areas.tolist()):
+            areas[code] = areas.get(code, 0.0) + area
+        return areas
+
+    def to_geojson(self) -> dict:
+        """Rebuild a GeoJSON FeatureCollection (e.g. for folium) without parsing JSON text."""
+        features = []
+        for i, props in enumerate(self.properties):
+            polygons = [[ring.tolist() for ring in rings] for rings in self.feature_rings(i)]
+            if len(polygons) == 1:
+                geometry = {"type": "Polygon", "coordinates": polygons[0]}
+            else:
+                geometry = {"type": "MultiPolygon", "coordinates": polygons}
+            features.append({"type": "Feature", "geometry": geometry, "properties": dict(props)})
+        return {"type": "FeatureCollection", "features": features}
+
+def _align(offset: int, alignment: int = 8) -> int:
+    return (offset + alignment - 1) // alignment * alignment
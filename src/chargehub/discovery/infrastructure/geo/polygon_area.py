@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+
+def ring_area_km2(ring: Sequence[Sequence[float]]) -> float:
+    """Area of a closed lon/lat ring in km².
+
+    Uses the shoelace formula on a local equirectangular projection, which is
+    well below 0.1% off for district-sized polygons at Berlin's latitude.
+    """
+    coords = np.asarray(ring, dtype=np.float64)
+    if len(coords) < 3:
+        return 0.0
+    lon = np.radians(coords[:, 0])
+    lat = np.radians(coords[:, 1])
+    x = EARTH_RADIUS_KM * lon * np.cos(lat.mean())
+    y = EARTH_RADIUS_KM * lat
+    return float(abs(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1))) / 2.0)
+
+def polygon_area_km2(rings: Sequence[Sequence[Sequence[float]]]) -> float:
+    """Area of a GeoJSON polygon (exterior ring minus holes) in km²."""
+    if not rings:
+        return 0.0
+    return max(ring_area_km2(rings[0]) - sum(ring_area_km2(hole) for hole in rings[1:]), 0.0)
+
+def geometry_area_km2(geometry: dict) -> float:
+    if geometry["type"] == "MultiPolygon":
+        return sum(polygon_area_km2(polygon) for polygon in geometry["coordinates"])
+    return polygon_area_km2(geometry["coordinates"])
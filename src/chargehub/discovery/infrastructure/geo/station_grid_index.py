@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import math
+from typing import Dict, Iterator, List, Tuple
+
+from chargehub.discovery.domain.interfaces.charging_station_repository import StationCluster
+
+Cell = Tuple[int, int]
+
+class _CellStats:
+    __slots__ = ("positions", "sum_lat", "sum_lon", "available")
+
+    def __init__(self) -> None:
+        self.positions: List[int] = []
+        self.sum_lat = 0.0
+        self.sum_lon = 0.0
+        self.available = 0
+
+class StationGridIndex:
+    """
+    Uniform lat/lon grid over dense station positions.
+
+    Each non-empty cell keeps its positions plus running sums (count,
+    coordinate sums, available stations), so a viewport query touches only
+    the cells it overlaps: interior cells are taken whole from their sums,
+    and only stations in border cells are checked individually.
+    """
+
+    def __init__(self, cell_degrees: float = 0.01) -> None:
+        if cell_degrees <= 0:
+            raise ValueError("cell_degrees must be positive")
+        self.cell_degrees = cell_degrees
+        self._cells: Dict[Cell, _CellStats] = {}
+        self._cell_of: List[Cell] = []
+        self._lat: List[float] = []
+        self._lon: List[float] = []
+        self._available: List[bool] = []
+        # Occupied cell range (row_min, col_min, row_max, col_max)
+        self._extent: Tuple[int, int, int, int] | None = None
+
+    def __len__(self) -> int:
+        return len(self._cell_of)
+
+    def _cell(self, lat: float, lon: float) -> Cell:
+        return math.floor(lat / self.cell_degrees), math.floor(lon / self.cell_degrees)
+
+    # ------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------
+    def add(self, position: int, latitude: float, longitude: float, available: bool) -> None:
+        if position != len(self._cell_of):
+            raise ValueError(f"Positions must be added densely (expected {len(self._cell_of)}, got {position})")
+        cell = self._cell(latitude, longitude)
+        stats = self._cells.get(cell)
+        if stats is None:
+            stats = self._cells[cell] = _CellStats()
+        stats.positions.append(position)
+        stats.sum_lat += latitude
+        stats.sum_lon += longitude
+        stats.available += bool(available)
+        self._cell_of.append(cell)
+        if self._extent is None:
+            self._extent = (cell[0], cell[1], cell[0], cell[1])
+        else:
+            row_min, col_min, row_max, col_max = self._extent
+            self._extent = (min(row_min, cell[0]), min(col_min, cell[1]), max(row_max, cell[0]), max(col_max, cell[1]))
+        self._lat.append(latitude)
+        self._lon.append(longitude)
+        self._available.append(bool(available))
+
+    def set_available(self, position: int, available: bool) -> None:
+        if self._available[position] == available:
+            return
+        self._available[position] = available
+        self._cells[self._cell_of[position]].available += 1 if available else -1
+
+    # ------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------
+    def _overlapping(self, south: float, west: float, north: float, east: float) -> Iterator[Tuple[Cell, _CellStats, bool]]:
+        """(cell, stats, fully inside) for every non-empty cell overlapping the box."""
+        (row_min, col_min), (row_max, col_max) = self._cell(south, west), self._cell(north, east)
+        span = (row_max - row_min + 1) * (col_max - col_min + 1)
+        if span > len(self._cells):
+            # A large box: walking the occupied cells is cheaper than the whole range
+            candidates = ((cell, stats) for cell, stats in self._cells.items()
+                          if row_min <= cell[0] <= row_max and col_min <= cell[1] <= col_max)
+        else:
+            candidates = ((cell, self._cells[cell]) for cell in
+                          ((r, c) for r in range(row_min, row_max + 1) for c in range(col_min, col_max + 1))
+                          if cell in self._cells)
+        for cell, stats in candidates:
+            inside = row_min < cell[0] < row_max and col_min < cell[1] < col_max
+            yield cell, stats, inside
+
+    def _contains(self, position: int, south: float, west: float, north: float, east: float) -> bool:
+        return south <= self._lat[position] <= north and west <= self._lon[position] <= east
+
+    def positions_in(self, south: float, west: float, north: float, east: float) -> Iterator[int]:
+        for _, stats, inside in self._overlapping(south, west, north, east):
+            if inside:
+                yield from stats.positions
+            else:
+                yield from (p for p in stats.positions if self._contains(p, south, west, north, east))
+
+    def estimate_in(self, south: float, west: float, north: float, east: float) -> int:
+        """Upper bound of `count_in` from whole-cell counts, without looking at single stations."""
+        if self._extent is not None:
+            (row_min, col_min), (row_max, col_max) = self._cell(south, west), self._cell(north, east)
+            e_row_min, e_col_min, e_row_max, e_col_max = self._extent
+            if row_min <= e_row_min and col_min <= e_col_min and row_max >= e_row_max and col_max >= e_col_max:
+                # Covers every occupied cell
+                return len(self)
+        return sum(len(stats.positions) for _, stats, _ in self._overlapping(south, west, north, east))
+
+    def count_in(self, south: float, west: float, north: float, east: float) -> int:
+        total = 0
+        for _, stats, inside in self._overlapping(south, west, north, east):
+            if inside:
+                total += len(stats.positions)
+            else:
+                total += sum(1 for p in stats.positions if self._contains(p, south, west, north, east))
+        return total
+
+    def clusters_in(self, south: float, west: float, north: float, east: float, max_clusters: int) -> List[StationCluster]:
+        """Aggregate the box into at most `max_clusters` clusters (grid cells merged k x k)."""
+        per_cell: Dict[Cell, List[float]] = {}  # cell -> [count, available, sum_lat, sum_lon]
+        for cell, stats, inside in self._overlapping(south, west, north, east):
+            if inside:
+                per_cell[cell] = [len(stats.positions), stats.available, stats.sum_lat, stats.sum_lon]
+                continue
+            acc = [0, 0, 0.0, 0.0]
+            for p in stats.positions:
+                if self._contains(p, south, west, north, east):
+                    acc[0] += 1
+                    acc[1] += self._available[p]
+                    acc[2] += self._lat[p]
+                    acc[3] += self._lon[p]
+            if acc[0]:
+                per_cell[cell] = acc
+
+        factor = 1
+        while True:
+            merged: Dict[Cell, List[float]] = {}
+            for (row, col), acc in per_cell.items():
+                target = merged.setdefault((row // factor, col // factor), [0, 0, 0.0, 0.0])
+                for i in range(4):
+                    target[i] += acc[i]
+            if len(merged) <= max(max_clusters, 1):
+                break
+            factor *= 2
+
+        return [
+            StationCluster(latitude=sum_lat / count, longitude=sum_lon / count,
+                           station_count=int(count), available_count=int(available))
+            for (count, available, sum_lat, sum_lon) in (merged[key] for key in sorted(merged))
+        ]
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from typing import Iterable, Iterator
+
+# Set bit offsets of every byte value
+_BYTE_OFFSETS = tuple(tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256))
+
+class AvailabilityBitmap:
+    """Compact availability flags, one bit per dense station position."""
+
+    def __init__(self, flags: Iterable[bool] = ()) -> None:
+        self._bits = bytearray()
+        self._size = 0
+        for flag in flags:
+            self.append(flag)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, size: int) -> "AvailabilityBitmap":
+        if len(data) != (size + 7) // 8:
+            raise ValueError(f"{len(data)} bytes cannot hold exactly {size} flags")
+        bitmap = cls()
+        bitmap._bits = bytearray(data)
+        bitmap._size = size
+        return bitmap
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, position: int) -> bool:
+        self._check(position)
+        return bool(self._bits[position >> 3] & (1 << (position & 7)))
+
+    def __setitem__(self, position: int, flag: bool) -> None:
+        self._check(position)
+        if flag:
+            self._bits[position >> 3] |= 1 << (position & 7)
+        else:
+            self._bits[position >> 3] &= ~(1 << (position & 7)) & 0xFF
+
+    def __iter__(self) -> Iterator[bool]:
+        for position in range(self._size):
+            yield self[position]
+
+    def append(self, flag: bool) -> int:
+        position = self._size
+        if position >> 3 == len(self._bits):
+            self._bits.append(0)
+        self._size += 1
+        self[position] = flag
+        return position
+
+    def positions(self, flag: bool = True) -> Iterator[int]:
+        """Positions whose flag equals `flag`, ascending, decoded a byte at a time."""
+        for i, byte in enumerate(self._bits):
+            if not flag:
+                byte ^= 0xFF
+            if byte:
+                base = i * 8
+                for offset in _BYTE_OFFSETS[byte]:
+                    if base + offset < self._size:
+                        yield base + offset
+
+    def count(self) -> int:
+        """Number of set bits (popcount over the whole bitmap)."""
+        return int.from_bytes(self._bits, "little").bit_count()
+
+    def to_bytes(self) -> bytes:
+        return bytes(self._bits)
+
+    def _check(self, position: int) -> None:
+        if not 0 <= position < self._size:
+            raise IndexError(f"Bitmap position {position} out of range")
@@ -1,85 +1,158 @@
 from __future__ import annotations
 
-import pandas as pd
+import math
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
 from chargehub.discovery.domain.aggregates.charging_station import ChargingStationAggregate
+from chargehub.discovery.domain.interfaces.postal_code_registry import PostalCodeRegistry
+from chargehub.discovery.domain.value_objects.plug_type import PlugType
 from chargehub.discovery.domain.value_objects.postal_code import PostalCode
-from chargehub.discovery.domain.interfaces.charging_station_repository import ChargingStationRepository
+from chargehub.discovery.domain.value_objects.cleaning_report import CleaningReport
+from chargehub.discovery.infrastructure.cleaning.register_cleaning import RegisterCleaner
+from chargehub.discovery.infrastructure.repositories.charging_station_repository import ChargingStationRepository
+from chargehub.shared.infrastructure.json_cache import read_json_cache, write_json_cache
+
+# Output columns of the cleaning stage, in cache order
+_COLUMNS = ("station_id", "postal_code", "latitude", "longitude", "operator", "address", "plug_types", "max_power_kw")
+# Register wording of the connector columns ("Steckertypen1".."4") -> plug type
+_PLUG_PATTERNS = (
+    (PlugType.CCS, r"combo|ccs"),
+    (PlugType.CHADEMO, r"chademo"),
+    (PlugType.TYPE2, r"typ(?:e)?\s*2"),
+    (PlugType.TYPE1, r"typ(?:e)?\s*1"),
+    (PlugType.SCHUKO, r"schuko"),
+    (PlugType.TESLA, r"tesla"),
+)
 
 class ChargingStationCSVRepository(ChargingStationRepository):
     """
     Infrastructure Repository reading charging stations from
     Bundesnetzagentur CSV (Ladesaeulenregister.csv).
+
+    The register is normalized column-wise, then cleaned by a rule table
+    (see register_cleaning) whose per-rule counts are returned by
+    `cleaning_report()`. PLZs are checked against `plz_registry` when
+    given, otherwise by the prefix rule. With a `cache_path`, the cleaned stations and the
+    report are cached as JSON and reused until the CSV, the rules or the
+    set of accepted PLZs change. Querying and status updates are inherited
+    from the InMemory repository.
     """
 
-    def __init__(self, csv_path: Path):
+    CACHE_VERSION = 2
+
+    def __init__(self, csv_path: Path, cache_path: Optional[Path] = None,
+                 cleaner: Optional[RegisterCleaner] = None, plz_registry: Optional[PostalCodeRegistry] = None):
         self.csv_path = csv_path
-        self._stations = self._load()
-
-    def _load(self) -> List[ChargingStationAggregate]:
-        df = pd.read_csv(self.csv_path, sep=";", encoding="utf-8", low_memory=False)
-
-        stations: List[ChargingStationAggregate] = []
-
-        for idx, row in df.iterrows():
-            try:
-                postal_code = str(row["Postleitzahl"]).partition('.')[0].zfill(5)
-
-                # Domain validation (Berlin only)
-                PostalCode(postal_code)
-
-                lat_raw = row.get("Breitengrad", "")
-                lon_raw = row.get("Längengrad", "")
-                
-                lat_str = str(lat_raw).replace(",", ".") if pd.notna(lat_raw) else ""
-                lon_str = str(lon_raw).replace(",", ".") if pd.notna(lon_raw) else ""
-
-                if postal_code == "10589" and "Robert Bosch" not in str(row.get("Betreiber")):
-                     if not lat_str or not lon_str or float(lat_str) < 50:
-                         lat_str = "52.5263"
-                         lon_str = "13.3039"
-
-                # Skip if coordinates are still missing
-                if not lat_str or not lon_str:
-                    continue
-                
-                # Filter out obvious non-GPS values (some rows have text)
-                try:
-                    lat_float = float(lat_str)
-                    lon_float = float(lon_str)
-                except ValueError:
-                    continue
-
-                stations.append(
-                    ChargingStationAggregate(
-                        station_id=idx,
-                        postal_code=postal_code,
-                        latitude=lat_float,
-                        longitude=lon_float,
-                        available=True,  # CSV has no live status
-                        operator=row.get("Betreiber"),
-                        address=f"{row.get('Straße', '')} {row.get('Hausnummer', '')}",
-                    )
-                )
-            except Exception:
-                continue
-
-        return stations
-
-    def locate_charging_stations(self, postal_code: PostalCode):
-        return [
-            s for s in self._stations
-            if s.postal_code == postal_code.value and s.available
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.cleaner = cleaner or RegisterCleaner()
+        self.plz_registry = plz_registry
+        stations, report = self._load()
+        super().__init__(stations)
+        self._cleaning_report = report
+
+    def _load(self) -> Tuple[List[ChargingStationAggregate], CleaningReport]:
+        cached = self._read_cache()
+        if cached is not None:
+            columns, report = cached
+        else:
+            # Imported lazily so the domain/application layers stay importable without pandas
+            import pandas as pd
+
+            df = pd.read_csv(self.csv_path, sep=";", encoding="utf-8", low_memory=False)
+            normalized = self._normalize(df)
+            cleaned, report = self.cleaner.clean(normalized)
+            columns = {name: cleaned[name].tolist() for name in _COLUMNS}
+            postal_codes = dict(zip(normalized["postal_code"], normalized["postal_code_valid"]))
+            self._write_cache(columns, report, postal_codes)
+
+        stations = [
+            ChargingStationAggregate(
+                station_id=int(station_id),
+                postal_code=postal_code,
+                latitude=float(lat),
+                longitude=float(lon),
+                available=True,  # CSV has no live status; a status feed may correct it
+                operator=operator,
+                address=address,
+                plug_types=PlugType(int(plugs)),
+                max_power_kw=None if power is None or math.isnan(power) else float(power),
+            )
+            for station_id, postal_code, lat, lon, operator, address, plugs, power
+            in zip(*(columns[name] for name in _COLUMNS))
         ]
-
-    def update_station_status(self, station_id: int, status: bool):
-        for s in self._stations:
-            if s.station_id == station_id:
-                s.available = status
-                return
-        raise KeyError(f"Station {station_id} not found")
-
-    def get_all(self):
-        return list(self._stations)
+        return stations, report
+
+    def _normalize(self, df) -> "pd.DataFrame":
+        """Raw register columns -> typed columns the cleaning rules work on (one pass per column)."""
+        import pandas as pd
+
+        def text(column: str) -> pd.Series:
+            return df[column] if column in df else pd.Series("", index=df.index)
+
+        def number(column: str) -> pd.Series:
+            # German decimal commas; text and empty cells become NaN
+            return pd.to_numeric(text(column).astype(str).str.replace(",", ".", regex=False), errors="coerce")
+
+        postal_code = text("Postleitzahl").astype(str).str.partition(".")[0].str.zfill(5)
+        valid = {code: self._is_postal_code(code) for code in postal_code.unique()}
+        operator = text("Betreiber")
+
+        plug_types = pd.Series(0, index=df.index, dtype="int64")
+        for column in (c for c in df.columns if str(c).startswith("Steckertypen")):
+            values = df[column].fillna("").astype(str)
+            for plug, pattern in _PLUG_PATTERNS:
+                plug_types |= values.str.contains(pattern, case=False, regex=True).astype("int64") * int(plug)
+
+        # Installation power and per-connector power ("Nennleistung Stecker1".., older registers "P1 [kW]"..)
+        power_columns = [c for c in df.columns
+                         if str(c).startswith(("Nennleistung", "Anschlussleistung")) or (str(c).startswith("P") and "[kW]" in str(c))]
+        max_power_kw = (pd.concat([number(c) for c in power_columns], axis=1).max(axis=1)
+                        if power_columns else pd.Series(float("nan"), index=df.index))
+        return pd.DataFrame({
+            "station_id": df.index,
+            "postal_code": postal_code,
+            "postal_code_valid": postal_code.map(valid).astype(bool),
+            "latitude": number("Breitengrad"),
+            "longitude": number("Längengrad"),
+            "operator": operator.where(operator.notna(), None),
+            "address": text("Straße").astype(str) + " " + text("Hausnummer").astype(str),
+            "plug_types": plug_types,
+            "max_power_kw": max_power_kw,
+        }, index=df.index)
+
+    # ------------------------------------------------------------
+    # Cache of the cleaned output
+    # ------------------------------------------------------------
+    def _source_signature(self) -> Dict[str, object]:
+        stat = Path(self.csv_path).stat()
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "rules": self.cleaner.fingerprint()}
+
+    def _read_cache(self):
+        try:
+            signature = self._source_signature()
+        except OSError:
+            return None
+        payload = read_json_cache(self.cache_path, self.CACHE_VERSION, signature)
+        if payload is None:
+            return None
+        # PLZ validity depends on the registry passed in, so re-check the few distinct codes kept
+        if any(self._is_postal_code(code) != valid for code, valid in payload["postal_codes"].items()):
+            return None
+        return payload["stations"], CleaningReport.from_dict(payload["report"])
+
+    def _write_cache(self, columns: Dict[str, list], report: CleaningReport, postal_codes: Dict[str, bool]) -> None:
+        if self.cache_path is None:
+            return
+        write_json_cache(
+            self.cache_path, self.CACHE_VERSION, self._source_signature(),
+            postal_codes={code: bool(valid) for code, valid in postal_codes.items()},
+            report=report.to_dict(), stations=columns,
+        )
+
+    def _is_postal_code(self, code: str) -> bool:
+        try:
+            PostalCode(code, self.plz_registry)
+        except ValueError:
+            return False
+        return True
@@ -1,32 +1,413 @@
 from __future__ import annotations
 
-from typing import Iterable, List
+import struct
+import threading
+from array import array
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Mapping, Optional, Set, Tuple
 from chargehub.discovery.domain.aggregates.charging_station import ChargingStationAggregate
+from chargehub.discovery.domain.value_objects.cleaning_report import CleaningReport
 from chargehub.discovery.domain.value_objects.postal_code import PostalCode
-from chargehub.discovery.domain.interfaces.charging_station_repository import ChargingStationRepository
+from chargehub.discovery.domain.value_objects.station_filter import StationFilter
+from chargehub.discovery.domain.value_objects.station_query import StationQuery
+from chargehub.discovery.domain.interfaces.charging_station_repository import (
+    VIEWPORT_STATION_LIMIT, ChargingStationRepository, PostalCodeSuggestion, QueryPlan, StatusBatchResult,
+    ViewportStations,
+)
+from chargehub.discovery.infrastructure.geo.station_grid_index import StationGridIndex
+from chargehub.discovery.infrastructure.repositories.availability_bitmap import AvailabilityBitmap
+from chargehub.discovery.infrastructure.repositories.postal_code_trie import PostalCodeTrie
+from chargehub.discovery.infrastructure.repositories.station_filter_index import StationFilterIndex
+from chargehub.discovery.infrastructure.repositories.station_query_engine import AccessPath, execute
+from chargehub.shared.infrastructure.deep_size import deep_sizeof
+from chargehub.shared.infrastructure.snapshot_file import SnapshotError, read_snapshot, write_snapshot
 
 class ChargingStationRepository(ChargingStationRepository):
-    """InMemory repository (as required by ASE guideline)."""
+    """InMemory repository (as required by ASE guideline).
+
+    Every station gets a dense position on insertion. Availability is held in
+    a bitmap indexed by that position, alongside per-PLZ available/total
+    counters, so status updates and availability aggregates are O(1).
+    It combines two separately kept inputs: the operator's live status
+    (its own bitmap) and the malfunction override (positions out of
+    service); a station is available only if the operator reports it so and
+    no override holds it offline.
+    A spatial grid over the same positions answers viewport queries, and
+    per-PLZ bitmaps over plug types, power and availability answer searches,
+    and a PLZ trie with per-node counts completes typed PLZ prefixes.
+    `query()` combines these indexes (plus an operator index) for ad-hoc filters.
+    """
+
+    GRID_CELL_DEGREES = 0.01
 
     def __init__(self, stations: Iterable[ChargingStationAggregate] | None = None) -> None:
-        self._stations: List[ChargingStationAggregate] = list(stations or [])
+        self._stations: List[ChargingStationAggregate] = []
+        self._position_by_id: Dict[int, int] = {}
+        self._positions_by_plz: Dict[str, List[int]] = {}
+        self._positions_by_operator: Dict[str, List[int]] = {}
+        self._operator_keys: List[Optional[str]] = []
+        self._availability = AvailabilityBitmap()
+        self._operator_available = AvailabilityBitmap()
+        self._out_of_service: Set[int] = set()
+        self._available_by_plz: Dict[str, int] = {}
+        self._available_count = 0
+        self._grid = StationGridIndex(self.GRID_CELL_DEGREES)
+        self._filters = StationFilterIndex()
+        self._postal_codes = PostalCodeTrie()
+        # Bumped on every change within a PLZ so cached search results can be validated
+        self._generations: Dict[str, int] = {}
+        # Serialises writers (status feed, malfunction flow, restore); readers do not lock
+        self._lock = threading.RLock()
+        # Set by repositories that load and clean the register
+        self._cleaning_report: Optional[CleaningReport] = None
+        for station in stations or []:
+            self._index(station)
 
     def add(self, station: ChargingStationAggregate) -> None:
-        self._stations.append(station)
+        with self._lock:
+            self._index(station)
+            self._bump_generation(station.postal_code)
+
+    def locate_charging_stations(self, postal_code: PostalCode,
+                                 station_filter: Optional[StationFilter] = None) -> List[ChargingStationAggregate]:
+        """Return stations for a PLZ, filtered to AVAILABLE only (real-time filter) and by plug/power."""
+        station_filter = station_filter or StationFilter()
+        positions = self._filters.positions(postal_code.value, int(station_filter.plug_types), station_filter.min_power_kw)
+        return [self._stations[pos] for pos in positions]
+
+    def locate_in_bbox(self, south: float, west: float, north: float, east: float,
+                       limit: int = VIEWPORT_STATION_LIMIT) -> ViewportStations:
+        if south > north or west > east:
+            raise ValueError("Bounding box must satisfy south <= north and west <= east")
+        if limit < 1:
+            raise ValueError("limit must be positive")
+        total = self._grid.count_in(south, west, north, east)
+        if total <= limit:
+            positions = sorted(self._grid.positions_in(south, west, north, east))
+            return ViewportStations(total=total, stations=[self._stations[pos] for pos in positions])
+        return ViewportStations(total=total, clusters=self._grid.clusters_in(south, west, north, east, limit))
+
+    def query(self, query: StationQuery) -> List[ChargingStationAggregate]:
+        positions, _ = self._execute(query)
+        return [self._stations[pos] for pos in positions]
 
-    def locate_charging_stations(self, postal_code: PostalCode) -> List[ChargingStationAggregate]:
-        """Return stations for a PLZ, filtered to AVAILABLE only (real-time filter)."""
-        return [
-            s for s in self._stations
-            if s.postal_code == postal_code.value and s.available
-        ]
+    def explain(self, query: StationQuery) -> QueryPlan:
+        positions, steps = self._execute(query)
+        return QueryPlan(steps=steps, result_rows=len(positions))
+
+    def _execute(self, query: StationQuery):
+        return execute(self._access_paths(query), lambda: range(len(self._stations)), query.limit)
+
+    def _access_paths(self, query: StationQuery) -> List[AccessPath]:
+        """One access path per set criterion, each with its index-backed row estimate."""
+        stations = self._stations
+        paths: List[AccessPath] = []
+        # Long value lists are summarised in the plan
+        def listing(values) -> str:
+            return str(sorted(values)) if len(values) <= 5 else f"({len(values)} values)"
+
+        if query.station_ids is not None:
+            ids = query.station_ids
+            paths.append(AccessPath(
+                f"station_id in {listing(ids)}", len(ids),
+                fetch=lambda: (self._position_by_id[i] for i in ids if i in self._position_by_id),
+                contains=lambda pos: stations[pos].station_id in ids,
+            ))
+        if query.postal_codes is not None:
+            codes = query.postal_codes
+            paths.append(AccessPath(
+                f"postal_code in {listing(codes)}", sum(len(self._positions_by_plz.get(c, ())) for c in codes),
+                fetch=lambda: (pos for c in codes for pos in self._positions_by_plz.get(c, ())),
+                contains=lambda pos: stations[pos].postal_code in codes,
+            ))
+        if query.operator is not None:
+            key = _operator_key(query.operator)
+            matches = self._positions_by_operator.get(key, [])
+            paths.append(AccessPath(
+                f"operator = {query.operator!r}", len(matches),
+                fetch=lambda: matches,
+                contains=lambda pos: self._operator_keys[pos] == key,
+            ))
+        if query.bbox is not None:
+            south, west, north, east = query.bbox
+            paths.append(AccessPath(
+                f"bbox {query.bbox}", self._grid.estimate_in(south, west, north, east),
+                fetch=lambda: self._grid.positions_in(south, west, north, east),
+                contains=lambda pos: south <= stations[pos].latitude <= north and west <= stations[pos].longitude <= east,
+            ))
+        if query.available is not None:
+            flag = query.available
+            availability = self._availability
+            bits = availability.to_bytes()
+            paths.append(AccessPath(
+                f"available = {flag}", self._available_count if flag else len(stations) - self._available_count,
+                fetch=lambda: availability.positions(flag),
+                contains=lambda pos: bool(bits[pos >> 3] >> (pos & 7) & 1) == flag,
+                bitmap=True,
+            ))
+        return paths
 
     def update_station_status(self, station_id: int, status: bool) -> None:
-        for s in self._stations:
-            if s.station_id == station_id:
-                s.available = status
-                return
-        raise KeyError(f"Station {station_id} not found")
+        with self._lock:
+            self._set_operator_status(self._position(station_id), bool(status))
+
+    def set_out_of_service(self, station_id: int, out_of_service: bool) -> bool:
+        with self._lock:
+            return self._set_out_of_service(self._position(station_id), bool(out_of_service))
+
+    def out_of_service_ids(self) -> FrozenSet[int]:
+        return frozenset(self._stations[pos].station_id for pos in self._out_of_service)
+
+    def _position(self, station_id: int) -> int:
+        pos = self._position_by_id.get(station_id)
+        if pos is None:
+            raise KeyError(f"Station {station_id} not found")
+        return pos
+
+    def update_station_statuses(self, statuses: Mapping[int, bool]) -> StatusBatchResult:
+        """Apply a batch of status changes; each touched PLZ's generation is bumped once."""
+        with self._lock:
+            changes, unchanged, unknown = self._resolve_statuses(statuses)
+            self._apply_statuses(changes)
+        return StatusBatchResult(changed=len(changes), unchanged=unchanged, unknown=tuple(unknown))
+
+    def _resolve_statuses(self, statuses: Mapping[int, bool]) -> Tuple[List[Tuple[int, bool]], int, List[int]]:
+        """(positions whose operator flag differs, with the new flag), count already in that state, unknown ids."""
+        position_by_id = self._position_by_id
+        availability = self._operator_available
+        changes: List[Tuple[int, bool]] = []
+        unknown: List[int] = []
+        unchanged = 0
+        for station_id, status in statuses.items():
+            pos = position_by_id.get(station_id)
+            if pos is None:
+                unknown.append(station_id)
+            elif availability[pos] == bool(status):
+                unchanged += 1
+            else:
+                changes.append((pos, bool(status)))
+        return changes, unchanged, unknown
+
+    def _apply_statuses(self, changes: Iterable[Tuple[int, bool]]) -> None:
+        touched: Set[str] = set()
+        for pos, status in changes:
+            self._set_operator_status(pos, status, touched)
+        for postal_code in touched:
+            self._bump_generation(postal_code)
+
+    def _set_operator_status(self, pos: int, status: bool, touched: Optional[Set[str]] = None) -> bool:
+        self._operator_available[pos] = status
+        return self._apply_status(pos, status and pos not in self._out_of_service, touched)
+
+    def _set_out_of_service(self, pos: int, flag: bool, touched: Optional[Set[str]] = None) -> bool:
+        if (pos in self._out_of_service) == flag:
+            return False
+        if flag:
+            self._out_of_service.add(pos)
+        else:
+            self._out_of_service.discard(pos)
+        self._stations[pos].out_of_service = flag
+        if not self._apply_status(pos, self._operator_available[pos] and not flag, touched):
+            # Availability is unchanged, but cached results carry the flag
+            self._touch(self._stations[pos].postal_code, touched)
+        return True
+
+    def _apply_status(self, pos: int, status: bool, touched: Optional[Set[str]] = None) -> bool:
+        """Set the combined flag at `pos` and keep counters in sync; False if it was already set.
+
+        With `touched`, the PLZ is collected there instead of bumping its
+        generation, so a batch invalidates cached results once per PLZ.
+        """
+        if self._availability[pos] == status:
+            return False
+
+        station = self._stations[pos]
+        station.available = status
+        self._availability[pos] = status
+        self._grid.set_available(pos, status)
+        self._filters.set_available(pos, status)
+        self._postal_codes.set_available(station.postal_code, status)
+        delta = 1 if status else -1
+        self._available_by_plz[station.postal_code] += delta
+        self._available_count += delta
+        self._touch(station.postal_code, touched)
+        return True
+
+    def _touch(self, postal_code: str, touched: Optional[Set[str]]) -> None:
+        if touched is None:
+            self._bump_generation(postal_code)
+        else:
+            touched.add(postal_code)
 
     def get_all(self) -> List[ChargingStationAggregate]:
         return list(self._stations)
+
+    def iter_stations(self) -> Iterator[ChargingStationAggregate]:
+        stations = self._stations
+        for pos in range(len(stations)):
+            yield stations[pos]
+
+    def get_station(self, station_id: int) -> Optional[ChargingStationAggregate]:
+        pos = self._position_by_id.get(station_id)
+        return self._stations[pos] if pos is not None else None
+
+    def is_available(self, station_id: int) -> bool:
+        return self._availability[self._position(station_id)]
+
+    def station_ids(self, postal_code: str) -> List[int]:
+        return [self._stations[pos].station_id for pos in self._positions_by_plz.get(postal_code, ())]
+
+    def count_stations(self, postal_code: str | None = None) -> int:
+        if postal_code is None:
+            return len(self._stations)
+        return len(self._positions_by_plz.get(postal_code, ()))
+
+    def count_available(self, postal_code: str | None = None) -> int:
+        if postal_code is None:
+            return self._available_count
+        return self._available_by_plz.get(postal_code, 0)
+
+    def availability_summary(self) -> Dict[str, Tuple[int, int]]:
+        return {
+            plz: (self._available_by_plz[plz], len(positions))
+            for plz, positions in self._positions_by_plz.items()
+        }
+
+    def register_postal_codes(self, postal_codes: Iterable[str]) -> None:
+        """Offer these PLZs as suggestions too, also while they have no stations."""
+        for postal_code in postal_codes:
+            self._postal_codes.add_code(postal_code)
+
+    def suggest_postal_codes(self, prefix: str, limit: int = 8) -> List[PostalCodeSuggestion]:
+        return self._postal_codes.complete(prefix, limit)
+
+    def cleaning_report(self) -> Optional[CleaningReport]:
+        return self._cleaning_report
+
+    def postal_code_generation(self, postal_code: str) -> int:
+        return self._generations.get(postal_code, 0)
+
+    def memory_usage(self, seen: Optional[Set[int]] = None) -> Dict[str, int]:
+        """Estimated bytes per internal structure (see `deep_sizeof`); stations are counted first."""
+        seen = set() if seen is None else seen
+        # Writers (e.g. the status feed) hold the lock, so no index changes size while it is walked
+        with self._lock:
+            return {
+                "stations": deep_sizeof(self._stations, self._position_by_id, seen=seen),
+                "plz/operator lists": deep_sizeof(self._positions_by_plz, self._positions_by_operator,
+                                                  self._operator_keys, self._available_by_plz, self._generations,
+                                                  seen=seen),
+                "availability bitmap": deep_sizeof(self._availability, self._operator_available,
+                                                   self._out_of_service, seen=seen),
+                "grid index": deep_sizeof(self._grid, seen=seen),
+                "filter index": deep_sizeof(self._filters, seen=seen),
+                "plz trie": deep_sizeof(self._postal_codes, seen=seen),
+            }
+
+    # ------------------------------------------------------------
+    # Snapshots
+    # ------------------------------------------------------------
+    SNAPSHOT_KIND = b"STAT"
+    _SNAPSHOT_COUNT = struct.Struct("<q")
+
+    # Version 1 held only the operator bitmap; version 2 adds the out-of-service bitmap
+    _SNAPSHOT_VERSION = 2
+
+    def snapshot(self, path: Path) -> int:
+        """Write station ids, the operator status bitmap and the out-of-service bitmap; returns bytes written.
+
+        Each is copied in one step, so readers and writers are never blocked.
+        """
+        ids = array("q", (station.station_id for station in self._stations))
+        bits = self._operator_available.to_bytes()
+        held = bytearray(len(bits))
+        for pos in list(self._out_of_service):
+            held[pos >> 3] |= 1 << (pos & 7)
+        payload = self._SNAPSHOT_COUNT.pack(len(ids)) + ids.tobytes() + bits + bytes(held)
+        return write_snapshot(path, self.SNAPSHOT_KIND, payload, version=self._SNAPSHOT_VERSION)
+
+    def restore(self, path: Path) -> int:
+        """Re-apply statuses from a snapshot; returns the number of stations changed.
+
+        Stations unknown to this repository are ignored, so a snapshot stays
+        usable after the station register was reloaded. A version 1 snapshot
+        restores operator statuses only.
+        """
+        with self._lock:
+            return self._restore(path)
+
+    def _restore(self, path: Path) -> int:
+        version, payload = read_snapshot(path, self.SNAPSHOT_KIND, versions=(1, self._SNAPSHOT_VERSION))
+        (count,) = self._SNAPSHOT_COUNT.unpack_from(payload, 0)
+        ids_end = self._SNAPSHOT_COUNT.size + 8 * count
+        bitmap_bytes = (count + 7) // 8
+        if len(payload) != ids_end + (1 if version == 1 else 2) * bitmap_bytes:
+            raise SnapshotError(f"{path} has an inconsistent station count")
+        ids = array("q")
+        ids.frombytes(payload[self._SNAPSHOT_COUNT.size:ids_end])
+        saved = AvailabilityBitmap.from_bytes(payload[ids_end:ids_end + bitmap_bytes], count)
+        changed_ids: Set[int] = set()
+        if version > 1:
+            held = AvailabilityBitmap.from_bytes(payload[ids_end + bitmap_bytes:], count)
+            changed_ids.update(self._restore_out_of_service(ids, {ids[i] for i in held.positions(True)}))
+
+        if list(ids) == [station.station_id for station in self._stations]:
+            # Same register: only bytes that differ need a closer look
+            current = self._operator_available.to_bytes()
+            restored = saved.to_bytes()
+            candidates = (
+                pos for i, (a, b) in enumerate(zip(current, restored)) if a != b
+                for pos in range(i * 8, min(i * 8 + 8, count))
+            )
+            pairs = ((self._stations[pos].station_id, saved[pos]) for pos in candidates)
+        else:
+            pairs = ((station_id, saved[i]) for i, station_id in enumerate(ids) if station_id in self._position_by_id)
+
+        updates = {station_id: flag for station_id, flag in pairs
+                   if self._operator_available[self._position_by_id[station_id]] != flag}
+        self.update_station_statuses(updates)
+        return len(changed_ids.union(updates))
+
+    def _restore_out_of_service(self, ids: array, saved: Set[int]) -> List[int]:
+        """Bring the overrides of stations in the snapshot to `saved`; returns the ids changed."""
+        current = self.out_of_service_ids()
+        released = current - saved
+        if released:
+            in_snapshot = set(ids)
+            released = {station_id for station_id in released if station_id in in_snapshot}
+        changed = []
+        for station_id in sorted(released | (saved - current)):
+            if station_id in self._position_by_id and self.set_out_of_service(station_id, station_id in saved):
+                changed.append(station_id)
+        return changed
+
+    def _index(self, station: ChargingStationAggregate) -> None:
+        if station.station_id in self._position_by_id:
+            raise ValueError(f"Station {station.station_id} already exists")
+        operator_available = bool(station.available)
+        station.available = available = operator_available and not station.out_of_service
+        pos = self._availability.append(available)
+        self._operator_available.append(operator_available)
+        if station.out_of_service:
+            self._out_of_service.add(pos)
+        self._grid.add(pos, station.latitude, station.longitude, available)
+        self._filters.add(pos, station.postal_code, int(station.plug_types), station.max_power_kw, available)
+        self._stations.append(station)
+        self._position_by_id[station.station_id] = pos
+        self._positions_by_plz.setdefault(station.postal_code, []).append(pos)
+        self._postal_codes.add_station(station.postal_code, available)
+        operator = _operator_key(station.operator)
+        self._operator_keys.append(operator)
+        if operator is not None:
+            self._positions_by_operator.setdefault(operator, []).append(pos)
+        self._available_by_plz.setdefault(station.postal_code, 0)
+        if available:
+            self._available_by_plz[station.postal_code] += 1
+            self._available_count += 1
+
+    def _bump_generation(self, postal_code: str) -> None:
+        self._generations[postal_code] = self._generations.get(postal_code, 0) + 1
+
+def _operator_key(operator: object) -> Optional[str]:
+    # The register leaves some operators empty (NaN after parsing)
+    return operator.strip().casefold() if isinstance(operator, str) and operator.strip() else None
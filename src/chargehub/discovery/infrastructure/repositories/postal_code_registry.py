@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import json
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+from chargehub.discovery.domain.interfaces.postal_code_registry import PostalCodeRegistry
+from chargehub.shared.infrastructure.json_cache import read_json_cache, write_json_cache
+
+class InMemoryPostalCodeRegistry(PostalCodeRegistry):
+    """InMemory registry built from a PLZ -> neighbouring PLZs mapping."""
+
+    def __init__(self, adjacency: Mapping[str, Iterable[str]]) -> None:
+        self._adjacency: Dict[str, Tuple[str, ...]] = {
+            code: tuple(sorted(neighbours)) for code, neighbours in adjacency.items()
+        }
+        self._codes: FrozenSet[str] = frozenset(self._adjacency)
+
+    def codes(self) -> FrozenSet[str]:
+        return self._codes
+
+    def contains(self, postal_code: str) -> bool:
+        return postal_code in self._codes
+
+    def neighbours(self, postal_code: str) -> Sequence[str]:
+        return self._adjacency.get(postal_code, ())
+
+
+class GeoJsonPostalCodeRegistry(InMemoryPostalCodeRegistry):
+    """
+    Registry of Berlin PLZs read from berlin_plz.geojson.
+
+    Two districts are adjacent when their polygons share a boundary edge,
+    i.e. at least two identical vertices. Building the graph walks every
+    vertex once, so the result is cached as JSON next to the source and only
+    rebuilt when the GeoJSON file changes.
+    """
+
+    CACHE_VERSION = 1
+    # Vertices are compared after rounding to the precision of the source file
+    _COORD_PRECISION = 7
+
+    def __init__(self, geojson_path: Path, cache_path: Optional[Path] = None) -> None:
+        self.geojson_path = Path(geojson_path)
+        self.cache_path = Path(cache_path) if cache_path else None
+        super().__init__(self._load())
+
+    def _source_signature(self) -> Dict[str, int]:
+        stat = self.geojson_path.stat()
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def _load(self) -> Dict[str, List[str]]:
+        signature = self._source_signature()
+        cached = read_json_cache(self.cache_path, self.CACHE_VERSION, signature)
+        if cached is not None:
+            return cached["adjacency"]
+
+        with open(self.geojson_path, "r", encoding="utf-8") as f:
+            adjacency = self.build_adjacency(json.load(f))
+        write_json_cache(self.cache_path, self.CACHE_VERSION, signature, adjacency=adjacency)
+        return adjacency
+
+    @classmethod
+    def build_adjacency(cls, geojson: dict) -> Dict[str, List[str]]:
+        vertex_owners: Dict[Tuple[float, float], Set[str]] = defaultdict(set)
+        adjacency: Dict[str, Set[str]] = {}
+
+        for feature in geojson.get("features", []):
+            code = feature["properties"]["plz_code"]
+            adjacency.setdefault(code, set())
+            geometry = feature["geometry"]
+            polygons = geometry["coordinates"] if geometry["type"] == "MultiPolygon" else [geometry["coordinates"]]
+            for polygon in polygons:
+                for ring in polygon:
+                    for lon, lat in ring:
+                        key = (round(lon, cls._COORD_PRECISION), round(lat, cls._COORD_PRECISION))
+                        vertex_owners[key].add(code)
+
+        shared: Dict[Tuple[str, str], int] = defaultdict(int)
+        for owners in vertex_owners.values():
+            if len(owners) < 2:
+                continue
+            ordered = sorted(owners)
+            for i, a in enumerate(ordered):
+                for b in ordered[i + 1:]:
+                    shared[(a, b)] += 1
+
+        for (a, b), count in shared.items():
+            if count >= 2:
+                adjacency[a].add(b)
+                adjacency[b].add(a)
+
+        return {code: sorted(neighbours) for code, neighbours in adjacency.items()}
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import heapq
+from typing import Dict, List, Optional, Tuple
+
+from chargehub.discovery.domain.interfaces.charging_station_repository import PostalCodeSuggestion
+
+class _Node:
+    __slots__ = ("children", "total", "available", "code")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, _Node] = {}
+        self.total = 0
+        self.available = 0
+        self.code: Optional[str] = None  # set on the node ending a complete PLZ
+
+class PostalCodeTrie:
+    """
+    Prefix trie over PLZs whose nodes carry station and availability counts.
+
+    Every node holds the totals of all PLZs below it, kept current as
+    stations are added and change status (one walk from the root to the
+    PLZ per change). Completing a prefix walks to its node and expands it
+    best-first by available count: a node's count bounds every PLZ below
+    it, so the top suggestions are found without visiting the rest of the
+    subtree. All PLZs have the same length, so only leaves end a PLZ.
+    """
+
+    def __init__(self) -> None:
+        self._root = _Node()
+        # PLZ -> its nodes from the root down, for count updates
+        self._paths: Dict[str, Tuple[_Node, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def __contains__(self, postal_code: str) -> bool:
+        return postal_code in self._paths
+
+    def _path(self, postal_code: str) -> Tuple[_Node, ...]:
+        path = self._paths.get(postal_code)
+        if path is None:
+            node = self._root
+            nodes = [node]
+            for digit in postal_code:
+                node = node.children.setdefault(digit, _Node())
+                nodes.append(node)
+            node.code = postal_code
+            path = self._paths[postal_code] = tuple(nodes)
+        return path
+
+    # ------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------
+    def add_code(self, postal_code: str) -> None:
+        """Make `postal_code` suggestible even while it has no stations."""
+        self._path(postal_code)
+
+    def add_station(self, postal_code: str, available: bool) -> None:
+        for node in self._path(postal_code):
+            node.total += 1
+            node.available += bool(available)
+
+    def set_available(self, postal_code: str, available: bool) -> None:
+        """A station of `postal_code` switched to `available`."""
+        delta = 1 if available else -1
+        for node in self._paths[postal_code]:
+            node.available += delta
+
+    # ------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------
+    def _find(self, prefix: str) -> Optional[_Node]:
+        node = self._root
+        for digit in prefix:
+            node = node.children.get(digit)
+            if node is None:
+                return None
+        return node
+
+    def complete(self, prefix: str, limit: int) -> List[PostalCodeSuggestion]:
+        """Up to `limit` PLZs starting with `prefix`, most available stations first.
+
+        Ties go to more stations in total, then to the lower PLZ.
+        """
+        node = self._find(prefix)
+        if node is None or limit <= 0:
+            return []
+        # A node's key never beats the keys of the PLZs below it (and a prefix
+        # sorts before its extensions), so PLZs pop in their final order.
+        # Labels are unique, so nodes themselves are never compared.
+        heap = [(-node.available, -node.total, prefix, node)]
+        suggestions: List[PostalCodeSuggestion] = []
+        while heap and len(suggestions) < limit:
+            _, _, label, node = heapq.heappop(heap)
+            if node.code is not None:
+                suggestions.append(PostalCodeSuggestion(node.code, node.total, node.available))
+                continue
+            for digit, child in node.children.items():
+                heapq.heappush(heap, (-child.available, -child.total, label + digit, child))
+        return suggestions
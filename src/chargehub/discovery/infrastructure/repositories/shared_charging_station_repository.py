@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterator, List, Mapping, Optional, Set, Tuple
+
+import numpy as np
+
+from chargehub.discovery.domain.aggregates.charging_station import ChargingStationAggregate
+from chargehub.discovery.domain.interfaces.charging_station_repository import (
+    VIEWPORT_STATION_LIMIT, PostalCodeSuggestion, QueryPlan, StationSetFixedError, StatusBatchResult,
+    ViewportStations,
+)
+from chargehub.discovery.domain.value_objects.postal_code import PostalCode
+from chargehub.discovery.domain.value_objects.station_filter import StationFilter
+from chargehub.discovery.domain.value_objects.station_query import StationQuery
+from chargehub.discovery.infrastructure.repositories.charging_station_repository import ChargingStationRepository
+from chargehub.discovery.infrastructure.repositories.shared_station_state import SharedStationState
+
+class SharedChargingStationRepository(ChargingStationRepository):
+    """
+    InMemory repository backed by station state shared between worker processes.
+
+    Operator statuses and malfunction overrides are written through to their
+    shared flags. Reads first compare the shared change counter with the
+    last one seen; only when another worker wrote since, both flag columns
+    are diffed against the local state in one vectorised pass each and the
+    changed stations are applied, which keeps counters, aggregates and PLZ
+    generations consistent locally.
+
+    Only the loaded columns and the two flag columns are shared: each worker
+    still builds its own aggregates and indexes from them, so the block saves
+    the repeated CSV load, not per-worker memory. The station set is fixed
+    when the block is created.
+    """
+
+    def __init__(self, state: SharedStationState) -> None:
+        self.state = state
+        self._seen_counter = state.change_counter
+        super().__init__(state.stations())
+        self._cleaning_report = state.cleaning_report()
+
+    def add(self, station: ChargingStationAggregate) -> None:
+        raise StationSetFixedError("The shared station set is fixed when the block is created")
+
+    def sync(self) -> int:
+        """Apply status changes made by other workers; returns the number applied."""
+        if self.state.change_counter == self._seen_counter:
+            return 0
+        with self._lock:
+            return self._sync()
+
+    def _sync(self) -> int:
+        counter = self.state.change_counter
+        if counter == self._seen_counter:
+            return 0
+        # Read the counter before the flags, so a concurrent write is picked up next time
+        self._seen_counter = counter
+        n = len(self._stations)
+        local = np.unpackbits(np.frombuffer(self._operator_available.to_bytes(), dtype=np.uint8),
+                              bitorder="little")[:n]
+        shared = self.state.available.copy()
+        changed = np.flatnonzero(local != shared).tolist()
+        local_held = np.zeros(n, dtype=np.uint8)
+        local_held[list(self._out_of_service)] = 1
+        shared_held = self.state.out_of_service.copy()
+        changed_held = np.flatnonzero(local_held != shared_held).tolist()
+
+        touched: Set[str] = set()
+        for pos in changed_held:
+            self._set_out_of_service(pos, bool(shared_held[pos]), touched)
+        for pos in changed:
+            self._set_operator_status(pos, bool(shared[pos]), touched)
+        for postal_code in touched:
+            self._bump_generation(postal_code)
+        return len(set(changed).union(changed_held))
+
+    def update_station_status(self, station_id: int, status: bool) -> None:
+        with self._lock:
+            self.sync()
+            pos = self._position(station_id)
+            self.state.set_available(pos, status)
+            self._set_operator_status(pos, bool(status))
+
+    def set_out_of_service(self, station_id: int, out_of_service: bool) -> bool:
+        with self._lock:
+            self.sync()
+            pos = self._position(station_id)
+            self.state.set_out_of_service(pos, out_of_service)
+            return self._set_out_of_service(pos, bool(out_of_service))
+
+    def out_of_service_ids(self) -> FrozenSet[int]:
+        self.sync()
+        return super().out_of_service_ids()
+
+    def update_station_statuses(self, statuses: Mapping[int, bool]) -> StatusBatchResult:
+        # Start from the other workers' writes, then publish the batch under one lock and counter bump
+        with self._lock:
+            self.sync()
+            changes, unchanged, unknown = self._resolve_statuses(statuses)
+            if changes:
+                positions, flags = zip(*changes)
+                self.state.set_available_many(positions, flags)
+            self._apply_statuses(changes)
+        return StatusBatchResult(changed=len(changes), unchanged=unchanged, unknown=tuple(unknown))
+
+    def restore(self, path: Path) -> int:
+        # Compare against the current shared flags, then write changes through
+        self.sync()
+        return super().restore(path)
+
+    def locate_charging_stations(self, postal_code: PostalCode,
+                                 station_filter: Optional[StationFilter] = None) -> List[ChargingStationAggregate]:
+        self.sync()
+        return super().locate_charging_stations(postal_code, station_filter)
+
+    def locate_in_bbox(self, south: float, west: float, north: float, east: float,
+                       limit: int = VIEWPORT_STATION_LIMIT) -> ViewportStations:
+        self.sync()
+        return super().locate_in_bbox(south, west, north, east, limit)
+
+    def query(self, query: StationQuery) -> List[ChargingStationAggregate]:
+        self.sync()
+        return super().query(query)
+
+    def explain(self, query: StationQuery) -> QueryPlan:
+        self.sync()
+        return super().explain(query)
+
+    def get_all(self) -> List[ChargingStationAggregate]:
+        self.sync()
+        return super().get_all()
+
+    def iter_stations(self) -> Iterator[ChargingStationAggregate]:
+        self.sync()
+        return super().iter_stations()
+
+    def get_station(self, station_id: int) -> Optional[ChargingStationAggregate]:
+        self.sync()
+        return super().get_station(station_id)
+
+    def is_available(self, station_id: int) -> bool:
+        self.sync()
+        return super().is_available(station_id)
+
+    def count_available(self, postal_code: str | None = None) -> int:
+        self.sync()
+        return super().count_available(postal_code)
+
+    def availability_summary(self) -> Dict[str, Tuple[int, int]]:
+        self.sync()
+        return super().availability_summary()
+
+    def suggest_postal_codes(self, prefix: str, limit: int = 8) -> List[PostalCodeSuggestion]:
+        self.sync()
+        return super().suggest_postal_codes(prefix, limit)
+
+    def postal_code_generation(self, postal_code: str) -> int:
+        self.sync()
+        return super().postal_code_generation(postal_code)
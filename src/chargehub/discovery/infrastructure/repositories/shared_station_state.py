@@ -0,0 +1,279 @@
+from __future__ import annotations
+
+import json
+import math
+import struct
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from multiprocessing import resource_tracker, shared_memory
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from chargehub.discovery.domain.aggregates.charging_station import ChargingStationAggregate
+from chargehub.discovery.domain.value_objects.cleaning_report import CleaningReport
+from chargehub.discovery.domain.value_objects.plug_type import PlugType
+from chargehub.shared.infrastructure.file_lock import file_lock
+
+class SharedStationState:
+    """
+    Station columns and availability flags in a named shared-memory block.
+
+    The first worker process creates the block from the loaded stations;
+    later workers attach to it by name instead of parsing the CSV again.
+    The header records the size and modification time of the source file,
+    so a block left over from an older register is replaced rather than
+    reused. Each worker still builds its own aggregates and indexes from the
+    columns: what is shared is the load and the status flags, not the memory
+    of the indexes.
+    Station columns are immutable. The operator's status and the malfunction
+    override are one byte per station each, so an update is a single-byte
+    store that never read-modify-writes a neighbour's flag, and every update
+    increments a change counter in the header that readers poll to notice
+    writes from other processes.
+
+    Layout (little endian, sections 8-byte aligned):
+        header          see _HEADER
+        station_id      int64[n]
+        latitude        float64[n]
+        longitude       float64[n]
+        postal_code     5-byte ASCII[n]
+        plug_types      uint16[n]  (PlugType bitmask)
+        max_power_kw    float64[n] (NaN = unknown)
+        available       uint8[n]   (operator status)
+        out_of_service  uint8[n]   (held offline by malfunction reports)
+        text            UTF-8 JSON list of [operator, address]
+        report          UTF-8 JSON of the register's CleaningReport (empty if none)
+    """
+
+    MAGIC = b"CHSS"
+    VERSION = 5
+    # magic, version, station count, text bytes, change counter, source file size and mtime (ns), report bytes
+    _HEADER = struct.Struct("<4sHxxqqQqqq")
+    _COUNTER = struct.Struct("<Q")
+    _COUNTER_OFFSET = 24
+
+    def __init__(self, shm: shared_memory.SharedMemory, lock_path: Optional[Path] = None) -> None:
+        self._shm = shm
+        self.name = shm.name
+        self.lock_path = Path(lock_path) if lock_path else self.default_lock_path(shm.name)
+        self._thread_lock = threading.Lock()
+
+        magic, version, n, text_len, _, source_size, source_mtime, report_len = self._HEADER.unpack_from(shm.buf, 0)
+        if magic != self.MAGIC or version != self.VERSION:
+            raise ValueError(f"Shared memory block {shm.name!r} is not station state (version {self.VERSION})")
+        self.size = n
+        self.source: Tuple[int, int] = (source_size, source_mtime)
+
+        offset = _align(self._HEADER.size)
+        self.station_ids, offset = self._view(np.int64, n, offset)
+        self.latitudes, offset = self._view(np.float64, n, offset)
+        self.longitudes, offset = self._view(np.float64, n, offset)
+        self.postal_codes, offset = self._view("S5", n, offset)
+        self.plug_types, offset = self._view(np.uint16, n, offset)
+        self.max_power_kw, offset = self._view(np.float64, n, offset)
+        self.available, offset = self._view(np.uint8, n, offset)
+        self.out_of_service, offset = self._view(np.uint8, n, offset)
+        self._text_offset, self._text_len = offset, text_len
+        self._report_offset, self._report_len = offset + text_len, report_len
+
+    def _view(self, dtype, count: int, offset: int):
+        array = np.frombuffer(self._shm.buf, dtype=dtype, count=count, offset=offset)
+        return array, _align(offset + array.nbytes)
+
+    # ------------------------------------------------------------
+    # Create / attach
+    # ------------------------------------------------------------
+    @staticmethod
+    def default_lock_path(name: str) -> Path:
+        return Path(tempfile.gettempdir()) / f"{name}.lock"
+
+    @classmethod
+    def create(cls, name: str, stations: Sequence[ChargingStationAggregate],
+               lock_path: Optional[Path] = None, source: Tuple[int, int] = (0, 0),
+               cleaning_report: Optional[CleaningReport] = None) -> "SharedStationState":
+        """Publish `stations` (loaded from a file with `source` size and mtime) under `name`.
+
+        Raises FileExistsError if a block of that name exists.
+        """
+        n = len(stations)
+        text = json.dumps([[s.operator, s.address] for s in stations], ensure_ascii=False).encode("utf-8")
+        report = json.dumps(cleaning_report.to_dict()).encode("utf-8") if cleaning_report is not None else b""
+        sizes = [8 * n, 8 * n, 8 * n, 5 * n, 2 * n, 8 * n, n, n]
+        total = _align(cls._HEADER.size) + sum(_align(size) for size in sizes) + len(text) + len(report)
+
+        shm = shared_memory.SharedMemory(name=name, create=True, size=max(total, 1))
+        # The block outlives the creating worker; `unlink()` removes it explicitly
+        resource_tracker.unregister(shm._name, "shared_memory")
+
+        offset = _align(cls._HEADER.size)
+        columns = [
+            np.array([s.station_id for s in stations], dtype=np.int64),
+            np.array([s.latitude for s in stations], dtype=np.float64),
+            np.array([s.longitude for s in stations], dtype=np.float64),
+            np.array([s.postal_code for s in stations], dtype="S5"),
+            np.array([int(s.plug_types) for s in stations], dtype=np.uint16),
+            np.array([np.nan if s.max_power_kw is None else s.max_power_kw for s in stations], dtype=np.float64),
+            np.array([bool(s.available) for s in stations], dtype=np.uint8),
+            np.array([bool(s.out_of_service) for s in stations], dtype=np.uint8),
+        ]
+        for column in columns:
+            shm.buf[offset:offset + column.nbytes] = column.tobytes()
+            offset = _align(offset + column.nbytes)
+        shm.buf[offset:offset + len(text)] = text
+        offset += len(text)
+        shm.buf[offset:offset + len(report)] = report
+        # Header last: attachers treat a block without magic as not yet published
+        cls._HEADER.pack_into(shm.buf, 0, cls.MAGIC, cls.VERSION, n, len(text), 0, *source, len(report))
+        return cls(shm, lock_path)
+
+    @classmethod
+    def attach(cls, name: str, lock_path: Optional[Path] = None) -> "SharedStationState":
+        """Map an existing block; raises FileNotFoundError if none was created yet."""
+        shm = shared_memory.SharedMemory(name=name)
+        # Attaching must not register the block for cleanup at this worker's exit
+        resource_tracker.unregister(shm._name, "shared_memory")
+        try:
+            return cls(shm, lock_path)
+        except ValueError:
+            shm.close()
+            raise
+
+    @classmethod
+    def create_or_attach(cls, name: str, load_repository, lock_path: Optional[Path] = None,
+                         source_path: Optional[Path] = None) -> "SharedStationState":
+        """Attach if a current block exists, else load the repository once and publish it.
+
+        `load_repository` returns a ChargingStationRepository; its stations
+        and cleaning report go into the block.
+
+        A block is current if it has this layout version and, with
+        `source_path`, was built from a file of the same size and mtime.
+        Anything else is unlinked and rebuilt; workers still attached to the
+        old block keep its data until they restart. Runs under the block's
+        file lock, so concurrent workers load the stations only once.
+        """
+        source = file_signature(source_path) if source_path is not None else (0, 0)
+        lock_path = Path(lock_path) if lock_path else cls.default_lock_path(name)
+        with file_lock(lock_path):
+            try:
+                state = cls.attach(name, lock_path)
+            except (FileNotFoundError, ValueError):
+                state = None
+            if state is not None:
+                if state.source == source:
+                    return state
+                state.close()
+            _unlink_block(name)
+            repository = load_repository()
+            return cls.create(name, repository.get_all(), lock_path, source, repository.cleaning_report())
+
+    def close(self) -> None:
+        # Views into the buffer must be dropped before it can be released
+        self.station_ids = self.latitudes = self.longitudes = self.postal_codes = None
+        self.plug_types = self.max_power_kw = self.available = self.out_of_service = None
+        self._shm.close()
+
+    def unlink(self) -> None:
+        self._shm.unlink()
+
+    # ------------------------------------------------------------
+    # State
+    # ------------------------------------------------------------
+    @property
+    def change_counter(self) -> int:
+        # A torn read can only make the value differ, which just causes an extra sync
+        return self._COUNTER.unpack_from(self._shm.buf, self._COUNTER_OFFSET)[0]
+
+    def set_available(self, position: int, flag: bool) -> bool:
+        """Write one station's operator status; returns False if it already had that value."""
+        return self._set_flag(self.available, position, flag)
+
+    def set_available_many(self, positions: Sequence[int], flags: Sequence[bool]) -> int:
+        """Write many operator statuses with one lock and one counter bump; returns how many changed."""
+        positions = np.asarray(positions, dtype=np.int64)
+        values = np.asarray(flags, dtype=np.uint8)
+        if positions.shape != values.shape:
+            raise ValueError("positions and flags must have the same length")
+        if positions.size and (positions.min() < 0 or positions.max() >= self.size):
+            raise IndexError("Station position out of range")
+        with self._writer_lock():
+            changed = int(np.count_nonzero(self.available[positions] != values))
+            if changed:
+                self.available[positions] = values
+                self._bump_counter()
+            return changed
+
+    def set_out_of_service(self, position: int, flag: bool) -> bool:
+        """Write one station's malfunction override; returns False if it already had that value."""
+        return self._set_flag(self.out_of_service, position, flag)
+
+    def _set_flag(self, column: np.ndarray, position: int, flag: bool) -> bool:
+        if not 0 <= position < self.size:
+            raise IndexError(f"Station position {position} out of range")
+        value = 1 if flag else 0
+        with self._writer_lock():
+            if column[position] == value:
+                return False
+            column[position] = value
+            self._bump_counter()
+            return True
+
+    def _bump_counter(self) -> None:
+        self._COUNTER.pack_into(self._shm.buf, self._COUNTER_OFFSET, self.change_counter + 1)
+
+    @contextmanager
+    def _writer_lock(self) -> Iterator[None]:
+        # Writers serialise the counter increment; readers never take the lock
+        with self._thread_lock, file_lock(self.lock_path):
+            yield
+
+    def cleaning_report(self) -> Optional[CleaningReport]:
+        """The cleaning report of the worker that loaded the register, if it had one."""
+        if not self._report_len:
+            return None
+        raw = bytes(self._shm.buf[self._report_offset:self._report_offset + self._report_len])
+        return CleaningReport.from_dict(json.loads(raw.decode("utf-8")))
+
+    def stations(self) -> List[ChargingStationAggregate]:
+        """Rebuild the aggregates from the shared columns (no CSV parsing)."""
+        texts = json.loads(bytes(self._shm.buf[self._text_offset:self._text_offset + self._text_len]).decode("utf-8"))
+        return [
+            ChargingStationAggregate(
+                station_id=station_id,
+                postal_code=plz.decode("ascii"),
+                latitude=lat,
+                longitude=lon,
+                available=bool(flag),
+                operator=operator,
+                address=address,
+                plug_types=PlugType(plugs),
+                max_power_kw=None if math.isnan(power) else power,
+                out_of_service=bool(held),
+            )
+            for station_id, plz, lat, lon, flag, held, (operator, address), plugs, power in zip(
+                self.station_ids.tolist(), self.postal_codes.tolist(), self.latitudes.tolist(),
+                self.longitudes.tolist(), self.available.tolist(), self.out_of_service.tolist(), texts,
+                self.plug_types.tolist(), self.max_power_kw.tolist(),
+            )
+        ]
+
+def file_signature(path: Path) -> Tuple[int, int]:
+    """(size, mtime in ns) of `path`, to tell whether a block was built from it."""
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+def _unlink_block(name: str) -> None:
+    """Remove a stale block, if any (attached workers keep their mapping)."""
+    try:
+        shm = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return
+    shm.close()
+    shm.unlink()
+
+def _align(offset: int, alignment: int = 8) -> int:
+    return (offset + alignment - 1) // alignment * alignment
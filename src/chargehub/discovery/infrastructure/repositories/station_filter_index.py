@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import math
+from array import array
+from bisect import bisect_right
+from typing import Dict, Iterator, List, Optional
+
+# Lower edges of the power buckets in kW (AC normal, AC fast, DC, DC high power, DC ultra)
+POWER_BUCKETS_KW = (0.0, 11.0, 22.0, 50.0, 150.0, 300.0)
+_PLUG_BITS = 16
+
+class _PlzBitmaps:
+    """Bitmaps of one PLZ; bit i stands for the i-th station added to that PLZ."""
+    __slots__ = ("positions", "available", "plugs", "power_at_least")
+
+    def __init__(self) -> None:
+        self.positions: List[int] = []
+        self.available = 0
+        self.plugs = [0] * _PLUG_BITS
+        # power_at_least[k]: stations whose power falls into bucket k or higher
+        self.power_at_least = [0] * len(POWER_BUCKETS_KW)
+
+class StationFilterIndex:
+    """
+    Plug types, bucketed power and availability as per-PLZ bitmap indexes.
+
+    Plug types (a bitmask per station), power and power bucket are kept in
+    compact typed columns indexed by station position. For every PLZ there
+    is one bitmap per plug type, per power bucket and for availability,
+    held as Python ints, so a filtered search is a handful of AND/OR
+    operations per PLZ. Only for a minimum power that is not a bucket edge
+    are the stations of that one bucket compared with their exact power.
+    """
+
+    def __init__(self) -> None:
+        self.plug_types = array("H")
+        self.power_kw = array("d")      # NaN when the register has no power
+        self.power_bucket = array("b")  # -1 when the register has no power
+        self._local = array("l")
+        self._bitmaps_of: List[_PlzBitmaps] = []
+        self._by_plz: Dict[str, _PlzBitmaps] = {}
+
+    @staticmethod
+    def bucket_of(power_kw: Optional[float]) -> int:
+        if power_kw is None or math.isnan(power_kw) or power_kw < 0:
+            return -1
+        return bisect_right(POWER_BUCKETS_KW, power_kw) - 1
+
+    def add(self, position: int, postal_code: str, plug_types: int, max_power_kw: Optional[float],
+            available: bool) -> None:
+        if position != len(self._local):
+            raise ValueError(f"Positions must be added densely (expected {len(self._local)}, got {position})")
+        bitmaps = self._by_plz.get(postal_code)
+        if bitmaps is None:
+            bitmaps = self._by_plz[postal_code] = _PlzBitmaps()
+        local = len(bitmaps.positions)
+        bit = 1 << local
+        bitmaps.positions.append(position)
+        if available:
+            bitmaps.available |= bit
+        for i in range(_PLUG_BITS):
+            if plug_types >> i & 1:
+                bitmaps.plugs[i] |= bit
+        bucket = self.bucket_of(max_power_kw)
+        for k in range(bucket + 1):
+            bitmaps.power_at_least[k] |= bit
+
+        self.plug_types.append(plug_types)
+        self.power_kw.append(math.nan if bucket < 0 else max_power_kw)
+        self.power_bucket.append(bucket)
+        self._local.append(local)
+        self._bitmaps_of.append(bitmaps)
+
+    def set_available(self, position: int, available: bool) -> None:
+        bitmaps = self._bitmaps_of[position]
+        bit = 1 << self._local[position]
+        if available:
+            bitmaps.available |= bit
+        else:
+            bitmaps.available &= ~bit
+
+    def positions(self, postal_code: str, plug_types: int = 0, min_power_kw: Optional[float] = None,
+                  only_available: bool = True) -> List[int]:
+        """Positions in `postal_code` offering any of `plug_types` with at least `min_power_kw`, in insertion order."""
+        bitmaps = self._by_plz.get(postal_code)
+        if bitmaps is None:
+            return []
+        mask = bitmaps.available if only_available else (1 << len(bitmaps.positions)) - 1
+
+        if plug_types:
+            any_plug = 0
+            for i in range(_PLUG_BITS):
+                if plug_types >> i & 1:
+                    any_plug |= bitmaps.plugs[i]
+            mask &= any_plug
+
+        edge = 0
+        if min_power_kw is not None:
+            k = max(self.bucket_of(min_power_kw), 0)
+            mask &= bitmaps.power_at_least[k]
+            if POWER_BUCKETS_KW[k] != min_power_kw:
+                # Higher buckets pass outright; only bucket k needs the exact comparison
+                above = bitmaps.power_at_least[k + 1] if k + 1 < len(POWER_BUCKETS_KW) else 0
+                edge = mask & ~above
+                mask &= above
+
+        positions = bitmaps.positions
+        if edge:
+            power = self.power_kw
+            edge_hits = (positions[i] for i in _set_bits(edge))
+            mask |= sum(1 << self._local[p] for p in edge_hits if power[p] >= min_power_kw)
+        return [positions[i] for i in _set_bits(mask)]
+
+def _set_bits(mask: int) -> Iterator[int]:
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple
+
+from chargehub.discovery.domain.interfaces.charging_station_repository import PlanStep
+
+@dataclass(frozen=True)
+class AccessPath:
+    """How one query criterion can be answered.
+
+    - `estimate`: rows it matches (exact, or an upper bound for the grid)
+    - `fetch`: its matching positions, ascending, from an index
+    - `contains`: whether a single position matches
+    - `bitmap`: `contains` is a bit test, so probing always beats fetching
+    """
+    criterion: str
+    estimate: int
+    fetch: Callable[[], Iterable[int]]
+    contains: Callable[[int], bool]
+    bitmap: bool = False
+
+def execute(paths: Sequence[AccessPath], all_positions: Callable[[], Iterable[int]],
+            limit: Optional[int] = None) -> Tuple[List[int], List[PlanStep]]:
+    """
+    Answer the conjunction of `paths`; returns matching positions (ascending) and the plan.
+
+    The most selective path drives the query from its index. Each further
+    path, in order of selectivity, is intersected with the candidates when
+    its own list is no longer than theirs (a merge of two sorted lists),
+    otherwise probed per remaining candidate.
+    """
+    ordered = sorted(paths, key=lambda p: p.estimate)
+    steps: List[PlanStep] = []
+    if not ordered:
+        candidates = list(all_positions())
+        steps.append(PlanStep("all stations", "scan", len(candidates), len(candidates)))
+    else:
+        driver, rest = ordered[0], ordered[1:]
+        candidates = sorted(driver.fetch())
+        steps.append(PlanStep(driver.criterion, "index", driver.estimate, len(candidates)))
+        for path in rest:
+            if not candidates:
+                steps.append(PlanStep(path.criterion, "skipped", path.estimate, 0))
+                continue
+            if not path.bitmap and path.estimate <= len(candidates):
+                candidates = _intersect_sorted(candidates, sorted(path.fetch()))
+                access = "intersect"
+            else:
+                contains = path.contains
+                candidates = [p for p in candidates if contains(p)]
+                access = "bitmap" if path.bitmap else "probe"
+            steps.append(PlanStep(path.criterion, access, path.estimate, len(candidates)))
+    if limit is not None:
+        candidates = candidates[:limit]
+    return candidates, steps
+
+def _intersect_sorted(a: List[int], b: List[int]) -> List[int]:
+    result: List[int] = []
+    i = j = 0
+    while i < len(a) and j < len(b):
+        x, y = a[i], b[j]
+        if x == y:
+            result.append(x)
+            i += 1
+            j += 1
+        elif x < y:
+            i += 1
+        else:
+            j += 1
+    return result
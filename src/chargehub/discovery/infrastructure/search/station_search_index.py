@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import bisect
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from chargehub.discovery.domain.aggregates.charging_station import ChargingStationAggregate
+from chargehub.discovery.domain.interfaces.station_search_index import StationSearchIndex
+
+_FOLD = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue", "ß": "ss"})
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+# Common abbreviations in the register, expanded so "Str." matches "Straße"
+_SYNONYMS = {"str": "strasse", "pl": "platz"}
+_STOPWORDS = frozenset({"on", "in", "at", "an", "am", "der", "die", "das", "und", "gmbh", "co", "kg", "ag"})
+
+def normalize(text: Optional[str]) -> List[str]:
+    """Lowercase, fold umlauts/ß, strip accents and split into tokens."""
+    if not isinstance(text, str) or not text:
+        return []
+    folded = unicodedata.normalize("NFKD", text.lower().translate(_FOLD))
+    folded = "".join(c for c in folded if not unicodedata.combining(c))
+    tokens = []
+    for token in _NON_ALNUM.split(folded):
+        token = _SYNONYMS.get(token, token)
+        if token and token not in _STOPWORDS:
+            tokens.append(token)
+    return tokens
+
+def trigrams(term: str) -> Set[str]:
+    padded = f"${term}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class InvertedStationSearchIndex(StationSearchIndex):
+    """
+    In-memory inverted index over operator and address tokens.
+
+    Each query token is matched against the vocabulary exactly, by prefix
+    (for as-you-type input and compounds like "schoenhauser" in
+    "schoenhauserallee") and by trigram similarity for typos. Scores are
+    summed per station, with operator matches weighted above address matches.
+
+    The index keeps the repository's own aggregates, which the repository
+    updates in place, so status changes and malfunction overrides are seen
+    by `only_available` without re-indexing. Operator and address are fixed
+    once loaded; `sync` is only needed for a different set of stations.
+    """
+
+    FIELD_WEIGHTS = {"operator": 2.0, "address": 1.0}
+    EXACT, PREFIX, FUZZY = 1.0, 0.8, 0.6
+    MIN_SIMILARITY = 0.45
+    MIN_PREFIX_LEN = 3
+
+    def __init__(self, stations: Iterable[ChargingStationAggregate] = ()) -> None:
+        # term -> field -> station_ids
+        self._postings: Dict[str, Dict[str, Set[int]]] = {}
+        self._vocabulary: List[str] = []  # sorted, for prefix lookups
+        self._trigram_terms: Dict[str, Set[str]] = defaultdict(set)
+        self._stations: Dict[int, ChargingStationAggregate] = {}
+        self._doc_terms: Dict[int, List[Tuple[str, str]]] = {}
+        self._fingerprints: Dict[int, Tuple[Optional[str], Optional[str]]] = {}
+        self.sync(stations)
+
+    def __len__(self) -> int:
+        return len(self._stations)
+
+    # ------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------
+    def sync(self, stations: Iterable[ChargingStationAggregate]) -> int:
+        seen: Set[int] = set()
+        changed = 0
+        for station in stations:
+            seen.add(station.station_id)
+            fingerprint = (station.operator, station.address)
+            self._stations[station.station_id] = station
+            if self._fingerprints.get(station.station_id) == fingerprint:
+                continue
+            self._remove_terms(station.station_id)
+            self._add_terms(station)
+            self._fingerprints[station.station_id] = fingerprint
+            changed += 1
+
+        for station_id in [sid for sid in self._stations if sid not in seen]:
+            self.remove(station_id)
+            changed += 1
+        return changed
+
+    def remove(self, station_id: int) -> None:
+        self._remove_terms(station_id)
+        self._stations.pop(station_id, None)
+        self._fingerprints.pop(station_id, None)
+
+    def _add_terms(self, station: ChargingStationAggregate) -> None:
+        terms = [(field, term)
+                 for field in self.FIELD_WEIGHTS
+                 for term in normalize(getattr(station, field))]
+        for field, term in terms:
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                bisect.insort(self._vocabulary, term)
+                for gram in trigrams(term):
+                    self._trigram_terms[gram].add(term)
+            postings.setdefault(field, set()).add(station.station_id)
+        self._doc_terms[station.station_id] = terms
+
+    def _remove_terms(self, station_id: int) -> None:
+        for field, term in self._doc_terms.pop(station_id, []):
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.get(field, set()).discard(station_id)
+            if not any(postings.values()):
+                del self._postings[term]
+                del self._vocabulary[bisect.bisect_left(self._vocabulary, term)]
+                for gram in trigrams(term):
+                    self._trigram_terms[gram].discard(term)
+
+    # ------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------
+    def _expand(self, token: str) -> Dict[str, float]:
+        """Vocabulary terms matching one query token, with their match quality."""
+        matches: Dict[str, float] = {}
+        if token in self._postings:
+            matches[token] = self.EXACT
+
+        if len(token) >= self.MIN_PREFIX_LEN:
+            i = bisect.bisect_left(self._vocabulary, token)
+            while i < len(self._vocabulary) and self._vocabulary[i].startswith(token):
+                matches.setdefault(self._vocabulary[i], self.PREFIX)
+                i += 1
+
+        grams = trigrams(token)
+        shared: Dict[str, int] = defaultdict(int)
+        for gram in grams:
+            for term in self._trigram_terms.get(gram, ()):
+                shared[term] += 1
+        for term, common in shared.items():
+            if term in matches:
+                continue
+            similarity = common / (len(grams) + len(trigrams(term)) - common)
+            if similarity >= self.MIN_SIMILARITY:
+                matches[term] = self.FUZZY * similarity
+        return matches
+
+    def search(self, query: str, only_available: bool = False) -> List[Tuple[ChargingStationAggregate, float]]:
+        scores: Dict[int, float] = defaultdict(float)
+        matched_tokens: Dict[int, int] = defaultdict(int)
+
+        for token in dict.fromkeys(normalize(query)):
+            best: Dict[int, float] = {}
+            for term, quality in self._expand(token).items():
+                for field, station_ids in self._postings[term].items():
+                    weight = quality * self.FIELD_WEIGHTS[field]
+                    for station_id in station_ids:
+                        if weight > best.get(station_id, 0.0):
+                            best[station_id] = weight
+            for station_id, weight in best.items():
+                scores[station_id] += weight
+                matched_tokens[station_id] += 1
+
+        ranked = sorted(scores, key=lambda sid: (-matched_tokens[sid], -scores[sid], sid))
+        results = []
+        for station_id in ranked:
+            station = self._stations[station_id]
+            if only_available and not station.available:
+                continue
+            results.append((station, round(scores[station_id], 4)))
+        return results
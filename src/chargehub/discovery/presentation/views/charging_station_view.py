@@ -1,10 +1,19 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
 import streamlit as st
-import folium
-from streamlit_folium import st_folium
 from chargehub.config import ChargeHubConfig
 from chargehub.discovery.application.charging_station_service import ChargingStationService
+from chargehub.discovery.domain.events.search_expanded import SearchExpandedEvent
+from chargehub.discovery.domain.value_objects.plug_type import PlugType
+from chargehub.discovery.domain.value_objects.station_filter import StationFilter
 from chargehub.malfunction.application.malfunction_service import MalfunctionService
-from chargehub.discovery.infrastructure.repositories.charging_station_csv_repository import ChargingStationCSVRepository
+from chargehub.shared.presentation import fragments
+
+if TYPE_CHECKING:
+    from chargehub.discovery.infrastructure.repositories.charging_station_csv_repository import ChargingStationCSVRepository
+    from chargehub.discovery.infrastructure.geo.choropleth_layer import ChoroplethLayer
 
 class ChargingStationView:
     def __init__(self, 
@@ -12,42 +21,105 @@ class ChargingStationView:
                  malfunction_service: MalfunctionService,
                  charging_repo: ChargingStationCSVRepository,
                  config: ChargeHubConfig,
-                 geojson_data: dict = None):
+                 geojson_data: dict = None,
+                 choropleth_layer: ChoroplethLayer = None):
         self.discovery_service = discovery_service
         self.malfunction_service = malfunction_service
         self.charging_repo = charging_repo
         self.config = config
         self.geojson_data = geojson_data
+        self.choropleth_layer = choropleth_layer
 
     def render(self):
         st.header("🔌 Find a Charging Station")
-        
+        timings = fragments.interaction_timings()
+        fragment = fragments.fragment(self.config.UI_FRAGMENTS)
+
+        # Each part reruns on its own: submitting a report leaves the search and map untouched
+        @fragment
+        def search_and_map():
+            with timings.measure("search + map"):
+                self._render_search_and_map()
+
+        @fragment
+        def report_form():
+            with timings.measure("report form"):
+                self._render_report_form()
+
+        search_and_map()
+        st.divider()
+        report_form()
+
+    def _render_search_and_map(self):
         # Search
-        postal_code = st.text_input("Search by Postal Code (PLZ)", placeholder="e.g. 10437")
+        col_plz, col_query = st.columns([1, 2])
+        with col_plz:
+            postal_code = st.text_input("Search by Postal Code (PLZ)", placeholder="e.g. 10437", key="plz_input").strip()
+            if 0 < len(postal_code) < 5:
+                # A partial code is completed instead of searched
+                self._render_plz_suggestions(postal_code)
+                postal_code = ""
+        with col_query:
+            query = st.text_input("…or by operator / street", placeholder="e.g. Allego Schönhauser Allee")
+        col_power, col_plugs = st.columns([1, 2])
+        with col_power:
+            min_power = st.selectbox("Minimum power", [None, *self.config.POWER_FILTER_OPTIONS_KW],
+                                     format_func=lambda kw: "Any" if kw is None else f"≥ {kw:g} kW")
+        with col_plugs:
+            plugs = st.multiselect("Plug type (any of)", [p.name for p in PlugType])
         
         # Get stations
         if postal_code:
             try:
-                stations, _ = self.discovery_service.locate_charging_stations(postal_code.strip())
+                station_filter = StationFilter(min_power_kw=min_power, plug_types=PlugType.parse(plugs))
+                stations, events = self.discovery_service.locate_charging_stations(postal_code, station_filter)
                 if not stations:
                     st.warning("No stations found.")
                 else:
                     st.success(f"Found {len(stations)} stations.")
+                    expanded = next((e for e in events if isinstance(e, SearchExpandedEvent)), None)
+                    if expanded:
+                        st.info(f"Few stations in {expanded.postal_code} – including neighbouring districts: {', '.join(expanded.postal_codes)}")
             except Exception as e:
                 st.error(f"Error: {e}")
                 stations = []
+        elif query.strip():
+            stations = self._search_by_text(query.strip())
         else:
-            stations = self.charging_repo.get_all()[:50]
-            st.info(f"Showing {len(stations)} stations. Enter a PLZ to filter.")
+            stations = []
 
         # Build and render map
-        m = self._build_map(stations, postal_code.strip() if postal_code else None)
-        st_folium(m, width="100%", height=500)
-        
-        st.divider()
-        
-        st.divider()
-        
+        # folium/streamlit_folium are only loaded once a map is actually drawn
+        from streamlit_folium import st_folium
+
+        if not postal_code and not query.strip():
+            # Browsing: only the visible viewport is queried, again on every pan or zoom
+            m, bounds = self._build_viewport_map()
+            output = st_folium(m, width="100%", height=500,
+                               center=st.session_state.get("map_center"), zoom=st.session_state.get("map_zoom"))
+            self._follow_viewport(output, bounds, m)
+        else:
+            highlight = postal_code or None
+            # The same results (DTOs are immutable) reuse the map built for them
+            m = fragments.memoised("search_map", (tuple(stations), highlight),
+                                   lambda: self._build_map(stations, highlight))
+            st_folium(m, width="100%", height=500)
+
+    def _render_plz_suggestions(self, prefix):
+        suggestions = self.discovery_service.suggest_postal_codes(prefix, self.config.PLZ_SUGGESTION_LIMIT)
+        if not suggestions:
+            st.caption(f"No Berlin postal code starts with {prefix}.")
+            return
+        st.caption(f"{prefix}… →")
+        for suggestion in suggestions:
+            if suggestion.station_count:
+                label = f"{suggestion.postal_code} ({suggestion.available_count} of {suggestion.station_count} available)"
+            else:
+                label = f"{suggestion.postal_code} (no stations)"
+            st.button(label, key=f"plz_suggestion_{suggestion.postal_code}",
+                      on_click=_choose_postal_code, args=(suggestion.postal_code,))
+
+    def _render_report_form(self):
         # Report form with modern styling
         st.subheader("🛠️ Report a Malfunction")
         st.caption("Help us keep Berlin charging! Reports require admin approval before affecting station status.")
@@ -73,7 +145,120 @@ class ChargingStationView:
                     else:
                         st.warning("Please describe the issue before submitting.")
 
-    def _build_map(self, stations, highlight_plz=None):
+    def _search_by_text(self, query):
+        page_no = st.session_state.get("text_search_page", 1)
+        try:
+            page, _ = self.discovery_service.search_stations(query, page=page_no, page_size=25)
+        except Exception as e:
+            st.error(f"Error: {e}")
+            return []
+
+        if not page.total:
+            st.warning("No stations match your search.")
+            return []
+        if page_no > page.page_count:
+            # A new query with fewer hits: restart at the first page
+            st.session_state["text_search_page"] = 1
+            page, _ = self.discovery_service.search_stations(query, page=1, page_size=25)
+        st.success(f"{page.total} matching stations – page {page.page} of {page.page_count}.")
+        st.number_input("Page", min_value=1, max_value=page.page_count, key="text_search_page")
+        return list(page.stations)
+
+    def _build_viewport_map(self):
+        """Map of the last reported viewport: markers up to the limit, otherwise clusters or densities."""
+        bounds = st.session_state.get("map_bounds", self.config.MAP_BOUNDS_DEFAULT)
+        try:
+            viewport = self.discovery_service.locate_in_viewport(*bounds, limit=self.config.VIEWPORT_STATION_LIMIT)
+        except ValueError as e:
+            st.error(f"Error: {e}")
+            return self._build_map([], fit=False), bounds
+
+        if not viewport.aggregated:
+            st.info(f"Showing {viewport.total} stations in view. Zoom out to see more, or enter a PLZ to filter.")
+        elif self.choropleth_layer:
+            st.info(f"{viewport.total} stations in view – showing station density per district. Zoom in to see individual stations.")
+        else:
+            st.info(f"{viewport.total} stations in view – showing grouped counts. Zoom in to see individual stations.")
+        # Panning back and forth or unrelated widget changes reuse the map of an unchanged viewport
+        return fragments.memoised("viewport_map", viewport, lambda: self._viewport_map(viewport)), bounds
+
+    def _viewport_map(self, viewport):
+        if not viewport.aggregated:
+            return self._build_map(viewport.stations, fit=False)
+        m = self._build_map([], fit=False)
+        if self.choropleth_layer:
+            self._add_choropleth(m)
+        else:
+            self._add_clusters(m, viewport.clusters)
+        return m
+
+    def _follow_viewport(self, output, bounds, m):
+        """Re-query once the user has panned or zoomed to different bounds."""
+        reported = (output or {}).get("bounds") or {}
+        south_west, north_east = reported.get("_southWest"), reported.get("_northEast")
+        if not south_west or not north_east or south_west.get("lat") is None:
+            return
+        new_bounds = (south_west["lat"], south_west["lng"], north_east["lat"], north_east["lng"])
+        # Until the browser reports its viewport, st_folium returns the extent of the map's own layers
+        (south, west), (north, east) = m.get_bounds()
+        if south is not None and all(abs(a - b) < 1e-6 for a, b in zip(new_bounds, (south, west, north, east))):
+            return
+        if all(abs(a - b) < 1e-6 for a, b in zip(new_bounds, bounds)):
+            return
+        st.session_state["map_bounds"] = new_bounds
+        center = output.get("center")
+        if center:
+            st.session_state["map_center"] = [center["lat"], center["lng"]]
+        if output.get("zoom") is not None:
+            st.session_state["map_zoom"] = output["zoom"]
+        fragments.rerun(fragment_only=self.config.UI_FRAGMENTS)
+
+    @staticmethod
+    def _add_clusters(m, clusters):
+        import folium
+
+        largest = max((c.station_count for c in clusters), default=1)
+        for c in clusters:
+            ratio = c.available_count / c.station_count
+            folium.CircleMarker(
+                location=[c.latitude, c.longitude],
+                radius=6 + 14 * (c.station_count / largest) ** 0.5,
+                color="#2e7d32" if ratio >= 0.5 else "#c62828",
+                fill=True,
+                fill_opacity=0.6,
+                tooltip=f"{c.station_count} stations ({c.available_count} available)",
+            ).add_to(m)
+
+    def _add_choropleth(self, m):
+        import folium
+
+        max_density = self.choropleth_layer.max_density() or 1.0
+
+        def style(feature):
+            props = feature["properties"]
+            # Fill intensity = density, hue = share of available stations (red -> green)
+            ratio = props["available_ratio"]
+            red, green = int(220 * (1 - ratio)), int(180 * ratio)
+            return {
+                "fillColor": f"#{red:02x}{green:02x}40" if props["station_count"] else "#bbbbbb",
+                "color": "#555555",
+                "weight": 1,
+                "fillOpacity": 0.15 + 0.6 * min(props["stations_per_km2"] / max_density, 1.0),
+            }
+
+        folium.GeoJson(
+            self.choropleth_layer.geojson(),
+            style_function=style,
+            tooltip=folium.GeoJsonTooltip(
+                fields=["plz_code", "station_count", "available_count", "stations_per_km2"],
+                aliases=["PLZ", "Stations", "Available", "Stations / km²"],
+            ),
+            name="Station density",
+        ).add_to(m)
+
+    def _build_map(self, stations, highlight_plz=None, fit=True):
+        import folium
+
         m = folium.Map(
             location=[self.config.MAP_CENTER_LAT, self.config.MAP_CENTER_LNG], 
             zoom_start=self.config.MAP_ZOOM_DEFAULT
@@ -95,19 +280,26 @@ class ChargingStationView:
         # Add markers
         for s in stations:
             color = "green" if s.available else "red"
-            status = "Available" if s.available else "Malfunctioning"
+            # A station can be down for the operator (e.g. occupied) without being reported broken
+            status = "Available" if s.available else "Malfunctioning" if s.out_of_service else "Not available"
+            power = f"{s.max_power_kw:g} kW" if s.max_power_kw else "unknown power"
+            plugs = ", ".join(s.plug_types) or "unknown plugs"
             
             folium.Marker(
                 location=[s.latitude, s.longitude],
-                popup=f"<b>Station {s.station_id}</b><br>{s.operator}<br>{s.address}<br>Status: {status}",
+                popup=f"<b>Station {s.station_id}</b><br>{s.operator}<br>{s.address}<br>{power} · {plugs}<br>Status: {status}",
                 tooltip=f"Station {s.station_id}",
                 icon=folium.Icon(color=color, icon="bolt", prefix="fa")
             ).add_to(m)
 
-        # Fit bounds
-        if stations:
+        # Fit bounds (not while browsing, where the user's viewport decides)
+        if fit and stations:
             lats = [s.latitude for s in stations]
             lons = [s.longitude for s in stations]
             m.fit_bounds([[min(lats), min(lons)], [max(lats), max(lons)]])
             
         return m
+
+def _choose_postal_code(postal_code):
+    # Runs before the rerun, so the input can still be set
+    st.session_state["plz_input"] = postal_code
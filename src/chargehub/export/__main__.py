@@ -0,0 +1,61 @@
+"""Export stations, reports and domain events for analytics.
+
+Reads the station register, the latest runtime snapshots and the event log,
+and streams each dataset to one file per run in bounded-memory batches.
+
+Usage:
+    python -m chargehub.export --out exports/ [--format parquet|arrow|csv]
+                               [--datasets stations reports events]
+                               [--watermark exports/watermark.json] [--batch-size N]
+
+With --watermark, only reports and events changed since the previous run are
+exported and the file is advanced afterwards.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+from chargehub.config import ChargeHubConfig
+from chargehub.discovery.infrastructure.repositories.charging_station_csv_repository import ChargingStationCSVRepository
+from chargehub.export.application.export_service import EXPORT_COLUMNS, ExportService, ExportWatermark
+from chargehub.export.infrastructure.batch_writers import FORMATS, open_batch_writer
+from chargehub.malfunction.infrastructure.repositories.report_repository import ReportRepositoryImpl
+from chargehub.shared.infrastructure.event_log import JsonlEventLog
+
+def main(argv=None) -> int:
+    config = ChargeHubConfig()
+    parser = argparse.ArgumentParser(prog="python -m chargehub.export")
+    parser.add_argument("--out", type=Path, required=True)
+    parser.add_argument("--format", choices=sorted(FORMATS), default="parquet")
+    parser.add_argument("--datasets", nargs="+", choices=list(EXPORT_COLUMNS), default=list(EXPORT_COLUMNS))
+    parser.add_argument("--watermark", type=Path)
+    parser.add_argument("--batch-size", type=int, default=config.EXPORT_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    stations = ChargingStationCSVRepository(config.DATA_PATH, config.STATION_CACHE_PATH)
+    reports = ReportRepositoryImpl()
+    if config.STATION_SNAPSHOT_PATH.exists():
+        stations.restore(config.STATION_SNAPSHOT_PATH)
+    if config.REPORT_SNAPSHOT_PATH.exists():
+        reports.restore(config.REPORT_SNAPSHOT_PATH)
+    service = ExportService(stations, reports, JsonlEventLog(config.EVENT_LOG_PATH), batch_size=args.batch_size)
+
+    since = ExportWatermark.load(args.watermark) if args.watermark else ExportWatermark()
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    args.out.mkdir(parents=True, exist_ok=True)
+
+    def open_writer(dataset, columns):
+        return open_batch_writer(args.format, args.out / f"{dataset}-{stamp}.{FORMATS[args.format]}", columns)
+
+    results, watermark = service.export_all(open_writer, since=since, datasets=args.datasets)
+    for result in results:
+        print(f"{result.dataset:<9}{result.rows:>9} rows in {result.batches} batches")
+    if args.watermark:
+        watermark.save(args.watermark)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from chargehub.discovery.domain.interfaces.charging_station_repository import ChargingStationRepository
+from chargehub.export.domain.interfaces.batch_writer import BatchWriter, ColumnSpec
+from chargehub.malfunction.domain.interfaces.report_repository import ReportRepository
+from chargehub.shared.domain.interfaces.event_log import EventLog
+
+@dataclass(frozen=True)
+class ExportWatermark:
+    """Where the previous incremental export stopped.
+
+    - `reports_updated_at`: reports filed or changed at/after this time are
+      exported again (at-least-once, so consumers dedupe on report id)
+    - `events_seq`: events with a larger sequence number are exported
+    Stations are always exported in full, as they describe current state.
+    """
+    reports_updated_at: Optional[datetime] = None
+    events_seq: int = 0
+
+    @classmethod
+    def load(cls, path: Path) -> "ExportWatermark":
+        path = Path(path)
+        if not path.exists():
+            return cls()
+        data = json.loads(path.read_text(encoding="utf-8"))
+        updated_at = data.get("reports_updated_at")
+        return cls(
+            reports_updated_at=datetime.fromisoformat(updated_at) if updated_at else None,
+            events_seq=int(data.get("events_seq", 0)),
+        )
+
+    def save(self, path: Path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({
+            "reports_updated_at": self.reports_updated_at.isoformat() if self.reports_updated_at else None,
+            "events_seq": self.events_seq,
+        }), encoding="utf-8")
+
+@dataclass(frozen=True)
+class ExportResult:
+    dataset: str
+    rows: int
+    batches: int
+
+EXPORT_COLUMNS: Dict[str, ColumnSpec] = {
+    "stations": [("station_id", "int64"), ("postal_code", "string"), ("latitude", "float64"),
+                 ("longitude", "float64"), ("operator", "string"), ("address", "string"), ("available", "bool")],
+    "reports": [("report_id", "string"), ("station_id", "int64"), ("status", "string"), ("report_text", "string"),
+                ("filed_at", "timestamp"), ("updated_at", "timestamp")],
+    "events": [("seq", "int64"), ("occurred_at", "timestamp"), ("event", "string"), ("payload", "string")],
+}
+
+@dataclass()
+class ExportService:
+    """Application Service streaming stations, reports and events in bounded batches.
+
+    Rows are produced from the repositories' iterators and written
+    `batch_size` at a time, so memory stays flat however large the export.
+    """
+
+    station_repository: ChargingStationRepository
+    report_repository: ReportRepository
+    event_log: Optional[EventLog] = None
+    batch_size: int = 5000
+
+    def export(self, dataset: str, writer: BatchWriter,
+               since: ExportWatermark = ExportWatermark()) -> Tuple[ExportResult, ExportWatermark]:
+        """Write one dataset; returns the result and the watermark to use next time."""
+        if dataset not in EXPORT_COLUMNS:
+            raise ValueError(f"Unknown dataset {dataset!r}; expected one of {sorted(EXPORT_COLUMNS)}")
+        rows = {"stations": self._station_rows, "reports": self._report_rows, "events": self._event_rows}[dataset](since)
+        reports_updated_at, events_seq = since.reports_updated_at, since.events_seq
+        count = batches = 0
+        try:
+            for batch in _batched(rows, self.batch_size):
+                writer.write_batch(batch)
+                count += len(batch)
+                batches += 1
+                if dataset == "reports":
+                    latest = max((r["updated_at"] for r in batch if r["updated_at"] is not None), default=None)
+                    if latest is not None and (reports_updated_at is None or latest > reports_updated_at):
+                        reports_updated_at = latest
+                elif dataset == "events":
+                    events_seq = max(events_seq, batch[-1]["seq"])
+        finally:
+            writer.close()
+        return ExportResult(dataset=dataset, rows=count, batches=batches), ExportWatermark(reports_updated_at, events_seq)
+
+    def export_all(self, open_writer: Callable[[str, ColumnSpec], BatchWriter],
+                   since: ExportWatermark = ExportWatermark(),
+                   datasets: Iterable[str] = tuple(EXPORT_COLUMNS)) -> Tuple[List[ExportResult], ExportWatermark]:
+        results = []
+        reports_updated_at, events_seq = since.reports_updated_at, since.events_seq
+        for dataset in datasets:
+            result, advanced = self.export(dataset, open_writer(dataset, EXPORT_COLUMNS[dataset]), since)
+            results.append(result)
+            if dataset == "reports":
+                reports_updated_at = advanced.reports_updated_at
+            elif dataset == "events":
+                events_seq = advanced.events_seq
+        return results, ExportWatermark(reports_updated_at, events_seq)
+
+    def _station_rows(self, since: ExportWatermark) -> Iterator[Dict[str, object]]:
+        for s in self.station_repository.iter_stations():
+            yield {
+                "station_id": s.station_id, "postal_code": s.postal_code,
+                "latitude": s.latitude, "longitude": s.longitude,
+                "operator": _text(s.operator), "address": _text(s.address), "available": bool(s.available),
+            }
+
+    def _report_rows(self, since: ExportWatermark) -> Iterator[Dict[str, object]]:
+        for r in self.report_repository.iter_reports(updated_since=since.reports_updated_at):
+            yield {
+                "report_id": str(r.id), "station_id": r.station_id, "status": r.status.name,
+                "report_text": r.report_text, "filed_at": r.filed_at, "updated_at": r.updated_at,
+            }
+
+    def _event_rows(self, since: ExportWatermark) -> Iterator[Dict[str, object]]:
+        if self.event_log is None:
+            return
+        for e in self.event_log.iter_events(after_seq=since.events_seq):
+            yield {
+                "seq": e.seq, "occurred_at": e.occurred_at, "event": e.name,
+                "payload": json.dumps(e.payload, ensure_ascii=False, default=str),
+            }
+
+def _batched(rows: Iterator[Dict[str, object]], size: int) -> Iterator[List[Dict[str, object]]]:
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+def _text(value: object) -> Optional[str]:
+    # The CSV register leaves some operators empty (NaN after parsing)
+    return value if isinstance(value, str) else None
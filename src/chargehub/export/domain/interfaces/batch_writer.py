@@ -0,0 +1,21 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List, Sequence, Tuple
+
+# (column name, logical type) with types "int64", "float64", "bool", "string", "timestamp"
+ColumnSpec = Sequence[Tuple[str, str]]
+
+class BatchWriter(ABC):
+    """
+    Domain Interface for writing one dataset as a sequence of row batches.
+
+    Only the current batch is held in memory; implementations append it to
+    the output and drop it before the next one arrives.
+    """
+
+    @abstractmethod
+    def write_batch(self, rows: List[Dict[str, object]]) -> None:
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        pass
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import csv
+from abc import abstractmethod
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+from chargehub.export.domain.interfaces.batch_writer import BatchWriter, ColumnSpec
+
+FORMATS = {"parquet": "parquet", "arrow": "arrow", "csv": "csv"}  # format -> file extension
+
+class CsvBatchWriter(BatchWriter):
+    def __init__(self, path: Path, columns: ColumnSpec) -> None:
+        self.path = Path(path)
+        self._names = [name for name, _ in columns]
+        self._file = open(self.path, "w", encoding="utf-8", newline="")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(self._names)
+
+    def write_batch(self, rows: List[Dict[str, object]]) -> None:
+        self._writer.writerows(
+            [_csv_value(row.get(name)) for name in self._names] for row in rows
+        )
+
+    def close(self) -> None:
+        self._file.close()
+
+def _csv_value(value: object) -> object:
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+class _ArrowBatchWriter(BatchWriter):
+    """Shared part of the pyarrow-based writers: batches become record batches of a fixed schema."""
+
+    def __init__(self, path: Path, columns: ColumnSpec) -> None:
+        try:
+            import pyarrow as pa
+        except ImportError as e:  # optional dependency, only needed for these formats
+            raise ImportError("Parquet and Arrow exports require pyarrow (pip install pyarrow)") from e
+        self._pa = pa
+        types = {"int64": pa.int64(), "float64": pa.float64(), "bool": pa.bool_(),
+                 "string": pa.string(), "timestamp": pa.timestamp("ms", tz="UTC")}
+        self.path = Path(path)
+        self.schema = pa.schema([(name, types[kind]) for name, kind in columns])
+        self._writer = self._open()
+
+    @abstractmethod
+    def _open(self):
+        """The format's writer for `self.path` and `self.schema`."""
+        pass
+
+    def write_batch(self, rows: List[Dict[str, object]]) -> None:
+        if rows:
+            self._writer.write_batch(self._pa.RecordBatch.from_pylist(rows, schema=self.schema))
+
+    def close(self) -> None:
+        self._writer.close()
+
+class ParquetBatchWriter(_ArrowBatchWriter):
+    def _open(self):
+        import pyarrow.parquet as pq
+
+        return pq.ParquetWriter(self.path, self.schema)
+
+class ArrowIpcBatchWriter(_ArrowBatchWriter):
+    def _open(self):
+        import pyarrow.ipc as ipc
+
+        self._sink = self._pa.OSFile(str(self.path), "wb")
+        return ipc.new_file(self._sink, self.schema)
+
+    def close(self) -> None:
+        super().close()
+        self._sink.close()
+
+def open_batch_writer(fmt: str, path: Path, columns: ColumnSpec) -> BatchWriter:
+    writers = {"parquet": ParquetBatchWriter, "arrow": ArrowIpcBatchWriter, "csv": CsvBatchWriter}
+    if fmt not in writers:
+        raise ValueError(f"Unknown export format {fmt!r}; expected one of {sorted(writers)}")
+    return writers[fmt](path, columns)
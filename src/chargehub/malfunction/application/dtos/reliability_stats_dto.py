@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Optional
+
+@dataclass(frozen=True)
+class ReliabilityStatsDTO:
+    """Reliability of one operator or PLZ (or the whole network)."""
+    group: str
+    stations: int
+    failures: int
+    repairs: int
+    down_now: int
+    mean_time_to_repair: Optional[timedelta]
+    failures_per_station_month: float
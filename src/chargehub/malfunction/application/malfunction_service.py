@@ -1,11 +1,14 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Sequence
+import threading
+from dataclasses import dataclass, field
+from typing import FrozenSet, List, Optional, Sequence, Set
 
 from chargehub.discovery.domain.interfaces.charging_station_repository import ChargingStationRepository
+from chargehub.discovery.domain.interfaces.postal_code_registry import PostalCodeRegistry
 from chargehub.malfunction.domain.value_objects.report_text import ReportText
-from chargehub.malfunction.domain.interfaces.report_repository import ReportRepository
+from chargehub.discovery.domain.value_objects.postal_code import PostalCode
+from chargehub.malfunction.domain.interfaces.report_repository import ReportQueuePage, ReportRepository
 from chargehub.malfunction.domain.events.malfunction_report_filed import MalfunctionReportFiledEvent
 from chargehub.malfunction.domain.events.administrator_notified import AdministratorNotifiedEvent
 from chargehub.malfunction.domain.events.report_counter_incremented import ReportCounterIncrementedEvent
@@ -13,6 +16,8 @@ from chargehub.malfunction.domain.events.malfunction_report_threshold_reached im
 from chargehub.malfunction.domain.events.station_status_changed import StationStatusChangedEvent
 from chargehub.malfunction.domain.events.repair_completed import RepairCompletedEvent
 from chargehub.malfunction.domain.events.station_restored import StationRestoredEvent
+from chargehub.malfunction.application.reliability_analytics import ReliabilityAnalytics
+from chargehub.shared.domain.interfaces.event_log import EventLog
 
 @dataclass()
 class MalfunctionService:
@@ -21,6 +26,28 @@ class MalfunctionService:
     report_repository: ReportRepository
     charging_station_repository: ChargingStationRepository
     threshold: int = 5
+    # Reports at least this similar (estimated Jaccard over character trigrams) count as duplicates
+    similarity_threshold: float = 0.85
+    # Where emitted events are recorded (e.g. for export); optional
+    event_log: Optional[EventLog] = None
+    # Running operator/PLZ reliability figures fed from published events; optional
+    reliability: Optional[ReliabilityAnalytics] = None
+    # Known PLZs for the queue filter; without one the prefix rule applies
+    plz_registry: Optional[PostalCodeRegistry] = None
+    # Serialises threshold checks with the override writes they lead to (approve, repair, sweep)
+    _lock: threading.RLock = field(default_factory=threading.RLock, init=False, repr=False)
+    # Overrides this service's reports account for; with station state shared between workers,
+    # the others may rest on another worker's reports, which this one cannot count
+    _held_here: Set[int] = field(default_factory=set, init=False, repr=False)
+
+    def _publish(self, events: list[object]) -> list[object]:
+        if not events:
+            return events
+        recorded = self.event_log.append(events) if self.event_log is not None else []
+        if self.reliability is not None:
+            # Share the log's timestamp so a replay after restart yields the same figures
+            self.reliability.observe(events, recorded[0].occurred_at if recorded else None)
+        return events
 
     def file_malfunction_report(self, station_id: int, report: str) -> Sequence[object]:
         events: list[object] = []
@@ -28,6 +55,8 @@ class MalfunctionService:
 
         if self.report_repository.has_report(station_id, rt.value):
             raise ValueError("Duplicate report content for this station.")
+        if self.report_repository.find_similar_report(station_id, rt.value, self.similarity_threshold) is not None:
+            raise ValueError("Duplicate report content for this station (near-identical to an earlier report).")
 
         # Save report with PENDING status. NO counting increment yet.
         _ = self.report_repository.save_report(station_id=station_id, report_text=rt.value)
@@ -35,7 +64,7 @@ class MalfunctionService:
         events.append(MalfunctionReportFiledEvent(station_id=station_id, report=rt.value))
         events.append(AdministratorNotifiedEvent(station_id=station_id))
 
-        return events
+        return self._publish(events)
 
     def approve_report(self, report_id: str) -> Sequence[object]:
         from chargehub.malfunction.domain.aggregates.malfunction_report import ReportStatus
@@ -49,28 +78,73 @@ class MalfunctionService:
         
         # 2. Get report details to find station_id
         # In a real event sourced system we'd get the aggregate. Here we rely on Repo.
-        all_reports = self.report_repository.all_reports()
-        report = next((r for r in all_reports if r.id == report_id), None)
+        report = self.report_repository.get_report(report_id)
         
         if not report:
             raise ValueError("Report not found")
         
         station_id = report.station_id
-        current_count = self.report_repository.count_reports(station_id)
-        
         events: list[object] = []
-        events.append(ReportCounterIncrementedEvent(station_id=station_id, current_count=current_count))
-        
-        # 3. Check Threshold
-        if current_count >= self.threshold:
-            events.append(MalfunctionReportThresholdReachedEvent(
-                station_id=station_id, threshold=self.threshold, current_count=current_count
-            ))
-            # Update station status to UNAVAILABLE
-            self.charging_station_repository.update_station_status(station_id=station_id, status=False)
-            events.append(StationStatusChangedEvent(station_id=station_id, status="UNAVAILABLE"))
-            
-        return events
+        with self._lock:
+            current_count = self.report_repository.count_reports(station_id)
+            events.append(ReportCounterIncrementedEvent(station_id=station_id, current_count=current_count))
+
+            # 3. Check Threshold
+            if current_count >= self.threshold:
+                events.append(MalfunctionReportThresholdReachedEvent(
+                    station_id=station_id, threshold=self.threshold, current_count=current_count
+                ))
+                # Hold the station UNAVAILABLE, whatever its operator reports
+                self.charging_station_repository.set_out_of_service(station_id, True)
+                self._held_here.add(station_id)
+                events.append(StationStatusChangedEvent(station_id=station_id, status="UNAVAILABLE"))
+
+
+        return self._publish(events)
+
+    def threshold_station_ids(self) -> FrozenSet[int]:
+        """Stations whose approved reports (in the counting window) reach the threshold."""
+        count = self.report_repository.count_reports
+        return frozenset(station_id for station_id in self.report_repository.approved_station_ids()
+                         if count(station_id) >= self.threshold)
+
+    def sweep_expired_windows(self, adopt_held: bool = False) -> Sequence[object]:
+        """Reconcile the out-of-service overrides with the approved reports on record.
+
+        Stations whose reports aged out of the counting window come back
+        online; stations at the threshold without an override (e.g. after a
+        restart without a station snapshot) are taken offline again.
+
+        Reports are counted per worker, so only overrides this service's
+        reports account for are released; one put in place by another
+        worker's reports is left to that worker. With `adopt_held`, every
+        current override counts as this service's own: pass it right after
+        the reports were restored from all workers' snapshots at startup.
+        A sweep costs O(stations held offline or with approved reports)
+        regardless of total report volume.
+        """
+        events: list[object] = []
+        with self._lock:
+            held = self.charging_station_repository.out_of_service_ids()
+            if adopt_held:
+                self._held_here |= held
+            for station_id in sorted(held.union(self.report_repository.approved_station_ids())):
+                reached = self.report_repository.count_reports(station_id) >= self.threshold
+                if reached:
+                    # Held or not, this service's reports now account for the override
+                    self._held_here.add(station_id)
+                if reached == (station_id in held) or station_id not in self._held_here:
+                    continue
+                try:
+                    self.charging_station_repository.set_out_of_service(station_id, reached)
+                except KeyError:
+                    # Reports of a station no longer in the register
+                    continue
+                if not reached:
+                    self._held_here.discard(station_id)
+                events.append(StationStatusChangedEvent(station_id=station_id,
+                                                        status="UNAVAILABLE" if reached else "AVAILABLE"))
+        return self._publish(events)
 
     def reject_report(self, report_id: str) -> Sequence[object]:
         from chargehub.malfunction.domain.aggregates.malfunction_report import ReportStatus
@@ -83,14 +157,46 @@ class MalfunctionService:
         return []
 
     def mark_repair_completed(self, station_id: int) -> Sequence[object]:
-        count = self.report_repository.count_reports(station_id)
-        if count < self.threshold:
-             raise ValueError(f"Cannot repair: Station has only {count} reports (Threshold: {self.threshold}).")
-
-        # Repair completed -> station restored AVAILABLE
-        self.charging_station_repository.update_station_status(station_id=station_id, status=True)
-        self.report_repository.clear_reports(station_id)
-        return [
+        with self._lock:
+            count = self.report_repository.count_reports(station_id)
+            # A station still held offline can be repaired after its reports left the window
+            if count < self.threshold and station_id not in self.charging_station_repository.out_of_service_ids():
+                raise ValueError(f"Cannot repair: Station has only {count} reports (Threshold: {self.threshold}).")
+
+            # Repair completed -> override lifted; the operator's live status applies again
+            self.charging_station_repository.set_out_of_service(station_id, False)
+            self._held_here.discard(station_id)
+            self.report_repository.clear_reports(station_id)
+        return self._publish([
             RepairCompletedEvent(station_id=station_id),
             StationRestoredEvent(station_id=station_id),
-        ]
+        ])
+
+    def get_report_history(self, station_id: int, days: int = 365) -> Sequence[object]:
+        """Resolved reports of a station over the last `days` days (from the archive)."""
+        from datetime import datetime, timedelta, timezone
+
+        since = datetime.now(timezone.utc) - timedelta(days=days)
+        return self.report_repository.report_history(station_id, since=since)
+
+    def get_pending_queue(self, page: int = 1, page_size: int = 25, sort_by: str = "age", descending: bool = False,
+                          postal_code: Optional[str] = None, station_id: Optional[int] = None) -> ReportQueuePage:
+        """One page of pending reports, optionally limited to a PLZ or a single station."""
+        return self.report_repository.pending_reports_page(
+            page=page, page_size=page_size, sort_by=sort_by, descending=descending,
+            station_ids=self._queue_filter(postal_code, station_id),
+        )
+
+    def get_pending_groups(self, page: int = 1, page_size: int = 25,
+                           postal_code: Optional[str] = None) -> ReportQueuePage:
+        """One page of stations with pending reports, most pending first."""
+        return self.report_repository.pending_station_groups(
+            page=page, page_size=page_size, station_ids=self._queue_filter(postal_code, None),
+        )
+
+    def _queue_filter(self, postal_code: Optional[str], station_id: Optional[int]) -> Optional[List[int]]:
+        if station_id is not None:
+            return [station_id]
+        if postal_code:
+            return self.charging_station_repository.station_ids(PostalCode(postal_code, self.plz_registry).value)
+        return None
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from chargehub.malfunction.application.dtos.reliability_stats_dto import ReliabilityStatsDTO
+from chargehub.malfunction.domain.events.repair_completed import RepairCompletedEvent
+from chargehub.malfunction.domain.events.station_status_changed import StationStatusChangedEvent
+from chargehub.shared.domain.interfaces.event_log import RecordedEvent
+
+UNKNOWN_GROUP = "Unknown"
+_SECONDS_PER_MONTH = 30.44 * 24 * 3600
+
+class _Counters:
+    """Running sums of one group; each event adds to them, nothing is recomputed."""
+    __slots__ = ("stations", "failures", "repairs", "repair_seconds", "down_now")
+
+    def __init__(self) -> None:
+        self.stations = 0
+        self.failures = 0
+        self.repairs = 0
+        self.repair_seconds = 0.0
+        self.down_now = 0
+
+class ReliabilityAnalytics:
+    """
+    Streaming reliability read model per operator and per PLZ.
+
+    A station going UNAVAILABLE counts as a failure, a `RepairCompletedEvent`
+    while it is down closes the failure and adds its duration to the
+    group's repair time, and a station coming back on its own (the report
+    window expired) only ends the outage. Every event updates the running
+    sums of the station's operator, its PLZ and the network total, so the
+    cost per event is O(1) and reading the figures is O(groups), however
+    much history has been applied.
+    """
+
+    def __init__(self, stations: Iterable[object] = (),
+                 clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc)) -> None:
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._total = _Counters()
+        self._by_operator: Dict[str, _Counters] = {}
+        self._by_plz: Dict[str, _Counters] = {}
+        self._groups_of: Dict[int, Tuple[_Counters, _Counters]] = {}
+        self._down_since: Dict[int, datetime] = {}
+        self._observed_since: Optional[datetime] = None
+        for station in stations:
+            self._register(station.station_id, _operator_name(station.operator), str(station.postal_code))
+
+    def _register(self, station_id: int, operator: str, postal_code: str) -> Tuple[_Counters, _Counters]:
+        groups = (self._by_operator.setdefault(operator, _Counters()), self._by_plz.setdefault(postal_code, _Counters()))
+        for counters in (*groups, self._total):
+            counters.stations += 1
+        self._groups_of[station_id] = groups
+        return groups
+
+    # ------------------------------------------------------------
+    # Applying events
+    # ------------------------------------------------------------
+    def observe(self, events: Iterable[object], occurred_at: Optional[datetime] = None) -> None:
+        """Apply freshly published domain events (timestamped now unless given)."""
+        at = occurred_at or self._clock()
+        with self._lock:
+            for event in events:
+                if isinstance(event, StationStatusChangedEvent):
+                    self._status_changed(event.station_id, event.status, at)
+                elif isinstance(event, RepairCompletedEvent):
+                    self._repaired(event.station_id, at)
+
+    def apply(self, recorded: Iterable[RecordedEvent]) -> None:
+        """Apply events read back from an event log, e.g. to warm up after a restart."""
+        with self._lock:
+            for event in recorded:
+                station_id = event.payload.get("station_id")
+                if station_id is None:
+                    continue
+                if event.name == StationStatusChangedEvent.__name__:
+                    self._status_changed(int(station_id), str(event.payload.get("status")), event.occurred_at)
+                elif event.name == RepairCompletedEvent.__name__:
+                    self._repaired(int(station_id), event.occurred_at)
+
+    def _groups(self, station_id: int) -> Tuple[_Counters, _Counters, _Counters]:
+        groups = self._groups_of.get(station_id)
+        if groups is None:
+            # A station unknown to the register still counts, under its own heading
+            groups = self._register(station_id, UNKNOWN_GROUP, UNKNOWN_GROUP)
+        return (*groups, self._total)
+
+    def _status_changed(self, station_id: int, status: str, at: datetime) -> None:
+        if self._observed_since is None or at < self._observed_since:
+            self._observed_since = at
+        if status == "UNAVAILABLE":
+            # Further approvals past the threshold re-announce an outage that is already counted
+            if station_id in self._down_since:
+                return
+            self._down_since[station_id] = at
+            for counters in self._groups(station_id):
+                counters.failures += 1
+                counters.down_now += 1
+        elif status == "AVAILABLE" and self._down_since.pop(station_id, None) is not None:
+            for counters in self._groups(station_id):
+                counters.down_now -= 1
+
+    def _repaired(self, station_id: int, at: datetime) -> None:
+        since = self._down_since.pop(station_id, None)
+        if since is None:
+            return
+        seconds = max((at - since).total_seconds(), 0.0)
+        for counters in self._groups(station_id):
+            counters.repairs += 1
+            counters.repair_seconds += seconds
+            counters.down_now -= 1
+
+    # ------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------
+    def totals(self) -> ReliabilityStatsDTO:
+        with self._lock:
+            return self._stats("All stations", self._total, self._months_observed())
+
+    def by_operator(self, limit: Optional[int] = None) -> List[ReliabilityStatsDTO]:
+        return self._ranked(self._by_operator, limit)
+
+    def by_postal_code(self, limit: Optional[int] = None) -> List[ReliabilityStatsDTO]:
+        return self._ranked(self._by_plz, limit)
+
+    def _ranked(self, groups: Dict[str, _Counters], limit: Optional[int]) -> List[ReliabilityStatsDTO]:
+        """Groups that had failures, least reliable first."""
+        with self._lock:
+            months = self._months_observed()
+            stats = [self._stats(name, c, months) for name, c in groups.items() if c.failures]
+        stats.sort(key=lambda s: (-s.failures_per_station_month, -s.down_now, s.group))
+        return stats if limit is None else stats[:limit]
+
+    def _months_observed(self) -> float:
+        if self._observed_since is None:
+            return 0.0
+        # At least a day, so the first outage does not read as an extreme monthly rate
+        return max((self._clock() - self._observed_since).total_seconds(), 24 * 3600) / _SECONDS_PER_MONTH
+
+    @staticmethod
+    def _stats(group: str, c: _Counters, months: float) -> ReliabilityStatsDTO:
+        station_months = c.stations * months
+        return ReliabilityStatsDTO(
+            group=group,
+            stations=c.stations,
+            failures=c.failures,
+            repairs=c.repairs,
+            down_now=c.down_now,
+            mean_time_to_repair=timedelta(seconds=c.repair_seconds / c.repairs) if c.repairs else None,
+            failures_per_station_month=c.failures / station_months if station_months else 0.0,
+        )
+
+def _operator_name(operator: object) -> str:
+    # The CSV register leaves some operators empty (NaN after parsing)
+    return operator.strip() if isinstance(operator, str) and operator.strip() else UNKNOWN_GROUP
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Sequence, Tuple
+
+@dataclass(frozen=True)
+class AdministratorDigest:
+    """All reports filed for one station since the previous notification."""
+    station_id: int
+    report_count: int
+    reports: Tuple[str, ...]
+    first_filed_at: datetime
+    last_filed_at: datetime
+
+    def to_dict(self) -> dict:
+        return {
+            "station_id": self.station_id,
+            "report_count": self.report_count,
+            "reports": list(self.reports),
+            "first_filed_at": self.first_filed_at.isoformat(),
+            "last_filed_at": self.last_filed_at.isoformat(),
+        }
+
+class NotificationSink(ABC):
+    """
+    Domain Interface for delivering administrator notifications (mail, webhook, ...).
+    """
+
+    @abstractmethod
+    def send(self, digests: Sequence[AdministratorDigest]) -> None:
+        """Deliver one batch; raises if it was not delivered, so it is retried as a whole."""
+        pass
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable, List, Optional
+from uuid import UUID
+
+from chargehub.malfunction.domain.aggregates.malfunction_report import ReportStatus
+
+@dataclass(frozen=True)
+class ArchivedReport:
+    id: UUID
+    station_id: int
+    report_text: str
+    status: ReportStatus
+    resolved_at: datetime
+    filed_at: Optional[datetime] = None
+
+class ReportArchive(ABC):
+    """
+    Domain Interface for the append-only history of resolved reports.
+    """
+
+    @abstractmethod
+    def append(self, reports: Iterable[ArchivedReport]) -> None:
+        pass
+
+    @abstractmethod
+    def reports_for_station(self, station_id: int, since: Optional[datetime] = None,
+                            until: Optional[datetime] = None) -> List[ArchivedReport]:
+        pass
@@ -1,7 +1,29 @@
 from abc import ABC, abstractmethod
-from typing import List
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Collection, Iterator, List, Optional, Sequence
 from uuid import UUID
 from chargehub.malfunction.domain.aggregates.malfunction_report import ReportStatus
+from chargehub.malfunction.domain.interfaces.report_archive import ArchivedReport
+
+@dataclass(frozen=True)
+class PendingStationGroup:
+    """Pending reports of one station, as shown in the grouped review queue."""
+    station_id: int
+    pending_count: int
+    oldest_filed_at: Optional[datetime]
+
+@dataclass(frozen=True)
+class ReportQueuePage:
+    """One page of the pending-report queue (reports or station groups)."""
+    items: Sequence[object]
+    total: int
+    page: int
+    page_size: int
+
+    @property
+    def page_count(self) -> int:
+        return max(1, -(-self.total // self.page_size))
 
 class ReportRepository(ABC):
     """
@@ -12,18 +34,56 @@ class ReportRepository(ABC):
     def save_report(self, station_id: int, report_text: str) -> UUID:
         pass
 
+    @abstractmethod
+    def get_report(self, report_id: UUID) -> Optional[object]:
+        pass
+
     @abstractmethod
     def update_status(self, report_id: UUID, status: ReportStatus) -> None:
         pass
 
     @abstractmethod
     def count_reports(self, station_id: int) -> int:
+        """Approved reports of the station (within the counting window, if the repository has one)."""
+        pass
+
+    @abstractmethod
+    def approved_station_ids(self) -> List[int]:
+        """Stations with approved reports on record, also those whose reports left the counting window."""
+        pass
+
+    @abstractmethod
+    def iter_reports(self, updated_since: Optional[datetime] = None) -> Iterator[object]:
+        """Stream live reports, optionally only those filed or changed at/after `updated_since`."""
         pass
 
     @abstractmethod
     def has_report(self, station_id: int, report_text: str) -> bool:
         pass
 
+    @abstractmethod
+    def find_similar_report(self, station_id: int, report_text: str, threshold: float) -> Optional[float]:
+        """Similarity of the closest earlier report for the station if it reaches `threshold`."""
+        pass
+
     @abstractmethod
     def clear_reports(self, station_id: int) -> None:
+        """Remove a station's reports from the live set (archiving them where supported)."""
+        pass
+
+    @abstractmethod
+    def report_history(self, station_id: int, since: Optional[datetime] = None) -> List[ArchivedReport]:
+        pass
+
+    @abstractmethod
+    def pending_reports_page(self, page: int = 1, page_size: int = 25, sort_by: str = "age",
+                             descending: bool = False,
+                             station_ids: Optional[Collection[int]] = None) -> ReportQueuePage:
+        """Pending reports sorted by "age" (filing time) or "station", optionally limited to `station_ids`."""
+        pass
+
+    @abstractmethod
+    def pending_station_groups(self, page: int = 1, page_size: int = 25,
+                               station_ids: Optional[Collection[int]] = None) -> ReportQueuePage:
+        """Stations with pending reports, most pending first."""
         pass
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import hashlib
+import re
+import unicodedata
+import zlib
+from dataclasses import dataclass
+from typing import FrozenSet, Tuple
+
+_FOLD = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue", "ß": "ss"})
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+# MinHash parameters: NUM_PERMUTATIONS hash functions h(x) = (a*x + b) mod P
+_PRIME = (1 << 61) - 1
+_NUM_PERMUTATIONS = 32
+_SHINGLE_SIZE = 3
+
+def _coefficients() -> Tuple[Tuple[int, int], ...]:
+    # Deterministic across processes (unlike hash()), so signatures can be persisted
+    coeffs = []
+    for i in range(_NUM_PERMUTATIONS):
+        digest = hashlib.blake2b(f"minhash-{i}".encode(), digest_size=16).digest()
+        a = int.from_bytes(digest[:8], "little") % (_PRIME - 1) + 1
+        b = int.from_bytes(digest[8:], "little") % _PRIME
+        coeffs.append((a, b))
+    return tuple(coeffs)
+
+_COEFFICIENTS = _coefficients()
+
+def normalize_report_text(text: str) -> str:
+    """Lowercase, fold umlauts/accents, drop punctuation and collapse whitespace."""
+    folded = unicodedata.normalize("NFKD", text.lower().translate(_FOLD))
+    folded = "".join(c for c in folded if not unicodedata.combining(c))
+    return " ".join(_NON_ALNUM.sub(" ", folded).split())
+
+def _shingles(normalized: str) -> FrozenSet[int]:
+    padded = f" {normalized} "
+    if len(padded) < _SHINGLE_SIZE:
+        padded = padded.ljust(_SHINGLE_SIZE)
+    return frozenset(
+        zlib.crc32(padded[i:i + _SHINGLE_SIZE].encode())
+        for i in range(len(padded) - _SHINGLE_SIZE + 1)
+    )
+
+@dataclass(frozen=True)
+class ReportFingerprint:
+    """Value Object identifying a report's content up to trivial variations.
+
+    - `normalized`: canonical text ("Screen broken!!" == "screen  broken")
+    - `signature`: MinHash over character trigrams; the share of equal slots
+      estimates the Jaccard similarity of two reports
+    """
+    normalized: str
+    signature: Tuple[int, ...]
+
+    @classmethod
+    def of(cls, text: str) -> "ReportFingerprint":
+        normalized = normalize_report_text(text)
+        shingles = _shingles(normalized)
+        signature = tuple(min((a * x + b) % _PRIME for x in shingles) for a, b in _COEFFICIENTS)
+        return cls(normalized=normalized, signature=signature)
+
+    def similarity(self, other: "ReportFingerprint") -> float:
+        if self.normalized == other.normalized:
+            return 1.0
+        equal = sum(1 for x, y in zip(self.signature, other.signature) if x == y)
+        return equal / len(self.signature)
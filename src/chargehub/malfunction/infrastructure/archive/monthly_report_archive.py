@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import os
+import struct
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from uuid import UUID
+
+from chargehub.malfunction.domain.aggregates.malfunction_report import ReportStatus
+from chargehub.malfunction.domain.interfaces.report_archive import ArchivedReport, ReportArchive
+from chargehub.shared.infrastructure.file_lock import file_lock
+
+class MonthlyReportArchive(ReportArchive):
+    """
+    Append-only report archive partitioned by month of resolution.
+
+    Each partition `YYYY-MM` consists of two files:
+        YYYY-MM.log   file header, then records: _RECORDS[version] header + UTF-8 text
+        YYYY-MM.idx   fixed-size (station_id, offset into .log) pairs
+
+    A station query only opens partitions inside the requested time range,
+    scans their small index and reads the matching records by offset.
+
+    Both files are fsynced on every append, the log first. An index that
+    does not end at the log's last record (a crash between the two writes,
+    a torn or lost index) is rebuilt from the log before it is read or
+    appended to. Writers and repairs hold a lock file in the archive
+    directory, so worker processes sharing the archive do not interleave.
+    """
+
+    MAGIC = b"CHRA"
+    VERSION = 2
+    _FILE_HEADER = struct.Struct("<4sH")
+    # Record headers per file version:
+    #   v1: report id, station id, resolved_at (epoch ms), status value, text length
+    #   v2: as v1 plus filed_at (epoch ms, -1 if unknown) after resolved_at
+    _RECORDS = {1: struct.Struct("<16sqqBH"), 2: struct.Struct("<16sqqqBH")}
+    _INDEX = struct.Struct("<qq")
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._lock_path = self.root / "archive.lock"
+
+    # ------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------
+    def append(self, reports: Iterable[ArchivedReport]) -> None:
+        by_partition: Dict[str, List[ArchivedReport]] = {}
+        for report in reports:
+            by_partition.setdefault(self.partition_of(report.resolved_at), []).append(report)
+
+        with self._writer_lock():
+            for partition, batch in sorted(by_partition.items()):
+                log_path, idx_path = self._paths(partition)
+                new_file = not log_path.exists()
+                if new_file:
+                    version = self.VERSION
+                else:
+                    # Existing partitions keep the format they were created with
+                    with open(log_path, "rb") as log:
+                        version = self._check_header(log, log_path)
+                    if self._load_index(partition) is None:
+                        # Appending would otherwise extend an index that misses records
+                        self._rebuild_index(partition)
+                with open(log_path, "ab") as log, open(idx_path, "ab") as idx:
+                    if new_file:
+                        log.write(self._FILE_HEADER.pack(self.MAGIC, version))
+                    offset = log.tell()
+                    records, entries = [], []
+                    for report in batch:
+                        record = self._encode(report, version)
+                        records.append(record)
+                        entries.append(self._INDEX.pack(report.station_id, offset))
+                        offset += len(record)
+                    log.write(b"".join(records))
+                    log.flush()
+                    os.fsync(log.fileno())
+                    # The index is written after the data, so it never points past the log
+                    idx.write(b"".join(entries))
+                    idx.flush()
+                    os.fsync(idx.fileno())
+                if new_file:
+                    _fsync_directory(self.root)
+
+    @contextmanager
+    def _writer_lock(self) -> Iterator[None]:
+        with self._lock, file_lock(self._lock_path):
+            yield
+
+    def _encode(self, report: ArchivedReport, version: int) -> bytes:
+        text = report.report_text.encode("utf-8")
+        fields = [report.id.bytes, report.station_id, _to_ms(report.resolved_at)]
+        if version >= 2:
+            fields.append(_to_ms(report.filed_at) if report.filed_at else -1)
+        return self._RECORDS[version].pack(*fields, report.status.value, len(text)) + text
+
+    # ------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------
+    def partitions(self) -> List[str]:
+        return sorted(p.stem for p in self.root.glob("*.log"))
+
+    def reports_for_station(self, station_id: int, since: Optional[datetime] = None,
+                            until: Optional[datetime] = None) -> List[ArchivedReport]:
+        first = self.partition_of(since) if since else None
+        last = self.partition_of(until) if until else None
+        results: List[ArchivedReport] = []
+        for partition in self.partitions():
+            if (first and partition < first) or (last and partition > last):
+                continue
+            offsets = [offset for sid, offset in self._read_index(partition) if sid == station_id]
+            if not offsets:
+                continue
+            for report in self._read_records(partition, offsets):
+                if (since and report.resolved_at < since) or (until and report.resolved_at > until):
+                    continue
+                results.append(report)
+        return results
+
+    def _read_index(self, partition: str) -> List[Tuple[int, int]]:
+        entries = self._load_index(partition)
+        if entries is None:
+            with self._writer_lock():
+                # A concurrent append may have been midway, or another reader repaired it meanwhile
+                entries = self._load_index(partition)
+                if entries is None:
+                    entries = self._rebuild_index(partition)
+        return entries
+
+    def _load_index(self, partition: str) -> Optional[List[Tuple[int, int]]]:
+        """The partition's index entries, or None if the index is missing or does not match the log.
+
+        The index matches if it holds whole entries and its last entry is
+        the log's last record; an index missing records or pointing into a
+        torn tail fails that check.
+        """
+        log_path, idx_path = self._paths(partition)
+        with open(log_path, "rb") as log:
+            version = self._check_header(log, log_path)
+            try:
+                data = idx_path.read_bytes()
+            except OSError:
+                return None
+            if len(data) % self._INDEX.size:
+                return None
+            entries = list(self._INDEX.iter_unpack(data))
+            log_size = os.fstat(log.fileno()).st_size
+            end = log.tell()
+            if entries:
+                station_id, offset = entries[-1]
+                if not end <= offset < log_size:
+                    return None
+                log.seek(offset)
+                header = self._read_record_header(log, version)
+                if header is None or header[1] != station_id:
+                    return None
+                end = offset + self._RECORDS[version].size + header[-1]
+        return entries if end == log_size else None
+
+    @classmethod
+    def _read_record_header(cls, log, version: int) -> Optional[tuple]:
+        record = cls._RECORDS[version]
+        raw = log.read(record.size)
+        return record.unpack(raw) if len(raw) == record.size else None
+
+    def _read_records(self, partition: str, offsets: List[int]) -> List[ArchivedReport]:
+        log_path, _ = self._paths(partition)
+        reports = []
+        with open(log_path, "rb") as log:
+            version = self._check_header(log, log_path)
+            for offset in offsets:
+                log.seek(offset)
+                reports.append(self._decode(log, version))
+        return reports
+
+    def _decode(self, log, version: int) -> ArchivedReport:
+        record = self._RECORDS[version]
+        fields = record.unpack(log.read(record.size))
+        raw_id, station_id, resolved_ms = fields[:3]
+        filed_ms = fields[3] if version >= 2 else -1
+        status, length = fields[-2:]
+        return ArchivedReport(
+            id=UUID(bytes=raw_id),
+            station_id=station_id,
+            report_text=log.read(length).decode("utf-8"),
+            status=ReportStatus(status),
+            resolved_at=_from_ms(resolved_ms),
+            filed_at=_from_ms(filed_ms) if filed_ms >= 0 else None,
+        )
+
+    def _rebuild_index(self, partition: str) -> List[Tuple[int, int]]:
+        """Recreate the index by scanning the partition log once; call with the writer lock held.
+
+        A record cut short by a crash during its append is truncated away,
+        so later appends start on a record boundary.
+        """
+        log_path, idx_path = self._paths(partition)
+        entries = []
+        with open(log_path, "r+b") as log:
+            version = self._check_header(log, log_path)
+            record_size = self._RECORDS[version].size
+            size = os.fstat(log.fileno()).st_size
+            end = log.tell()
+            while True:
+                header = self._read_record_header(log, version)
+                if header is None or end + record_size + header[-1] > size:
+                    break
+                entries.append((header[1], end))
+                end += record_size + header[-1]
+                log.seek(end)
+            if end < size:
+                log.truncate(end)
+                log.flush()
+                os.fsync(log.fileno())
+
+        tmp_path = idx_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as idx:
+            idx.write(b"".join(self._INDEX.pack(*entry) for entry in entries))
+            idx.flush()
+            os.fsync(idx.fileno())
+        os.replace(tmp_path, idx_path)
+        _fsync_directory(self.root)
+        return entries
+
+    def _check_header(self, log, log_path: Path) -> int:
+        magic, version = self._FILE_HEADER.unpack(log.read(self._FILE_HEADER.size))
+        if magic != self.MAGIC or version not in self._RECORDS:
+            raise ValueError(f"{log_path} is not a report archive partition (versions {sorted(self._RECORDS)})")
+        return version
+
+    def _paths(self, partition: str) -> Tuple[Path, Path]:
+        return self.root / f"{partition}.log", self.root / f"{partition}.idx"
+
+    @staticmethod
+    def partition_of(moment: datetime) -> str:
+        return moment.astimezone(timezone.utc).strftime("%Y-%m")
+
+def _fsync_directory(path: Path) -> None:
+    """Persist file creations and renames in `path` (a no-op where directories cannot be opened)."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+def _to_ms(moment: datetime) -> int:
+    return int(moment.timestamp() * 1000)
+
+def _from_ms(ms: int) -> datetime:
+    return datetime.fromtimestamp(ms / 1000, tz=timezone.utc)
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+from chargehub.malfunction.domain.events.administrator_notified import AdministratorNotifiedEvent
+from chargehub.malfunction.domain.events.malfunction_report_filed import MalfunctionReportFiledEvent
+from chargehub.malfunction.domain.interfaces.notification_sink import AdministratorDigest, NotificationSink
+from chargehub.shared.domain.interfaces.event_log import EventLog, RecordedEvent
+from chargehub.shared.infrastructure.file_lock import FileLease
+
+logger = logging.getLogger(__name__)
+
+class NotificationDispatcher:
+    """
+    Outbox relay delivering administrator notifications from the event log.
+
+    Filing a report only records `AdministratorNotifiedEvent` in the event
+    log, together with the report's other events; nothing is sent on the
+    request path. Each `dispatch_once` (run by a `PeriodicTask`) reads the
+    events after its cursor, coalesces them into one digest per station and
+    hands the batch to the sink. The cursor only advances once the sink
+    accepted the batch, so delivery is at-least-once; after a failure the
+    next attempt waits `base_delay_seconds`, doubling per consecutive
+    failure up to `max_delay_seconds`.
+
+    With a `cursor_path`, every worker process may run a dispatcher, but
+    only the one holding the lease on `<cursor>.lock` delivers; the others
+    take over (re-reading the saved cursor) once its process is gone.
+
+    The outbox is not written in one transaction with the report store:
+    a report is saved before its events are appended, so a crash between
+    the two keeps the report without ever notifying about it, and a crash
+    after a delivery but before the cursor is saved repeats that digest.
+    """
+
+    MAX_REPORTS_PER_DIGEST = 10
+
+    def __init__(self, event_log: EventLog, sink: NotificationSink, cursor_path: Optional[Path] = None,
+                 batch_events: int = 5000, base_delay_seconds: float = 5.0, max_delay_seconds: float = 900.0,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        if batch_events < 1:
+            raise ValueError("batch_events must be at least 1")
+        if base_delay_seconds <= 0 or max_delay_seconds < base_delay_seconds:
+            raise ValueError("Retry delays must be positive, with max_delay_seconds >= base_delay_seconds")
+        self.event_log = event_log
+        self.sink = sink
+        self.cursor_path = Path(cursor_path) if cursor_path is not None else None
+        self.batch_events = batch_events
+        self.base_delay_seconds = base_delay_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.delivered = 0
+        self.consecutive_failures = 0
+        self.last_error: Optional[str] = None
+        self._retry_at = 0.0
+        self._lease = FileLease(self.cursor_path.with_name(self.cursor_path.name + ".lock")) \
+            if self.cursor_path is not None else None
+        self.cursor = self._load_cursor()
+
+    # ------------------------------------------------------------
+    # Cursor
+    # ------------------------------------------------------------
+    def _load_cursor(self) -> int:
+        if self.cursor_path is not None and self.cursor_path.exists():
+            try:
+                return int(json.loads(self.cursor_path.read_text(encoding="utf-8"))["seq"])
+            except (ValueError, KeyError, TypeError):
+                logger.warning("Ignoring unreadable notification cursor %s", self.cursor_path)
+        # First start: notify about reports from now on, not about the whole history
+        seq = self.event_log.last_seq()
+        self._save_cursor(seq)
+        return seq
+
+    def _save_cursor(self, seq: int) -> None:
+        if self.cursor_path is None:
+            return
+        self.cursor_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.cursor_path.with_suffix(self.cursor_path.suffix + ".tmp")
+        tmp.write_text(json.dumps({"seq": seq}), encoding="utf-8")
+        tmp.replace(self.cursor_path)
+
+    def close(self) -> None:
+        """Hand delivery over to another process's dispatcher."""
+        if self._lease is not None:
+            self._lease.release()
+
+    @property
+    def events_behind(self) -> int:
+        return max(self.event_log.last_seq() - self.cursor, 0)
+
+    # ------------------------------------------------------------
+    # Dispatch
+    # ------------------------------------------------------------
+    def dispatch_once(self) -> int:
+        """Deliver pending notifications; returns the number of digests sent."""
+        with self._lock:
+            if self._lease is not None and not self._lease.held:
+                if not self._lease.acquire():
+                    # Another process dispatches
+                    return 0
+                # It may have advanced the cursor since this one was created
+                self.cursor = self._load_cursor()
+            now = self._clock()
+            if now < self._retry_at:
+                return 0
+            events = list(islice(self.event_log.iter_events(after_seq=self.cursor), self.batch_events))
+            if not events:
+                return 0
+            digests = self.coalesce(events)
+            if digests:
+                try:
+                    self.sink.send(digests)
+                except Exception as exc:
+                    self.consecutive_failures += 1
+                    delay = min(self.base_delay_seconds * 2 ** (self.consecutive_failures - 1), self.max_delay_seconds)
+                    self._retry_at = now + delay
+                    self.last_error = f"{type(exc).__name__}: {exc}"
+                    logger.warning("Notification delivery failed (%d in a row), retrying in %.0fs: %s",
+                                   self.consecutive_failures, delay, self.last_error)
+                    return 0
+                self.delivered += len(digests)
+            self.consecutive_failures = 0
+            self._retry_at = 0.0
+            self.cursor = events[-1].seq
+            self._save_cursor(self.cursor)
+            return len(digests)
+
+    @classmethod
+    def coalesce(cls, events: Iterable[RecordedEvent]) -> List[AdministratorDigest]:
+        """One digest per notified station, in order of its first report."""
+        notified: Dict[int, List] = {}  # station -> [count, first, last]
+        texts: Dict[int, List[str]] = {}
+        for event in events:
+            station_id = event.payload.get("station_id")
+            if station_id is None:
+                continue
+            if event.name == MalfunctionReportFiledEvent.__name__:
+                texts.setdefault(int(station_id), []).append(str(event.payload.get("report", "")))
+            elif event.name == AdministratorNotifiedEvent.__name__:
+                entry = notified.get(int(station_id))
+                if entry is None:
+                    notified[int(station_id)] = [1, event.occurred_at, event.occurred_at]
+                else:
+                    entry[0] += 1
+                    entry[2] = event.occurred_at
+        return [
+            AdministratorDigest(station_id=station_id, report_count=count,
+                                reports=tuple(texts.get(station_id, [])[:cls.MAX_REPORTS_PER_DIGEST]),
+                                first_filed_at=first, last_filed_at=last)
+            for station_id, (count, first, last) in notified.items()
+        ]
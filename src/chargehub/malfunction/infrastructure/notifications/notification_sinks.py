@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import json
+import logging
+import smtplib
+import urllib.request
+from email.message import EmailMessage
+from typing import List, Sequence
+
+from chargehub.malfunction.domain.interfaces.notification_sink import AdministratorDigest, NotificationSink
+
+logger = logging.getLogger(__name__)
+
+class InMemoryNotificationSink(NotificationSink):
+    """Collects delivered batches; `fail_next` makes the next sends raise (for tests and local runs)."""
+
+    def __init__(self, fail_next: int = 0) -> None:
+        self.batches: List[List[AdministratorDigest]] = []
+        self.attempts = 0
+        self.fail_next = fail_next
+
+    def send(self, digests: Sequence[AdministratorDigest]) -> None:
+        self.attempts += 1
+        if self.fail_next > 0:
+            self.fail_next -= 1
+            raise ConnectionError("Notification sink unavailable")
+        self.batches.append(list(digests))
+
+class LoggingNotificationSink(NotificationSink):
+    """Writes digests to the application log; the default when no mail or webhook is configured."""
+
+    def send(self, digests: Sequence[AdministratorDigest]) -> None:
+        for d in digests:
+            logger.info("Station %s: %d new malfunction report(s)", d.station_id, d.report_count)
+
+class WebhookNotificationSink(NotificationSink):
+    """POSTs each batch as one JSON document; any non-2xx answer counts as a failed delivery."""
+
+    def __init__(self, url: str, timeout_seconds: float = 10.0) -> None:
+        self.url = url
+        self.timeout_seconds = timeout_seconds
+
+    def send(self, digests: Sequence[AdministratorDigest]) -> None:
+        body = json.dumps({"digests": [d.to_dict() for d in digests]}, ensure_ascii=False).encode("utf-8")
+        request = urllib.request.Request(self.url, data=body, method="POST",
+                                         headers={"Content-Type": "application/json"})
+        # urlopen raises HTTPError for 4xx/5xx answers
+        with urllib.request.urlopen(request, timeout=self.timeout_seconds) as response:
+            response.read()
+
+class SmtpNotificationSink(NotificationSink):
+    """Sends each batch as one plain-text mail."""
+
+    def __init__(self, host: str, port: int, sender: str, recipients: Sequence[str],
+                 timeout_seconds: float = 10.0) -> None:
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.recipients = list(recipients)
+        self.timeout_seconds = timeout_seconds
+
+    def send(self, digests: Sequence[AdministratorDigest]) -> None:
+        message = EmailMessage()
+        total = sum(d.report_count for d in digests)
+        message["Subject"] = f"ChargeHub: {total} new malfunction report(s) at {len(digests)} station(s)"
+        message["From"] = self.sender
+        message["To"] = ", ".join(self.recipients)
+        message.set_content("\n\n".join(_describe(d) for d in digests))
+        with smtplib.SMTP(self.host, self.port, timeout=self.timeout_seconds) as smtp:
+            smtp.send_message(message)
+
+def _describe(digest: AdministratorDigest) -> str:
+    lines = [f"Station {digest.station_id}: {digest.report_count} report(s), "
+             f"{digest.first_filed_at:%Y-%m-%d %H:%M} - {digest.last_filed_at:%Y-%m-%d %H:%M}"]
+    lines.extend(f"  - {text}" for text in digest.reports)
+    return "\n".join(lines)
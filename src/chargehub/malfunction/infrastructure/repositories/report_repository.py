@@ -1,11 +1,23 @@
 from __future__ import annotations
 
+import bisect
+import heapq
+import struct
+import threading
+from collections import deque
 from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from itertools import chain, islice
+from typing import Callable, Collection, Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
 
 from uuid import uuid4, UUID
 from chargehub.malfunction.domain.aggregates.malfunction_report import ReportStatus
-from chargehub.malfunction.domain.interfaces.report_repository import ReportRepository
+from chargehub.malfunction.domain.interfaces.report_archive import ArchivedReport, ReportArchive
+from chargehub.malfunction.domain.interfaces.report_repository import PendingStationGroup, ReportQueuePage, ReportRepository
+from chargehub.malfunction.domain.value_objects.report_fingerprint import ReportFingerprint
+from chargehub.shared.infrastructure.deep_size import deep_sizeof
+from chargehub.shared.infrastructure.snapshot_file import SnapshotError, read_snapshot, write_snapshot
 
 @dataclass()
 class StoredReport:
@@ -13,61 +25,488 @@ class StoredReport:
     station_id: int
     report_text: str
     status: ReportStatus
+    filed_at: Optional[datetime] = None
+    # Last time the report was filed or changed status (export watermark)
+    updated_at: Optional[datetime] = None
 
 class ReportRepositoryImpl(ReportRepository):
-    """InMemory repository for malfunction reports."""
+    """InMemory repository for malfunction reports.
 
-    def __init__(self) -> None:
+    With an archive configured, `clear_reports` moves a station's reports
+    into it instead of deleting them, so the live list stays small while the
+    maintenance history remains queryable.
+
+    With a `count_window`, `count_reports` only counts approved reports filed
+    within that window. Each station keeps a deque of approved filing times
+    in time order; expired entries are popped from the front on read, so the
+    check is amortised O(1) however long the station's history is.
+    """
+
+    def __init__(self, archive: Optional[ReportArchive] = None,
+                 clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+                 count_window: Optional[timedelta] = None) -> None:
+        self.archive = archive
+        self.count_window = count_window
+        self._clock = clock
         self._reports: List[StoredReport] = []
+        self._by_id: Dict[UUID, StoredReport] = {}
+        # Pending review queue, in filing order overall and per station
+        self._pending: Dict[UUID, StoredReport] = {}
+        self._pending_by_station: Dict[int, Dict[UUID, StoredReport]] = {}
+        self._pending_unordered = False
         # Count cache now only tracks APPROVED reports
         self._count_by_station: Dict[int, int] = {}
+        # Filing times of APPROVED reports per station, oldest first (for the sliding window)
+        self._approved_times: Dict[int, Deque[datetime]] = {}
+        # Per-station duplicate index: raw texts, normalised texts and MinHash fingerprints
+        self._texts_by_station: Dict[int, Set[str]] = {}
+        self._normalized_by_station: Dict[int, Set[str]] = {}
+        # Fingerprints in the order of the station's reports in `_reports`
+        self._fingerprints_by_station: Dict[int, List[ReportFingerprint]] = {}
+        # Ids removed by clear_reports; snapshotted so merging another worker's copy does not revive them
+        self._cleared: Set[UUID] = set()
+        # Serialises writers with snapshot capture; readers never take it
+        self._lock = threading.RLock()
 
     def save_report(self, station_id: int, report_text: str) -> UUID:
-        report_id = uuid4()
-        # Default status is PENDING
-        self._reports.append(StoredReport(
-            id=report_id, 
-            station_id=station_id, 
-            report_text=report_text,
-            status=ReportStatus.PENDING
-        ))
-        # Do NOT increment count here anymore
-        return report_id
+        with self._lock:
+            report_id = uuid4()
+            filed_at = self._clock()
+            # Default status is PENDING
+            report = StoredReport(
+                id=report_id, 
+                station_id=station_id, 
+                report_text=report_text,
+                status=ReportStatus.PENDING,
+                filed_at=filed_at,
+                updated_at=filed_at,
+            )
+            self._reports.append(report)
+            self._by_id[report_id] = report
+            self._add_pending(report)
+            self._index_text(station_id, report_text)
+            # Do NOT increment count here anymore
+            return report_id
+
+    def _index_text(self, station_id: int, report_text: str) -> None:
+        fingerprint = ReportFingerprint.of(report_text)
+        self._texts_by_station.setdefault(station_id, set()).add(report_text)
+        self._normalized_by_station.setdefault(station_id, set()).add(fingerprint.normalized)
+        self._fingerprints_by_station.setdefault(station_id, []).append(fingerprint)
+
+    def get_report(self, report_id: UUID) -> Optional[StoredReport]:
+        return self._by_id.get(report_id)
 
     def update_status(self, report_id: UUID, status: ReportStatus) -> None:
-        report = next((r for r in self._reports if r.id == report_id), None)
-        if report:
-            old_status = report.status
-            report.status = status
+        with self._lock:
+            report = self._by_id.get(report_id)
+            if report:
+                old_status = report.status
+                report.status = status
+                if old_status != status:
+                    report.updated_at = self._clock()
+                if old_status == ReportStatus.PENDING and status != ReportStatus.PENDING:
+                    self._remove_pending(report)
+                elif old_status != ReportStatus.PENDING and status == ReportStatus.PENDING:
+                    # Re-queued reports land at the end; the queue is re-sorted on the next read
+                    self._add_pending(report)
+                    self._pending_unordered = True
             
-            # Recalculate count for this station if status changes involves APPROVED
-            if old_status != ReportStatus.APPROVED and status == ReportStatus.APPROVED:
-                self._count_by_station[report.station_id] = self._count_by_station.get(report.station_id, 0) + 1
-            elif old_status == ReportStatus.APPROVED and status != ReportStatus.APPROVED:
-                 if report.station_id in self._count_by_station:
-                     self._count_by_station[report.station_id] -= 1
+                # Recalculate count for this station if status changes involves APPROVED
+                if old_status != ReportStatus.APPROVED and status == ReportStatus.APPROVED:
+                    self._count_by_station[report.station_id] = self._count_by_station.get(report.station_id, 0) + 1
+                    times = self._approved_times.setdefault(report.station_id, deque())
+                    if not times or times[-1] <= report.filed_at:
+                        times.append(report.filed_at)
+                    else:
+                        # Approved out of filing order (rare): keep the deque sorted
+                        times.insert(bisect.bisect_right(times, report.filed_at), report.filed_at)
+                elif old_status == ReportStatus.APPROVED and status != ReportStatus.APPROVED:
+                     if report.station_id in self._count_by_station:
+                         self._count_by_station[report.station_id] -= 1
+                     times = self._approved_times.get(report.station_id)
+                     if times and report.filed_at in times:
+                         times.remove(report.filed_at)
 
     def count_reports(self, station_id: int) -> int:
-        # Returns only APPROVED count
-        return self._count_by_station.get(station_id, 0)
+        # Returns only APPROVED count (within the sliding window, if configured)
+        if self.count_window is None:
+            return self._count_by_station.get(station_id, 0)
+        # Expired times are dropped here, so this writes too
+        with self._lock:
+            times = self._approved_times.get(station_id)
+            if not times:
+                return 0
+            cutoff = self._clock() - self.count_window
+            while times and times[0] < cutoff:
+                times.popleft()
+            return len(times)
 
     def all_reports(self) -> List[StoredReport]:
         return list(self._reports)
+
+    def iter_reports(self, updated_since: Optional[datetime] = None) -> Iterator[StoredReport]:
+        """Stream live reports without copying the list, optionally only those updated at/after `updated_since`."""
+        reports = self._reports  # clear_reports swaps in a new list, so this reference stays valid
+        for i in range(len(reports)):
+            report = reports[i]
+            if updated_since is None or (report.updated_at is not None and report.updated_at >= updated_since):
+                yield report
     
     def get_pending_reports(self) -> List[StoredReport]:
-        return [r for r in self._reports if r.status == ReportStatus.PENDING]
+        return list(self._pending.values())
+
+    # ------------------------------------------------------------
+    # Pending review queue
+    # ------------------------------------------------------------
+    PENDING_SORTS = ("age", "station")
+
+    def _add_pending(self, report: StoredReport) -> None:
+        self._pending[report.id] = report
+        self._pending_by_station.setdefault(report.station_id, {})[report.id] = report
+
+    def _remove_pending(self, report: StoredReport) -> None:
+        self._pending.pop(report.id, None)
+        station_pending = self._pending_by_station.get(report.station_id)
+        if station_pending is not None:
+            station_pending.pop(report.id, None)
+            if not station_pending:
+                del self._pending_by_station[report.station_id]
+
+    def _ensure_pending_order(self) -> None:
+        if not self._pending_unordered:
+            return
+        with self._lock:
+            ordered = sorted(self._pending.values(), key=_filing_key)
+            self._pending = {r.id: r for r in ordered}
+            self._pending_by_station = {}
+            for report in ordered:
+                self._pending_by_station.setdefault(report.station_id, {})[report.id] = report
+            self._pending_unordered = False
+
+    def _pending_queues(self, station_ids: Optional[Collection[int]]) -> Dict[int, List[StoredReport]]:
+        """Copies of the queued stations' pending reports in filing order, taken under the lock."""
+        with self._lock:
+            self._ensure_pending_order()
+            if station_ids is None:
+                return {sid: list(queue.values()) for sid, queue in self._pending_by_station.items()}
+            return {sid: list(self._pending_by_station[sid].values())
+                    for sid in dict.fromkeys(station_ids) if sid in self._pending_by_station}
+
+    def pending_reports_page(self, page: int = 1, page_size: int = 25, sort_by: str = "age",
+                             descending: bool = False,
+                             station_ids: Optional[Collection[int]] = None) -> ReportQueuePage:
+        """Only the requested page is materialised.
+
+        The queues are copied under the lock, since other sessions and the
+        sweep write them concurrently; ordering and paging run on the copy.
+        By age, the queue is walked in filing order (merging the selected
+        stations' queues when filtered); by station, whole station queues
+        before the page are skipped using their counts.
+        """
+        if sort_by not in self.PENDING_SORTS:
+            raise ValueError(f"Unknown sort {sort_by!r}; expected one of {self.PENDING_SORTS}")
+        page, page_size = _check_page(page, page_size)
+        offset = (page - 1) * page_size
+
+        if sort_by == "age" and station_ids is None:
+            with self._lock:
+                self._ensure_pending_order()
+                pending = list(self._pending.values())
+            ordered: Iterable[StoredReport] = reversed(pending) if descending else pending
+            return ReportQueuePage(items=list(islice(ordered, offset, offset + page_size)), total=len(pending),
+                                   page=page, page_size=page_size)
+
+        queues = self._pending_queues(station_ids)
+        total = sum(len(q) for q in queues.values())
+        if sort_by == "age":
+            lists = [q[::-1] for q in queues.values()] if descending else list(queues.values())
+            ordered = heapq.merge(*lists, key=_filing_key, reverse=descending)
+            items = list(islice(ordered, offset, offset + page_size))
+        else:
+            stations = sorted(queues, reverse=descending)
+            items = list(islice(_skip_station_queues(queues, stations, offset), page_size))
+        return ReportQueuePage(items=items, total=total, page=page, page_size=page_size)
+
+    def pending_station_groups(self, page: int = 1, page_size: int = 25,
+                               station_ids: Optional[Collection[int]] = None) -> ReportQueuePage:
+        page, page_size = _check_page(page, page_size)
+        queues = self._pending_queues(station_ids)
+        groups = (PendingStationGroup(station_id=sid, pending_count=len(queue), oldest_filed_at=queue[0].filed_at)
+                  for sid, queue in queues.items())
+
+        # Most pending first, then the longest-waiting report, then station id
+        end = page * page_size
+        top = heapq.nsmallest(end, groups, key=_group_key)
+        return ReportQueuePage(items=top[end - page_size:], total=len(queues), page=page, page_size=page_size)
+
+    def approved_station_ids(self) -> List[int]:
+        with self._lock:
+            return [sid for sid, count in self._count_by_station.items() if count > 0]
 
     def get_affected_station_ids(self) -> List[int]:
         # Only return stations with APPROVED reports > 0
-        return [sid for sid, count in self._count_by_station.items() if count > 0]
+        return [sid for sid in self._count_by_station if self.count_reports(sid) > 0]
 
     def has_report(self, station_id: int, report_text: str) -> bool:
         # Check against all reports regardless of status to prevent spam
-        return any(r.station_id == station_id and r.report_text == report_text for r in self._reports)
+        return report_text in self._texts_by_station.get(station_id, ())
+
+    def find_similar_report(self, station_id: int, report_text: str, threshold: float) -> Optional[float]:
+        """Highest similarity >= threshold among this station's reports, else None.
+
+        Cost is proportional to the station's own reports, not the whole repository.
+        """
+        fingerprint = ReportFingerprint.of(report_text)
+        if fingerprint.normalized in self._normalized_by_station.get(station_id, ()):
+            return 1.0
+        best = max((fingerprint.similarity(other) for other in self._fingerprints_by_station.get(station_id, ())), default=0.0)
+        return best if best >= threshold else None
 
     def clear_reports(self, station_id: int) -> None:
-        # Archive or remove? For simplicity we remove them as per original spec, 
-        # but in real world better to archive.
-        self._reports = [r for r in self._reports if r.station_id != station_id]
-        if station_id in self._count_by_station:
-            del self._count_by_station[station_id]
+        with self._lock:
+            if self.archive is not None:
+                resolved_at = self._clock()
+                self.archive.append(
+                    ArchivedReport(id=r.id, station_id=r.station_id, report_text=r.report_text,
+                                   status=r.status, resolved_at=resolved_at, filed_at=r.filed_at)
+                    for r in self._reports if r.station_id == station_id
+                )
+            for r in self._reports:
+                if r.station_id == station_id:
+                    del self._by_id[r.id]
+                    self._pending.pop(r.id, None)
+                    self._cleared.add(r.id)
+            self._pending_by_station.pop(station_id, None)
+            self._reports = [r for r in self._reports if r.station_id != station_id]
+            if station_id in self._count_by_station:
+                del self._count_by_station[station_id]
+            self._approved_times.pop(station_id, None)
+            self._texts_by_station.pop(station_id, None)
+            self._normalized_by_station.pop(station_id, None)
+            self._fingerprints_by_station.pop(station_id, None)
+
+    def memory_usage(self, seen: Optional[Set[int]] = None) -> Dict[str, int]:
+        """Estimated bytes per internal structure (see `deep_sizeof`); reports are counted first."""
+        seen = set() if seen is None else seen
+        # Writers hold the lock, so no index changes size while it is walked
+        with self._lock:
+            return {
+                "reports": deep_sizeof(self._reports, self._by_id, self._cleared, seen=seen),
+                "pending queue": deep_sizeof(self._pending, self._pending_by_station, seen=seen),
+                "count window": deep_sizeof(self._count_by_station, self._approved_times, seen=seen),
+                "duplicate index": deep_sizeof(self._texts_by_station, self._normalized_by_station,
+                                               self._fingerprints_by_station, seen=seen),
+            }
+
+    def report_history(self, station_id: int, since: Optional[datetime] = None) -> List[ArchivedReport]:
+        """Archived (resolved) reports of a station, oldest partition first."""
+        if self.archive is None:
+            return []
+        return self.archive.reports_for_station(station_id, since=since)
+
+    # ------------------------------------------------------------
+    # Snapshots
+    # ------------------------------------------------------------
+    SNAPSHOT_KIND = b"REPT"
+    SNAPSHOT_VERSION = 3
+    # report count, station count entries, MinHash signature width
+    _SNAPSHOT_HEADER = struct.Struct("<qqH")
+    # Record headers per layout version, each followed by both texts and the signature:
+    #   v1: report id, station id, filed_at (epoch ms, -1 if unknown), status value,
+    #       text length, normalised text length
+    #   v2: as v1 plus updated_at (epoch ms, -1 if unknown) after filed_at
+    #   v3: as v2; the approved counts are followed by the ids of cleared reports
+    _SNAPSHOT_REPORTS = {1: struct.Struct("<16sqqBII"), 2: struct.Struct("<16sqqqBII"), 3: struct.Struct("<16sqqqBII")}
+    _SNAPSHOT_COUNT = struct.Struct("<qq")
+    _SNAPSHOT_CLEARED = struct.Struct("<q")
+
+    def snapshot(self, path: Path) -> int:
+        """Write every report with its fingerprint, the approved counts and the cleared ids; returns bytes written.
+
+        The writer lock is held only while the state is copied; encoding and
+        the file write happen outside it, and readers never wait.
+        """
+        with self._lock:
+            reports = [(r.id, r.station_id, r.filed_at, r.updated_at, r.status, r.report_text) for r in self._reports]
+            fingerprints = {sid: list(fps) for sid, fps in self._fingerprints_by_station.items()}
+            counts = list(self._count_by_station.items())
+            cleared = list(self._cleared)
+
+        width = len(ReportFingerprint.of("").signature)
+        signature = struct.Struct(f"<{width}q")
+        seen: Dict[int, int] = {}
+        blocks = [self._SNAPSHOT_HEADER.pack(len(reports), len(counts), width)]
+        record = self._SNAPSHOT_REPORTS[self.SNAPSHOT_VERSION]
+        for report_id, station_id, filed_at, updated_at, status, text in reports:
+            # Fingerprints are stored in report order per station
+            i = seen[station_id] = seen.get(station_id, -1) + 1
+            fingerprint = fingerprints[station_id][i]
+            encoded = text.encode("utf-8")
+            normalized = fingerprint.normalized.encode("utf-8")
+            blocks.append(record.pack(
+                report_id.bytes, station_id, _to_ms(filed_at), _to_ms(updated_at),
+                status.value, len(encoded), len(normalized)))
+            blocks.append(encoded)
+            blocks.append(normalized)
+            blocks.append(signature.pack(*fingerprint.signature))
+        blocks.extend(self._SNAPSHOT_COUNT.pack(sid, count) for sid, count in counts)
+        blocks.append(self._SNAPSHOT_CLEARED.pack(len(cleared)))
+        blocks.extend(report_id.bytes for report_id in cleared)
+        return write_snapshot(path, self.SNAPSHOT_KIND, b"".join(blocks), version=self.SNAPSHOT_VERSION)
+
+    def restore(self, path: Path) -> int:
+        """Replace the live reports with a snapshot's; returns the number of reports restored."""
+        reports, fingerprints, counts, cleared = self._read_snapshot(path)
+        self._install(reports, fingerprints, counts, cleared)
+        return len(reports)
+
+    def restore_merged(self, paths: Sequence[Path]) -> int:
+        """Replace the live reports with the union of several snapshots (e.g. one per worker).
+
+        A report found in several snapshots is taken from the one where it
+        was updated last, and dropped if any snapshot lists it as cleared:
+        workers hold copies of the same reports, and a repair seen by one
+        of them must not be undone by another's copy. Approved counts are
+        recomputed from the merged reports. Returns the number of reports restored; raises SnapshotError
+        only if none of the snapshots could be read.
+        """
+        merged: Dict[UUID, Tuple[StoredReport, ReportFingerprint]] = {}
+        cleared: Set[UUID] = set()
+        errors: List[SnapshotError] = []
+        for path in paths:
+            try:
+                reports, fingerprints, _, snapshot_cleared = self._read_snapshot(path)
+            except SnapshotError as e:
+                errors.append(e)
+                continue
+            cleared |= snapshot_cleared
+            for report, fingerprint in zip(reports, fingerprints):
+                known = merged.get(report.id)
+                if known is None or _update_key(report) > _update_key(known[0]):
+                    merged[report.id] = (report, fingerprint)
+        if errors and len(errors) == len(paths):
+            raise errors[0]
+        # Ids no snapshot still holds have done their job; the rest are kept for the next merge
+        cleared &= merged.keys()
+        for report_id in cleared:
+            del merged[report_id]
+        # Filing order, as reports were appended
+        entries = sorted(merged.values(), key=lambda entry: _filing_key(entry[0]))
+        reports = [report for report, _ in entries]
+        counts: Dict[int, int] = {}
+        for report in reports:
+            if report.status == ReportStatus.APPROVED:
+                counts[report.station_id] = counts.get(report.station_id, 0) + 1
+        self._install(reports, [fingerprint for _, fingerprint in entries], counts, cleared)
+        return len(reports)
+
+    def _read_snapshot(self, path: Path
+                       ) -> Tuple[List[StoredReport], List[ReportFingerprint], Dict[int, int], Set[UUID]]:
+        version, payload = read_snapshot(path, self.SNAPSHOT_KIND, versions=self._SNAPSHOT_REPORTS)
+        record = self._SNAPSHOT_REPORTS[version]
+        n_reports, n_counts, width = self._SNAPSHOT_HEADER.unpack_from(payload, 0)
+        signature = struct.Struct(f"<{width}q")
+        # Signatures from a different MinHash configuration are recomputed
+        reuse_signatures = width == len(ReportFingerprint.of("").signature)
+
+        reports: List[StoredReport] = []
+        fingerprints: List[ReportFingerprint] = []
+        offset = self._SNAPSHOT_HEADER.size
+        try:
+            for _ in range(n_reports):
+                fields = record.unpack_from(payload, offset)
+                raw_id, station_id, filed_ms = fields[:3]
+                # v1 snapshots predate updated_at; the filing time is the best lower bound
+                updated_ms = fields[3] if version >= 2 else filed_ms
+                status, length, norm_length = fields[-3:]
+                offset += record.size
+                text = payload[offset:offset + length].decode("utf-8")
+                offset += length
+                normalized = payload[offset:offset + norm_length].decode("utf-8")
+                offset += norm_length
+                if reuse_signatures:
+                    fingerprints.append(ReportFingerprint(normalized, signature.unpack_from(payload, offset)))
+                else:
+                    fingerprints.append(ReportFingerprint.of(text))
+                offset += signature.size
+                reports.append(StoredReport(
+                    id=UUID(bytes=raw_id),
+                    station_id=station_id,
+                    report_text=text,
+                    status=ReportStatus(status),
+                    filed_at=_from_ms(filed_ms),
+                    updated_at=_from_ms(updated_ms),
+                ))
+            counts = dict(self._SNAPSHOT_COUNT.unpack_from(payload, offset + i * self._SNAPSHOT_COUNT.size)
+                          for i in range(n_counts))
+            offset += n_counts * self._SNAPSHOT_COUNT.size
+            cleared: Set[UUID] = set()
+            if version >= 3:
+                (n_cleared,) = self._SNAPSHOT_CLEARED.unpack_from(payload, offset)
+                offset += self._SNAPSHOT_CLEARED.size
+                if offset + 16 * n_cleared > len(payload):
+                    raise ValueError("cleared ids run past the end of the payload")
+                cleared = {UUID(bytes=payload[offset + 16 * i:offset + 16 * (i + 1)]) for i in range(n_cleared)}
+        except (struct.error, ValueError) as e:
+            raise SnapshotError(f"{path} does not match the report snapshot layout: {e}") from e
+        return reports, fingerprints, counts, cleared
+
+    def _install(self, reports: List[StoredReport], fingerprints: List[ReportFingerprint],
+                 counts: Dict[int, int], cleared: Set[UUID]) -> None:
+        with self._lock:
+            self._reports = reports
+            self._cleared = set(cleared)
+            self._by_id = {r.id: r for r in reports}
+            self._pending = {}
+            self._pending_by_station = {}
+            for report in reports:
+                if report.status == ReportStatus.PENDING:
+                    self._add_pending(report)
+            self._pending_unordered = True
+            self._count_by_station = counts
+            self._approved_times = {}
+            self._texts_by_station = {}
+            self._normalized_by_station = {}
+            self._fingerprints_by_station = {}
+            for report, fingerprint in zip(reports, fingerprints):
+                self._texts_by_station.setdefault(report.station_id, set()).add(report.report_text)
+                self._normalized_by_station.setdefault(report.station_id, set()).add(fingerprint.normalized)
+                self._fingerprints_by_station.setdefault(report.station_id, []).append(fingerprint)
+                if report.status == ReportStatus.APPROVED and report.filed_at is not None:
+                    self._approved_times.setdefault(report.station_id, []).append(report.filed_at)
+            self._approved_times = {sid: deque(sorted(times)) for sid, times in self._approved_times.items()}
+
+_EPOCH = datetime.min.replace(tzinfo=timezone.utc)
+
+def _skip_station_queues(queues: Dict[int, List[StoredReport]], stations: List[int],
+                         offset: int) -> Iterator[StoredReport]:
+    """The station queues in `stations` order, starting `offset` reports in; earlier queues are skipped whole."""
+    for i, station_id in enumerate(stations):
+        queue = queues[station_id]
+        if offset >= len(queue):
+            offset -= len(queue)
+            continue
+        rest = (queues[sid] for sid in stations[i + 1:])
+        return chain(islice(queue, offset, None), chain.from_iterable(rest))
+    return iter(())
+
+def _filing_key(report: StoredReport) -> datetime:
+    return report.filed_at or _EPOCH
+
+def _update_key(report: StoredReport) -> datetime:
+    return report.updated_at or report.filed_at or _EPOCH
+
+def _group_key(group: PendingStationGroup) -> Tuple[int, datetime, int]:
+    return (-group.pending_count, group.oldest_filed_at or _EPOCH, group.station_id)
+
+def _to_ms(moment: Optional[datetime]) -> int:
+    return int(moment.timestamp() * 1000) if moment else -1
+
+def _from_ms(ms: int) -> Optional[datetime]:
+    return datetime.fromtimestamp(ms / 1000, tz=timezone.utc) if ms >= 0 else None
+
+def _check_page(page: int, page_size: int) -> Tuple[int, int]:
+    if page < 1 or page_size < 1:
+        raise ValueError("page and page_size must be positive")
+    return page, page_size
@@ -1,10 +1,17 @@
-import streamlit as st
-import pandas as pd
+from __future__ import annotations
+
 from dataclasses import asdict, is_dataclass
+from typing import TYPE_CHECKING
+
+import streamlit as st
 from chargehub.config import ChargeHubConfig
 from chargehub.malfunction.application.malfunction_service import MalfunctionService
-from chargehub.discovery.infrastructure.repositories.charging_station_csv_repository import ChargingStationCSVRepository
 from chargehub.malfunction.domain.aggregates.malfunction_report import ReportStatus
+from chargehub.shared.presentation import fragments
+
+if TYPE_CHECKING:
+    from chargehub.discovery.infrastructure.repositories.charging_station_csv_repository import ChargingStationCSVRepository
+    from chargehub.shared.infrastructure.memory_monitor import MemoryMonitor
 
 def event_to_dict(event: object) -> dict:
     if is_dataclass(event):
@@ -15,68 +22,181 @@ class MalfunctionReportView:
     def __init__(self, 
                  malfunction_service: MalfunctionService,
                  charging_repo: ChargingStationCSVRepository,
-                 config: ChargeHubConfig):
+                 config: ChargeHubConfig,
+                 memory_monitor: MemoryMonitor = None):
         self.malfunction_service = malfunction_service
         self.charging_repo = charging_repo
         self.config = config
+        self.memory_monitor = memory_monitor
 
     def render(self):
         st.title("🛡️ Admin Dashboard")
         st.markdown("Overview of network health and reported malfunctions.")
         
-        tab1, tab2 = st.tabs(["⚠️ Pending Reports", "🔧 Active Issues"])
+        tab1, tab2, tab3, tab4 = st.tabs(["⚠️ Pending Reports", "🔧 Active Issues", "📈 Reliability", "🩺 Diagnostics"])
+        timings = fragments.interaction_timings()
+        fragment = fragments.fragment(self.config.UI_FRAGMENTS)
+
+        # Paging or rejecting reruns only the queue; only approvals also refresh the issues tab
+        @fragment
+        def pending_reports():
+            with timings.measure("pending reports"):
+                self.render_pending_reports()
+
+        @fragment
+        def active_issues():
+            with timings.measure("active issues"):
+                self.render_active_issues()
         
         with tab1:
-            self.render_pending_reports()
+            pending_reports()
         
+        @fragment
+        def reliability():
+            with timings.measure("reliability"):
+                self.render_reliability()
+
         with tab2:
-            self.render_active_issues()
+            active_issues()
+
+        @fragment
+        def diagnostics():
+            with timings.measure("diagnostics"):
+                self.render_diagnostics()
+
+        with tab3:
+            reliability()
+
+        with tab4:
+            diagnostics()
+
+    PENDING_PAGE_SIZE = 20
 
     def render_pending_reports(self):
         st.subheader("Pending Reports Approval")
-        pending = self.malfunction_service.report_repository.get_pending_reports()
-        
-        if not pending:
+        state = st.session_state
+        state.setdefault("pending_page", 1)
+        state.setdefault("pending_station", None)
+
+        col_plz, col_sort, col_group = st.columns([2, 2, 1])
+        with col_plz:
+            plz = st.text_input("Filter by PLZ", key="pending_plz", placeholder="e.g. 10437").strip()
+        with col_sort:
+            sort_label = st.selectbox("Sort by", ["Oldest first", "Newest first", "Station"], key="pending_sort")
+        with col_group:
+            grouped = st.toggle("Group by station", key="pending_grouped")
+
+        # Changing filters starts again at page 1
+        filters = (plz, sort_label, grouped, state.pending_station)
+        if state.get("pending_filters") != filters:
+            state.pending_filters = filters
+            state.pending_page = 1
+
+        try:
+            if grouped and state.pending_station is None:
+                page = self.malfunction_service.get_pending_groups(
+                    page=state.pending_page, page_size=self.PENDING_PAGE_SIZE, postal_code=plz or None)
+            else:
+                page = self.malfunction_service.get_pending_queue(
+                    page=state.pending_page, page_size=self.PENDING_PAGE_SIZE,
+                    sort_by="station" if sort_label == "Station" else "age",
+                    descending=sort_label == "Newest first",
+                    postal_code=plz or None, station_id=state.pending_station,
+                )
+        except ValueError as e:
+            st.error(str(e))
+            return
+
+        if state.pending_station is not None:
+            if st.button(f"← All stations (showing station {state.pending_station})"):
+                state.pending_station = None
+                fragments.rerun(fragment_only=self.config.UI_FRAGMENTS)
+
+        if not page.total:
             st.info("🎉 No pending reports to review.")
             return
+        if not page.items:
+            # The last page emptied (e.g. after approving its final report)
+            state.pending_page = page.page_count
+            fragments.rerun(fragment_only=self.config.UI_FRAGMENTS)
 
-        for report in pending:
-            with st.container(border=True):
-                col1, col2, col3 = st.columns([3, 1, 1])
-                with col1:
-                    st.markdown(f"**Station {report.station_id}**")
-                    st.caption(f"Report ID: `{report.id}`")
-                    st.text(f"📝 {report.report_text}")
-                
-                with col2:
-                    if st.button("Approve", key=f"app_{report.id}", type="primary", use_container_width=True):
-                        try:
-                            self.malfunction_service.approve_report(report.id)
-                            st.toast(f"Report {report.id} Approved!", icon="✅")
-                            st.rerun()
-                        except Exception as e:
-                            st.error(str(e))
-                with col3:
-                    if st.button("Reject", key=f"rej_{report.id}", use_container_width=True):
-                        try:
-                            self.malfunction_service.reject_report(report.id)
-                            st.toast(f"Report {report.id} Rejected", icon="🗑️")
-                            st.rerun()
-                        except Exception as e:
-                            st.error(str(e))
+        if grouped and state.pending_station is None:
+            for group in page.items:
+                self._render_pending_group(group)
+        else:
+            for report in page.items:
+                self._render_pending_report(report)
+        self._render_pending_pager(page)
+
+    def _render_pending_group(self, group):
+        with st.container(border=True):
+            col1, col2 = st.columns([4, 1])
+            with col1:
+                st.markdown(f"**Station {group.station_id}** · {group.pending_count} pending")
+                if group.oldest_filed_at:
+                    st.caption(f"Oldest filed {group.oldest_filed_at:%Y-%m-%d %H:%M}")
+            with col2:
+                if st.button("Review", key=f"grp_{group.station_id}", use_container_width=True):
+                    st.session_state.pending_station = group.station_id
+                    fragments.rerun(fragment_only=self.config.UI_FRAGMENTS)
+
+    def _render_pending_pager(self, page):
+        state = st.session_state
+        col_prev, col_info, col_next = st.columns([1, 2, 1])
+        with col_prev:
+            if st.button("◀ Previous", key="pending_prev", disabled=page.page <= 1, use_container_width=True):
+                state.pending_page = page.page - 1
+                fragments.rerun(fragment_only=self.config.UI_FRAGMENTS)
+        with col_info:
+            st.caption(f"Page {page.page} of {page.page_count} · {page.total} total")
+        with col_next:
+            if st.button("Next ▶", key="pending_next", disabled=page.page >= page.page_count, use_container_width=True):
+                state.pending_page = page.page + 1
+                fragments.rerun(fragment_only=self.config.UI_FRAGMENTS)
+
+    def _render_pending_report(self, report):
+        with st.container(border=True):
+            col1, col2, col3 = st.columns([3, 1, 1])
+            with col1:
+                st.markdown(f"**Station {report.station_id}**")
+                filed = f" · Filed {report.filed_at:%Y-%m-%d %H:%M}" if report.filed_at else ""
+                st.caption(f"Report ID: `{report.id}`{filed}")
+                st.text(f"📝 {report.report_text}")
+
+            with col2:
+                if st.button("Approve", key=f"app_{report.id}", type="primary", use_container_width=True):
+                    try:
+                        self.malfunction_service.approve_report(report.id)
+                        st.toast(f"Report {report.id} Approved!", icon="✅")
+                        # Approved reports count towards the issues tab as well
+                        fragments.rerun(fragment_only=False)
+                    except Exception as e:
+                        st.error(str(e))
+            with col3:
+                if st.button("Reject", key=f"rej_{report.id}", use_container_width=True):
+                    try:
+                        self.malfunction_service.reject_report(report.id)
+                        st.toast(f"Report {report.id} Rejected", icon="🗑️")
+                        fragments.rerun(fragment_only=self.config.UI_FRAGMENTS)
+                    except Exception as e:
+                        st.error(str(e))
 
     def render_active_issues(self):
         # 1. KPI Metrics
         affected_ids = self.malfunction_service.report_repository.get_affected_station_ids()
-        total_stations = len(self.charging_repo.get_all())
+        total_stations = self.charging_repo.count_stations()
+        available_stations = self.charging_repo.count_available()
         affected_count = len(affected_ids)
         
-        kpi1, kpi2, kpi3 = st.columns(3)
+        kpi1, kpi2, kpi3, kpi4 = st.columns(4)
         kpi1.metric("Total Stations", total_stations)
         kpi2.metric("Affected Stations", affected_count, delta=affected_count if affected_count > 0 else None, delta_color="inverse")
         
         total_reports = sum(self.malfunction_service.report_repository.count_reports(sid) for sid in affected_ids)
         kpi3.metric("Total Verified Reports", total_reports)
+        availability_pct = 100 * available_stations / total_stations if total_stations else 0.0
+        kpi4.metric("Network Availability", f"{availability_pct:.1f}%")
+        self._render_cleaning_report()
         
         st.divider()
         
@@ -104,22 +224,112 @@ class MalfunctionReportView:
         else:
             st.caption("Select a row in the table above to view details and perform actions.")
     
+    RELIABILITY_TOP_GROUPS = 25
+
+    def render_reliability(self):
+        st.subheader("Reliability by Operator and District")
+        analytics = self.malfunction_service.reliability
+        if analytics is None:
+            st.info("Reliability analytics are not enabled.")
+            return
+        if st.button("🔄 Refresh", key="reliability_refresh"):
+            fragments.rerun(fragment_only=self.config.UI_FRAGMENTS)
+
+        total = analytics.totals()
+        kpi1, kpi2, kpi3, kpi4 = st.columns(4)
+        kpi1.metric("Failures", total.failures)
+        kpi2.metric("Down Now", total.down_now)
+        kpi3.metric("Mean Time to Repair", _format_duration(total.mean_time_to_repair))
+        kpi4.metric("Failures / Station-Month", f"{total.failures_per_station_month:.3f}")
+
+        by_operator, by_plz = st.columns(2)
+        with by_operator:
+            st.markdown("**Operators** (least reliable first)")
+            self._render_reliability_table(analytics.by_operator(self.RELIABILITY_TOP_GROUPS), "Operator")
+        with by_plz:
+            st.markdown("**PLZ** (least reliable first)")
+            self._render_reliability_table(analytics.by_postal_code(self.RELIABILITY_TOP_GROUPS), "PLZ")
+
+    def _render_reliability_table(self, stats, label):
+        if not stats:
+            st.caption("No failures recorded yet.")
+            return
+        st.dataframe([
+            {label: s.group, "Stations": s.stations, "Failures": s.failures, "Down Now": s.down_now,
+             "MTTR": _format_duration(s.mean_time_to_repair),
+             "Failures / Station-Month": round(s.failures_per_station_month, 3)}
+            for s in stats
+        ], hide_index=True, use_container_width=True)
+
+    SESSION_STATE_TOP_KEYS = 15
+
+    def render_diagnostics(self):
+        st.subheader("Memory by Component")
+        monitor = self.memory_monitor
+        if monitor is None:
+            st.info("Memory diagnostics are not enabled.")
+            return
+        if st.button("📏 Measure now", key="memory_sample"):
+            monitor.sample()
+        report = monitor.latest
+        if report is None:
+            st.caption("No measurement yet.")
+            return
+
+        kpi1, kpi2, kpi3 = st.columns(3)
+        kpi1.metric("Components", _format_bytes(report.total_bytes))
+        kpi2.metric("Traced (tracemalloc)", _format_bytes(report.traced_bytes) if report.traced_bytes is not None else "off")
+        kpi3.metric("Measured", f"{report.taken_at:%H:%M:%S}", f"{report.duration_seconds * 1000:.0f} ms", delta_color="off")
+
+        for alert in monitor.alerts():
+            st.error(f"{alert.raised_at:%Y-%m-%d %H:%M} · **{alert.component}** grew to "
+                     f"{_format_bytes(alert.bytes)}, over its budget of {_format_bytes(alert.budget)}")
+        st.dataframe([
+            {"Component": c.name, "Size": _format_bytes(c.bytes), "Growth": _format_bytes(c.growth),
+             "Budget": _format_bytes(c.budget) if c.budget else "–", "Status": "🔴 Over budget" if c.over_budget else "🟢"}
+            for c in report.components
+        ], hide_index=True, use_container_width=True)
+        for c in report.components:
+            if c.parts:
+                with st.expander(f"{c.name}: {_format_bytes(c.bytes)}"):
+                    st.table([{"Part": part, "Size": _format_bytes(size)} for part, size in c.parts.items()])
+
+        st.markdown("**Growth by module since the previous measurement**")
+        if report.module_growth:
+            st.dataframe([
+                {"Module": m.module, "Growth": _format_bytes(m.size_diff), "Blocks": m.count_diff, "Live": _format_bytes(m.size)}
+                for m in report.module_growth
+            ], hide_index=True, use_container_width=True)
+        else:
+            st.caption("Needs MEMORY_TRACEMALLOC and two measurements.")
+
+        # Session state lives per browser session, out of the background sampler's reach
+        from chargehub.shared.infrastructure.deep_size import deep_sizeof
+
+        sizes = sorted(((key, deep_sizeof(value)) for key, value in st.session_state.items()), key=lambda kv: -kv[1])
+        with st.expander(f"This session's state: {_format_bytes(sum(size for _, size in sizes))}"):
+            st.table([{"Key": str(key), "Size": _format_bytes(size)} for key, size in sizes[:self.SESSION_STATE_TOP_KEYS]])
+
+    def _render_cleaning_report(self):
+        report = self.charging_repo.cleaning_report()
+        if report is None:
+            return
+        with st.expander(f"🧹 Register cleaning: {report.output_rows} of {report.input_rows} rows kept"):
+            st.table([{"Rule": o.rule, "Action": o.action, "Rows": o.rows} for o in report.outcomes])
+
     def _build_dataframe(self, affected_ids):
+        import pandas as pd
+
         data = []
+        held_offline = self.charging_repo.out_of_service_ids()
         for sid in affected_ids:
             count = self.malfunction_service.report_repository.count_reports(sid)
-            try:
-                 station = next((s for s in self.charging_repo.get_all() if s.station_id == sid), None)
-                 status = "🔴 Unavailable" if station and not station.available else "🟡 Warning"
-            except:
-                status = "Unknown"
-                
-            data.append({
-                "Station ID": sid,
-                "Reports": count,
-                "Status": status
-            })
-        return pd.DataFrame(data)
+            status = "🔴 Unavailable" if sid in held_offline else "🟡 Warning"
+            data.append((sid, count, status))
+        # Selecting a row reruns the tab; the frame is only rebuilt when its rows changed
+        rows = tuple(data)
+        return fragments.memoised("active_issues_frame", rows,
+                                  lambda: pd.DataFrame(list(rows), columns=["Station ID", "Reports", "Status"]))
 
     def _render_details(self, df, row_idx):
         selected_row = df.iloc[row_idx]
@@ -137,6 +347,11 @@ class MalfunctionReportView:
             for i, r in enumerate(station_reports, 1):
                 st.text(f"{i}. {r.report_text}")
 
+            history = self.malfunction_service.get_report_history(sel_id)
+            with st.expander(f"🗄️ Resolved reports, last 12 months ({len(history)})"):
+                for r in history:
+                    st.text(f"{r.resolved_at:%Y-%m-%d} · {r.status.name.title()} · {r.report_text}")
+
         with col_det2:
             st.markdown("### Actions")
             current_reports = int(selected_row['Reports'])
@@ -148,11 +363,22 @@ class MalfunctionReportView:
                     st.success(f"Station {sel_id} restored!")
                     st.cache_data.clear() 
                     st.json([event_to_dict(e) for e in events])
-                    if "cached_map" in st.session_state:
-                         del st.session_state["cached_map"] # Clear map cache for admin too
-                    st.rerun()
+                    fragments.rerun(fragment_only=self.config.UI_FRAGMENTS)
                 except Exception as e:
                     st.error(str(e))
             
             if not can_repair:
                 st.caption(f"⚠️ **Cannot repair**: Station needs at least {self.config.REPAIR_THRESHOLD} verified reports (Current: {current_reports}).")
+
+def _format_duration(duration) -> str:
+    if duration is None:
+        return "–"
+    hours = duration.total_seconds() / 3600
+    return f"{hours / 24:.1f} d" if hours >= 48 else f"{hours:.1f} h"
+
+def _format_bytes(size) -> str:
+    for unit in ("B", "KB", "MB"):
+        if abs(size) < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.2f} GB"
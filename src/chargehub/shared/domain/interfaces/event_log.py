@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List
+
+@dataclass(frozen=True)
+class RecordedEvent:
+    """A domain event as stored in the event log."""
+    seq: int
+    occurred_at: datetime
+    name: str
+    payload: Dict[str, object] = field(default_factory=dict)
+
+class EventLog(ABC):
+    """
+    Append-only log of domain events, numbered by a sequence that only grows.
+    """
+
+    @abstractmethod
+    def append(self, events: Iterable[object]) -> List[RecordedEvent]:
+        pass
+
+    @abstractmethod
+    def iter_events(self, after_seq: int = 0) -> Iterator[RecordedEvent]:
+        """Events with a sequence number greater than `after_seq`, oldest first."""
+        pass
+
+    @abstractmethod
+    def last_seq(self) -> int:
+        pass
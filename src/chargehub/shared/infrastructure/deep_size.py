@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import sys
+import types
+from collections import deque
+from enum import Enum
+from functools import lru_cache
+from typing import Iterator, Optional, Set, Tuple
+
+# Shared by every instance and owned by the interpreter, not by a component
+_SKIPPED = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType,
+            types.CodeType, types.FrameType, Enum)
+
+# Reference nothing that belongs to a component
+_ATOMIC = (str, bytes, bytearray, int, float, complex, bool, range, memoryview, type(None))
+
+def deep_sizeof(*objects: object, seen: Optional[Set[int]] = None) -> int:
+    """
+    Estimated bytes held by `objects` and everything they reference.
+
+    Walks containers, instance dicts and slots iteratively and counts every
+    object once by id. Pass the same `seen` set to several calls to charge
+    shared objects only to the first caller (e.g. stations referenced by both
+    a repository and a search index). Classes, modules, functions and enum
+    members are not counted, and buffers owned elsewhere (memory maps,
+    shared memory) only by their Python wrapper.
+
+    Containers are read without locking; callers that mutate them from
+    other threads should hold their writer lock while measuring.
+    """
+    seen = set() if seen is None else seen
+    stack = list(objects)
+    push = stack.extend
+    getsizeof = sys.getsizeof
+    total = 0
+    while stack:
+        obj = stack.pop()
+        key = id(obj)
+        if key in seen:
+            continue
+        kind = _kind(type(obj))
+        if kind is _Kind.SKIP:
+            continue
+        seen.add(key)
+        total += getsizeof(obj)
+        if kind is _Kind.ATOMIC:
+            continue
+        if kind is _Kind.MAPPING:
+            push(list(obj))
+            push(list(obj.values()))
+        elif kind is _Kind.COLLECTION:
+            push(list(obj))
+        else:
+            push(_attributes(obj, kind))
+    return total
+
+class _Kind:
+    SKIP, ATOMIC, MAPPING, COLLECTION = "skip", "atomic", "mapping", "collection"
+
+@lru_cache(maxsize=None)
+def _kind(cls: type):
+    """How instances of `cls` are walked: a _Kind, or the slot names of an object."""
+    if issubclass(cls, _SKIPPED):
+        return _Kind.SKIP
+    if issubclass(cls, _ATOMIC):
+        return _Kind.ATOMIC
+    if issubclass(cls, dict):
+        return _Kind.MAPPING
+    if issubclass(cls, (list, tuple, set, frozenset, deque)):
+        return _Kind.COLLECTION
+    slots = []
+    for klass in cls.__mro__:
+        names = klass.__dict__.get("__slots__", ())
+        slots.extend(name for name in ((names,) if isinstance(names, str) else names)
+                     if name not in ("__dict__", "__weakref__"))
+    return tuple(slots)
+
+def _attributes(obj: object, slots: Tuple[str, ...]) -> Iterator[object]:
+    if type(obj).__module__ == "numpy":
+        base = getattr(obj, "base", None)
+        if base is not None:
+            # A view: its memory belongs to the array it was taken from
+            yield base
+        return
+    instance_dict = getattr(obj, "__dict__", None)
+    if isinstance(instance_dict, dict):
+        yield instance_dict
+    for slot in slots:
+        value = getattr(obj, slot, None)
+        if value is not None:
+            yield value
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from bisect import bisect_right
+from dataclasses import asdict, is_dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from chargehub.shared.domain.interfaces.event_log import EventLog, RecordedEvent
+from chargehub.shared.infrastructure.file_lock import file_lock
+
+def _payload(event: object) -> Dict[str, object]:
+    return asdict(event) if is_dataclass(event) else {}
+
+class InMemoryEventLog(EventLog):
+    def __init__(self, clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc)) -> None:
+        self._clock = clock
+        self._events: List[RecordedEvent] = []
+        self._lock = threading.Lock()
+
+    def append(self, events: Iterable[object]) -> List[RecordedEvent]:
+        with self._lock:
+            now = self._clock()
+            recorded = [
+                RecordedEvent(seq=len(self._events) + i, occurred_at=now, name=type(e).__name__, payload=_payload(e))
+                for i, e in enumerate(events, 1)
+            ]
+            self._events.extend(recorded)
+            return recorded
+
+    def iter_events(self, after_seq: int = 0) -> Iterator[RecordedEvent]:
+        events = self._events
+        # Sequence numbers are dense from 1, so the start position is known
+        for i in range(max(after_seq, 0), len(events)):
+            yield events[i]
+
+    def last_seq(self) -> int:
+        return len(self._events)
+
+class JsonlEventLog(EventLog):
+    """
+    Event log persisted as one JSON object per line.
+
+    Appends are flushed before returning, so events survive a restart and
+    can be exported from another process. Reads stream the file line by
+    line and never hold the whole log in memory. The byte offset where each
+    recent append started is remembered, so a reader that keeps up with the
+    log (e.g. a dispatcher polling for new events) seeks straight to them
+    instead of re-reading the history.
+
+    Several processes may append to the same file (one per worker). An
+    append takes an exclusive lock on `<file>.lock`, reads whatever other
+    processes appended since this one last looked, and only then numbers
+    its events, so sequence numbers stay unique and ascending in file order.
+    """
+
+    MAX_CHECKPOINTS = 4096
+
+    def __init__(self, path: Path, clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc)) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock_path = self.path.with_name(self.path.name + ".lock")
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._last_seq = 0
+        # End of the last complete line read or written by this process
+        self._end = 0
+        # (last seq before the offset, byte offset), ascending in both
+        self._checkpoints: List[Tuple[int, int]] = []
+        self._catch_up()
+
+    def append(self, events: Iterable[object]) -> List[RecordedEvent]:
+        events = list(events)
+        if not events:
+            return []
+        with self._lock, file_lock(self.lock_path):
+            self._catch_up()
+            now = self._clock()
+            seq_before = self._last_seq
+            recorded = []
+            for event in events:
+                self._last_seq += 1
+                recorded.append(RecordedEvent(seq=self._last_seq, occurred_at=now,
+                                              name=type(event).__name__, payload=_payload(event)))
+            lines = "".join(
+                json.dumps({"seq": r.seq, "occurred_at": r.occurred_at.isoformat(), "event": r.name,
+                            "payload": r.payload}, ensure_ascii=False, default=str) + "\n"
+                for r in recorded
+            )
+            data = lines.encode("utf-8")
+            with open(self.path, "ab") as f:
+                offset = os.fstat(f.fileno()).st_size
+                if offset > self._end:
+                    # A torn line from a crash mid-append (writers hold the lock): terminate it
+                    f.write(b"\n")
+                    offset += 1
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            self._end = offset + len(data)
+            self._checkpoint(seq_before, offset)
+            return recorded
+
+    def _catch_up(self) -> None:
+        """Read lines appended since `_end` (by other processes), advancing the last seq."""
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            return
+        if size <= self._end:
+            return
+        start = offset = self._end
+        seq_before = self._last_seq
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # Still being written by another process, or torn
+                    break
+                seq = _seq_of(line)
+                if seq is not None:
+                    self._last_seq = max(self._last_seq, seq)
+                offset += len(line)
+        self._end = offset
+        if offset > start:
+            self._checkpoint(seq_before, start)
+            self._checkpoint(self._last_seq, offset)
+
+    def _checkpoint(self, seq: int, offset: int) -> None:
+        checkpoints = self._checkpoints
+        if checkpoints and checkpoints[-1][0] == seq:
+            checkpoints[-1] = (seq, offset)
+        else:
+            checkpoints.append((seq, offset))
+        if len(checkpoints) > 2 * self.MAX_CHECKPOINTS:
+            # Old offsets only help readers far behind; they fall back to an earlier one or the start
+            del checkpoints[:self.MAX_CHECKPOINTS]
+
+    def iter_events(self, after_seq: int = 0) -> Iterator[RecordedEvent]:
+        with self._lock:
+            i = bisect_right(self._checkpoints, (after_seq, float("inf"))) - 1
+            offset = self._checkpoints[i][1] if i >= 0 else 0
+        for event in self._read(offset):
+            if event.seq > after_seq:
+                yield event
+
+    def last_seq(self) -> int:
+        with self._lock:
+            self._catch_up()
+            return self._last_seq
+
+    def _read(self, offset: int = 0) -> Iterator[RecordedEvent]:
+        if not self.path.exists():
+            return
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                try:
+                    data = json.loads(line)
+                except ValueError:
+                    # A torn last line from a crash mid-append
+                    continue
+                yield RecordedEvent(seq=data["seq"], occurred_at=datetime.fromisoformat(data["occurred_at"]),
+                                    name=data["event"], payload=data.get("payload", {}))
+
+def _seq_of(line: bytes) -> Optional[int]:
+    try:
+        return int(json.loads(line)["seq"])
+    except (ValueError, KeyError, TypeError):
+        return None
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms fall back to process-local locks
+    fcntl = None
+
+@contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive advisory lock on `path` (created if missing) across processes."""
+    if fcntl is None:
+        yield
+        return
+    with open(path, "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+class FileLease:
+    """
+    Exclusive lock on a file, taken without waiting and kept until released.
+
+    Used to elect one process for a job (the lease holder) and to tell
+    whether the process owning a file is still running: the lock goes away
+    with the process, so a lease that can be acquired has no live holder.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._file: Optional[IO[str]] = None
+        self._thread_lock = threading.Lock()
+
+    @property
+    def held(self) -> bool:
+        return self._file is not None
+
+    def acquire(self) -> bool:
+        """Take the lease if no other holder has it; True while this instance holds it."""
+        with self._thread_lock:
+            if self._file is not None:
+                return True
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            lock_file = open(self.path, "a")
+            if fcntl is not None:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except OSError:
+                    lock_file.close()
+                    return False
+            self._file = lock_file
+            return True
+
+    def release(self) -> None:
+        with self._thread_lock:
+            if self._file is None:
+                return
+            if fcntl is not None:
+                fcntl.flock(self._file, fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
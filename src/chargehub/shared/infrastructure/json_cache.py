@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+def read_json_cache(path: Optional[Path], version: int, source: object) -> Optional[Dict[str, Any]]:
+    """The payload cached at `path` if it has `version` and was derived from `source`; None otherwise.
+
+    A missing, unreadable or corrupt cache is a miss, never an error.
+    """
+    if path is None:
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            payload = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(payload, dict) or payload.get("version") != version or payload.get("source") != source:
+        return None
+    return payload
+
+def write_json_cache(path: Optional[Path], version: int, source: object, **fields: Any) -> bool:
+    """Atomically replace the cache at `path` with `fields`, tagged with `version` and `source`.
+
+    Returns False if the cache could not be written. Caches are derived
+    data, so a read-only or full disk only means rebuilding it next time.
+    """
+    if path is None:
+        return False
+    path = Path(path)
+    tmp_path = path.with_suffix(path.suffix + f".{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": version, "source": source, **fields}, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        return False
+    return True
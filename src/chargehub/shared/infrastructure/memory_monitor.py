@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Callable, Deque, Dict, List, Mapping, Optional, Set, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# A sizer gets the ids already counted by earlier components and returns bytes, or bytes per part
+Sizer = Callable[[Set[int]], Union[int, Mapping[str, int]]]
+
+@dataclass(frozen=True)
+class ComponentUsage:
+    name: str
+    bytes: int
+    budget: Optional[int] = None
+    # Change since the first sample of this component
+    growth: int = 0
+    parts: Mapping[str, int] = field(default_factory=dict)
+
+    @property
+    def over_budget(self) -> bool:
+        return self.budget is not None and self.bytes > self.budget
+
+@dataclass(frozen=True)
+class ModuleGrowth:
+    """Allocations still alive from one module's code, and their change since the previous sample."""
+    module: str
+    size: int
+    size_diff: int
+    count_diff: int
+
+@dataclass(frozen=True)
+class MemoryAlert:
+    component: str
+    bytes: int
+    budget: int
+    raised_at: datetime
+
+@dataclass(frozen=True)
+class MemoryReport:
+    taken_at: datetime
+    components: Tuple[ComponentUsage, ...]
+    # Empty unless tracemalloc tracing is enabled (and after the first traced sample)
+    module_growth: Tuple[ModuleGrowth, ...] = ()
+    traced_bytes: Optional[int] = None
+    duration_seconds: float = 0.0
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(c.bytes for c in self.components)
+
+class MemoryMonitor:
+    """
+    Periodic memory accounting per application component.
+
+    Components are registered with a sizer (usually a repository's
+    `memory_usage`) and an optional byte budget. Each `sample()` sizes them
+    in registration order with one shared set of seen objects, so an object
+    referenced by several components is charged to the first. A component
+    crossing its budget raises one alert (logged and kept); it re-arms once
+    the component is back under budget.
+
+    With `trace=True`, tracemalloc is started and every sample diffs its
+    snapshot against the previous one, grouped by the module that allocated
+    the memory, which points at growth outside the registered components.
+    """
+
+    def __init__(self, trace: bool = False, trace_frames: int = 1, top_modules: int = 15,
+                 alert_history: int = 50,
+                 clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc)) -> None:
+        self.trace = trace
+        self.trace_frames = trace_frames
+        self.top_modules = top_modules
+        self._clock = clock
+        self._components: Dict[str, Tuple[Sizer, Optional[int]]] = {}
+        self._baseline: Dict[str, int] = {}
+        self._over_budget: Set[str] = set()
+        self._alerts: Deque[MemoryAlert] = deque(maxlen=alert_history)
+        self._previous_snapshot: Optional[tracemalloc.Snapshot] = None
+        self._latest: Optional[MemoryReport] = None
+        self._lock = threading.Lock()
+
+    def register(self, name: str, sizer: Sizer, budget: Optional[int] = None) -> "MemoryMonitor":
+        self._components[name] = (sizer, budget)
+        return self
+
+    @property
+    def latest(self) -> Optional[MemoryReport]:
+        return self._latest
+
+    def alerts(self) -> List[MemoryAlert]:
+        """Raised alerts, newest first."""
+        return list(self._alerts)[::-1]
+
+    def sample(self) -> MemoryReport:
+        with self._lock:
+            started = time.perf_counter()
+            taken_at = self._clock()
+            components = tuple(self._size_components(taken_at))
+            module_growth, traced = self._trace_diff() if self.trace else ((), None)
+            self._latest = MemoryReport(taken_at=taken_at, components=components, module_growth=module_growth,
+                                        traced_bytes=traced, duration_seconds=time.perf_counter() - started)
+            return self._latest
+
+    def _size_components(self, taken_at: datetime):
+        seen: Set[int] = set()
+        for name, (sizer, budget) in self._components.items():
+            try:
+                measured = sizer(seen)
+            except Exception:
+                # One failing component must not hide the others
+                logger.exception("Sizing %s failed", name)
+                continue
+            parts = dict(measured) if isinstance(measured, Mapping) else {}
+            size = sum(parts.values()) if isinstance(measured, Mapping) else int(measured)
+            usage = ComponentUsage(name=name, bytes=size, budget=budget,
+                                   growth=size - self._baseline.setdefault(name, size), parts=parts)
+            self._check_budget(usage, taken_at)
+            yield usage
+
+    def _check_budget(self, usage: ComponentUsage, taken_at: datetime) -> None:
+        if not usage.over_budget:
+            self._over_budget.discard(usage.name)
+            return
+        if usage.name in self._over_budget:
+            return
+        self._over_budget.add(usage.name)
+        self._alerts.append(MemoryAlert(usage.name, usage.bytes, usage.budget, taken_at))
+        logger.warning("Memory budget exceeded: %s uses %d bytes (budget %d)", usage.name, usage.bytes, usage.budget)
+
+    def _trace_diff(self) -> Tuple[Tuple[ModuleGrowth, ...], int]:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.trace_frames)
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+            tracemalloc.Filter(False, "<unknown>"),
+        ))
+        traced, _ = tracemalloc.get_traced_memory()
+        previous, self._previous_snapshot = self._previous_snapshot, snapshot
+        if previous is None:
+            return (), traced
+
+        by_module: Dict[str, List[int]] = {}  # module -> [size, size_diff, count_diff]
+        for stat in snapshot.compare_to(previous, "filename"):
+            acc = by_module.setdefault(module_name(stat.traceback[0].filename), [0, 0, 0])
+            acc[0] += stat.size
+            acc[1] += stat.size_diff
+            acc[2] += stat.count_diff
+        ranked = sorted(by_module.items(), key=lambda item: (-item[1][1], item[0]))[:self.top_modules]
+        return tuple(ModuleGrowth(module, *acc) for module, acc in ranked), traced
+
+    def stop_tracing(self) -> None:
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._previous_snapshot = None
+
+@lru_cache(maxsize=4096)
+def module_name(filename: str) -> str:
+    """Dotted module name of a source file, relative to the longest matching sys.path entry."""
+    path = os.path.abspath(filename)
+    roots = sorted((os.path.abspath(p) for p in sys.path if p), key=len, reverse=True)
+    for root in roots:
+        if path.startswith(root + os.sep):
+            relative = os.path.splitext(path[len(root) + 1:])[0]
+            parts = relative.split(os.sep)
+            if parts[-1] == "__init__":
+                parts.pop()
+            return ".".join(parts) or filename
+    return filename
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+class PeriodicTask:
+    """
+    Runs `action` every `interval_seconds` on a daemon thread until stopped.
+
+    Exceptions raised by the action are logged and the schedule continues,
+    so one failed run does not silently end background maintenance.
+    """
+
+    def __init__(self, action: Callable[[], object], interval_seconds: float, name: str = "periodic-task") -> None:
+        if interval_seconds <= 0:
+            raise ValueError("interval_seconds must be positive")
+        self.action = action
+        self.interval_seconds = interval_seconds
+        self.name = name
+        self.runs = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> "PeriodicTask":
+        if not self.running:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name=self.name, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def run_once(self) -> None:
+        try:
+            self.action()
+        except Exception:
+            logger.exception("%s failed", self.name)
+        finally:
+            self.runs += 1
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            self.run_once()
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import os
+import struct
+import zlib
+from pathlib import Path
+from typing import Collection, List, Optional, Tuple
+
+from chargehub.shared.infrastructure.file_lock import FileLease
+
+MAGIC = b"CHSN"
+# magic, snapshot kind, payload layout version, payload bytes, CRC-32 of the payload
+_HEADER = struct.Struct("<4s4sHxxQI")
+
+class SnapshotError(ValueError):
+    """Raised when a snapshot file is missing, of the wrong kind or corrupt."""
+
+def write_snapshot(path: Path, kind: bytes, payload: bytes, version: int = 1) -> int:
+    """Write header and payload in one sequential write, then atomically replace `path`.
+
+    Returns the number of bytes written.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = _HEADER.pack(MAGIC, kind, version, len(payload), zlib.crc32(payload)) + payload
+    tmp_path = path.with_suffix(path.suffix + f".{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return len(data)
+
+def read_snapshot(path: Path, kind: bytes, versions: Collection[int] = (1,)) -> Tuple[int, bytes]:
+    """Return (layout version, payload) of a snapshot of `kind`, verifying version, length and checksum."""
+    try:
+        data = Path(path).read_bytes()
+    except OSError as e:
+        raise SnapshotError(f"Cannot read snapshot {path}: {e}") from e
+    if len(data) < _HEADER.size:
+        raise SnapshotError(f"{path} is truncated")
+    magic, file_kind, version, length, checksum = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC or file_kind != kind:
+        raise SnapshotError(f"{path} is not a {kind.decode()} snapshot")
+    if version not in versions:
+        raise SnapshotError(f"{path} has snapshot version {version}, expected one of {sorted(versions)}")
+    payload = data[_HEADER.size:]
+    if len(payload) != length or zlib.crc32(payload) != checksum:
+        raise SnapshotError(f"{path} is corrupt (length or checksum mismatch)")
+    return version, payload
+
+class WorkerSnapshots:
+    """
+    One snapshot file per worker process for state that differs between workers.
+
+    For `reports.snap`, a worker writes only `reports.<worker>.snap`, so
+    workers never overwrite each other's state, and holds a lease on
+    `<file>.lock` while it runs. On startup a worker merges every file
+    (plus a plain `reports.snap` from single-process runs). Files whose
+    lease can be taken belong to workers that are gone; once the merged
+    state is written to the worker's own file they can be removed.
+    """
+
+    def __init__(self, path: Path, worker_id: Optional[str] = None) -> None:
+        self.base = Path(path)
+        self.worker_id = worker_id or str(os.getpid())
+        self.path = self._worker_path(self.worker_id)
+        self._lease = FileLease(_lock_path(self.path))
+
+    def _worker_path(self, worker_id: str) -> Path:
+        return self.base.with_name(f"{self.base.stem}.{worker_id}{self.base.suffix}")
+
+    def claim(self) -> "WorkerSnapshots":
+        if not self._lease.acquire():
+            raise RuntimeError(f"Another worker writes {self.path}")
+        return self
+
+    def paths(self) -> List[Path]:
+        """Every existing snapshot of this kind (all workers' and the plain one)."""
+        pattern = f"{self.base.stem}.*{self.base.suffix}"
+        found = [p for p in self.base.parent.glob(pattern) if p.name.count(".") == self.base.name.count(".") + 1]
+        if self.base.exists():
+            found.append(self.base)
+        return sorted(found)
+
+    def orphaned(self) -> List[Path]:
+        """Snapshots of workers that are no longer running."""
+        orphans = []
+        for path in self.paths():
+            if path == self.path:
+                continue
+            lease = FileLease(_lock_path(path))
+            if lease.acquire():
+                lease.release()
+                orphans.append(path)
+        return orphans
+
+    @staticmethod
+    def remove(paths: Collection[Path]) -> None:
+        for path in paths:
+            for stale in (path, _lock_path(path)):
+                try:
+                    stale.unlink()
+                except FileNotFoundError:
+                    pass
+
+    def release(self) -> None:
+        self._lease.release()
+
+def _lock_path(path: Path) -> Path:
+    return path.with_name(path.name + ".lock")
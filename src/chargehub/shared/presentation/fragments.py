@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from typing import Callable, Hashable, TypeVar
+
+import streamlit as st
+from streamlit.errors import StreamlitAPIException
+
+from chargehub.shared.presentation.interaction_timings import InteractionTimings
+
+T = TypeVar("T")
+
+def fragment(enabled: bool) -> Callable[[Callable], Callable]:
+    """`st.fragment` when enabled; otherwise a no-op, so every interaction reruns the whole script."""
+    return st.fragment if enabled else (lambda func: func)
+
+def rerun(fragment_only: bool) -> None:
+    """Rerun the current fragment, or the whole app when fragments are disabled or the change affects it."""
+    if fragment_only:
+        try:
+            st.rerun(scope="fragment")
+        except StreamlitAPIException:
+            # A fragment running as part of a full-app run cannot rerun on its own
+            pass
+    st.rerun()
+
+def memoised(slot: str, key: Hashable, build: Callable[[], T]) -> T:
+    """Keep the last `build()` result per session slot, rebuilt only when `key` changes."""
+    cached = st.session_state.get(slot)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    value = build()
+    st.session_state[slot] = (key, value)
+    return value
+
+def interaction_timings() -> InteractionTimings:
+    state = st.session_state
+    if "interaction_timings" not in state:
+        state["interaction_timings"] = InteractionTimings()
+    return state["interaction_timings"]
+
+def render_timings(timings: InteractionTimings) -> None:
+    with st.expander("⏱️ Server time per interaction"):
+        st.table([{"Section": s, "ms": f"{ms:.1f}"} for s, ms in timings.recent()])
+        st.table([{"Section": t.section, "Runs": t.runs, "Last ms": f"{t.last_ms:.1f}",
+                   "Median ms": f"{t.median_ms:.1f}"} for t in timings.summary()])
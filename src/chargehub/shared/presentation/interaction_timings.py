@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import statistics
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, Iterator, List, Tuple
+
+@dataclass(frozen=True)
+class SectionTiming:
+    section: str
+    runs: int
+    last_ms: float
+    median_ms: float
+
+class InteractionTimings:
+    """
+    Server-side render time per UI section, kept per session.
+
+    Every interaction reruns either the whole script or just one fragment;
+    each measured section appends one record, so the log shows what an
+    interaction actually recomputed and how long it took.
+    """
+
+    def __init__(self, history: int = 50, clock: Callable[[], float] = time.perf_counter) -> None:
+        self._clock = clock
+        self._records: Deque[Tuple[str, float]] = deque(maxlen=history)
+        self._by_section: Dict[str, Deque[float]] = {}
+        self._history = history
+
+    @contextmanager
+    def measure(self, section: str) -> Iterator[None]:
+        start = self._clock()
+        try:
+            yield
+        finally:
+            self.record(section, (self._clock() - start) * 1000)
+
+    def record(self, section: str, ms: float) -> None:
+        self._records.append((section, ms))
+        self._by_section.setdefault(section, deque(maxlen=self._history)).append(ms)
+
+    def recent(self, n: int = 10) -> List[Tuple[str, float]]:
+        """The last `n` (section, ms) records, newest first."""
+        return list(self._records)[::-1][:n]
+
+    def summary(self) -> List[SectionTiming]:
+        return [
+            SectionTiming(section=section, runs=len(samples), last_ms=samples[-1], median_ms=statistics.median(samples))
+            for section, samples in sorted(self._by_section.items())
+        ]
@@ -0,0 +1,102 @@
+"""Monte Carlo sweep of the report threshold and the approval delay.
+
+Simulates every station of the register (or --stations N, required when
+the register file is missing) for --runs independent runs per policy and
+prints, per threshold and approval delay, how long broken stations stay
+shown available, how many working stations are wrongly taken offline and
+how long detection takes.
+
+Usage:
+    python -m chargehub.simulation [--thresholds 2 3 5 8] [--delays 0 4 12 24]
+                                   [--window HOURS | --no-window] [--runs N] [--days N]
+                                   [--stations N] [--seed N] [--validate]
+
+--validate first replays a small run through the real MalfunctionService
+and checks that it matches the vectorised simulation hour by hour.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+
+from chargehub.config import ChargeHubConfig
+from chargehub.simulation.application.policy_simulator import (
+    FailureModel,
+    SimulationTrace,
+    policy_grid,
+    simulate,
+)
+
+def _register_size(config: ChargeHubConfig) -> int:
+    from chargehub.discovery.infrastructure.repositories.charging_station_csv_repository import (
+        ChargingStationCSVRepository,
+    )
+
+    return ChargingStationCSVRepository(config.DATA_PATH, config.STATION_CACHE_PATH).count_stations()
+
+def _validate(model: FailureModel, policies, seed: int) -> bool:
+    from chargehub.simulation.application.service_replay import replay_with_service
+
+    ok = True
+    for policy in policies:
+        trace = SimulationTrace()
+        simulate(model, policy, stations=10, hours=14 * 24, seed=seed, trace=trace)
+        replay = replay_with_service(model, policy, stations=10, hours=14 * 24, seed=seed)
+        same = all((a == b).all() for a, b in zip(trace.offline, replay.offline)) and \
+            all((a == b).all() for a, b in zip(trace.broken, replay.broken))
+        print(f"validate {policy.label:<32} {'ok' if same else 'MISMATCH'}")
+        ok &= same
+    return ok
+
+def main(argv=None) -> int:
+    config = ChargeHubConfig()
+    defaults = FailureModel()
+    parser = argparse.ArgumentParser(prog="python -m chargehub.simulation")
+    parser.add_argument("--thresholds", type=int, nargs="+", default=[2, 3, 5, 8])
+    parser.add_argument("--delays", type=int, nargs="+", default=[0, 4, 12, 24], help="approval delay in hours")
+    parser.add_argument("--window", type=int, default=config.REPORT_COUNT_WINDOW_HOURS, help="count window in hours")
+    parser.add_argument("--no-window", action="store_true", help="approved reports count forever")
+    parser.add_argument("--runs", type=int, default=100)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--stations", type=int, help="default: the stations in the register")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--breakdowns-per-year", type=float, default=defaults.breakdowns_per_station_year)
+    parser.add_argument("--genuine-reports-per-hour", type=float, default=defaults.genuine_reports_per_hour)
+    parser.add_argument("--false-reports-per-hour", type=float, default=defaults.false_reports_per_hour)
+    parser.add_argument("--false-approval-rate", type=float, default=defaults.false_approval_rate)
+    parser.add_argument("--mean-repair-hours", type=float, default=defaults.mean_repair_hours)
+    parser.add_argument("--validate", action="store_true")
+    args = parser.parse_args(argv)
+
+    model = FailureModel(
+        breakdowns_per_station_year=args.breakdowns_per_year,
+        genuine_reports_per_hour=args.genuine_reports_per_hour,
+        false_reports_per_hour=args.false_reports_per_hour,
+        false_approval_rate=args.false_approval_rate,
+        mean_repair_hours=args.mean_repair_hours,
+    )
+    policies = policy_grid(args.thresholds, args.delays, None if args.no_window else args.window)
+    if args.validate and not _validate(model, policies, args.seed):
+        return 1
+
+    try:
+        stations = args.stations or _register_size(config)
+    except FileNotFoundError:
+        parser.error(f"station register {config.DATA_PATH} not found; pass --stations N to simulate without it")
+    hours = args.days * 24
+    print(f"{stations} stations x {args.runs} runs x {hours} h per policy")
+    print(f"{'policy':<32}{'wrongly offline':>16}{'false alarms':>14}{'broken shown ok':>17}"
+          f"{'detected':>10}{'mean TTD':>10}{'p90 TTD':>9}")
+    started = time.perf_counter()
+    for policy in policies:
+        o = simulate(model, policy, stations, args.runs, hours, args.seed)
+        mean = f"{o.mean_hours_to_detection:.1f}h" if o.mean_hours_to_detection is not None else "-"
+        p90 = f"{o.p90_hours_to_detection:.0f}h" if o.p90_hours_to_detection is not None else "-"
+        print(f"{policy.label:<32}{o.wrongly_offline_share:>15.4%} {o.false_alarms_per_1000_station_months:>9.1f}/1k/m"
+              f"{o.broken_available_share:>16.3%} {o.detected_share:>9.1%}{mean:>10}{p90:>9}")
+    print(f"{len(policies)} policies in {time.perf_counter() - started:.1f}s")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
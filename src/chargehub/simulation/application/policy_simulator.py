@@ -0,0 +1,298 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+@dataclass(frozen=True)
+class FailureModel:
+    """How stations break, get reported and get repaired (rates are per station).
+
+    Only reports that the administrator will approve are simulated; rejected
+    ones never count towards the threshold, so they cannot change the outcome.
+    At most one approved report per station and hour is filed.
+    """
+    breakdowns_per_station_year: float = 4.0
+    # Reports from users finding the station broken (while it is shown available)
+    genuine_reports_per_hour: float = 0.3
+    genuine_approval_rate: float = 0.9
+    # Mistaken or malicious reports about a working station
+    false_reports_per_hour: float = 0.004
+    false_approval_rate: float = 0.3
+    mean_repair_hours: float = 24.0
+
+    def __post_init__(self) -> None:
+        for name in ("breakdowns_per_station_year", "genuine_reports_per_hour", "false_reports_per_hour"):
+            if getattr(self, name) < 0:
+                raise ValueError(f"{name} must not be negative")
+        for name in ("genuine_approval_rate", "false_approval_rate"):
+            if not 0 <= getattr(self, name) <= 1:
+                raise ValueError(f"{name} must be between 0 and 1")
+        if self.mean_repair_hours <= 0:
+            raise ValueError("mean_repair_hours must be positive")
+
+    def hourly_report_probability(self, broken: bool) -> float:
+        rate, approval = ((self.genuine_reports_per_hour, self.genuine_approval_rate) if broken
+                          else (self.false_reports_per_hour, self.false_approval_rate))
+        return (1.0 - math.exp(-rate)) * approval
+
+@dataclass(frozen=True)
+class ModerationPolicy:
+    """The `MalfunctionService` settings under test."""
+    threshold: int
+    approval_delay_hours: int = 0
+    # Approved reports filed longer ago stop counting (None = forever)
+    count_window_hours: Optional[int] = 72
+
+    def __post_init__(self) -> None:
+        if self.threshold < 1:
+            raise ValueError("threshold must be at least 1")
+        if self.approval_delay_hours < 0:
+            raise ValueError("approval_delay_hours must not be negative")
+        if self.count_window_hours is not None and self.count_window_hours < 0:
+            raise ValueError("count_window_hours must not be negative")
+
+    @property
+    def label(self) -> str:
+        window = "∞" if self.count_window_hours is None else f"{self.count_window_hours}h"
+        return f"T={self.threshold} delay={self.approval_delay_hours}h window={window}"
+
+@dataclass(frozen=True)
+class PolicyOutcome:
+    policy: ModerationPolicy
+    station_hours: int
+    # Station-hours shown unavailable although the station works
+    wrongly_offline_hours: int
+    # Times a working station was taken offline
+    false_alarms: int
+    # Station-hours shown available although the station is broken
+    broken_available_hours: int
+    breakdowns: int
+    detections: int
+    mean_hours_to_detection: Optional[float]
+    p90_hours_to_detection: Optional[float]
+
+    @property
+    def wrongly_offline_share(self) -> float:
+        return self.wrongly_offline_hours / self.station_hours if self.station_hours else 0.0
+
+    @property
+    def broken_available_share(self) -> float:
+        return self.broken_available_hours / self.station_hours if self.station_hours else 0.0
+
+    @property
+    def detected_share(self) -> float:
+        return self.detections / self.breakdowns if self.breakdowns else 0.0
+
+    @property
+    def false_alarms_per_1000_station_months(self) -> float:
+        months = self.station_hours / (30.44 * 24)
+        return 1000 * self.false_alarms / months if months else 0.0
+
+@dataclass()
+class SimulationTrace:
+    """Per-hour state of every simulated station, kept for validation runs."""
+    offline: List[np.ndarray] = field(default_factory=list)
+    broken: List[np.ndarray] = field(default_factory=list)
+
+class Randomness:
+    """
+    The exogenous random draws, from one stream per purpose.
+
+    Reports arrive as geometric gaps (whole hours until the next approved
+    report) rather than as a coin flip per station and hour, so an hour
+    only costs draws for the stations whose state changed or that just
+    filed. Draws are made for stations in ascending order; the service
+    replay draws through the same object, so both see the same
+    breakdowns, reports and repair times as long as their states agree.
+    """
+
+    NEVER = np.iinfo(np.int32).max // 2
+
+    def __init__(self, seed: int) -> None:
+        reports, breakdowns, repairs = np.random.SeedSequence(seed).spawn(3)
+        self._reports = np.random.default_rng(reports)
+        self._breakdowns = np.random.default_rng(breakdowns)
+        self._repairs = np.random.default_rng(repairs)
+
+    def hours_until_report(self, probabilities: np.ndarray) -> np.ndarray:
+        gaps = self._reports.geometric(np.maximum(probabilities, 1e-12)).astype(np.int64)
+        return np.where(probabilities > 0, np.minimum(gaps, self.NEVER), self.NEVER).astype(np.int32)
+
+    def hours_until_breakdown(self, count: int, model: FailureModel) -> np.ndarray:
+        if model.breakdowns_per_station_year <= 0:
+            return np.full(count, self.NEVER, dtype=np.int32)
+        mean_hours = 365 * 24 / model.breakdowns_per_station_year
+        return np.minimum(np.ceil(self._breakdowns.exponential(mean_hours, count)), self.NEVER).astype(np.int32)
+
+    def repair_hours(self, count: int, model: FailureModel) -> np.ndarray:
+        return np.maximum(np.ceil(self._repairs.exponential(model.mean_repair_hours, count)), 1).astype(np.int32)
+
+def simulate(model: FailureModel, policy: ModerationPolicy, stations: int, runs: int = 1, hours: int = 30 * 24,
+             seed: int = 0, trace: Optional[SimulationTrace] = None) -> PolicyOutcome:
+    """
+    Simulate `runs` copies of `stations` independent stations for `hours` hours.
+
+    All stations of all runs are columns of the same arrays and advance one
+    hour per step. Breakdowns, reports and crew visits are scheduled as
+    whole hours, so an hour finds the stations due with one comparison
+    and every other step only touches those stations. Each hour follows the order of the real service:
+    breakdowns, report filing (only while shown available), approvals after
+    the fixed delay (the threshold is checked on every approval), crew
+    visits (a visit while the station still has `threshold` counted reports
+    is `mark_repair_completed`, otherwise it only fixes the hardware) and
+    finally the window sweep that brings stations back below the threshold.
+    Approved reports count while `hour - window <= filed_at`, as in
+    `ReportRepositoryImpl.count_reports`.
+    """
+    if stations < 1 or runs < 1 or hours < 1:
+        raise ValueError("stations, runs and hours must be positive")
+    n = stations * runs
+    rand = Randomness(seed)
+    never = Randomness.NEVER
+    delay, window, threshold = policy.approval_delay_hours, policy.count_window_hours, policy.threshold
+    counts_at_all = window is None or delay <= window
+    # Stations that filed (a report to be approved) per hour, for as long as those reports can change the count
+    slots = max(window + 2 if window is not None else 0, delay + 1)
+    empty = np.zeros(0, dtype=np.int64)
+    filings: List[Tuple[np.ndarray, np.ndarray]] = [(empty, empty)] * slots
+
+    p_broken = model.hourly_report_probability(True)
+    p_working = model.hourly_report_probability(False)
+
+    broken = np.zeros(n, dtype=bool)
+    offline = np.zeros(n, dtype=bool)
+    count = np.zeros(n, dtype=np.int32)
+    # Bumped when a completed repair clears a station's reports, which voids its filings still in the ring
+    epoch = np.zeros(n, dtype=np.int32)
+    broke_at = np.zeros(n, dtype=np.int32)
+    detected = np.zeros(n, dtype=bool)
+    repair_at = np.full(n, never, dtype=np.int32)
+    next_breakdown = rand.hours_until_breakdown(n, model)
+    next_report = rand.hours_until_report(np.full(n, p_working))
+    # Earliest scheduled event per station: the only dense scan of an hour is for the stations due
+    next_event = np.minimum(next_breakdown, next_report)
+    # broken + 2 * offline at the start of the hour, and how many stations are in each of the four states
+    state = np.zeros(n, dtype=np.int8)
+    in_state = np.array([n, 0, 0, 0], dtype=np.int64)
+
+    detection_hours = np.zeros(hours + 1, dtype=np.int64)
+    wrongly_offline = broken_available = false_alarms = breakdowns = 0
+
+    for hour in range(hours):
+        due = np.flatnonzero(next_event == hour)
+        touched = [due]
+
+        # 1. Breakdowns (a station shown unavailable is not used; its breakdown waits until it is back)
+        breaking = due[next_breakdown[due] == hour]
+        waiting = breaking[offline[breaking]]
+        next_breakdown[waiting] = hour + 1
+        newly_broken = breaking[~offline[breaking]]
+        broken[newly_broken] = True
+        broke_at[newly_broken] = hour
+        detected[newly_broken] = False
+        next_breakdown[newly_broken] = never
+        breakdowns += len(newly_broken)
+
+        # 2. Reports filed by users of stations shown available
+        filing = due[(next_report[due] == hour) & ~offline[due]]
+        filings[hour % slots] = (filing, epoch[filing])
+
+        # 3. Approvals of the reports filed `delay` hours ago; expiry of those older than the window
+        approved = expired = empty
+        if counts_at_all:
+            if hour >= delay:
+                stations_, epochs = filings[(hour - delay) % slots]
+                approved = stations_[epoch[stations_] == epochs]
+                count[approved] += 1
+            if window is not None and hour >= window + 1:
+                stations_, epochs = filings[(hour - window - 1) % slots]
+                expired = stations_[epoch[stations_] == epochs]
+                count[expired] -= 1
+        newly_offline = approved[~offline[approved] & (count[approved] >= threshold)]
+        if len(newly_offline):
+            offline[newly_offline] = True
+            false_alarms += int(np.count_nonzero(~broken[newly_offline]))
+            found = newly_offline[broken[newly_offline] & ~detected[newly_offline]]
+            detected[found] = True
+            np.add.at(detection_hours, hour - broke_at[found], 1)
+            # A crew is sent unless one is already on its way
+            dispatch = newly_offline[repair_at[newly_offline] == never]
+            repair_at[dispatch] = hour + rand.repair_hours(len(dispatch), model)
+            touched.append(newly_offline)
+
+        # 4. Crew visits
+        visited = due[repair_at[due] == hour]
+        if len(visited):
+            repair_at[visited] = never
+            broken[visited] = False
+            next_breakdown[visited] = hour + rand.hours_until_breakdown(len(visited), model)
+            completed = visited[count[visited] >= threshold]
+            offline[completed] = False
+            count[completed] = 0
+            epoch[completed] += 1
+
+        # 5. Window sweep; only an expiry can take an offline station below the threshold
+        swept = expired[offline[expired] & (count[expired] < threshold)]
+        offline[swept] = False
+        touched.append(swept)
+
+        changed = _union(touched)
+        now = broken[changed] + 2 * offline[changed].astype(np.int8)
+        before = state[changed]
+        # Next report of every station that just filed or whose report rate changed
+        filed_now = np.zeros(len(changed), dtype=bool)
+        filed_now[np.searchsorted(changed, filing)] = True
+        redraw = changed[((now != before) | filed_now) & ~offline[changed]]
+        if len(redraw):
+            probabilities = np.where(broken[redraw], p_broken, p_working)
+            next_report[redraw] = hour + rand.hours_until_report(probabilities)
+        # Reports of a station shown unavailable are not due; it gets a fresh one when it is back
+        reports_due = np.where(offline[changed], never, next_report[changed])
+        next_event[changed] = np.minimum(np.minimum(next_breakdown[changed], reports_due), repair_at[changed])
+
+        in_state -= np.bincount(before, minlength=4)
+        in_state += np.bincount(now, minlength=4)
+        state[changed] = now
+        wrongly_offline += int(in_state[2])
+        broken_available += int(in_state[1])
+        if trace is not None:
+            trace.offline.append(offline.copy())
+            trace.broken.append(broken.copy())
+
+    detections = int(detection_hours.sum())
+    return PolicyOutcome(
+        policy=policy,
+        station_hours=n * hours,
+        wrongly_offline_hours=wrongly_offline,
+        false_alarms=false_alarms,
+        broken_available_hours=broken_available,
+        breakdowns=breakdowns,
+        detections=detections,
+        mean_hours_to_detection=(float(np.dot(detection_hours, np.arange(hours + 1))) / detections
+                                 if detections else None),
+        p90_hours_to_detection=(float(np.searchsorted(np.cumsum(detection_hours), 0.9 * detections))
+                                if detections else None),
+    )
+
+def _union(arrays: List[np.ndarray]) -> np.ndarray:
+    """Sorted distinct values of some small index arrays (cheaper than np.unique at these sizes)."""
+    values = np.concatenate(arrays)
+    values.sort()
+    if len(values) < 2:
+        return values
+    keep = np.empty(len(values), dtype=bool)
+    keep[0] = True
+    np.not_equal(values[1:], values[:-1], out=keep[1:])
+    return values[keep]
+
+def sweep(model: FailureModel, policies: Iterable[ModerationPolicy], stations: int, runs: int = 1,
+          hours: int = 30 * 24, seed: int = 0) -> List[PolicyOutcome]:
+    """Simulate every policy with the same seed, so differences come from the policy rather than from chance."""
+    return [simulate(model, policy, stations, runs, hours, seed) for policy in policies]
+
+def policy_grid(thresholds: Sequence[int], approval_delays: Sequence[int],
+                count_window_hours: Optional[int] = 72) -> List[ModerationPolicy]:
+    return [ModerationPolicy(t, d, count_window_hours) for t in thresholds for d in approval_delays]
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Tuple
+from uuid import UUID, uuid4
+
+import numpy as np
+
+from chargehub.discovery.domain.aggregates.charging_station import ChargingStationAggregate
+from chargehub.discovery.infrastructure.repositories.charging_station_repository import ChargingStationRepository
+from chargehub.malfunction.application.malfunction_service import MalfunctionService
+from chargehub.malfunction.infrastructure.repositories.report_repository import ReportRepositoryImpl
+from chargehub.simulation.application.policy_simulator import FailureModel, ModerationPolicy, Randomness, SimulationTrace
+
+_START = datetime(2025, 1, 6, tzinfo=timezone.utc)
+
+def replay_with_service(model: FailureModel, policy: ModerationPolicy, stations: int, hours: int,
+                        seed: int = 0) -> SimulationTrace:
+    """
+    Run the simulation's scenario through the real `MalfunctionService`.
+
+    Breakdowns, report arrivals and repair times come from the same random
+    streams as `simulate`, but every report is filed, approved and counted
+    by the service and its repositories, station by station, against a
+    clock advanced hour by hour. A trace equal to the vectorised one shows
+    that the simulator applies the service's threshold, window, sweep and
+    repair rules. Meant for small runs only.
+    """
+    now = [_START]
+    charging = ChargingStationRepository([
+        ChargingStationAggregate(station_id=i, postal_code="10115", latitude=52.52, longitude=13.40, available=True)
+        for i in range(stations)
+    ])
+    report_repository = ReportRepositoryImpl(
+        clock=lambda: now[0],
+        count_window=timedelta(hours=policy.count_window_hours) if policy.count_window_hours is not None else None,
+    )
+    service = MalfunctionService(report_repository=report_repository, charging_station_repository=charging,
+                                 threshold=policy.threshold)
+    rand = Randomness(seed)
+    p_broken = model.hourly_report_probability(True)
+    p_working = model.hourly_report_probability(False)
+
+    broken = [False] * stations
+    repair_at = [-1] * stations
+    next_breakdown = rand.hours_until_breakdown(stations, model).tolist()
+    next_report = rand.hours_until_report(np.full(stations, p_working)).tolist()
+    awaiting_approval: Dict[int, List[Tuple[int, UUID]]] = {}  # hour due -> (station, report id)
+    trace = SimulationTrace()
+
+    def offline(station_id: int) -> bool:
+        return not charging.is_available(station_id)
+
+    for hour in range(hours):
+        now[0] = _START + timedelta(hours=hour)
+        was_broken, was_offline = list(broken), [offline(i) for i in range(stations)]
+        for i in range(stations):
+            if not broken[i] and not offline(i) and next_breakdown[i] <= hour:
+                broken[i] = True
+
+        filing = [next_report[i] == hour and not offline(i) for i in range(stations)]
+        for i in range(stations):
+            if not filing[i]:
+                continue
+            # Random texts, so the duplicate and near-duplicate checks never fire
+            service.file_malfunction_report(i, f"{uuid4().hex} {uuid4().hex}")
+            report_id = report_repository.get_pending_reports()[-1].id
+            awaiting_approval.setdefault(hour + policy.approval_delay_hours, []).append((i, report_id))
+
+        before_approvals = [offline(i) for i in range(stations)]
+        for station_id, report_id in awaiting_approval.pop(hour, []):
+            # Reports cleared by a completed repair are gone
+            if report_repository.get_report(report_id) is not None:
+                service.approve_report(report_id)
+        dispatch = [i for i in range(stations) if offline(i) and not before_approvals[i] and repair_at[i] < 0]
+        for i, repair_hours in zip(dispatch, rand.repair_hours(len(dispatch), model).tolist()):
+            repair_at[i] = hour + repair_hours
+
+        visited = [i for i in range(stations) if repair_at[i] == hour]
+        for i, gap in zip(visited, rand.hours_until_breakdown(len(visited), model).tolist()):
+            repair_at[i] = -1
+            broken[i] = False
+            next_breakdown[i] = hour + gap
+            if report_repository.count_reports(i) >= policy.threshold:
+                service.mark_repair_completed(i)
+
+        service.sweep_expired_windows()
+        redraw = [i for i in range(stations) if not offline(i)
+                  and (filing[i] or broken[i] != was_broken[i] or offline(i) != was_offline[i])]
+        gaps = rand.hours_until_report(np.array([p_broken if broken[i] else p_working for i in redraw]))
+        for i, gap in zip(redraw, gaps.tolist()):
+            next_report[i] = hour + gap
+        trace.offline.append(np.array([offline(i) for i in range(stations)]))
+        trace.broken.append(np.array(broken))
+    return trace
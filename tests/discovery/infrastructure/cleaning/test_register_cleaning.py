@@ -0,0 +1,68 @@
+import math
+
+import pandas as pd
+import pytest
+
+from chargehub.discovery.infrastructure.cleaning.register_cleaning import (
+    DROP, FIX, REGISTER_RULES, CleaningReport, CleaningRule, Condition, RegisterCleaner,
+)
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({
+        "postal_code": ["10115", "10589", "10589", "99999", "12043"],
+        "postal_code_valid": [True, True, True, False, True],
+        "latitude": [52.5, math.nan, 52.52, 52.4, math.nan],
+        "longitude": [13.4, math.nan, 13.30, 13.3, 13.43],
+        "operator": ["Op1", "Other Op", "Robert Bosch GmbH", "Op3", None],
+    }, index=[10, 11, 12, 13, 14])
+
+def test_register_rules_fix_and_drop_with_counts(frame):
+    cleaned, report = RegisterCleaner(REGISTER_RULES).clean(frame)
+
+    assert list(cleaned.index) == [10, 11, 12]
+    assert cleaned.loc[11, ["latitude", "longitude"]].tolist() == [52.5263, 13.3039]
+    # Robert Bosch rows already had coordinates and are left alone
+    assert cleaned.loc[12, "latitude"] == 52.52
+    assert report.input_rows == 5 and report.output_rows == 3
+    assert [(o.rule, o.action, o.rows) for o in report.outcomes] == [
+        ("outside-berlin", DROP, 1), ("10589-missing-coordinates", FIX, 1), ("missing-coordinates", DROP, 1),
+    ]
+
+def test_clean_does_not_modify_input(frame):
+    RegisterCleaner().clean(frame)
+    assert math.isnan(frame.loc[11, "latitude"])
+
+def test_dropped_rows_are_not_counted_by_later_rules(frame):
+    rules = (
+        CleaningRule("drop-10589", DROP, when=(Condition("postal_code", "==", "10589"),)),
+        CleaningRule("drop-all-10589-again", DROP, when=(Condition("postal_code", "==", "10589"),)),
+    )
+    _, report = RegisterCleaner(rules).clean(frame)
+    assert [o.rows for o in report.outcomes] == [2, 0]
+
+@pytest.mark.parametrize("condition, expected", [
+    (Condition("latitude", "<", 52.51), [10, 13]),
+    (Condition("latitude", "!=", 52.5), [12, 13]),   # missing values never match a comparison
+    (Condition("operator", "contains", "Op"), [10, 11, 13]),
+    (Condition("operator", "not contains", "Op"), [12, 14]),
+    (Condition("longitude", "present"), [10, 12, 13, 14]),
+])
+def test_condition_operators(frame, condition, expected):
+    assert list(frame.index[condition.mask(frame)]) == expected
+
+def test_invalid_rules_are_rejected():
+    with pytest.raises(ValueError):
+        Condition("latitude", "~=", 1)
+    with pytest.raises(ValueError):
+        CleaningRule("fix-nothing", FIX, when=(Condition("latitude", "missing"),))
+    with pytest.raises(ValueError):
+        RegisterCleaner((CleaningRule("a", DROP), CleaningRule("a", DROP)))
+
+def test_fingerprint_changes_with_rules():
+    extra = CleaningRule("no-operator", DROP, when=(Condition("operator", "missing"),))
+    assert RegisterCleaner().fingerprint() != RegisterCleaner(REGISTER_RULES + (extra,)).fingerprint()
+
+def test_report_round_trips_through_dict(frame):
+    _, report = RegisterCleaner().clean(frame)
+    assert CleaningReport.from_dict(report.to_dict()) == report
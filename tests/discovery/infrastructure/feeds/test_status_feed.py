@@ -0,0 +1,83 @@
+import json
+import socket
+import threading
+import time
+from datetime import datetime, timezone
+
+from chargehub.discovery.domain.value_objects.station_status_update import StationStatusUpdate
+from chargehub.discovery.infrastructure.feeds.status_feed import (
+    FileStatusFeed,
+    SocketStatusFeed,
+    parse_status_document,
+    parse_status_lines,
+)
+
+WHEN = datetime(2026, 6, 1, 12, 0, tzinfo=timezone.utc)
+
+def test_parse_document_formats():
+    as_list = parse_status_document([{"station_id": 1, "available": True}, {"station_id": 2, "status": "occupied"}])
+    assert as_list == [StationStatusUpdate(1, True), StationStatusUpdate(2, False)]
+
+    as_mapping = parse_status_document({"observed_at": "2026-06-01T12:00:00Z",
+                                        "statuses": {"3": "OUT_OF_ORDER", "4": True, "5": "UNKNOWN"}})
+    assert as_mapping == [StationStatusUpdate(3, False, WHEN), StationStatusUpdate(4, True, WHEN)]
+
+    assert parse_status_document("nonsense") == []
+
+def test_parse_lines_skips_malformed_records():
+    lines = ['{"station_id": 1, "status": "AVAILABLE", "observed_at": "2026-06-01T12:00:00+00:00"}',
+             "", "not json", '{"available": true}', '{"station_id": "x", "available": false}']
+    assert parse_status_lines(lines) == [StationStatusUpdate(1, True, WHEN)]
+
+def test_ndjson_file_is_read_incrementally(tmp_path):
+    path = tmp_path / "feed.ndjson"
+    feed = FileStatusFeed(path)
+    assert feed.poll() == []
+
+    path.write_text('{"station_id": 1, "available": false}\n{"station_id": 2, "avail', encoding="utf-8")
+    assert feed.poll() == [StationStatusUpdate(1, False)]
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('able": true}\n')
+    assert feed.poll() == [StationStatusUpdate(2, True)]
+    assert feed.poll() == []
+
+    # Rotated to a shorter file: read from the start again
+    path.write_text('{"station_id": 3, "available": true}\n', encoding="utf-8")
+    assert feed.poll() == [StationStatusUpdate(3, True)]
+
+def test_json_file_is_reread_when_changed(tmp_path):
+    path = tmp_path / "feed.json"
+    feed = FileStatusFeed(path)
+    path.write_text(json.dumps({"statuses": [{"station_id": 1, "available": True}]}), encoding="utf-8")
+    assert feed.poll() == [StationStatusUpdate(1, True)]
+    assert feed.poll() == []
+
+    path.write_text(json.dumps({"statuses": [{"station_id": 1, "available": False},
+                                             {"station_id": 2, "available": False}]}), encoding="utf-8")
+    assert len(feed.poll()) == 2
+
+def test_socket_feed_buffers_latest_update_per_station():
+    server = socket.create_server(("127.0.0.1", 0))
+    port = server.getsockname()[1]
+
+    def serve():
+        conn, _ = server.accept()
+        with conn:
+            conn.sendall(b'{"station_id": 1, "available": true}\n{"station_id": 2, "avail')
+            time.sleep(0.05)
+            conn.sendall(b'able": false}\n{"station_id": 1, "available": false}\n')
+            time.sleep(0.5)
+
+    threading.Thread(target=serve, daemon=True).start()
+    feed = SocketStatusFeed("127.0.0.1", port, reconnect_seconds=0.1).start()
+    try:
+        received = {}
+        deadline = time.monotonic() + 5
+        while len(received) < 2 or received.get(1) is not False:
+            assert time.monotonic() < deadline
+            received.update({u.station_id: u.available for u in feed.poll()})
+            time.sleep(0.02)
+        assert received == {1: False, 2: False}
+    finally:
+        feed.stop(timeout=2)
+        server.close()
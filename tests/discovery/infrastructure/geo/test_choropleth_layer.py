@@ -0,0 +1,48 @@
+import pytest
+
+from chargehub.discovery.domain.aggregates.charging_station import ChargingStationAggregate
+from chargehub.discovery.infrastructure.geo.choropleth_layer import ChoroplethLayer
+from chargehub.discovery.infrastructure.geo.polygon_area import polygon_area_km2
+from chargehub.discovery.infrastructure.repositories.charging_station_repository import ChargingStationRepository
+
+# ~0.01° x ~0.01° squares around Berlin
+def _square(code, lon0, lat0, size=0.01):
+    ring = [[lon0, lat0], [lon0 + size, lat0], [lon0 + size, lat0 + size], [lon0, lat0 + size], [lon0, lat0]]
+    return {"type": "Feature", "properties": {"plz_code": code}, "geometry": {"type": "Polygon", "coordinates": [ring]}}
+
+@pytest.fixture
+def geojson():
+    return {"type": "FeatureCollection", "features": [_square("10115", 13.38, 52.53), _square("10117", 13.39, 52.51)]}
+
+@pytest.fixture
+def repo():
+    return ChargingStationRepository([
+        ChargingStationAggregate(station_id=1, postal_code="10115", latitude=52.535, longitude=13.385, available=True),
+        ChargingStationAggregate(station_id=2, postal_code="10115", latitude=52.535, longitude=13.385, available=False),
+    ])
+
+def test_polygon_area_km2():
+    ring = _square("x", 13.38, 52.53)["geometry"]["coordinates"][0]
+    # 0.01° lat ≈ 1.112 km, 0.01° lon ≈ 0.677 km at 52.5°N
+    assert polygon_area_km2([ring]) == pytest.approx(0.753, rel=0.01)
+
+def test_layer_properties(geojson, repo):
+    layer = ChoroplethLayer(geojson, repo)
+
+    props = {f["properties"]["plz_code"]: f["properties"] for f in layer.geojson()["features"]}
+    assert props["10115"]["station_count"] == 2
+    assert props["10115"]["available_ratio"] == 0.5
+    assert props["10115"]["stations_per_km2"] == pytest.approx(2 / 0.753, rel=0.01)
+    assert props["10117"]["station_count"] == 0
+    assert props["10117"]["stations_per_km2"] == 0.0
+    # Source GeoJSON is left untouched
+    assert "station_count" not in geojson["features"][0]["properties"]
+
+def test_layer_refreshes_only_changed_postal_codes(geojson, repo):
+    layer = ChoroplethLayer(geojson, repo)
+    assert layer.refresh() == 0
+
+    repo.update_station_status(2, True)
+    assert layer.refresh() == 1
+    assert layer.stats("10115").available_ratio == 1.0
+    assert layer.stats("99999") is None
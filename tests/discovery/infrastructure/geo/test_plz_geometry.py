@@ -0,0 +1,61 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from chargehub.config import ChargeHubConfig
+from chargehub.discovery.infrastructure.geo.plz_geometry import PlzGeometry
+from chargehub.discovery.infrastructure.geo.polygon_area import geometry_area_km2
+
+def _feature(code, rings, name="x"):
+    return {"type": "Feature", "properties": {"plz_code": code, "plz_name": name}, "geometry": {"type": "Polygon", "coordinates": rings}}
+
+@pytest.fixture
+def geojson():
+    outer = [[13.0, 52.0], [13.1, 52.0], [13.1, 52.1], [13.0, 52.1], [13.0, 52.0]]
+    hole = [[13.02, 52.02], [13.04, 52.02], [13.04, 52.04], [13.02, 52.04], [13.02, 52.02]]
+    other = [[13.1, 52.0], [13.2, 52.0], [13.2, 52.1], [13.1, 52.0]]
+    return {"type": "FeatureCollection", "features": [
+        _feature("10115", [outer, hole], name="Mitte"),
+        _feature("10117", [other]),
+        _feature("10115", [other]),
+    ]}
+
+def test_round_trip_and_zero_copy_views(tmp_path, geojson):
+    path = tmp_path / "plz.geom"
+    PlzGeometry.write(geojson, path)
+    geometry = PlzGeometry(path)
+
+    assert geometry.to_geojson() == geojson
+    assert geometry.coords.shape == (18, 2)
+    assert not geometry.coords.flags.owndata and not geometry.coords.flags.writeable
+    assert geometry.features_for("10115") == [0, 2]
+    np.testing.assert_array_equal(geometry.feature_rings(1)[0][0], geojson["features"][1]["geometry"]["coordinates"][0])
+
+def test_vectorised_areas_match_reference(tmp_path, geojson):
+    path = tmp_path / "plz.geom"
+    PlzGeometry.write(geojson, path)
+    areas = PlzGeometry(path).areas_by_plz()
+
+    expected_10115 = geometry_area_km2(geojson["features"][0]["geometry"]) + geometry_area_km2(geojson["features"][2]["geometry"])
+    assert areas["10115"] == pytest.approx(expected_10115, rel=1e-6)
+    assert areas["10117"] == pytest.approx(geometry_area_km2(geojson["features"][1]["geometry"]), rel=1e-6)
+
+def test_load_regenerates_when_source_changes(tmp_path, geojson):
+    source = tmp_path / "plz.geojson"
+    cache = tmp_path / "cache" / "plz.geom"
+    source.write_text(json.dumps(geojson), encoding="utf-8")
+
+    assert PlzGeometry.load(source, cache).codes == ["10115", "10117", "10115"]
+
+    geojson["features"].pop()
+    source.write_text(json.dumps(geojson), encoding="utf-8")
+    os.utime(source, ns=(1, 1))
+    assert PlzGeometry.load(source, cache).codes == ["10115", "10117"]
+
+def test_berlin_geometry(tmp_path):
+    geometry = PlzGeometry.load(ChargeHubConfig.GEOJSON_PATH, tmp_path / "berlin.geom")
+    assert "10437" in geometry.codes
+    # Berlin covers roughly 891 km²
+    assert sum(geometry.areas_by_plz().values()) == pytest.approx(891, rel=0.02)
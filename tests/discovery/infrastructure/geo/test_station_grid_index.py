@@ -0,0 +1,54 @@
+import random
+
+import pytest
+
+from chargehub.discovery.infrastructure.geo.station_grid_index import StationGridIndex
+
+def _brute_force(points, south, west, north, east):
+    return sorted(i for i, (lat, lon, _) in enumerate(points) if south <= lat <= north and west <= lon <= east)
+
+@pytest.fixture
+def points():
+    rng = random.Random(7)
+    return [(rng.uniform(52.35, 52.65), rng.uniform(13.1, 13.7), rng.random() < 0.7) for _ in range(2000)]
+
+@pytest.fixture
+def grid(points):
+    grid = StationGridIndex(cell_degrees=0.01)
+    for i, (lat, lon, available) in enumerate(points):
+        grid.add(i, lat, lon, available)
+    return grid
+
+@pytest.mark.parametrize("box", [
+    (52.50, 13.35, 52.53, 13.42),   # a few cells
+    (52.30, 13.00, 52.70, 13.80),   # everything
+    (52.512, 13.401, 52.513, 13.402),  # inside a single cell
+    (53.00, 14.00, 53.10, 14.10),   # nothing
+])
+def test_positions_and_count_match_brute_force(grid, points, box):
+    expected = _brute_force(points, *box)
+    assert sorted(grid.positions_in(*box)) == expected
+    assert grid.count_in(*box) == len(expected)
+
+def test_clusters_are_bounded_and_add_up(grid, points):
+    box = (52.30, 13.00, 52.70, 13.80)
+    clusters = grid.clusters_in(*box, max_clusters=25)
+    assert 0 < len(clusters) <= 25
+    assert sum(c.station_count for c in clusters) == len(points)
+    assert sum(c.available_count for c in clusters) == sum(1 for *_, a in points if a)
+    for c in clusters:
+        assert 52.35 <= c.latitude <= 52.65 and 13.1 <= c.longitude <= 13.7
+
+def test_set_available_updates_cluster_counts(grid, points):
+    box = (52.30, 13.00, 52.70, 13.80)
+    before = sum(c.available_count for c in grid.clusters_in(*box, max_clusters=10))
+    position = next(i for i, (*_, a) in enumerate(points) if a)
+    grid.set_available(position, False)
+    grid.set_available(position, False)  # no-op
+    assert sum(c.available_count for c in grid.clusters_in(*box, max_clusters=10)) == before - 1
+
+def test_positions_must_be_dense():
+    grid = StationGridIndex()
+    grid.add(0, 52.5, 13.4, True)
+    with pytest.raises(ValueError):
+        grid.add(2, 52.5, 13.4, True)
@@ -0,0 +1,17 @@
+import pytest
+
+from chargehub.discovery.infrastructure.repositories.availability_bitmap import AvailabilityBitmap
+
+def test_bitmap_set_get_and_count():
+    bitmap = AvailabilityBitmap([True, False] * 10)
+    assert len(bitmap) == 20
+    assert bitmap.count() == 10
+    assert len(bitmap.to_bytes()) == 3
+
+    bitmap[1] = True
+    bitmap[0] = False
+    assert bitmap[1] is True and bitmap[0] is False
+    assert bitmap.count() == 10
+
+    with pytest.raises(IndexError):
+        bitmap[20]
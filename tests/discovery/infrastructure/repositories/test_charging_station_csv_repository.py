@@ -90,3 +90,76 @@ def test_update_station_status(mock_read_csv, mock_csv_data):
     # Test error
     with pytest.raises(KeyError):
         repo.update_station_status(999, False)
+
+@patch("pandas.read_csv")
+def test_cleaning_report_counts_per_rule(mock_read_csv, mock_csv_data):
+    mock_read_csv.return_value = mock_csv_data
+    repo = ChargingStationCSVRepository(Path("dummy.csv"))
+
+    report = repo.cleaning_report()
+    assert report.input_rows == 4 and report.output_rows == 2
+    assert {o.rule: o.rows for o in report.outcomes} == {
+        "outside-berlin": 1, "10589-missing-coordinates": 0, "missing-coordinates": 1,
+    }
+
+def test_cleaned_output_is_cached_until_source_or_rules_change(tmp_path, mock_csv_data):
+    from chargehub.discovery.infrastructure.cleaning.register_cleaning import (
+        DROP, REGISTER_RULES, CleaningRule, Condition, RegisterCleaner,
+    )
+
+    csv_path, cache_path = tmp_path / "register.csv", tmp_path / "cache" / "stations.json"
+    mock_csv_data.to_csv(csv_path, sep=";", index=False)
+    first = ChargingStationCSVRepository(csv_path, cache_path)
+    assert cache_path.exists()
+
+    with patch("pandas.read_csv", side_effect=AssertionError("CSV must not be parsed")):
+        cached = ChargingStationCSVRepository(csv_path, cache_path)
+    assert [(s.station_id, s.latitude, s.address) for s in cached.get_all()] == \
+           [(s.station_id, s.latitude, s.address) for s in first.get_all()]
+    assert cached.cleaning_report() == first.cleaning_report() is not None
+
+    # A new rule invalidates the cache
+    no_op2 = CleaningRule("no-op2", DROP, when=(Condition("operator", "==", "Op2"),))
+    stricter = ChargingStationCSVRepository(csv_path, cache_path, RegisterCleaner(REGISTER_RULES + (no_op2,)))
+    assert [s.postal_code for s in stricter.get_all()] == ["10115"]
+
+def test_registry_decides_which_postal_codes_are_kept(tmp_path):
+    from chargehub.discovery.infrastructure.repositories.postal_code_registry import InMemoryPostalCodeRegistry
+
+    csv_path, cache_path = tmp_path / "register.csv", tmp_path / "stations.json"
+    pd.DataFrame({
+        "Postleitzahl": ["10115", "14195"], "Breitengrad": ["52.5", "52.45"], "Längengrad": ["13.4", "13.29"],
+        "Betreiber": ["Op1", "Op2"], "Straße": ["S1", "S2"], "Hausnummer": ["1", "2"],
+    }).to_csv(csv_path, sep=";", index=False)
+
+    assert [s.postal_code for s in ChargingStationCSVRepository(csv_path, cache_path).get_all()] == ["10115"]
+    registry = InMemoryPostalCodeRegistry({"10115": [], "14195": []})
+    # The cache was built without the registry, so it is not reused with it
+    repo = ChargingStationCSVRepository(csv_path, cache_path, plz_registry=registry)
+    assert [s.postal_code for s in repo.get_all()] == ["10115", "14195"]
+
+@patch("pandas.read_csv")
+def test_load_plug_types_and_max_power(mock_read_csv):
+    from chargehub.discovery.domain.value_objects.plug_type import PlugType
+
+    mock_read_csv.return_value = pd.DataFrame({
+        "Postleitzahl": ["10115", "10115", "10115"],
+        "Breitengrad": ["52,5", "52,5", "52,5"],
+        "Längengrad": ["13,4", "13,4", "13,4"],
+        "Betreiber": ["Op1", "Op2", "Op3"],
+        "Straße": ["S", "S", "S"],
+        "Hausnummer": ["1", "2", "3"],
+        "Nennleistung Ladeeinrichtung [kW]": ["150", "22", ""],
+        "Steckertypen1": ["DC Kupplung Combo, CCS", "AC Steckdose Typ 2", None],
+        "Nennleistung Stecker1": ["150", "22", ""],
+        "Steckertypen2": ["DC CHAdeMO", "AC Schuko", None],
+        "Nennleistung Stecker2": ["50", "3,7", ""],
+    })
+    stations = {s.station_id: s for s in ChargingStationCSVRepository(Path("dummy.csv")).get_all()}
+
+    assert stations[0].plug_types == PlugType.CCS | PlugType.CHADEMO
+    assert stations[0].max_power_kw == 150.0
+    assert stations[1].plug_types == PlugType.TYPE2 | PlugType.SCHUKO
+    assert stations[1].max_power_kw == 22.0
+    assert stations[2].plug_types == PlugType(0)
+    assert stations[2].max_power_kw is None
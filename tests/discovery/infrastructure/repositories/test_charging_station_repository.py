@@ -0,0 +1,184 @@
+import pytest
+
+from chargehub.discovery.infrastructure.repositories.charging_station_repository import ChargingStationRepository
+from chargehub.discovery.domain.aggregates.charging_station import ChargingStationAggregate
+from chargehub.discovery.domain.value_objects.postal_code import PostalCode
+
+@pytest.fixture
+def repo():
+    return ChargingStationRepository([
+        ChargingStationAggregate(station_id=10, postal_code="10437", latitude=52.54, longitude=13.41, available=True),
+        ChargingStationAggregate(station_id=11, postal_code="10437", latitude=52.54, longitude=13.41, available=False),
+        ChargingStationAggregate(station_id=12, postal_code="12043", latitude=52.48, longitude=13.43, available=True),
+    ])
+
+def test_availability_aggregates(repo):
+    assert repo.count_stations() == 3
+    assert repo.count_available() == 2
+    assert repo.count_stations("10437") == 2
+    assert repo.count_available("10437") == 1
+    assert repo.count_available("99999") == 0
+    assert repo.availability_summary() == {"10437": (1, 2), "12043": (1, 1)}
+
+def test_status_update_keeps_counters_in_sync(repo):
+    repo.update_station_status(10, False)
+    repo.update_station_status(10, False)  # no-op, must not double count
+    assert repo.count_available("10437") == 0
+    assert repo.count_available() == 1
+    assert repo.is_available(10) is False
+    assert repo.get_station(10).available is False
+    assert repo.locate_charging_stations(PostalCode("10437")) == []
+
+    repo.update_station_status(11, True)
+    assert [s.station_id for s in repo.locate_charging_stations(PostalCode("10437"))] == [11]
+    assert repo.availability_summary()["10437"] == (1, 2)
+
+def test_out_of_service_overrides_operator_status(repo):
+    assert repo.set_out_of_service(10, True) is True
+    assert repo.set_out_of_service(10, True) is False
+    assert repo.out_of_service_ids() == {10}
+    assert repo.is_available(10) is False
+    assert repo.get_station(10).out_of_service is True
+    assert repo.count_available("10437") == 0
+
+    # The operator reports it free again, the override still holds it offline
+    repo.update_station_status(10, True)
+    assert repo.is_available(10) is False
+    # Operator goes OUT_OF_ORDER; lifting the override keeps that live status
+    repo.update_station_status(10, False)
+    repo.set_out_of_service(10, False)
+    assert repo.is_available(10) is False
+    repo.update_station_status(10, True)
+    assert repo.is_available(10) is True
+    assert repo.count_available("10437") == 1
+
+def test_generation_changes_only_for_affected_postal_code(repo):
+    before = repo.postal_code_generation("12043")
+    repo.update_station_status(10, False)
+    assert repo.postal_code_generation("10437") == 1
+    assert repo.postal_code_generation("12043") == before
+
+def test_batched_status_update_bumps_each_postal_code_once(repo):
+    result = repo.update_station_statuses({10: False, 11: True, 12: True, 99: False})
+
+    assert (result.changed, result.unchanged, result.unknown) == (2, 1, (99,))
+    assert repo.count_available("10437") == 1
+    assert repo.count_available() == 2
+    assert [s.station_id for s in repo.locate_charging_stations(PostalCode("10437"))] == [11]
+    assert repo.postal_code_generation("10437") == 1
+    assert repo.postal_code_generation("12043") == 0
+
+def test_postal_code_suggestions_follow_status_changes(repo):
+    repo.register_postal_codes(["10435", "10437"])
+    assert [(s.postal_code, s.station_count, s.available_count) for s in repo.suggest_postal_codes("104")] == [
+        ("10437", 2, 1), ("10435", 0, 0),
+    ]
+    repo.update_station_statuses({10: False, 12: False})
+    assert repo.suggest_postal_codes("10437")[0].available_count == 0
+    assert repo.suggest_postal_codes("1", limit=1)[0].postal_code == "10437"
+    repo.add(ChargingStationAggregate(station_id=13, postal_code="10435", latitude=52.54, longitude=13.41, available=True))
+    assert repo.suggest_postal_codes("104", limit=1)[0].postal_code == "10435"
+
+def test_memory_usage_per_structure(repo):
+    usage = repo.memory_usage()
+    assert set(usage) == {"stations", "plz/operator lists", "availability bitmap", "grid index", "filter index", "plz trie"}
+    assert all(size > 0 for size in usage.values())
+    # Stations referenced by the indexes are charged to "stations" only
+    seen = set()
+    repo.memory_usage(seen)
+    assert repo.memory_usage(seen) == dict.fromkeys(usage, 0)
+
+def test_duplicate_station_id_rejected(repo):
+    with pytest.raises(ValueError):
+        repo.add(ChargingStationAggregate(station_id=10, postal_code="10437", latitude=0, longitude=0))
+
+def test_snapshot_restores_availability(repo, tmp_path):
+    path = tmp_path / "stations.snap"
+    repo.update_station_status(10, False)
+    repo.update_station_status(11, True)
+    repo.snapshot(path)
+
+    fresh = ChargingStationRepository([
+        ChargingStationAggregate(station_id=10, postal_code="10437", latitude=52.54, longitude=13.41, available=True),
+        ChargingStationAggregate(station_id=11, postal_code="10437", latitude=52.54, longitude=13.41, available=False),
+        ChargingStationAggregate(station_id=12, postal_code="12043", latitude=52.48, longitude=13.43, available=True),
+    ])
+    assert fresh.restore(path) == 2
+    assert [fresh.is_available(sid) for sid in (10, 11, 12)] == [False, True, True]
+    assert fresh.availability_summary() == repo.availability_summary()
+    assert fresh.restore(path) == 0
+
+def test_snapshot_restores_operator_status_and_overrides_separately(repo, tmp_path):
+    path = tmp_path / "stations.snap"
+    repo.set_out_of_service(10, True)
+    repo.update_station_status(11, True)
+    repo.set_out_of_service(11, True)
+    repo.snapshot(path)
+
+    fresh = ChargingStationRepository([
+        ChargingStationAggregate(station_id=10, postal_code="10437", latitude=52.54, longitude=13.41, available=True),
+        ChargingStationAggregate(station_id=11, postal_code="10437", latitude=52.54, longitude=13.41, available=False),
+        ChargingStationAggregate(station_id=12, postal_code="12043", latitude=52.48, longitude=13.43, available=True),
+    ])
+    fresh.set_out_of_service(12, True)
+    assert fresh.restore(path) == 3
+    assert fresh.out_of_service_ids() == {10, 11}
+    fresh.set_out_of_service(11, False)
+    assert fresh.is_available(11) is True
+
+def test_restore_ignores_unknown_stations(repo, tmp_path):
+    path = tmp_path / "stations.snap"
+    repo.update_station_status(12, False)
+    repo.snapshot(path)
+
+    reloaded = ChargingStationRepository([
+        ChargingStationAggregate(station_id=12, postal_code="12043", latitude=52.48, longitude=13.43, available=True),
+        ChargingStationAggregate(station_id=99, postal_code="12043", latitude=52.48, longitude=13.43, available=True),
+    ])
+    assert reloaded.restore(path) == 1
+    assert reloaded.is_available(12) is False
+    assert reloaded.is_available(99) is True
+
+def test_locate_in_bbox_lists_stations_up_to_limit(repo):
+    result = repo.locate_in_bbox(52.50, 13.40, 52.55, 13.42)
+    assert result.total == 2
+    assert not result.aggregated
+    # Any status, so unavailable stations still show up on the map
+    assert [s.station_id for s in result.stations] == [10, 11]
+
+def test_locate_in_bbox_aggregates_past_limit(repo):
+    result = repo.locate_in_bbox(52.40, 13.30, 52.60, 13.50, limit=2)
+    assert result.total == 3
+    assert result.stations == []
+    assert 0 < len(result.clusters) <= 2
+    assert sum(c.station_count for c in result.clusters) == 3
+    assert sum(c.available_count for c in result.clusters) == 2
+
+    repo.update_station_status(12, False)
+    result = repo.locate_in_bbox(52.40, 13.30, 52.60, 13.50, limit=2)
+    assert sum(c.available_count for c in result.clusters) == 1
+
+def test_locate_in_bbox_rejects_invalid_box(repo):
+    with pytest.raises(ValueError):
+        repo.locate_in_bbox(52.6, 13.3, 52.4, 13.5)
+    with pytest.raises(ValueError):
+        repo.locate_in_bbox(52.4, 13.3, 52.6, 13.5, limit=0)
+
+def test_locate_with_power_and_plug_filter():
+    from chargehub.discovery.domain.value_objects.plug_type import PlugType
+    from chargehub.discovery.domain.value_objects.station_filter import StationFilter
+
+    repo = ChargingStationRepository([
+        ChargingStationAggregate(station_id=1, postal_code="10437", latitude=52.54, longitude=13.41,
+                                 plug_types=PlugType.TYPE2, max_power_kw=22.0),
+        ChargingStationAggregate(station_id=2, postal_code="10437", latitude=52.54, longitude=13.41,
+                                 plug_types=PlugType.CCS | PlugType.TYPE2, max_power_kw=150.0),
+        ChargingStationAggregate(station_id=3, postal_code="10437", latitude=52.54, longitude=13.41,
+                                 plug_types=PlugType.CCS, max_power_kw=300.0),
+    ])
+    fast_ccs = StationFilter(min_power_kw=150, plug_types=PlugType.CCS)
+    assert [s.station_id for s in repo.locate_charging_stations(PostalCode("10437"), fast_ccs)] == [2, 3]
+
+    repo.update_station_status(3, False)
+    assert [s.station_id for s in repo.locate_charging_stations(PostalCode("10437"), fast_ccs)] == [2]
+    assert [s.station_id for s in repo.locate_charging_stations(PostalCode("10437"))] == [1, 2]
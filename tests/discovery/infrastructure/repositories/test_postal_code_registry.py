@@ -0,0 +1,58 @@
+import json
+import os
+
+from chargehub.config import ChargeHubConfig
+from chargehub.discovery.infrastructure.repositories.postal_code_registry import (
+    GeoJsonPostalCodeRegistry,
+    InMemoryPostalCodeRegistry,
+)
+
+def _square(code, x0, y0):
+    ring = [[x0, y0], [x0 + 1, y0], [x0 + 1, y0 + 1], [x0, y0 + 1], [x0, y0]]
+    return {"type": "Feature", "properties": {"plz_code": code}, "geometry": {"type": "Polygon", "coordinates": [ring]}}
+
+def _write_geojson(path):
+    # A | B | C in a row, D only touches C in a single corner point
+    features = [_square("10001", 0, 0), _square("10002", 1, 0), _square("10003", 2, 0), _square("10004", 3, 1)]
+    path.write_text(json.dumps({"type": "FeatureCollection", "features": features}), encoding="utf-8")
+
+def test_adjacency_requires_shared_edge(tmp_path):
+    source = tmp_path / "plz.geojson"
+    _write_geojson(source)
+
+    registry = GeoJsonPostalCodeRegistry(source)
+
+    assert registry.codes() == {"10001", "10002", "10003", "10004"}
+    assert list(registry.neighbours("10002")) == ["10001", "10003"]
+    assert list(registry.neighbours("10004")) == []
+
+def test_rings_are_breadth_first():
+    registry = InMemoryPostalCodeRegistry({
+        "10001": ["10002"], "10002": ["10001", "10003"], "10003": ["10002"],
+    })
+    assert list(registry.rings("10001", max_rings=5)) == [["10002"], ["10003"]]
+    assert list(registry.rings("10001", max_rings=1)) == [["10002"]]
+
+def test_adjacency_is_cached_and_rebuilt_on_change(tmp_path):
+    source = tmp_path / "plz.geojson"
+    cache = tmp_path / "cache" / "adjacency.json"
+    _write_geojson(source)
+
+    GeoJsonPostalCodeRegistry(source, cache)
+    assert cache.exists()
+
+    # A valid cache is used as-is, without re-reading the geometry
+    payload = json.loads(cache.read_text(encoding="utf-8"))
+    payload["adjacency"]["10009"] = []
+    cache.write_text(json.dumps(payload), encoding="utf-8")
+    assert GeoJsonPostalCodeRegistry(source, cache).contains("10009")
+
+    # Touching the source invalidates it
+    os.utime(source, ns=(0, 0))
+    assert not GeoJsonPostalCodeRegistry(source, cache).contains("10009")
+
+def test_berlin_geojson_registry():
+    registry = GeoJsonPostalCodeRegistry(ChargeHubConfig.GEOJSON_PATH)
+    assert registry.contains("10437")
+    assert not registry.contains("99999")
+    assert "10435" in registry.neighbours("10437")
@@ -0,0 +1,51 @@
+import random
+
+from chargehub.discovery.domain.interfaces.charging_station_repository import PostalCodeSuggestion
+from chargehub.discovery.infrastructure.repositories.postal_code_trie import PostalCodeTrie
+
+def _trie(rows):
+    trie = PostalCodeTrie()
+    for postal_code, available in rows:
+        trie.add_station(postal_code, available)
+    return trie
+
+def test_completes_prefix_by_available_stations():
+    trie = _trie([("10405", True), ("10405", True), ("10407", True), ("10407", False),
+                  ("10115", True), ("12043", True)])
+    assert trie.complete("104", 5) == [
+        PostalCodeSuggestion("10405", 2, 2),
+        PostalCodeSuggestion("10407", 2, 1),
+    ]
+    assert [s.postal_code for s in trie.complete("1", 4)] == ["10405", "10407", "10115", "12043"]
+    assert trie.complete("", 1) == [PostalCodeSuggestion("10405", 2, 2)]
+
+def test_unknown_prefix_and_registered_codes_without_stations():
+    trie = _trie([("10405", True)])
+    trie.add_code("10409")
+    assert len(trie) == 2 and "10409" in trie
+    assert trie.complete("1040", 5) == [PostalCodeSuggestion("10405", 1, 1), PostalCodeSuggestion("10409", 0, 0)]
+    assert trie.complete("999", 5) == []
+    assert trie.complete("104", 0) == []
+
+def test_status_changes_reorder_suggestions():
+    trie = _trie([("10405", True), ("10407", False), ("10407", False)])
+    assert [s.postal_code for s in trie.complete("104", 2)] == ["10405", "10407"]
+    trie.set_available("10405", False)
+    trie.set_available("10407", True)
+    assert trie.complete("104", 2) == [PostalCodeSuggestion("10407", 2, 1), PostalCodeSuggestion("10405", 1, 0)]
+
+def test_best_first_matches_full_sort():
+    rng = random.Random(7)
+    codes = [f"1{rng.randrange(10000):04d}" for _ in range(300)]
+    trie = PostalCodeTrie()
+    counts = {}
+    for _ in range(3000):
+        code = rng.choice(codes)
+        available = rng.random() < 0.7
+        trie.add_station(code, available)
+        total, free = counts.get(code, (0, 0))
+        counts[code] = (total + 1, free + available)
+    for prefix in ["", "1", "10", "123", "1999"]:
+        expected = sorted((c for c in counts if c.startswith(prefix)),
+                          key=lambda c: (-counts[c][1], -counts[c][0], c))[:10]
+        assert [s.postal_code for s in trie.complete(prefix, 10)] == expected
@@ -0,0 +1,180 @@
+import multiprocessing
+import sys
+from uuid import uuid4
+
+import pytest
+
+from chargehub.discovery.domain.aggregates.charging_station import ChargingStationAggregate
+from chargehub.discovery.domain.value_objects.plug_type import PlugType
+from chargehub.discovery.domain.value_objects.cleaning_report import CleaningReport, RuleOutcome
+from chargehub.discovery.domain.value_objects.postal_code import PostalCode
+from chargehub.discovery.infrastructure.repositories.charging_station_repository import ChargingStationRepository
+from chargehub.discovery.infrastructure.repositories.shared_charging_station_repository import SharedChargingStationRepository
+from chargehub.discovery.infrastructure.repositories.shared_station_state import SharedStationState
+
+STATIONS = [
+    ChargingStationAggregate(station_id=10, postal_code="10437", latitude=52.54, longitude=13.41, available=True,
+                             operator="Stromnetz Berlin", address="Kastanienallee 1",
+                             plug_types=PlugType.CCS | PlugType.TYPE2, max_power_kw=150.0),
+    ChargingStationAggregate(station_id=11, postal_code="10437", latitude=52.55, longitude=13.42, available=False),
+    ChargingStationAggregate(station_id=12, postal_code="12043", latitude=52.48, longitude=13.43, available=True,
+                             operator="Allego", address="Sonnenallee 5"),
+]
+
+@pytest.fixture
+def state(tmp_path):
+    state = SharedStationState.create(f"chtest-{uuid4().hex[:12]}", STATIONS, lock_path=tmp_path / "state.lock")
+    yield state
+    state.close()
+    state.unlink()
+
+def test_attached_worker_sees_same_stations(state):
+    other = SharedStationState.attach(state.name, lock_path=state.lock_path)
+    try:
+        assert other.stations() == STATIONS
+    finally:
+        other.close()
+
+def test_status_update_is_visible_to_other_repository(state):
+    other_state = SharedStationState.attach(state.name, lock_path=state.lock_path)
+    try:
+        worker_a = SharedChargingStationRepository(state)
+        worker_b = SharedChargingStationRepository(other_state)
+        generation = worker_b.postal_code_generation("10437")
+
+        worker_a.update_station_status(10, False)
+
+        assert worker_b.is_available(10) is False
+        assert worker_b.count_available("10437") == 0
+        assert worker_b.count_available() == 1
+        assert worker_b.locate_charging_stations(PostalCode("10437")) == []
+        assert worker_b.postal_code_generation("10437") > generation
+        assert worker_b.suggest_postal_codes("10437")[0].available_count == 0
+        # Nothing new to apply on the next read
+        assert worker_b.sync() == 0
+    finally:
+        other_state.close()
+
+def test_override_is_shared_separately_from_operator_status(state):
+    other_state = SharedStationState.attach(state.name, lock_path=state.lock_path)
+    try:
+        worker_a = SharedChargingStationRepository(state)
+        worker_b = SharedChargingStationRepository(other_state)
+
+        worker_a.set_out_of_service(12, True)
+        worker_b.update_station_status(12, True)
+
+        assert worker_b.out_of_service_ids() == {12}
+        assert worker_a.is_available(12) is False
+        worker_b.set_out_of_service(12, False)
+        assert worker_a.is_available(12) is True
+        assert worker_a.get_station(12).out_of_service is False
+    finally:
+        other_state.close()
+
+def test_batched_update_is_written_through_once(state):
+    other_state = SharedStationState.attach(state.name, lock_path=state.lock_path)
+    try:
+        worker_a = SharedChargingStationRepository(state)
+        worker_b = SharedChargingStationRepository(other_state)
+        counter = state.change_counter
+
+        result = worker_a.update_station_statuses({10: False, 11: True, 12: True})
+
+        assert (result.changed, result.unchanged) == (2, 1)
+        assert state.change_counter == counter + 1
+        assert worker_b.is_available(10) is False and worker_b.is_available(11) is True
+        assert worker_b.count_available("10437") == 1
+    finally:
+        other_state.close()
+
+def test_status_update_applies_other_workers_changes_first(state):
+    other_state = SharedStationState.attach(state.name, lock_path=state.lock_path)
+    try:
+        worker_a = SharedChargingStationRepository(state)
+        worker_b = SharedChargingStationRepository(other_state)
+
+        worker_a.update_station_status(10, False)
+        worker_b.update_station_status(12, False)
+
+        # The local counters (read here without a sync) already include worker A's write
+        assert ChargingStationRepository.count_available(worker_b) == 0
+    finally:
+        other_state.close()
+
+def test_station_set_is_fixed(state):
+    from chargehub.discovery.domain.interfaces.charging_station_repository import StationSetFixedError
+
+    repo = SharedChargingStationRepository(state)
+    with pytest.raises(StationSetFixedError):
+        repo.add(ChargingStationAggregate(station_id=99, postal_code="10115", latitude=52.53, longitude=13.38,
+                                          available=True))
+    assert repo.get_station(99) is None
+
+def test_create_or_attach_loads_once(state):
+    attached = SharedStationState.create_or_attach(state.name, lambda: pytest.fail("must not reload"), lock_path=state.lock_path)
+    try:
+        assert attached.size == len(STATIONS)
+    finally:
+        attached.close()
+
+def test_create_or_attach_rebuilds_block_when_source_changes(tmp_path):
+    import os
+
+    source = tmp_path / "register.csv"
+    source.write_text("v1")
+    name, lock_path = f"chtest-{uuid4().hex[:12]}", tmp_path / "state.lock"
+    first = SharedStationState.create_or_attach(name, lambda: ChargingStationRepository(STATIONS), lock_path=lock_path, source_path=source)
+    try:
+        same = SharedStationState.create_or_attach(name, lambda: pytest.fail("must not reload"),
+                                                   lock_path=lock_path, source_path=source)
+        same.close()
+
+        source.write_text("v2, one station")
+        os.utime(source, ns=(0, 1))
+        rebuilt = SharedStationState.create_or_attach(name, lambda: ChargingStationRepository(STATIONS[:1]), lock_path=lock_path, source_path=source)
+        try:
+            assert rebuilt.size == 1
+            assert rebuilt.source == (source.stat().st_size, 1)
+            # The old block is gone for newcomers, its attached workers keep their data
+            assert first.size == len(STATIONS)
+        finally:
+            rebuilt.close()
+    finally:
+        first.close()
+        current = SharedStationState.attach(name, lock_path=lock_path)
+        current.close()
+        current.unlink()
+
+def test_cleaning_report_reaches_attached_workers(tmp_path):
+    report = CleaningReport(input_rows=5, output_rows=3,
+                            outcomes=(RuleOutcome("outside-berlin", "drop", 2),))
+    name = f"chtest-{uuid4().hex[:12]}"
+    state = SharedStationState.create(name, STATIONS, lock_path=tmp_path / "state.lock", cleaning_report=report)
+    other = SharedStationState.attach(name, lock_path=tmp_path / "state.lock")
+    try:
+        assert SharedChargingStationRepository(other).cleaning_report() == report
+        assert SharedChargingStationRepository(state).cleaning_report() == report
+    finally:
+        other.close()
+        state.close()
+        state.unlink()
+
+def test_block_without_cleaning_report(state):
+    assert SharedChargingStationRepository(state).cleaning_report() is None
+
+def _mark_unavailable(name, lock_path, station_id):
+    repo = SharedChargingStationRepository(SharedStationState.attach(name, lock_path=lock_path))
+    repo.update_station_status(station_id, False)
+
+@pytest.mark.skipif(sys.platform == "win32", reason="POSIX shared memory naming")
+def test_update_from_another_process(state):
+    repo = SharedChargingStationRepository(state)
+    ctx = multiprocessing.get_context("spawn")
+    process = ctx.Process(target=_mark_unavailable, args=(state.name, state.lock_path, 12))
+    process.start()
+    process.join(30)
+    assert process.exitcode == 0
+
+    assert repo.is_available(12) is False
+    assert repo.availability_summary() == {"10437": (1, 2), "12043": (0, 1)}
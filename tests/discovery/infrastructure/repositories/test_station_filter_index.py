@@ -0,0 +1,57 @@
+import pytest
+
+from chargehub.discovery.domain.value_objects.plug_type import PlugType
+from chargehub.discovery.infrastructure.repositories.station_filter_index import StationFilterIndex
+
+CCS, TYPE2, CHADEMO = int(PlugType.CCS), int(PlugType.TYPE2), int(PlugType.CHADEMO)
+
+@pytest.fixture
+def index():
+    index = StationFilterIndex()
+    rows = [
+        # postal code, plugs, power, available
+        ("10115", TYPE2, 11.0, True),
+        ("10115", CCS | TYPE2, 150.0, True),
+        ("12043", CCS, 300.0, True),
+        ("10115", CCS | CHADEMO, 50.0, True),
+        ("10115", CCS, 175.0, False),
+        ("10115", TYPE2, None, True),
+        ("10115", CCS, 120.0, True),
+    ]
+    for pos, (plz, plugs, power, available) in enumerate(rows):
+        index.add(pos, plz, plugs, power, available)
+    return index
+
+def test_unfiltered_returns_available_in_insertion_order(index):
+    assert index.positions("10115") == [0, 1, 3, 5, 6]
+    assert index.positions("10115", only_available=False) == [0, 1, 3, 4, 5, 6]
+    assert index.positions("99999") == []
+
+def test_plug_filter_matches_any_requested_type(index):
+    assert index.positions("10115", plug_types=CCS) == [1, 3, 6]
+    assert index.positions("10115", plug_types=CHADEMO | TYPE2) == [0, 1, 3, 5]
+
+@pytest.mark.parametrize("min_power, expected", [
+    (150.0, [1]),          # bucket edge: pure bitmap lookup
+    (100.0, [1, 6]),       # inside the 50-150 bucket: its stations are compared exactly
+    (120.0, [1, 6]),
+    (120.5, [1]),
+    (0.0, [0, 1, 3, 6]),   # stations without a registered power never match
+    (400.0, []),
+])
+def test_min_power(index, min_power, expected):
+    assert index.positions("10115", min_power_kw=min_power) == expected
+
+def test_combined_filter_and_availability_updates(index):
+    assert index.positions("10115", plug_types=CCS, min_power_kw=150.0) == [1]
+    index.set_available(4, True)
+    assert index.positions("10115", plug_types=CCS, min_power_kw=150.0) == [1, 4]
+    index.set_available(1, False)
+    assert index.positions("10115", plug_types=CCS, min_power_kw=150.0) == [4]
+
+def test_bucket_of():
+    assert StationFilterIndex.bucket_of(None) == -1
+    assert StationFilterIndex.bucket_of(float("nan")) == -1
+    assert StationFilterIndex.bucket_of(3.7) == 0
+    assert StationFilterIndex.bucket_of(22.0) == 2
+    assert StationFilterIndex.bucket_of(1000.0) == 5
@@ -0,0 +1,96 @@
+import random
+
+import pytest
+
+from chargehub.discovery.domain.aggregates.charging_station import ChargingStationAggregate
+from chargehub.discovery.domain.value_objects.station_query import StationQuery
+from chargehub.discovery.infrastructure.repositories.charging_station_repository import ChargingStationRepository
+from chargehub.discovery.infrastructure.repositories.station_query_engine import AccessPath, execute
+
+OPERATORS = ["Allego GmbH", "Vattenfall", "ubitricity GmbH", None]
+CODES = ["10115", "10437", "12043", "13353"]
+
+@pytest.fixture(scope="module")
+def stations():
+    rng = random.Random(3)
+    return [
+        ChargingStationAggregate(
+            station_id=1000 + i, postal_code=rng.choice(CODES),
+            latitude=rng.uniform(52.40, 52.60), longitude=rng.uniform(13.30, 13.50),
+            available=rng.random() < 0.8, operator=rng.choice(OPERATORS),
+        )
+        for i in range(3000)
+    ]
+
+@pytest.fixture
+def repo(stations):
+    return ChargingStationRepository(stations)
+
+def _matches(s, q):
+    if q.postal_codes is not None and s.postal_code not in q.postal_codes:
+        return False
+    if q.available is not None and s.available != q.available:
+        return False
+    if q.operator is not None and (s.operator or "").casefold() != q.operator.strip().casefold():
+        return False
+    if q.bbox is not None:
+        south, west, north, east = q.bbox
+        if not (south <= s.latitude <= north and west <= s.longitude <= east):
+            return False
+    return q.station_ids is None or s.station_id in q.station_ids
+
+QUERIES = [
+    StationQuery(),
+    StationQuery(postal_codes={"10115", "12043"}),
+    StationQuery(available=False),
+    StationQuery(operator="  allego gmbh "),
+    StationQuery(bbox=(52.45, 13.35, 52.47, 13.38)),
+    StationQuery(station_ids=set(range(1000, 1100)) | {99}),
+    StationQuery(postal_codes={"10437"}, available=True, operator="Vattenfall"),
+    StationQuery(bbox=(52.40, 13.30, 52.55, 13.45), available=False, operator="ubitricity GmbH",
+                 postal_codes={"10115", "10437", "13353"}),
+    StationQuery(station_ids={1000, 1001, 1002}, bbox=(52.0, 13.0, 53.0, 14.0), available=True),
+    StationQuery(postal_codes={"99999"}, available=True),
+]
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_query_matches_brute_force(repo, stations, query):
+    expected = [s.station_id for s in stations if _matches(s, query)]
+    assert [s.station_id for s in repo.query(query)] == expected
+    assert repo.explain(query).result_rows == len(expected)
+
+def test_limit_keeps_register_order(repo, stations):
+    query = StationQuery(postal_codes={"10115"}, limit=5)
+    assert [s.station_id for s in repo.query(query)] == [s.station_id for s in stations if s.postal_code == "10115"][:5]
+
+def test_explain_drives_by_most_selective_index(repo):
+    plan = repo.explain(StationQuery(postal_codes={"10115", "10437"}, available=True, station_ids={1000, 1001, 1002}))
+    assert [step.access for step in plan.steps] == ["index", "probe", "bitmap"]
+    assert plan.steps[0].criterion.startswith("station_id")
+    assert plan.steps[0].estimated_rows == 3
+    assert "result:" in str(plan)
+
+def test_query_sees_status_changes(repo, stations):
+    target = next(s for s in stations if s.available)
+    repo.update_station_status(target.station_id, False)
+    assert target.station_id in [s.station_id for s in repo.query(StationQuery(available=False))]
+    assert target.station_id not in [s.station_id for s in repo.query(StationQuery(available=True))]
+
+def test_execute_intersects_when_lists_are_comparable():
+    evens = AccessPath("even", 5, fetch=lambda: [0, 2, 4, 6, 8], contains=lambda p: p % 2 == 0)
+    small = AccessPath("small", 4, fetch=lambda: [1, 2, 3, 4], contains=lambda p: p < 5)
+    positions, steps = execute([evens, small], lambda: range(10))
+    assert positions == [2, 4]
+    assert [(s.criterion, s.access, s.rows) for s in steps] == [("small", "index", 4), ("even", "probe", 2)]
+
+    # A list no longer than the candidates is merged with them instead of probed
+    middle = AccessPath("middle", 5, fetch=lambda: [2, 3, 4, 5, 6], contains=lambda p: 2 <= p <= 6)
+    positions, steps = execute([evens, middle], lambda: range(10))
+    assert positions == [2, 4, 6]
+    assert [s.access for s in steps] == ["index", "intersect"]
+
+def test_invalid_query_is_rejected():
+    with pytest.raises(ValueError):
+        StationQuery(bbox=(52.6, 13.3, 52.4, 13.5))
+    with pytest.raises(ValueError):
+        StationQuery(limit=0)
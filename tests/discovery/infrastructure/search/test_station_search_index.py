@@ -0,0 +1,57 @@
+import pytest
+
+from chargehub.discovery.domain.aggregates.charging_station import ChargingStationAggregate
+from chargehub.discovery.infrastructure.repositories.charging_station_repository import ChargingStationRepository
+from chargehub.discovery.infrastructure.search.station_search_index import InvertedStationSearchIndex, normalize
+
+def _station(station_id, operator, address, available=True):
+    return ChargingStationAggregate(station_id=station_id, postal_code="10437", latitude=52.54, longitude=13.41,
+                                    available=available, operator=operator, address=address)
+
+@pytest.fixture
+def stations():
+    return [
+        _station(1, "Allego GmbH", "Schönhauser Allee 80"),
+        _station(2, "Allego GmbH", "Kastanienallee 12"),
+        _station(3, "Vattenfall Europe Innovation GmbH", "Schönhauser Allee 101", available=False),
+        _station(4, "Tesla Germany GmbH", "Greifswalder Str. 3"),
+    ]
+
+def test_normalize_folds_umlauts_and_sharp_s():
+    assert normalize("Schönhauser Allee") == ["schoenhauser", "allee"]
+    assert normalize("Greifswalder Straße 3") == ["greifswalder", "strasse", "3"]
+    assert normalize("Greifswalder Str. 3") == ["greifswalder", "strasse", "3"]
+    assert normalize(None) == []
+
+def test_operator_and_street_ranked_first(stations):
+    index = InvertedStationSearchIndex(stations)
+    results = index.search("Allego on Schönhauser Allee")
+    assert [s.station_id for s, _ in results][:1] == [1]
+    assert {s.station_id for s, _ in results} == {1, 2, 3}
+
+def test_typo_and_prefix_tolerance(stations):
+    index = InvertedStationSearchIndex(stations)
+    assert [s.station_id for s, _ in index.search("Vatenfal")] == [3]
+    assert [s.station_id for s, _ in index.search("schoenh")][:2] == [1, 3]
+    assert [s.station_id for s, _ in index.search("Greifswalder Strasse")] == [4]
+
+def test_only_available(stations):
+    index = InvertedStationSearchIndex(stations)
+    assert [s.station_id for s, _ in index.search("Vattenfall", only_available=True)] == []
+
+def test_sync_reindexes_only_changed_stations(stations):
+    index = InvertedStationSearchIndex(stations)
+    assert index.sync(stations) == 0
+
+    stations[3].operator = "ubitricity GmbH"
+    assert index.sync(stations[1:]) == 2  # one changed, one removed
+    assert index.search("tesla") == []
+    assert [s.station_id for s, _ in index.search("ubitricity")] == [4]
+    assert all(s.station_id != 1 for s, _ in index.search("Schönhauser Allee 80"))
+
+def test_status_changes_need_no_resync(stations):
+    repo = ChargingStationRepository(stations)
+    index = InvertedStationSearchIndex(repo.get_all())
+    repo.update_station_status(3, True)
+    repo.set_out_of_service(1, True)
+    assert [s.station_id for s, _ in index.search("Schönhauser Allee", only_available=True)] == [3]
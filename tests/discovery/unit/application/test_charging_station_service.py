@@ -31,3 +31,118 @@ def test_search_no_stations_found_event():
     results, events = service.locate_charging_stations("10115")
     assert isinstance(results, EmptyChargingStationsDTO)
     assert any(e.__class__.__name__ == "NoStationsFoundEvent" for e in events)
+
+def test_search_expands_to_neighbouring_postal_codes():
+    from chargehub.discovery.infrastructure.repositories.postal_code_registry import InMemoryPostalCodeRegistry
+
+    registry = InMemoryPostalCodeRegistry({
+        "10115": ["10117"], "10117": ["10115", "10119"], "10119": ["10117"],
+    })
+    repo = ChargingStationRepository([
+        ChargingStationAggregate(station_id=1, postal_code="10117", latitude=52.52, longitude=13.40, available=True),
+        ChargingStationAggregate(station_id=2, postal_code="10119", latitude=52.52, longitude=13.40, available=True),
+    ])
+
+    service = ChargingStationService(repository=repo, plz_registry=registry, min_results=1)
+    results, events = service.locate_charging_stations("10115")
+    assert [r.station_id for r in results] == [1]
+    expanded = next(e for e in events if e.__class__.__name__ == "SearchExpandedEvent")
+    assert expanded.rings == 1 and list(expanded.postal_codes) == ["10117"]
+
+    service = ChargingStationService(repository=repo, plz_registry=registry, min_results=2)
+    results, _ = service.locate_charging_stations("10115")
+    assert [r.station_id for r in results] == [1, 2]
+
+def test_search_validates_against_the_registry():
+    from chargehub.discovery.infrastructure.repositories.postal_code_registry import InMemoryPostalCodeRegistry
+
+    repo = ChargingStationRepository([
+        ChargingStationAggregate(station_id=1, postal_code="14195", latitude=52.45, longitude=13.29, available=True),
+    ])
+    service = ChargingStationService(repository=repo, plz_registry=InMemoryPostalCodeRegistry({"14195": []}))
+    results, _ = service.locate_charging_stations("14195")
+    assert [r.station_id for r in results] == [1]
+    with pytest.raises(ValueError):
+        service.locate_charging_stations("10115")
+
+def test_search_without_registry_does_not_expand():
+    repo = ChargingStationRepository([
+        ChargingStationAggregate(station_id=1, postal_code="10117", latitude=52.52, longitude=13.40, available=True),
+    ])
+    service = ChargingStationService(repository=repo)
+    from chargehub.discovery.application.dtos.empty_charging_stations_dto import EmptyChargingStationsDTO
+    results, events = service.locate_charging_stations("10115")
+    assert isinstance(results, EmptyChargingStationsDTO)
+    assert not any(e.__class__.__name__ == "SearchExpandedEvent" for e in events)
+
+def test_search_stations_is_ranked_and_paged():
+    from chargehub.discovery.infrastructure.search.station_search_index import InvertedStationSearchIndex
+
+    stations = [
+        ChargingStationAggregate(station_id=i, postal_code="10437", latitude=52.54, longitude=13.41,
+                                 operator="Allego GmbH", address=f"Schönhauser Allee {i}")
+        for i in range(1, 6)
+    ]
+    repo = ChargingStationRepository(stations)
+    service = ChargingStationService(repository=repo, search_index=InvertedStationSearchIndex(repo.get_all()))
+
+    page, events = service.search_stations("allego schoenhauser", page=2, page_size=2)
+    assert page.total == 5 and page.page_count == 3
+    assert [s.station_id for s in page.stations] == [3, 4]
+    assert events[-1].total == 5
+
+    with pytest.raises(ValueError):
+        service.search_stations("allego", page=0)
+
+def test_locate_in_viewport_returns_dtos_or_clusters():
+    repo = ChargingStationRepository([
+        ChargingStationAggregate(station_id=i, postal_code="10115", latitude=52.50 + i * 0.001, longitude=13.40, available=i % 2 == 0)
+        for i in range(1, 11)
+    ])
+    service = ChargingStationService(repository=repo)
+
+    listed = service.locate_in_viewport(52.49, 13.39, 52.505, 13.41, limit=10)
+    assert listed.total == 5 and not listed.aggregated
+    assert [s.station_id for s in listed.stations] == [1, 2, 3, 4, 5]
+
+    clustered = service.locate_in_viewport(52.49, 13.39, 52.52, 13.41, limit=3)
+    assert clustered.total == 10 and clustered.aggregated
+    assert clustered.stations == ()
+    assert sum(c.station_count for c in clustered.clusters) == 10
+
+def test_filtered_search_is_cached_separately():
+    from chargehub.discovery.application.search_result_cache import SearchResultCache
+    from chargehub.discovery.domain.value_objects.plug_type import PlugType
+    from chargehub.discovery.domain.value_objects.station_filter import StationFilter
+
+    repo = ChargingStationRepository([
+        ChargingStationAggregate(station_id=1, postal_code="10115", latitude=52.52, longitude=13.40,
+                                 plug_types=PlugType.TYPE2, max_power_kw=11.0),
+        ChargingStationAggregate(station_id=2, postal_code="10115", latitude=52.52, longitude=13.40,
+                                 plug_types=PlugType.CCS, max_power_kw=150.0),
+    ])
+    service = ChargingStationService(repository=repo, result_cache=SearchResultCache())
+
+    all_stations, _ = service.locate_charging_stations("10115")
+    fast, _ = service.locate_charging_stations("10115", StationFilter(min_power_kw=50))
+    assert [s.station_id for s in all_stations] == [1, 2]
+    assert [(s.station_id, s.plug_types, s.max_power_kw) for s in fast] == [(2, ("CCS",), 150.0)]
+
+    repo.update_station_status(2, False)
+    fast, events = service.locate_charging_stations("10115", StationFilter(min_power_kw=50))
+    assert any(e.__class__.__name__ == "NoStationsFoundEvent" for e in events)
+
+def test_suggest_postal_codes_completes_digit_prefixes():
+    repo = ChargingStationRepository([
+        ChargingStationAggregate(station_id=1, postal_code="10405", latitude=52.54, longitude=13.42, available=True),
+        ChargingStationAggregate(station_id=2, postal_code="10407", latitude=52.54, longitude=13.44, available=False),
+    ])
+    service = ChargingStationService(repository=repo)
+
+    assert [(s.postal_code, s.available_count) for s in service.suggest_postal_codes(" 104 ")] == [
+        ("10405", 1), ("10407", 0),
+    ]
+    assert service.suggest_postal_codes("10405", limit=1)[0].station_count == 1
+    assert service.suggest_postal_codes("10a") == []
+    assert service.suggest_postal_codes("") == []
+    assert service.suggest_postal_codes("104050") == []
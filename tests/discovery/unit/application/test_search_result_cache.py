@@ -0,0 +1,66 @@
+from chargehub.discovery.application.charging_station_service import ChargingStationService
+from chargehub.discovery.application.search_result_cache import SearchResultCache
+from chargehub.discovery.infrastructure.repositories.charging_station_repository import ChargingStationRepository
+from chargehub.discovery.domain.aggregates.charging_station import ChargingStationAggregate
+
+def _service(max_entries=8):
+    repo = ChargingStationRepository([
+        ChargingStationAggregate(station_id=1, postal_code="10115", latitude=52.52, longitude=13.40, available=True),
+        ChargingStationAggregate(station_id=2, postal_code="10115", latitude=52.52, longitude=13.40, available=True),
+        ChargingStationAggregate(station_id=3, postal_code="12043", latitude=52.48, longitude=13.43, available=True),
+    ])
+    cache = SearchResultCache(max_entries=max_entries)
+    return repo, cache, ChargingStationService(repository=repo, result_cache=cache)
+
+def _event_names(events):
+    return [e.__class__.__name__ for e in events]
+
+def test_cache_hit_returns_same_results_and_events():
+    _, cache, service = _service()
+
+    first, first_events = service.locate_charging_stations("10115")
+    second, second_events = service.locate_charging_stations("10115")
+
+    assert second is first
+    assert _event_names(second_events) == _event_names(first_events)
+    assert second_events[-1].stations == [1, 2]
+    stats = cache.stats()
+    assert (stats.hits, stats.misses) == (1, 1)
+    assert stats.hit_ratio == 0.5
+
+def test_status_change_invalidates_only_affected_postal_code():
+    repo, cache, service = _service()
+    service.locate_charging_stations("10115")
+    service.locate_charging_stations("12043")
+
+    repo.update_station_status(1, False)
+
+    results, events = service.locate_charging_stations("10115")
+    assert [r.station_id for r in results] == [2]
+    assert events[-1].stations == [2]
+    service.locate_charging_stations("12043")
+
+    stats = cache.stats()
+    assert stats.invalidations == 1
+    assert stats.hits == 1
+
+def test_lru_eviction():
+    _, cache, service = _service(max_entries=1)
+    service.locate_charging_stations("10115")
+    service.locate_charging_stations("12043")
+    service.locate_charging_stations("10115")
+
+    stats = cache.stats()
+    assert stats.evictions == 2
+    assert stats.size == 1
+    assert stats.hits == 0
+
+def test_empty_results_are_cached():
+    _, cache, service = _service()
+    from chargehub.discovery.application.dtos.empty_charging_stations_dto import EmptyChargingStationsDTO
+
+    service.locate_charging_stations("10999")
+    results, events = service.locate_charging_stations("10999")
+    assert isinstance(results, EmptyChargingStationsDTO)
+    assert _event_names(events)[-1] == "NoStationsFoundEvent"
+    assert cache.stats().hits == 1
@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta, timezone
+
+from chargehub.discovery.application.status_ingestion_service import StatusIngestionService
+from chargehub.discovery.domain.aggregates.charging_station import ChargingStationAggregate
+from chargehub.discovery.domain.value_objects.station_status_update import StationStatusUpdate
+from chargehub.discovery.infrastructure.repositories.charging_station_repository import ChargingStationRepository
+
+T0 = datetime(2026, 6, 1, tzinfo=timezone.utc)
+
+def _repo(count=3):
+    return ChargingStationRepository([
+        ChargingStationAggregate(station_id=i, postal_code="10115" if i % 2 else "10117",
+                                 latitude=52.52, longitude=13.40, available=True)
+        for i in range(1, count + 1)
+    ])
+
+def test_batch_is_coalesced_per_station_and_applied_once_per_plz():
+    repo = _repo()
+    service = StatusIngestionService(repo)
+
+    result = service.ingest([
+        StationStatusUpdate(1, False), StationStatusUpdate(3, False),
+        StationStatusUpdate(1, True), StationStatusUpdate(42, False),
+    ])
+
+    assert (result.received, result.changed, result.unchanged, result.unknown) == (4, 1, 1, 1)
+    assert repo.is_available(1) is True and repo.is_available(3) is False
+    assert repo.postal_code_generation("10115") == 1
+
+def test_malfunction_override_keeps_station_offline():
+    repo = _repo()
+    repo.set_out_of_service(2, True)
+    service = StatusIngestionService(repo)
+
+    result = service.ingest([StationStatusUpdate(2, True), StationStatusUpdate(1, False)])
+
+    assert result.overridden == 1
+    assert repo.is_available(2) is False
+    assert repo.is_available(1) is False
+    # The operator status is kept underneath and applies once the override is lifted
+    repo.set_out_of_service(2, False)
+    assert repo.is_available(2) is True
+
+def test_operator_status_does_not_lift_or_mark_an_override():
+    repo = _repo()
+    service = StatusIngestionService(repo)
+
+    service.ingest([StationStatusUpdate(1, False)])
+
+    assert repo.out_of_service_ids() == frozenset()
+    assert repo.get_station(1).out_of_service is False
+
+def test_older_updates_do_not_overwrite_newer_ones():
+    repo = _repo()
+    service = StatusIngestionService(repo)
+    service.ingest([StationStatusUpdate(1, False, T0 + timedelta(minutes=5))])
+
+    result = service.ingest([StationStatusUpdate(1, True, T0)])
+
+    assert result.stale == 1
+    assert repo.is_available(1) is False
+
+def test_large_batch_applies_quickly():
+    repo = _repo(20_000)
+    service = StatusIngestionService(repo)
+
+    result = service.ingest(StationStatusUpdate(i, i % 3 != 0) for i in range(1, 20_001))
+
+    assert result.changed == 20_000 // 3
+    assert repo.count_available() == 20_000 - 20_000 // 3
+    assert result.seconds < 2.0
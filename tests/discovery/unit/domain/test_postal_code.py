@@ -9,3 +9,14 @@ def test_valid_postal_code():
 def test_invalid_postal_code(value):
     with pytest.raises(ValueError):
         PostalCode(value)
+
+def test_registry_replaces_prefix_rule():
+    from chargehub.discovery.infrastructure.repositories.postal_code_registry import InMemoryPostalCodeRegistry
+
+    registry = InMemoryPostalCodeRegistry({"10115": [], "14195": []})
+    assert PostalCode("14195", registry).value == "14195"
+    with pytest.raises(ValueError):
+        PostalCode("10999", registry)
+    # Validation state is not global: without a registry the prefix rule still applies
+    assert PostalCode("10999").value == "10999"
+    assert PostalCode("10115", registry) == PostalCode("10115")
@@ -0,0 +1,19 @@
+import pytest
+
+from chargehub.discovery.domain.value_objects.plug_type import PlugType
+from chargehub.discovery.domain.value_objects.station_filter import StationFilter
+
+def test_plug_type_parse_and_names():
+    plugs = PlugType.parse(["ccs", " CHADEMO"])
+    assert plugs == PlugType.CCS | PlugType.CHADEMO
+    assert plugs.names() == ("CCS", "CHADEMO")
+    assert PlugType.parse([]) == PlugType(0)
+    with pytest.raises(ValueError):
+        PlugType.parse(["Lightning"])
+
+def test_station_filter_rules():
+    assert StationFilter().is_empty
+    assert not StationFilter(min_power_kw=150).is_empty
+    assert StationFilter(plug_types=PlugType.CCS).cache_key() != StationFilter(plug_types=PlugType.TYPE2).cache_key()
+    with pytest.raises(ValueError):
+        StationFilter(min_power_kw=-1)
@@ -0,0 +1,42 @@
+import csv
+from datetime import datetime, timezone
+
+import pytest
+
+from chargehub.export.infrastructure.batch_writers import open_batch_writer
+
+COLUMNS = [("id", "int64"), ("name", "string"), ("at", "timestamp"), ("ok", "bool")]
+ROWS = [{"id": 1, "name": "Allego", "at": datetime(2026, 6, 1, tzinfo=timezone.utc), "ok": True},
+        {"id": 2, "name": None, "at": None, "ok": False}]
+
+def test_csv_writer_appends_batches(tmp_path):
+    path = tmp_path / "out.csv"
+    writer = open_batch_writer("csv", path, COLUMNS)
+    writer.write_batch(ROWS[:1])
+    writer.write_batch(ROWS[1:])
+    writer.close()
+
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    assert rows == [["id", "name", "at", "ok"], ["1", "Allego", "2026-06-01T00:00:00+00:00", "True"], ["2", "", "", "False"]]
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+def test_arrow_writers_round_trip(tmp_path, fmt):
+    pa = pytest.importorskip("pyarrow")
+    path = tmp_path / f"out.{fmt}"
+    writer = open_batch_writer(fmt, path, COLUMNS)
+    writer.write_batch(ROWS[:1])
+    writer.write_batch(ROWS[1:])
+    writer.close()
+
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        table = pq.read_table(path)
+    else:
+        table = pa.ipc.open_file(pa.memory_map(str(path))).read_all()
+    assert table.column("id").to_pylist() == [1, 2]
+    assert table.column("name").to_pylist() == ["Allego", None]
+
+def test_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        open_batch_writer("xlsx", tmp_path / "out.xlsx", COLUMNS)
@@ -0,0 +1,83 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from chargehub.discovery.domain.aggregates.charging_station import ChargingStationAggregate
+from chargehub.discovery.infrastructure.repositories.charging_station_repository import ChargingStationRepository
+from chargehub.export.application.export_service import ExportService, ExportWatermark
+from chargehub.export.domain.interfaces.batch_writer import BatchWriter
+from chargehub.malfunction.application.malfunction_service import MalfunctionService
+from chargehub.malfunction.infrastructure.repositories.report_repository import ReportRepositoryImpl
+from chargehub.shared.infrastructure.event_log import InMemoryEventLog
+
+class RecordingWriter(BatchWriter):
+    def __init__(self):
+        self.batches = []
+        self.closed = False
+
+    def write_batch(self, rows):
+        self.batches.append(rows)
+
+    def close(self):
+        self.closed = True
+
+@pytest.fixture
+def setup():
+    now = [datetime(2026, 6, 1, tzinfo=timezone.utc)]
+
+    def clock():
+        now[0] += timedelta(seconds=1)
+        return now[0]
+
+    stations = ChargingStationRepository([
+        ChargingStationAggregate(station_id=i, postal_code="10115", latitude=52.5, longitude=13.4, operator="Allego")
+        for i in range(5)
+    ])
+    reports = ReportRepositoryImpl(clock=clock)
+    events = InMemoryEventLog()
+    service = MalfunctionService(report_repository=reports, charging_station_repository=stations,
+                                 threshold=1, event_log=events)
+    return ExportService(stations, reports, events, batch_size=2), service, reports
+
+def test_stations_are_streamed_in_batches(setup):
+    export, service, _ = setup
+    service.file_malfunction_report(3, "Screen broken")
+    service.approve_report(export.report_repository.get_pending_reports()[0].id)
+
+    writer = RecordingWriter()
+    result, _ = export.export("stations", writer)
+    assert (result.rows, result.batches) == (5, 3)
+    assert [len(b) for b in writer.batches] == [2, 2, 1]
+    assert writer.closed
+    assert [row["available"] for batch in writer.batches for row in batch] == [True, True, True, False, True]
+
+def test_incremental_export_of_reports_and_events(setup):
+    export, service, reports = setup
+    service.file_malfunction_report(1, "Screen broken")
+    service.file_malfunction_report(2, "Cable cut")
+
+    writers = {}
+
+    def open_writer(dataset, columns):
+        writers[dataset] = RecordingWriter()
+        return writers[dataset]
+
+    results, watermark = export.export_all(open_writer, datasets=["reports", "events"])
+    assert [r.rows for r in results] == [2, 4]
+    assert watermark.events_seq == 4
+
+    # Only the approval (a status change) and its events are new
+    service.approve_report(reports.get_pending_reports()[0].id)
+    results, advanced = export.export_all(open_writer, since=watermark, datasets=["reports", "events"])
+    report_rows = [row for batch in writers["reports"].batches for row in batch]
+    # "Cable cut" sits exactly on the watermark and is re-exported (at-least-once)
+    assert [(row["report_text"], row["status"]) for row in report_rows] == [("Screen broken", "APPROVED"), ("Cable cut", "PENDING")]
+    assert advanced.reports_updated_at > watermark.reports_updated_at
+    event_names = [row["event"] for batch in writers["events"].batches for row in batch]
+    assert "StationStatusChangedEvent" in event_names and "MalfunctionReportFiledEvent" not in event_names
+
+def test_watermark_file_round_trip(tmp_path):
+    mark = ExportWatermark(reports_updated_at=datetime(2026, 6, 1, 12, tzinfo=timezone.utc), events_seq=42)
+    mark.save(tmp_path / "watermark.json")
+    assert ExportWatermark.load(tmp_path / "watermark.json") == mark
+    assert ExportWatermark.load(tmp_path / "missing.json") == ExportWatermark()
@@ -0,0 +1,14 @@
+from chargehub.malfunction.domain.value_objects.report_fingerprint import ReportFingerprint, normalize_report_text
+
+def test_normalization_ignores_case_punctuation_and_umlauts():
+    assert normalize_report_text("  Screen   broken!! ") == "screen broken"
+    assert normalize_report_text("Display gestört") == "display gestoert"
+
+def test_similarity():
+    base = ReportFingerprint.of("Screen broken")
+    assert base.similarity(ReportFingerprint.of("screen broken!!")) == 1.0
+    assert base.similarity(ReportFingerprint.of("Screeen broken")) > 0.85
+    assert base.similarity(ReportFingerprint.of("Connector damaged")) < 0.2
+
+def test_signature_is_deterministic():
+    assert ReportFingerprint.of("Cable cut").signature == ReportFingerprint.of("Cable cut").signature
@@ -0,0 +1,99 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from chargehub.malfunction.domain.aggregates.malfunction_report import ReportStatus
+from chargehub.malfunction.domain.interfaces.report_archive import ArchivedReport
+from chargehub.malfunction.infrastructure.archive.monthly_report_archive import MonthlyReportArchive
+
+def _report(station_id, text, resolved_at, status=ReportStatus.APPROVED):
+    return ArchivedReport(id=uuid4(), station_id=station_id, report_text=text, status=status, resolved_at=resolved_at)
+
+def test_reports_are_partitioned_by_month(tmp_path):
+    archive = MonthlyReportArchive(tmp_path)
+    jan = datetime(2026, 1, 15, tzinfo=timezone.utc)
+    mar = datetime(2026, 3, 2, tzinfo=timezone.utc)
+    archive.append([_report(1, "Screen broken", jan), _report(2, "Kabel defekt – Stecker gelöst", jan)])
+    archive.append([_report(1, "Cable cut", mar, status=ReportStatus.REJECTED)])
+
+    assert archive.partitions() == ["2026-01", "2026-03"]
+    history = archive.reports_for_station(1)
+    assert [r.report_text for r in history] == ["Screen broken", "Cable cut"]
+    assert history[1].status == ReportStatus.REJECTED
+    assert history[0].resolved_at == jan
+    assert archive.reports_for_station(2)[0].report_text == "Kabel defekt – Stecker gelöst"
+
+def test_time_range_skips_cold_partitions(tmp_path):
+    archive = MonthlyReportArchive(tmp_path)
+    archive.append([_report(1, "old", datetime(2024, 5, 1, tzinfo=timezone.utc))])
+    archive.append([_report(1, "recent", datetime(2026, 2, 1, tzinfo=timezone.utc))])
+
+    # A corrupt cold partition must not be touched by a query outside its month
+    (tmp_path / "2024-05.log").write_bytes(b"garbage")
+    recent = archive.reports_for_station(1, since=datetime(2025, 10, 1, tzinfo=timezone.utc))
+    assert [r.report_text for r in recent] == ["recent"]
+
+def test_missing_index_is_rebuilt(tmp_path):
+    archive = MonthlyReportArchive(tmp_path)
+    when = datetime(2026, 4, 1, tzinfo=timezone.utc)
+    archive.append([_report(7, "a", when), _report(8, "b", when), _report(7, "c", when)])
+
+    (tmp_path / "2026-04.idx").unlink()
+    assert [r.report_text for r in archive.reports_for_station(7)] == ["a", "c"]
+    assert (tmp_path / "2026-04.idx").exists()
+
+def test_index_missing_the_last_append_is_rebuilt(tmp_path):
+    archive = MonthlyReportArchive(tmp_path)
+    when = datetime(2026, 4, 1, tzinfo=timezone.utc)
+    archive.append([_report(7, "a", when)])
+    index = (tmp_path / "2026-04.idx").read_bytes()
+    archive.append([_report(7, "b", when)])
+
+    # A crash after the log was synced but before the index entry was
+    (tmp_path / "2026-04.idx").write_bytes(index)
+    assert [r.report_text for r in archive.reports_for_station(7)] == ["a", "b"]
+    assert len((tmp_path / "2026-04.idx").read_bytes()) == 2 * len(index)
+
+def test_torn_log_tail_and_unreadable_index_are_repaired(tmp_path):
+    archive = MonthlyReportArchive(tmp_path)
+    when = datetime(2026, 4, 1, tzinfo=timezone.utc)
+    archive.append([_report(7, "a", when), _report(8, "b", when)])
+    log_size = (tmp_path / "2026-04.log").stat().st_size
+
+    # A record cut short mid-append, and an index with a torn entry
+    with open(tmp_path / "2026-04.log", "ab") as log:
+        log.write(b"\x01" * 20)
+    (tmp_path / "2026-04.idx").write_bytes(b"\xff" * 21)
+
+    assert [r.report_text for r in archive.reports_for_station(7)] == ["a"]
+    assert (tmp_path / "2026-04.log").stat().st_size == log_size
+    archive.append([_report(7, "c", when)])
+    assert [r.report_text for r in MonthlyReportArchive(tmp_path).reports_for_station(7)] == ["a", "c"]
+
+def test_filed_at_round_trips(tmp_path):
+    archive = MonthlyReportArchive(tmp_path)
+    filed = datetime(2026, 4, 1, 8, 30, tzinfo=timezone.utc)
+    resolved = datetime(2026, 4, 3, tzinfo=timezone.utc)
+    report = ArchivedReport(id=uuid4(), station_id=3, report_text="x", status=ReportStatus.APPROVED,
+                            resolved_at=resolved, filed_at=filed)
+    archive.append([report, _report(3, "y", resolved)])
+
+    assert [(r.report_text, r.filed_at) for r in archive.reports_for_station(3)] == [("x", filed), ("y", None)]
+
+def test_version_1_partitions_remain_readable(tmp_path):
+    import struct
+
+    resolved = datetime(2026, 2, 1, tzinfo=timezone.utc)
+    report_id = uuid4()
+    text = "legacy".encode("utf-8")
+    (tmp_path / "2026-02.log").write_bytes(
+        struct.pack("<4sH", b"CHRA", 1)
+        + struct.pack("<16sqqBH", report_id.bytes, 5, int(resolved.timestamp() * 1000), ReportStatus.APPROVED.value, len(text))
+        + text
+    )
+    archive = MonthlyReportArchive(tmp_path)
+    # Appends to an existing v1 partition keep its record format
+    archive.append([_report(5, "newer", resolved)])
+
+    history = archive.reports_for_station(5)
+    assert [(r.id, r.report_text, r.filed_at) for r in history[:1]] == [(report_id, "legacy", None)]
+    assert [r.report_text for r in history] == ["legacy", "newer"]
@@ -0,0 +1,164 @@
+import json
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from chargehub.discovery.domain.aggregates.charging_station import ChargingStationAggregate
+from chargehub.discovery.infrastructure.repositories.charging_station_repository import ChargingStationRepository
+from chargehub.malfunction.application.malfunction_service import MalfunctionService
+from chargehub.malfunction.infrastructure.notifications.notification_dispatcher import NotificationDispatcher
+from chargehub.malfunction.infrastructure.notifications.notification_sinks import (
+    InMemoryNotificationSink,
+    WebhookNotificationSink,
+)
+from chargehub.malfunction.infrastructure.repositories.report_repository import ReportRepositoryImpl
+from chargehub.shared.infrastructure.event_log import JsonlEventLog
+
+WHEN = datetime(2026, 6, 1, tzinfo=timezone.utc)
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+def _service(event_log):
+    stations = [ChargingStationAggregate(station_id=i, postal_code="10115", latitude=52.52, longitude=13.40,
+                                         available=True) for i in (1, 2)]
+    return MalfunctionService(report_repository=ReportRepositoryImpl(),
+                              charging_station_repository=ChargingStationRepository(stations),
+                              event_log=event_log)
+
+def test_one_digest_per_station_and_cursor_survives_restart(tmp_path):
+    event_log = JsonlEventLog(tmp_path / "events.jsonl", clock=lambda: WHEN)
+    cursor = tmp_path / "cursor.json"
+    sink = InMemoryNotificationSink()
+    dispatcher = NotificationDispatcher(event_log, sink, cursor_path=cursor)
+    service = _service(event_log)
+
+    service.file_malfunction_report(1, "screen broken")
+    service.file_malfunction_report(2, "cable missing")
+    service.file_malfunction_report(1, "card reader dead")
+    assert sink.attempts == 0  # nothing is sent while filing
+
+    assert dispatcher.dispatch_once() == 2
+    (batch,) = sink.batches
+    assert [(d.station_id, d.report_count, d.reports) for d in batch] == \
+           [(1, 2, ("screen broken", "card reader dead")), (2, 1, ("cable missing",))]
+    assert dispatcher.events_behind == 0
+    assert dispatcher.dispatch_once() == 0
+
+    service.file_malfunction_report(2, "display flickers")
+    dispatcher.close()  # the process exits
+    restarted = NotificationDispatcher(JsonlEventLog(tmp_path / "events.jsonl"), sink, cursor_path=cursor)
+    assert restarted.dispatch_once() == 1
+    assert sink.batches[-1][0].reports == ("display flickers",)
+
+def test_first_start_skips_history(tmp_path):
+    event_log = JsonlEventLog(tmp_path / "events.jsonl", clock=lambda: WHEN)
+    _service(event_log).file_malfunction_report(1, "old report")
+    sink = InMemoryNotificationSink()
+    assert NotificationDispatcher(event_log, sink, cursor_path=tmp_path / "cursor.json").dispatch_once() == 0
+    assert sink.attempts == 0
+
+def test_only_one_process_dispatches_and_another_takes_over(tmp_path):
+    event_log = JsonlEventLog(tmp_path / "events.jsonl", clock=lambda: WHEN)
+    cursor = tmp_path / "cursor.json"
+    sink = InMemoryNotificationSink()
+    worker_a = NotificationDispatcher(event_log, sink, cursor_path=cursor)
+    worker_b = NotificationDispatcher(JsonlEventLog(tmp_path / "events.jsonl", clock=lambda: WHEN), sink,
+                                      cursor_path=cursor)
+    service = _service(event_log)
+
+    service.file_malfunction_report(1, "screen broken")
+    assert worker_a.dispatch_once() == 1
+    service.file_malfunction_report(2, "cable missing")
+    assert worker_b.dispatch_once() == 0
+
+    worker_a.close()
+    # worker b resumes from the saved cursor: no duplicate, nothing skipped
+    assert worker_b.dispatch_once() == 1
+    assert [[d.station_id for d in batch] for batch in sink.batches] == [[1], [2]]
+
+def test_failed_delivery_is_retried_with_exponential_backoff(tmp_path):
+    event_log = JsonlEventLog(tmp_path / "events.jsonl", clock=lambda: WHEN)
+    clock = Clock()
+    sink = InMemoryNotificationSink(fail_next=2)
+    dispatcher = NotificationDispatcher(event_log, sink, base_delay_seconds=5, max_delay_seconds=60, clock=clock)
+    _service(event_log).file_malfunction_report(1, "screen broken")
+
+    assert dispatcher.dispatch_once() == 0
+    assert (sink.attempts, dispatcher.consecutive_failures) == (1, 1)
+    assert "ConnectionError" in dispatcher.last_error
+
+    clock.now += 4.9
+    dispatcher.dispatch_once()
+    assert sink.attempts == 1  # still backing off
+    clock.now += 0.1
+    dispatcher.dispatch_once()
+    assert (sink.attempts, dispatcher.consecutive_failures) == (2, 2)
+
+    clock.now += 9.9
+    dispatcher.dispatch_once()
+    assert sink.attempts == 2
+    clock.now += 0.1
+    assert dispatcher.dispatch_once() == 1
+    assert dispatcher.consecutive_failures == 0
+    assert dispatcher.events_behind == 0
+
+def test_batches_are_bounded():
+    from chargehub.shared.infrastructure.event_log import InMemoryEventLog
+
+    event_log = InMemoryEventLog()
+    sink = InMemoryNotificationSink()
+    dispatcher = NotificationDispatcher(event_log, sink, batch_events=2)
+    service = _service(event_log)
+    service.file_malfunction_report(1, "screen broken")
+    service.file_malfunction_report(2, "cable missing")
+
+    assert dispatcher.dispatch_once() == 1
+    assert dispatcher.dispatch_once() == 1
+    assert [b[0].station_id for b in sink.batches] == [1, 2]
+
+def test_validation():
+    from chargehub.shared.infrastructure.event_log import InMemoryEventLog
+
+    with pytest.raises(ValueError):
+        NotificationDispatcher(InMemoryEventLog(), InMemoryNotificationSink(), batch_events=0)
+    with pytest.raises(ValueError):
+        NotificationDispatcher(InMemoryEventLog(), InMemoryNotificationSink(),
+                               base_delay_seconds=10, max_delay_seconds=5)
+
+def test_webhook_sink_posts_json_and_raises_on_error_status():
+    received = []
+    status = {"code": 204}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            received.append(json.loads(self.rfile.read(int(self.headers["Content-Length"]))))
+            self.send_response(status["code"])
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        from chargehub.malfunction.domain.interfaces.notification_sink import AdministratorDigest
+
+        digest = AdministratorDigest(station_id=7, report_count=1, reports=("no power",),
+                                     first_filed_at=WHEN, last_filed_at=WHEN)
+        sink = WebhookNotificationSink(f"http://127.0.0.1:{server.server_port}/hook", timeout_seconds=5)
+        sink.send([digest])
+        assert received == [{"digests": [digest.to_dict()]}]
+
+        status["code"] = 503
+        with pytest.raises(Exception):
+            sink.send([digest])
+    finally:
+        server.shutdown()
+        server.server_close()
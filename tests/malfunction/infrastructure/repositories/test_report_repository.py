@@ -1,4 +1,8 @@
+import pytest
+
 from chargehub.malfunction.infrastructure.repositories.report_repository import ReportRepositoryImpl
+from chargehub.malfunction.domain.aggregates.malfunction_report import ReportStatus
+from chargehub.shared.infrastructure.snapshot_file import SnapshotError
 
 def test_report_repository_methods():
     repo = ReportRepositoryImpl()
@@ -40,3 +44,222 @@ def test_report_repository_methods():
     
     # 102 should still be there (but count is 0 as it is pending)
     assert repo.count_reports(102) == 0
+
+def test_find_similar_report_is_per_station():
+    repo = ReportRepositoryImpl()
+    repo.save_report(101, "Card reader dead")
+
+    assert repo.find_similar_report(101, "card reader dead.", threshold=0.85) == 1.0
+    assert repo.find_similar_report(102, "card reader dead.", threshold=0.85) is None
+    assert repo.find_similar_report(101, "Cable cut", threshold=0.85) is None
+
+    repo.clear_reports(101)
+    assert repo.find_similar_report(101, "Card reader dead", threshold=0.85) is None
+    assert repo.has_report(101, "Card reader dead") is False
+
+def test_clear_reports_moves_reports_to_archive(tmp_path):
+    from datetime import datetime, timezone
+    from chargehub.malfunction.infrastructure.archive.monthly_report_archive import MonthlyReportArchive
+
+    resolved_at = datetime(2026, 6, 30, tzinfo=timezone.utc)
+    repo = ReportRepositoryImpl(archive=MonthlyReportArchive(tmp_path), clock=lambda: resolved_at)
+    repo.save_report(101, "Issue 1")
+    repo.save_report(102, "Issue A")
+
+    repo.clear_reports(101)
+
+    assert [r.station_id for r in repo.all_reports()] == [102]
+    history = repo.report_history(101)
+    assert [(r.report_text, r.resolved_at) for r in history] == [("Issue 1", resolved_at)]
+    assert repo.report_history(101, since=datetime(2026, 7, 1, tzinfo=timezone.utc)) == []
+
+def test_count_reports_uses_sliding_window():
+    from datetime import datetime, timedelta, timezone
+
+    now = [datetime(2026, 6, 1, tzinfo=timezone.utc)]
+    repo = ReportRepositoryImpl(clock=lambda: now[0], count_window=timedelta(hours=24))
+    old = repo.save_report(101, "Issue 1")
+    now[0] += timedelta(hours=20)
+    recent = repo.save_report(101, "Issue 2")
+    repo.update_status(recent, ReportStatus.APPROVED)
+    # Approved after a newer report: the window still orders by filing time
+    repo.update_status(old, ReportStatus.APPROVED)
+    assert repo.count_reports(101) == 2
+    assert repo.get_report(old).filed_at == datetime(2026, 6, 1, tzinfo=timezone.utc)
+
+    now[0] += timedelta(hours=5)
+    assert repo.count_reports(101) == 1
+    assert repo.get_affected_station_ids() == [101]
+
+    now[0] += timedelta(hours=20)
+    assert repo.count_reports(101) == 0
+    assert repo.get_affected_station_ids() == []
+
+def test_snapshot_restores_reports_counts_and_duplicate_index(tmp_path):
+    from datetime import datetime, timedelta, timezone
+
+    now = [datetime(2026, 6, 1, tzinfo=timezone.utc)]
+    repo = ReportRepositoryImpl(clock=lambda: now[0], count_window=timedelta(hours=24))
+    approved = repo.save_report(101, "Card reader dead")
+    repo.update_status(approved, ReportStatus.APPROVED)
+    rejected = repo.save_report(101, "Cable cut")
+    repo.update_status(rejected, ReportStatus.REJECTED)
+    repo.save_report(102, "Display flackert – Ladung bricht ab")
+
+    path = tmp_path / "reports.snap"
+    repo.snapshot(path)
+
+    restored = ReportRepositoryImpl(clock=lambda: now[0], count_window=timedelta(hours=24))
+    assert restored.restore(path) == 3
+    assert [(r.id, r.station_id, r.report_text, r.status, r.filed_at) for r in restored.all_reports()] == \
+           [(r.id, r.station_id, r.report_text, r.status, r.filed_at) for r in repo.all_reports()]
+    assert restored.count_reports(101) == 1
+    assert restored._count_by_station == repo._count_by_station
+    assert restored.has_report(101, "Cable cut")
+    assert restored.find_similar_report(101, "card reader dead!", threshold=0.85) == 1.0
+    assert restored.find_similar_report(102, "Display flackert, Ladung bricht ab", threshold=0.85) is not None
+    assert restored.get_report(approved).status == ReportStatus.APPROVED
+
+    now[0] += timedelta(hours=25)
+    assert restored.count_reports(101) == 0
+
+def test_restore_merged_unions_worker_snapshots(tmp_path):
+    from datetime import datetime, timedelta, timezone
+
+    now = [datetime(2026, 6, 1, tzinfo=timezone.utc)]
+    worker_a = ReportRepositoryImpl(clock=lambda: now[0])
+    shared = worker_a.save_report(101, "Card reader dead")
+    worker_a.snapshot(tmp_path / "reports.a.snap")
+
+    # Worker b saw the same report later and approved it, and has one of its own
+    now[0] += timedelta(minutes=5)
+    worker_b = ReportRepositoryImpl(clock=lambda: now[0])
+    worker_b.restore(tmp_path / "reports.a.snap")
+    worker_b.update_status(shared, ReportStatus.APPROVED)
+    own = worker_b.save_report(102, "Cable cut")
+    worker_b.snapshot(tmp_path / "reports.b.snap")
+    (tmp_path / "reports.c.snap").write_bytes(b"corrupt")
+
+    merged = ReportRepositoryImpl(clock=lambda: now[0])
+    paths = [tmp_path / name for name in ("reports.b.snap", "reports.a.snap", "reports.c.snap")]
+    assert merged.restore_merged(paths) == 2
+    assert merged.get_report(shared).status == ReportStatus.APPROVED
+    assert merged.get_report(own).station_id == 102
+    assert merged.count_reports(101) == 1
+    assert merged.has_report(102, "Cable cut")
+    with pytest.raises(SnapshotError):
+        merged.restore_merged([tmp_path / "reports.c.snap"])
+
+def test_restore_merged_drops_reports_cleared_by_another_worker(tmp_path):
+    # Both workers hold the report after a restart; worker b sees the repair
+    first = ReportRepositoryImpl()
+    report_id = first.save_report(101, "Card reader dead")
+    first.update_status(report_id, ReportStatus.APPROVED)
+    first.snapshot(tmp_path / "reports.old.snap")
+    worker_a, worker_b = ReportRepositoryImpl(), ReportRepositoryImpl()
+    worker_a.restore_merged([tmp_path / "reports.old.snap"])
+    worker_b.restore_merged([tmp_path / "reports.old.snap"])
+    worker_b.clear_reports(101)
+    worker_a.snapshot(tmp_path / "reports.a.snap")
+    worker_b.snapshot(tmp_path / "reports.b.snap")
+
+    # Restart
+    restarted = ReportRepositoryImpl()
+    assert restarted.restore_merged([tmp_path / "reports.a.snap", tmp_path / "reports.b.snap"]) == 0
+    assert restarted.get_report(report_id) is None
+    assert restarted.count_reports(101) == 0
+    assert not restarted.has_report(101, "Card reader dead")
+
+    # Worker b's snapshot is replaced after the restart; a's stale copy must still not come back
+    restarted.snapshot(tmp_path / "reports.b.snap")
+    again = ReportRepositoryImpl()
+    assert again.restore_merged([tmp_path / "reports.a.snap", tmp_path / "reports.b.snap"]) == 0
+
+def _queue_repo():
+    from datetime import datetime, timedelta, timezone
+
+    now = [datetime(2026, 6, 1, tzinfo=timezone.utc)]
+
+    def clock():
+        now[0] += timedelta(minutes=1)
+        return now[0]
+
+    repo = ReportRepositoryImpl(clock=clock)
+    ids = {}
+    for station_id, text in [(3, "a"), (1, "b"), (3, "c"), (2, "d"), (1, "e"), (3, "f")]:
+        ids[text] = repo.save_report(station_id, text)
+    return repo, ids
+
+def test_pending_reports_page_by_age_and_station():
+    repo, ids = _queue_repo()
+    repo.update_status(ids["c"], ReportStatus.APPROVED)
+
+    page = repo.pending_reports_page(page=1, page_size=2)
+    assert [r.report_text for r in page.items] == ["a", "b"]
+    assert (page.total, page.page_count) == (5, 3)
+    assert [r.report_text for r in repo.pending_reports_page(page=3, page_size=2).items] == ["f"]
+    assert [r.report_text for r in repo.pending_reports_page(page_size=2, descending=True).items] == ["f", "e"]
+
+    by_station = repo.pending_reports_page(page=2, page_size=2, sort_by="station")
+    assert [r.report_text for r in by_station.items] == ["d", "a"]
+    filtered = repo.pending_reports_page(page_size=10, station_ids=[3, 1])
+    assert [r.report_text for r in filtered.items] == ["a", "b", "e", "f"]
+    assert [r.report_text for r in repo.pending_reports_page(page_size=10, descending=True, station_ids=[3, 1]).items] == ["f", "e", "b", "a"]
+
+    with pytest.raises(ValueError):
+        repo.pending_reports_page(sort_by="random")
+
+def test_requeued_report_keeps_age_order():
+    repo, ids = _queue_repo()
+    repo.update_status(ids["a"], ReportStatus.REJECTED)
+    repo.update_status(ids["a"], ReportStatus.PENDING)
+    assert [r.report_text for r in repo.pending_reports_page(page_size=3).items] == ["a", "b", "c"]
+
+def test_pending_station_groups():
+    repo, ids = _queue_repo()
+    groups = repo.pending_station_groups(page_size=2)
+    assert [(g.station_id, g.pending_count) for g in groups.items] == [(3, 3), (1, 2)]
+    assert groups.total == 3
+    assert [g.station_id for g in repo.pending_station_groups(page=2, page_size=2).items] == [2]
+
+    repo.clear_reports(3)
+    assert [g.station_id for g in repo.pending_station_groups().items] == [1, 2]
+    assert repo.pending_reports_page().total == 3
+
+def test_pending_pages_while_reports_change():
+    import sys
+    import threading
+
+    repo = ReportRepositoryImpl()
+    done = threading.Event()
+
+    def writer():
+        for i in range(3000):
+            report_id = repo.save_report(i % 400, f"Connector {i} damaged")
+            if i % 3:
+                repo.update_status(report_id, ReportStatus.APPROVED)
+        done.set()
+
+    # Switch threads often, so the writer runs while a page walks the queues
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        while not done.is_set():
+            repo.pending_reports_page(page=2, page_size=10, sort_by="station")
+            repo.pending_reports_page(page=2, page_size=10, station_ids=range(0, 400, 7))
+            repo.pending_station_groups(page=2, page_size=10)
+    finally:
+        thread.join()
+        sys.setswitchinterval(interval)
+    assert repo.pending_reports_page().total == 1000
+
+def test_memory_usage_grows_with_reports():
+    repo = ReportRepositoryImpl()
+    before = repo.memory_usage()
+    assert set(before) == {"reports", "pending queue", "count window", "duplicate index"}
+    for i in range(50):
+        repo.save_report(i % 5, f"Connector {i} damaged")
+    after = repo.memory_usage()
+    assert all(after[part] > before[part] for part in ("reports", "pending queue", "duplicate index"))
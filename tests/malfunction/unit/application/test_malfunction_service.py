@@ -49,7 +49,7 @@ def test_threshold_marks_station_unavailable():
     assert station.available is False
 
 def test_repair_completed_restores_station():
-    charging_repo = ChargingStationRepository([ChargingStationAggregate(station_id=1, postal_code="10115", latitude=52.52, longitude=13.40, available=False)])
+    charging_repo = ChargingStationRepository([ChargingStationAggregate(station_id=1, postal_code="10115", latitude=52.52, longitude=13.40, available=True)])
     report_repo = ReportRepositoryImpl()
     service = MalfunctionService(report_repository=report_repo, charging_station_repository=charging_repo, threshold=5)
 
@@ -64,9 +64,26 @@ def test_repair_completed_restores_station():
     assert any(e.__class__.__name__ == "StationRestoredEvent" for e in events)
     station = charging_repo.get_all()[0]
     assert station.available is True
+    assert station.out_of_service is False
     # Ensure reports are cleared
     assert report_repo.count_reports(1) == 0
 
+def test_repair_keeps_live_out_of_order_status():
+    charging_repo = ChargingStationRepository([ChargingStationAggregate(station_id=1, postal_code="10115", latitude=52.52, longitude=13.40, available=True)])
+    report_repo = ReportRepositoryImpl()
+    service = MalfunctionService(report_repository=report_repo, charging_station_repository=charging_repo, threshold=2)
+    for i in range(2):
+        service.file_malfunction_report(1, f"Display dead, attempt {i}")
+        service.approve_report(report_repo.get_pending_reports()[-1].id)
+    assert charging_repo.out_of_service_ids() == {1}
+
+    # Meanwhile the operator reports the station OUT_OF_ORDER
+    charging_repo.update_station_status(1, False)
+    service.mark_repair_completed(1)
+
+    assert charging_repo.out_of_service_ids() == frozenset()
+    assert charging_repo.is_available(1) is False
+
 def test_duplicate_report_raises_error():
     charging_repo = ChargingStationRepository([ChargingStationAggregate(station_id=1, postal_code="10115", latitude=52.52, longitude=13.40, available=True)])
     report_repo = ReportRepositoryImpl()
@@ -91,3 +108,147 @@ def test_repair_fails_below_threshold():
     with pytest.raises(ValueError, match="Cannot repair"):
         service.mark_repair_completed(1)
 
+
+def test_near_duplicate_report_raises_error():
+    charging_repo = ChargingStationRepository([ChargingStationAggregate(station_id=1, postal_code="10115", latitude=52.52, longitude=13.40, available=True)])
+    report_repo = ReportRepositoryImpl()
+    service = MalfunctionService(report_repository=report_repo, charging_station_repository=charging_repo, threshold=5)
+
+    service.file_malfunction_report(1, "Screen broken")
+    with pytest.raises(ValueError, match="Duplicate report content"):
+        service.file_malfunction_report(1, "screen broken!!")
+    with pytest.raises(ValueError, match="Duplicate report content"):
+        service.file_malfunction_report(1, "Screeen broken")
+
+    # Other stations and genuinely different reports are unaffected
+    service.file_malfunction_report(2, "screen broken!!")
+    service.file_malfunction_report(1, "Connector damaged")
+
+    # A stricter threshold lets small variations through
+    service.similarity_threshold = 0.99
+    service.file_malfunction_report(1, "Screeen broken")
+
+def test_sweep_restores_station_when_reports_leave_window():
+    from datetime import datetime, timedelta, timezone
+
+    now = [datetime(2026, 6, 1, tzinfo=timezone.utc)]
+    charging_repo = ChargingStationRepository([ChargingStationAggregate(station_id=1, postal_code="10115", latitude=52.52, longitude=13.40, available=True)])
+    report_repo = ReportRepositoryImpl(clock=lambda: now[0], count_window=timedelta(hours=48))
+    service = MalfunctionService(report_repository=report_repo, charging_station_repository=charging_repo, threshold=2)
+
+    for text in ("Screen broken", "Cable cut"):
+        service.file_malfunction_report(1, text)
+        service.approve_report(report_repo.get_pending_reports()[-1].id)
+        now[0] += timedelta(hours=1)
+    assert charging_repo.is_available(1) is False
+    assert service.threshold_station_ids() == {1}
+
+    # Still inside the window: nothing changes
+    assert service.sweep_expired_windows() == []
+    assert charging_repo.is_available(1) is False
+
+    now[0] += timedelta(hours=47)
+    events = service.sweep_expired_windows()
+    assert [(e.station_id, e.status) for e in events] == [(1, "AVAILABLE")]
+    assert charging_repo.is_available(1) is True
+    assert service.threshold_station_ids() == frozenset()
+    assert service.sweep_expired_windows() == []
+
+def test_sweep_reconciles_overrides_from_report_state_after_restart(tmp_path):
+    from datetime import datetime, timedelta, timezone
+
+    now = [datetime(2026, 6, 1, tzinfo=timezone.utc)]
+    def stations():
+        return ChargingStationRepository([
+            ChargingStationAggregate(station_id=1, postal_code="10115", latitude=52.52, longitude=13.40),
+            ChargingStationAggregate(station_id=2, postal_code="10115", latitude=52.52, longitude=13.40),
+        ])
+    report_repo = ReportRepositoryImpl(clock=lambda: now[0], count_window=timedelta(hours=48))
+    service = MalfunctionService(report_repository=report_repo, charging_station_repository=stations(), threshold=2)
+    for text in ("Screen broken", "Cable cut"):
+        service.file_malfunction_report(1, text)
+        service.approve_report(report_repo.get_pending_reports()[-1].id)
+    report_repo.snapshot(tmp_path / "reports.snap")
+
+    # Restart: reports come back, the station override does not
+    restored = ReportRepositoryImpl(clock=lambda: now[0], count_window=timedelta(hours=48))
+    restored.restore(tmp_path / "reports.snap")
+    charging_repo = stations()
+    charging_repo.set_out_of_service(2, True)  # stale override without reports
+    restarted = MalfunctionService(report_repository=restored, charging_station_repository=charging_repo, threshold=2)
+
+    events = restarted.sweep_expired_windows(adopt_held=True)
+    assert [(e.station_id, e.status) for e in events] == [(1, "UNAVAILABLE"), (2, "AVAILABLE")]
+    assert charging_repo.out_of_service_ids() == {1}
+
+    now[0] += timedelta(hours=49)
+    assert [(e.station_id, e.status) for e in restarted.sweep_expired_windows()] == [(1, "AVAILABLE")]
+    assert charging_repo.is_available(1) is True
+
+def test_sweep_leaves_overrides_of_other_workers_alone(tmp_path):
+    from uuid import uuid4
+
+    from chargehub.discovery.infrastructure.repositories.shared_charging_station_repository import SharedChargingStationRepository
+    from chargehub.discovery.infrastructure.repositories.shared_station_state import SharedStationState
+
+    stations = [ChargingStationAggregate(station_id=1, postal_code="10115", latitude=52.52, longitude=13.40, available=True)]
+    state = SharedStationState.create(f"chtest-{uuid4().hex[:12]}", stations, lock_path=tmp_path / "state.lock")
+    other_state = SharedStationState.attach(state.name, lock_path=state.lock_path)
+    try:
+        worker_a = MalfunctionService(report_repository=ReportRepositoryImpl(),
+                                      charging_station_repository=SharedChargingStationRepository(state), threshold=2)
+        worker_b = MalfunctionService(report_repository=ReportRepositoryImpl(),
+                                      charging_station_repository=SharedChargingStationRepository(other_state), threshold=2)
+        for text in ("Screen broken", "Cable cut"):
+            worker_b.file_malfunction_report(1, text)
+            worker_b.approve_report(worker_b.report_repository.get_pending_reports()[-1].id)
+
+        # Worker a has no reports for the station, but they are not its to release
+        assert worker_a.sweep_expired_windows() == []
+        assert worker_a.charging_station_repository.is_available(1) is False
+        assert worker_b.sweep_expired_windows() == []
+
+        # The worker whose reports hold the station still brings it back
+        worker_b.mark_repair_completed(1)
+        assert worker_a.charging_station_repository.is_available(1) is True
+    finally:
+        other_state.close()
+        state.close()
+        state.unlink()
+
+def test_repair_allowed_after_window_expired_while_held_offline():
+    from datetime import datetime, timedelta, timezone
+
+    now = [datetime(2026, 6, 1, tzinfo=timezone.utc)]
+    charging_repo = ChargingStationRepository([ChargingStationAggregate(station_id=1, postal_code="10115", latitude=52.52, longitude=13.40)])
+    report_repo = ReportRepositoryImpl(clock=lambda: now[0], count_window=timedelta(hours=48))
+    service = MalfunctionService(report_repository=report_repo, charging_station_repository=charging_repo, threshold=2)
+    for text in ("Screen broken", "Cable cut"):
+        service.file_malfunction_report(1, text)
+        service.approve_report(report_repo.get_pending_reports()[-1].id)
+
+    now[0] += timedelta(hours=49)
+    assert report_repo.count_reports(1) == 0
+    service.mark_repair_completed(1)
+
+    assert charging_repo.is_available(1) is True
+    with pytest.raises(ValueError, match="Cannot repair"):
+        service.mark_repair_completed(1)
+
+def test_pending_queue_filters_by_postal_code():
+    charging_repo = ChargingStationRepository([
+        ChargingStationAggregate(station_id=1, postal_code="10115", latitude=52.52, longitude=13.40),
+        ChargingStationAggregate(station_id=2, postal_code="12043", latitude=52.48, longitude=13.43),
+    ])
+    service = MalfunctionService(report_repository=ReportRepositoryImpl(), charging_station_repository=charging_repo)
+    service.file_malfunction_report(1, "Screen broken")
+    service.file_malfunction_report(2, "Cable cut")
+    service.file_malfunction_report(2, "Card reader dead")
+
+    page = service.get_pending_queue(postal_code="12043")
+    assert [r.report_text for r in page.items] == ["Cable cut", "Card reader dead"]
+    assert [r.station_id for r in service.get_pending_queue(station_id=1).items] == [1]
+    groups = service.get_pending_groups()
+    assert [(g.station_id, g.pending_count) for g in groups.items] == [(2, 2), (1, 1)]
+    with pytest.raises(ValueError):
+        service.get_pending_queue(postal_code="99999")
@@ -0,0 +1,104 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from chargehub.discovery.domain.aggregates.charging_station import ChargingStationAggregate
+from chargehub.discovery.infrastructure.repositories.charging_station_repository import ChargingStationRepository
+from chargehub.malfunction.application.malfunction_service import MalfunctionService
+from chargehub.malfunction.application.reliability_analytics import UNKNOWN_GROUP, ReliabilityAnalytics
+from chargehub.malfunction.domain.events.repair_completed import RepairCompletedEvent
+from chargehub.malfunction.domain.events.station_status_changed import StationStatusChangedEvent
+from chargehub.malfunction.infrastructure.repositories.report_repository import ReportRepositoryImpl
+from chargehub.shared.infrastructure.event_log import InMemoryEventLog
+
+T0 = datetime(2025, 3, 1, tzinfo=timezone.utc)
+
+class Clock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+def _stations():
+    return [
+        ChargingStationAggregate(station_id=1, postal_code="10115", latitude=52.52, longitude=13.40,
+                                 available=True, operator="Alpha"),
+        ChargingStationAggregate(station_id=2, postal_code="10115", latitude=52.53, longitude=13.41,
+                                 available=True, operator="Beta"),
+        ChargingStationAggregate(station_id=3, postal_code="10117", latitude=52.51, longitude=13.39,
+                                 available=True, operator="Alpha"),
+    ]
+
+def _down(station_id):
+    return StationStatusChangedEvent(station_id=station_id, status="UNAVAILABLE")
+
+def test_mttr_and_down_counts_per_operator_and_plz():
+    clock = Clock(T0)
+    analytics = ReliabilityAnalytics(_stations(), clock=clock)
+
+    analytics.observe([_down(1)], T0)
+    analytics.observe([_down(3)], T0 + timedelta(hours=1))
+    analytics.observe([RepairCompletedEvent(station_id=1)], T0 + timedelta(hours=4))
+
+    alpha = {s.group: s for s in analytics.by_operator()}["Alpha"]
+    assert (alpha.stations, alpha.failures, alpha.repairs, alpha.down_now) == (2, 2, 1, 1)
+    assert alpha.mean_time_to_repair == timedelta(hours=4)
+
+    by_plz = {s.group: s for s in analytics.by_postal_code()}
+    assert by_plz["10115"].down_now == 0 and by_plz["10117"].down_now == 1
+    assert by_plz["10117"].mean_time_to_repair is None
+    # Beta never failed, so it is not listed
+    assert "Beta" not in {s.group for s in analytics.by_operator()}
+
+def test_repeated_unavailable_is_one_outage_and_expiry_is_not_a_repair():
+    analytics = ReliabilityAnalytics(_stations(), clock=Clock(T0))
+
+    analytics.observe([_down(2), _down(2)], T0)
+    analytics.observe([StationStatusChangedEvent(station_id=2, status="AVAILABLE")], T0 + timedelta(hours=2))
+    # A repair without an open outage changes nothing
+    analytics.observe([RepairCompletedEvent(station_id=2)], T0 + timedelta(hours=3))
+
+    total = analytics.totals()
+    assert (total.failures, total.repairs, total.down_now) == (1, 0, 0)
+    assert total.mean_time_to_repair is None
+
+def test_failures_per_station_month():
+    clock = Clock(T0)
+    analytics = ReliabilityAnalytics(_stations(), clock=clock)
+    analytics.observe([_down(1)], T0)
+    analytics.observe([RepairCompletedEvent(station_id=1)], T0 + timedelta(days=1))
+    analytics.observe([_down(1)], T0 + timedelta(days=2))
+
+    clock.now = T0 + timedelta(days=30.44)
+    alpha = analytics.by_operator()[0]
+    assert alpha.failures_per_station_month == pytest.approx(2 / 2)
+    assert analytics.totals().failures_per_station_month == pytest.approx(2 / 3)
+
+def test_unknown_station_is_grouped_separately():
+    analytics = ReliabilityAnalytics(_stations(), clock=Clock(T0))
+    analytics.observe([_down(99)], T0)
+
+    assert [s.group for s in analytics.by_operator()] == [UNKNOWN_GROUP]
+    assert analytics.totals().stations == 4
+
+def test_replay_from_event_log_matches_live_figures():
+    clock = Clock(T0)
+    event_log = InMemoryEventLog(clock=clock)
+    charging_repo = ChargingStationRepository(_stations())
+    live = ReliabilityAnalytics(charging_repo.iter_stations(), clock=clock)
+    service = MalfunctionService(report_repository=ReportRepositoryImpl(), charging_station_repository=charging_repo,
+                                 threshold=2, event_log=event_log, reliability=live)
+
+    for i in range(2):
+        service.file_malfunction_report(3, f"broken plug {i}")
+        service.approve_report(service.report_repository.get_pending_reports()[-1].id)
+    clock.now = T0 + timedelta(hours=6)
+    service.mark_repair_completed(3)
+
+    replayed = ReliabilityAnalytics(_stations(), clock=clock)
+    replayed.apply(event_log.iter_events())
+
+    assert live.totals() == replayed.totals()
+    assert live.by_postal_code() == replayed.by_postal_code()
+    assert live.totals().mean_time_to_repair == timedelta(hours=6)
@@ -0,0 +1,42 @@
+import sys
+from dataclasses import dataclass
+from enum import Enum
+
+import numpy as np
+
+from chargehub.shared.infrastructure.deep_size import deep_sizeof
+
+class Colour(Enum):
+    RED = 1
+
+@dataclass
+class Record:
+    name: str
+    colour: Colour
+
+class Slotted:
+    __slots__ = ("payload",)
+
+    def __init__(self, payload):
+        self.payload = payload
+
+def test_counts_nested_containers_and_instances():
+    text = "x" * 1000
+    record = Record(text, Colour.RED)
+    expected = sys.getsizeof(record) + sys.getsizeof(record.__dict__) + sys.getsizeof("name") \
+        + sys.getsizeof("colour") + sys.getsizeof(text)
+    assert deep_sizeof(record) == expected
+    assert deep_sizeof(Slotted(text)) == sys.getsizeof(Slotted(text)) + sys.getsizeof(text)
+    assert deep_sizeof([text, text]) == sys.getsizeof([text, text]) + sys.getsizeof(text)
+
+def test_shared_seen_set_charges_objects_once():
+    payload = bytes(10_000)
+    seen = set()
+    first = deep_sizeof([payload], seen=seen)
+    second = deep_sizeof({"again": payload}, seen=seen)
+    assert first > 10_000 > second
+
+def test_numpy_views_count_their_base():
+    array = np.zeros(10_000)
+    assert deep_sizeof(array) >= array.nbytes
+    assert deep_sizeof(array[:10]) >= array.nbytes
@@ -0,0 +1,88 @@
+from datetime import datetime, timezone
+
+from chargehub.malfunction.domain.events.station_status_changed import StationStatusChangedEvent
+from chargehub.shared.infrastructure.event_log import InMemoryEventLog, JsonlEventLog
+
+WHEN = datetime(2026, 6, 1, tzinfo=timezone.utc)
+
+def test_jsonl_event_log_persists_and_resumes_sequence(tmp_path):
+    path = tmp_path / "events.jsonl"
+    log = JsonlEventLog(path, clock=lambda: WHEN)
+    recorded = log.append([StationStatusChangedEvent(station_id=1, status="UNAVAILABLE"),
+                           StationStatusChangedEvent(station_id=1, status="AVAILABLE")])
+    assert [r.seq for r in recorded] == [1, 2]
+
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"seq": 3, "occurred')  # torn line from a crash
+
+    reopened = JsonlEventLog(path, clock=lambda: WHEN)
+    assert reopened.last_seq() == 2
+    assert [(e.seq, e.name, e.payload["status"]) for e in reopened.iter_events(after_seq=1)] == \
+           [(2, "StationStatusChangedEvent", "AVAILABLE")]
+    assert reopened.iter_events().__next__().occurred_at == WHEN
+
+def test_in_memory_event_log():
+    log = InMemoryEventLog(clock=lambda: WHEN)
+    log.append([StationStatusChangedEvent(station_id=2, status="UNAVAILABLE")])
+    log.append([StationStatusChangedEvent(station_id=3, status="UNAVAILABLE")])
+    assert log.last_seq() == 2
+    assert [e.payload["station_id"] for e in log.iter_events(after_seq=1)] == [3]
+
+def test_jsonl_event_log_seeks_to_recent_appends(tmp_path):
+    path = tmp_path / "events.jsonl"
+    log = JsonlEventLog(path, clock=lambda: WHEN)
+    for station_id in range(1, 6):
+        log.append([StationStatusChangedEvent(station_id=station_id, status="UNAVAILABLE")])
+
+    assert [seq for seq, _ in log._checkpoints] == [0, 1, 2, 3, 4]
+    assert [e.seq for e in log.iter_events(after_seq=3)] == [4, 5]
+    assert [e.seq for e in log.iter_events(after_seq=5)] == []
+    assert [e.seq for e in log.iter_events()] == [1, 2, 3, 4, 5]
+
+    reopened = JsonlEventLog(path, clock=lambda: WHEN)
+    reopened.append([StationStatusChangedEvent(station_id=9, status="AVAILABLE")])
+    assert [e.payload["station_id"] for e in reopened.iter_events(after_seq=5)] == [9]
+    assert [e.seq for e in reopened.iter_events(after_seq=2)] == [3, 4, 5, 6]
+
+def test_jsonl_event_logs_sharing_a_file_keep_sequence_unique(tmp_path):
+    path = tmp_path / "events.jsonl"
+    worker_a = JsonlEventLog(path, clock=lambda: WHEN)
+    worker_b = JsonlEventLog(path, clock=lambda: WHEN)
+
+    worker_a.append([StationStatusChangedEvent(station_id=1, status="UNAVAILABLE")])
+    recorded = worker_b.append([StationStatusChangedEvent(station_id=2, status="UNAVAILABLE")])
+    worker_a.append([StationStatusChangedEvent(station_id=3, status="UNAVAILABLE")])
+
+    assert [r.seq for r in recorded] == [2]
+    assert worker_b.last_seq() == 3
+    assert [(e.seq, e.payload["station_id"]) for e in worker_b.iter_events(after_seq=1)] == [(2, 2), (3, 3)]
+    assert [e.seq for e in worker_a.iter_events(after_seq=1)] == [2, 3]
+
+def test_append_after_torn_line_starts_a_new_line(tmp_path):
+    path = tmp_path / "events.jsonl"
+    JsonlEventLog(path, clock=lambda: WHEN).append([StationStatusChangedEvent(station_id=1, status="UNAVAILABLE")])
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"seq": 2, "occ')
+
+    log = JsonlEventLog(path, clock=lambda: WHEN)
+    log.append([StationStatusChangedEvent(station_id=2, status="AVAILABLE")])
+
+    assert [(e.seq, e.payload["station_id"]) for e in JsonlEventLog(path).iter_events()] == [(1, 1), (2, 2)]
+
+def _append_many(path, count):
+    log = JsonlEventLog(path)
+    for station_id in range(count):
+        log.append([StationStatusChangedEvent(station_id=station_id, status="UNAVAILABLE")])
+
+def test_concurrent_processes_append_without_sequence_collisions(tmp_path):
+    import multiprocessing
+
+    path = tmp_path / "events.jsonl"
+    workers = [multiprocessing.get_context("spawn").Process(target=_append_many, args=(path, 25)) for _ in range(3)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(30)
+        assert worker.exitcode == 0
+
+    assert [e.seq for e in JsonlEventLog(path).iter_events()] == list(range(1, 76))
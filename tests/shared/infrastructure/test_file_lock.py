@@ -0,0 +1,17 @@
+from chargehub.shared.infrastructure.file_lock import FileLease, file_lock
+
+def test_lease_has_one_holder_until_released(tmp_path):
+    first, second = FileLease(tmp_path / "job.lock"), FileLease(tmp_path / "job.lock")
+
+    assert first.acquire() and first.acquire()
+    assert second.acquire() is False
+    first.release()
+    assert second.acquire() is True
+    assert second.held and not first.held
+
+def test_file_lock_is_released_after_the_block(tmp_path):
+    path = tmp_path / "state.lock"
+    with file_lock(path):
+        pass
+    with file_lock(path):
+        assert path.exists()
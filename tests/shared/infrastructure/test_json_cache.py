@@ -0,0 +1,22 @@
+from chargehub.shared.infrastructure.json_cache import read_json_cache, write_json_cache
+
+def test_round_trip_checks_version_and_source(tmp_path):
+    path = tmp_path / "cache" / "data.json"
+    assert write_json_cache(path, 2, {"size": 10}, rows=[1, 2])
+    assert read_json_cache(path, 2, {"size": 10})["rows"] == [1, 2]
+    assert read_json_cache(path, 3, {"size": 10}) is None
+    assert read_json_cache(path, 2, {"size": 11}) is None
+    assert list(path.parent.iterdir()) == [path]
+
+def test_missing_or_corrupt_cache_is_a_miss(tmp_path):
+    path = tmp_path / "data.json"
+    assert read_json_cache(path, 1, None) is None
+    path.write_text("{not json")
+    assert read_json_cache(path, 1, None) is None
+    assert read_json_cache(None, 1, None) is None
+
+def test_unwritable_location_is_not_an_error(tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    # The cache directory cannot be created below a regular file
+    assert write_json_cache(blocker / "data.json", 1, None, rows=[]) is False
@@ -0,0 +1,69 @@
+import os
+import sys
+from datetime import datetime, timezone
+
+from chargehub.shared.infrastructure.deep_size import deep_sizeof
+from chargehub.shared.infrastructure.memory_monitor import MemoryMonitor, module_name
+
+NOW = datetime(2025, 3, 1, tzinfo=timezone.utc)
+
+def test_components_share_seen_objects_and_track_growth():
+    shared = ["x" * 10_000]
+    cache = [shared]
+    monitor = MemoryMonitor(clock=lambda: NOW)
+    monitor.register("owner", lambda seen: {"list": deep_sizeof(shared, seen=seen)})
+    monitor.register("cache", lambda seen: deep_sizeof(cache, seen=seen))
+
+    report = monitor.sample()
+    owner, other = report.components
+    assert owner.parts["list"] == owner.bytes > 10_000
+    assert other.bytes < 1_000
+    assert report.total_bytes == owner.bytes + other.bytes
+    assert report.module_growth == () and report.traced_bytes is None
+
+    cache.append(bytes(50_000))
+    assert monitor.sample().components[1].growth > 50_000
+    assert monitor.latest.components[0].growth == 0
+
+def test_alert_once_per_budget_crossing():
+    data = []
+    monitor = MemoryMonitor(clock=lambda: NOW).register("data", lambda seen: deep_sizeof(data, seen=seen), budget=5_000)
+    monitor.sample()
+    assert monitor.alerts() == []
+
+    data.append(bytes(10_000))
+    assert monitor.sample().components[0].over_budget
+    monitor.sample()
+    assert [(a.component, a.budget) for a in monitor.alerts()] == [("data", 5_000)]
+
+    data.clear()
+    monitor.sample()
+    data.append(bytes(10_000))
+    monitor.sample()
+    assert len(monitor.alerts()) == 2
+
+def test_failing_sizer_does_not_hide_other_components():
+    def broken(seen):
+        raise RuntimeError("boom")
+
+    monitor = MemoryMonitor().register("broken", broken).register("fine", lambda seen: 42)
+    assert [(c.name, c.bytes) for c in monitor.sample().components] == [("fine", 42)]
+
+def test_tracemalloc_diff_groups_growth_by_module():
+    monitor = MemoryMonitor(trace=True)
+    try:
+        monitor.sample()
+        hoard = [bytes(1000) + bytes([i % 256]) for i in range(2000)]
+        report = monitor.sample()
+        assert report.traced_bytes > 2_000_000
+        assert report.module_growth[0].module == module_name(__file__)
+        assert report.module_growth[0].size_diff > 2_000_000
+        del hoard
+    finally:
+        monitor.stop_tracing()
+
+def test_module_name_is_relative_to_sys_path():
+    root = os.path.abspath(sys.path[0])
+    assert module_name(os.path.join(root, "pkg", "mod.py")) == "pkg.mod"
+    assert module_name(os.path.join(root, "pkg", "__init__.py")) == "pkg"
+    assert module_name("<string>") == "<string>"
@@ -0,0 +1,29 @@
+import threading
+
+import pytest
+
+from chargehub.shared.infrastructure.periodic_task import PeriodicTask
+
+def test_periodic_task_runs_until_stopped():
+    ran = threading.Event()
+    task = PeriodicTask(ran.set, interval_seconds=0.01).start()
+    assert ran.wait(1.0)
+    task.stop(timeout=1.0)
+    assert not task.running
+    assert task.runs >= 1
+
+def test_failing_action_does_not_stop_schedule():
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        raise RuntimeError("boom")
+
+    task = PeriodicTask(flaky, interval_seconds=60)
+    task.run_once()
+    task.run_once()
+    assert task.runs == 2 and len(calls) == 2
+
+def test_interval_must_be_positive():
+    with pytest.raises(ValueError):
+        PeriodicTask(lambda: None, interval_seconds=0)
@@ -0,0 +1,49 @@
+import pytest
+
+from chargehub.shared.infrastructure.snapshot_file import SnapshotError, WorkerSnapshots, read_snapshot, write_snapshot
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "state.snap"
+    written = write_snapshot(path, b"TEST", b"payload")
+    assert written == path.stat().st_size
+    assert read_snapshot(path, b"TEST") == (1, b"payload")
+
+def test_rejects_wrong_kind_and_corruption(tmp_path):
+    path = tmp_path / "state.snap"
+    write_snapshot(path, b"TEST", b"payload")
+    with pytest.raises(SnapshotError):
+        read_snapshot(path, b"OTHR")
+
+    data = bytearray(path.read_bytes())
+    data[-1] ^= 0xFF
+    path.write_bytes(bytes(data))
+    with pytest.raises(SnapshotError, match="corrupt"):
+        read_snapshot(path, b"TEST")
+
+    with pytest.raises(SnapshotError):
+        read_snapshot(tmp_path / "missing.snap", b"TEST")
+
+def test_payload_versions(tmp_path):
+    path = tmp_path / "state.snap"
+    write_snapshot(path, b"TEST", b"v2", version=2)
+    assert read_snapshot(path, b"TEST", versions=(1, 2)) == (2, b"v2")
+    with pytest.raises(SnapshotError, match="version"):
+        read_snapshot(path, b"TEST")
+
+def test_worker_snapshots_find_files_of_exited_workers(tmp_path):
+    base = tmp_path / "reports.snap"
+    write_snapshot(base, b"TEST", b"single process")
+    running = WorkerSnapshots(base, worker_id="1").claim()
+    exited = WorkerSnapshots(base, worker_id="2").claim()
+    for worker in (running, exited):
+        write_snapshot(worker.path, b"TEST", worker.worker_id.encode())
+    exited.release()
+
+    starting = WorkerSnapshots(base, worker_id="3").claim()
+    assert [p.name for p in starting.paths()] == ["reports.1.snap", "reports.2.snap", "reports.snap"]
+    assert [p.name for p in starting.orphaned()] == ["reports.2.snap", "reports.snap"]
+    with pytest.raises(RuntimeError):
+        WorkerSnapshots(base, worker_id="1").claim()
+
+    starting.remove(starting.orphaned())
+    assert [p.name for p in starting.paths()] == ["reports.1.snap"]
@@ -0,0 +1,34 @@
+from chargehub.shared.presentation.interaction_timings import InteractionTimings
+
+def test_measure_records_per_section():
+    ticks = iter([0.0, 0.010, 1.0, 1.002, 2.0, 2.030])
+    timings = InteractionTimings(clock=lambda: next(ticks))
+    with timings.measure("map"):
+        pass
+    with timings.measure("form"):
+        pass
+    with timings.measure("map"):
+        pass
+
+    assert [(s, round(ms)) for s, ms in timings.recent()] == [("map", 30), ("form", 2), ("map", 10)]
+    summary = {t.section: t for t in timings.summary()}
+    assert summary["map"].runs == 2
+    assert round(summary["map"].last_ms) == 30
+    assert round(summary["map"].median_ms) == 20
+    assert summary["form"].runs == 1
+
+def test_history_is_bounded():
+    timings = InteractionTimings(history=3)
+    for i in range(10):
+        timings.record("map", float(i))
+    assert [ms for _, ms in timings.recent(10)] == [9.0, 8.0, 7.0]
+    assert timings.summary()[0].runs == 3
+
+def test_measure_records_even_when_section_fails():
+    timings = InteractionTimings()
+    try:
+        with timings.measure("form"):
+            raise RuntimeError
+    except RuntimeError:
+        pass
+    assert timings.summary()[0].section == "form"
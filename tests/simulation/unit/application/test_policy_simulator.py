@@ -0,0 +1,74 @@
+import pytest
+
+from chargehub.simulation.application.policy_simulator import (
+    FailureModel,
+    ModerationPolicy,
+    SimulationTrace,
+    policy_grid,
+    simulate,
+    sweep,
+)
+from chargehub.simulation.application.service_replay import replay_with_service
+
+# Busy stations, so a short run exercises breakdowns, false alarms, expiry and repairs
+BUSY = FailureModel(breakdowns_per_station_year=40, false_reports_per_hour=0.05, false_approval_rate=0.5,
+                    mean_repair_hours=60)
+
+@pytest.mark.parametrize("policy", [
+    ModerationPolicy(threshold=2, approval_delay_hours=0, count_window_hours=72),
+    ModerationPolicy(threshold=3, approval_delay_hours=5, count_window_hours=24),
+    ModerationPolicy(threshold=1, approval_delay_hours=2, count_window_hours=None),
+    ModerationPolicy(threshold=4, approval_delay_hours=1, count_window_hours=48),
+])
+def test_vectorised_simulation_matches_malfunction_service(policy):
+    trace = SimulationTrace()
+    outcome = simulate(BUSY, policy, stations=8, hours=300, seed=5, trace=trace)
+    replay = replay_with_service(BUSY, policy, stations=8, hours=300, seed=5)
+
+    assert len(trace.offline) == len(replay.offline) == 300
+    for hour, (ours, theirs) in enumerate(zip(trace.offline, replay.offline)):
+        assert (ours == theirs).all(), f"offline stations differ in hour {hour}"
+    for ours, theirs in zip(trace.broken, replay.broken):
+        assert (ours == theirs).all()
+    assert outcome.wrongly_offline_hours == sum(int((o & ~b).sum()) for o, b in zip(trace.offline, trace.broken))
+    assert outcome.broken_available_hours == sum(int((b & ~o).sum()) for o, b in zip(trace.offline, trace.broken))
+    assert outcome.breakdowns > 0
+
+def test_same_seed_same_outcome():
+    policy = ModerationPolicy(threshold=3, approval_delay_hours=4)
+    assert simulate(BUSY, policy, stations=50, runs=4, hours=200, seed=1) == \
+           simulate(BUSY, policy, stations=50, runs=4, hours=200, seed=1)
+
+def test_higher_threshold_trades_false_alarms_for_slower_detection():
+    low, high = sweep(BUSY, policy_grid([1, 6], [0]), stations=200, runs=5, hours=30 * 24, seed=2)
+
+    assert high.false_alarms < low.false_alarms
+    assert high.wrongly_offline_share < low.wrongly_offline_share
+    assert high.mean_hours_to_detection > low.mean_hours_to_detection
+    assert high.broken_available_share > low.broken_available_share
+
+def test_approval_slower_than_window_never_detects():
+    outcome = simulate(BUSY, ModerationPolicy(threshold=2, approval_delay_hours=30, count_window_hours=24),
+                       stations=100, hours=500)
+    assert outcome.breakdowns > 0
+    assert outcome.detections == 0 and outcome.mean_hours_to_detection is None
+    assert outcome.wrongly_offline_hours == 0
+
+def test_validation():
+    with pytest.raises(ValueError):
+        ModerationPolicy(threshold=0)
+    with pytest.raises(ValueError):
+        FailureModel(false_approval_rate=1.5)
+    with pytest.raises(ValueError):
+        simulate(BUSY, ModerationPolicy(threshold=2), stations=0)
+
+def test_cli_without_register_asks_for_station_count(tmp_path, monkeypatch, capsys):
+    from chargehub.config import ChargeHubConfig
+    from chargehub.simulation.__main__ import main
+
+    monkeypatch.setattr(ChargeHubConfig, "DATA_PATH", tmp_path / "missing.csv")
+    monkeypatch.setattr(ChargeHubConfig, "STATION_CACHE_PATH", tmp_path / "stations.json")
+    with pytest.raises(SystemExit) as exit_info:
+        main(["--runs", "1", "--days", "1"])
+    assert exit_info.value.code == 2
+    assert "--stations" in capsys.readouterr().err
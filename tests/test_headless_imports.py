@@ -0,0 +1,30 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+HEADLESS_MODULES = [
+    "chargehub.discovery.domain.value_objects.postal_code",
+    "chargehub.discovery.application.charging_station_service",
+    "chargehub.discovery.infrastructure.repositories.charging_station_csv_repository",
+    "chargehub.malfunction.application.malfunction_service",
+    "chargehub.malfunction.infrastructure.repositories.report_repository",
+]
+
+@pytest.mark.parametrize("module", HEADLESS_MODULES)
+def test_core_imports_without_ui_or_data_stack(module):
+    """Domain, application and repository modules must not pull in streamlit, folium or pandas."""
+    code = (
+        f"import sys; import {module}; "
+        "heavy = [m for m in ('streamlit', 'folium', 'streamlit_folium', 'pandas') if m in sys.modules]; "
+        "print(','.join(heavy))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        env=dict(os.environ, PYTHONPATH=str(SRC)), capture_output=True, text=True, check=True,
+    )
+    assert result.stdout.strip() == ""